@@ -8,41 +8,35 @@
 
 set -e
 
-# Function to setup log file permissions
+# Function to setup log segments directory permissions
 setup_logs() {
-    local log_file="/app/logs/fastapi.log"
+    local log_dir="/app/logs/segments"
 
-    # Ensure logs directory exists
-    if [ ! -d "/app/logs" ]; then
-        mkdir -p /app/logs 2>/dev/null || {
-            echo "Warning: Could not create /app/logs directory"
+    # Ensure logs directory exists (hourly JSON segments + index, see core/log_store.py)
+    if [ ! -d "$log_dir" ]; then
+        mkdir -p "$log_dir" 2>/dev/null || {
+            echo "Warning: Could not create $log_dir directory"
             return 1
         }
     fi
 
-    # Remove old log file if it has wrong permissions
-    if [ -f "$log_file" ]; then
-        if ! touch "$log_file" 2>/dev/null; then
-            echo "Warning: Existing log file not writable, attempting removal..."
-            rm -f "$log_file" 2>/dev/null || {
-                echo "Error: Cannot remove old log file, logging may fail"
-                return 1
-            }
-        fi
+    # Owned by the app user, group-writable only (same as /app/logs in the image)
+    if [ "$(id -u)" = "0" ]; then
+        chown appuser:appuser "$log_dir" 2>/dev/null || {
+            echo "Warning: Could not change log directory owner to appuser"
+        }
     fi
-
-    # Create fresh log file with proper permissions
-    touch "$log_file" 2>/dev/null || {
-        echo "Warning: Could not create log file (may require host permissions)"
-        return 1
+    chmod 775 "$log_dir" 2>/dev/null || {
+        echo "Warning: Could not set log directory permissions (may require host permissions)"
     }
 
-    # Set universal write permissions (works for bind mounts and named volumes)
-    chmod 666 "$log_file" 2>/dev/null || {
-        echo "Warning: Could not set log file permissions (may require host permissions)"
-    }
+    if ! touch "$log_dir/.write-test" 2>/dev/null; then
+        echo "Warning: Log directory not writable, logging may fail"
+        return 1
+    fi
+    rm -f "$log_dir/.write-test"
 
-    echo "✅ Log file ready: $log_file"
+    echo "✅ Log directory ready: $log_dir"
     return 0
 }
 
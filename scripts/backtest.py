@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward Backtest
+=====================
+
+CLI de domain/ml/backtesting.py: compara variantes de Prophet (precio REE)
+o del RandomForest de optimización (sklearn) con folds rolling-origin
+entrenados en paralelo. Sustituye a validate_prophet_walkforward*.py y
+test_prophet_*_walkforward.py.
+
+Las métricas por horizonte se registran en ModelMetricsTracker como
+``backtest_<variante>`` (salvo --no-log).
+
+Uso:
+    python scripts/backtest.py --model prophet --folds 8 --horizon 168 \\
+        --variant '{"name": "baseline"}' \\
+        --variant '{"name": "cp40", "n_changepoints": 40, "inertia_hours": 3}'
+    python scripts/backtest.py --model sklearn --variant '{"name": "rf200", "n_estimators": 200}'
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'src' / 'fastapi-app'))
+
+from domain.ml.backtesting import KIND_PROPHET, KIND_SKLEARN, run_backtest, spec_from_dict  # noqa: E402
+
+
+def _fmt(value) -> str:
+    return "   -   " if value is None else f"{value:7.4f}"
+
+
+def print_report(report: dict):
+    print(f"\n{report['kind']}: {report['folds']} folds × {report['horizon_hours']}h, "
+          f"{report['data']['rows']} rows ({report['data']['start']} → {report['data']['end']}), "
+          f"{report['workers']} worker(s), {report['duration_seconds']:.1f}s")
+    for name, variant in report["variants"].items():
+        failed = [fold for fold in variant["folds"] if "error" in fold]
+        print(f"\n  {name}" + (f"  ({len(failed)} fold(s) skipped)" if failed else ""))
+        print(f"  {'horizon':>10}  {'MAE':>7}  {'RMSE':>7}  {'R²':>7}  {'n':>6}")
+        for row in variant["horizons"]:
+            print(f"  {row['horizon']:>10}  {_fmt(row['mae'])}  {_fmt(row['rmse'])}  "
+                  f"{_fmt(row['r2'])}  {row['samples']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=[KIND_PROPHET, KIND_SKLEARN], default=KIND_PROPHET)
+    parser.add_argument("--variant", action="append", default=[],
+                        help="Spec JSON (ProphetSpec/SklearnSpec fields); repeatable")
+    parser.add_argument("--folds", type=int, default=8)
+    parser.add_argument("--horizon", type=int, default=168, help="Horizon hours per fold")
+    parser.add_argument("--step", type=int, default=None, help="Hours between origins (default: horizon)")
+    parser.add_argument("--bucket", type=int, default=24, help="Horizon bucket hours for metrics")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel processes (default: available cores)")
+    parser.add_argument("--months-back", type=int, default=36)
+    parser.add_argument("--no-log", action="store_true", help="Do not log metrics to ModelMetricsTracker")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the full report to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for noisy in ("cmdstanpy", "prophet"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+    try:
+        specs = [spec_from_dict(args.model, json.loads(raw)) for raw in (args.variant or ["{}"])]
+    except (ValueError, json.JSONDecodeError) as e:
+        parser.error(str(e))
+
+    report = asyncio.run(run_backtest(
+        specs,
+        folds=args.folds,
+        horizon_hours=args.horizon,
+        step_hours=args.step,
+        bucket_hours=args.bucket,
+        workers=args.workers,
+        months_back=args.months_back,
+        log_metrics=not args.no_log
+    ))
+    if not report.get("success"):
+        print(f"❌ {report.get('error')}")
+        sys.exit(1)
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str))
+        print(f"\n📄 Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
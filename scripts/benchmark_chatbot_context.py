@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Chatbot Context Benchmark
+=========================
+
+Latencia end-to-end de POST /chat/ask (LLM stub: sin llamada a Anthropic)
+con las dos formas de construir el contexto:
+
+- loopback: como antes, cada sección hace su propia petición HTTP a la API
+  (/dashboard/complete, /insights/*, /ree/prices/*, /optimize/production/daily),
+  con un cliente httpx nuevo por sección y sin compartir nada
+- in-process: services/chatbot_context_providers.py, servicios de dominio
+  llamados directamente y un snapshot por pregunta
+
+Levanta un uvicorn local con los routers implicados. Por defecto las
+fuentes de datos (Influx, Prophet, optimizador) se sustituyen por payloads
+fijos con --source-latency ms de espera, iguales en ambos modos: la
+diferencia medida es la capa de contexto. Con --live se usan los servicios
+reales (requiere InfluxDB y modelos).
+
+Uso:
+    python scripts/benchmark_chatbot_context.py [--rounds 20] [--source-latency 20] [--live]
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'src' / 'fastapi-app'))
+
+QUESTIONS = [
+    "¿Cuándo debo producir chocolate mañana?",
+    "¿Cuál es el precio actual de la energía?",
+    "¿Hay alertas activas?",
+    "¿Qué análisis histórico tenemos de temperatura?",
+    "¿Qué me recomiendas hacer con la producción?",
+    "Dame un resumen",
+]
+
+# Fuente → endpoint equivalente (modo loopback): método, ruta, parámetros, clave del resultado
+LOOPBACK_ENDPOINTS = {
+    "dashboard": ("GET", "/dashboard/complete", None, None),
+    "optimal_windows": ("GET", "/insights/optimal-windows", None, None),
+    "alerts": ("GET", "/insights/alerts", None, None),
+    "savings": ("GET", "/insights/savings-tracking", None, None),
+    "latest_price": ("GET", "/ree/prices/latest", None, None),
+    "price_stats": ("GET", "/ree/prices/stats", {"start_date": "2026-01-01"}, None),
+    "production_plan": ("POST", "/optimize/production/daily", {"target_kg": 200}, "optimization"),
+}
+
+
+# =================================================================
+# FUENTES STUB
+# =================================================================
+
+def _stub_payloads():
+    hours = [{"datetime": f"2026-10-{17 + h // 24:02d}T{h % 24:02d}:00:00", "predicted_price": 0.08 + (h % 24) / 200,
+              "lower": 0.05, "upper": 0.2} for h in range(168)]
+    days = [{"date": f"2026-10-{17 + d}", "day_name": "Lunes", "avg_price_eur_kwh": 0.11, "avg_temperature": 19.5,
+             "recommendation_icon": "🟢", "hourly": hours[d * 24:(d + 1) * 24]} for d in range(7)]
+    dashboard = {
+        "current_info": {"energy": {"price_eur_kwh": 0.0812, "trend": "down"},
+                         "weather": {"temperature": 21.5, "humidity": 48, "pressure": 1013},
+                         "production_status": "optimal", "factory_efficiency": 87.5},
+        "predictions": {"energy_optimization": {"score": 82, "recommendation": "produce"},
+                        "production_recommendation": {"class": "Optimal", "confidence": 91}},
+        "weekly_forecast": {"calendar_days": days, "summary": {"price_summary": {"min_price": 0.05, "max_price": 0.21}}},
+        "price_forecast": hours,
+        "siar_analysis": {"seasonal_patterns": {"best_month": {"name": "Enero"}, "worst_month": {"name": "Julio"}}},
+        "historical_analytics": {"optimization_potential": {"annual_savings_projection": 1234.5}},
+        "recommendations": {"human_recommendation": {"main_message": {"title": "Producir ahora"}}},
+    }
+    windows = [{"datetime": h["datetime"], "hours": "02-05h", "avg_price_eur_kwh": 0.065, "quality": "EXCELLENT",
+                "recommended_process": "Conchado", "estimated_savings_eur": 18.4} for h in hours[:40:8]]
+    batch = {"start_time": "02:00", "end_time": "08:00", "quality_type": "premium", "avg_price_eur_kwh": 0.0654}
+    return {
+        "dashboard": dashboard,
+        "optimal_windows": {"status": "success", "optimal_windows": windows},
+        "alerts": {"status": "success", "total_alerts": 1, "alerts": [{"severity": "high", "message": "Pico 19h"}]},
+        "savings": {"status": "success", "daily_savings": {"savings_eur": 4.55}},
+        "latest_price": {"price_eur_kwh": 0.0812, "timestamp": "2026-10-16T03:00:00+00:00"},
+        "price_stats": {"min": 0.01, "max": 0.3, "avg": 0.12, "median": 0.11, "count": 720},
+        "production_plan": {"target_date": "2026-10-17T00:00:00", "plan": {"batches": [batch]}},
+    }
+
+
+def _stub_sources(stack: ExitStack, latency: float):
+    """Sustituir las fuentes de datos (no la capa de contexto) en ambos modos."""
+    payloads = _stub_payloads()
+
+    def source(name):
+        async def fetch(*args, **kwargs):
+            await asyncio.sleep(latency)
+            return payloads[name]
+        return fetch
+
+    class _Ingestion:
+        client = None
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    optimizer = SimpleNamespace(optimize_daily_production=source("production_plan"))
+    stack.enter_context(patch("services.dashboard.get_dashboard_service", lambda: SimpleNamespace()))
+    stack.enter_context(patch("services.dashboard_snapshot.DashboardSnapshotService._build_document",
+                              lambda self, service: source("dashboard")()))
+    for method, name in (("get_optimal_windows", "optimal_windows"), ("get_predictive_alerts", "alerts"),
+                         ("get_savings_tracking", "savings")):
+        stack.enter_context(patch(f"services.predictive_insights_service.PredictiveInsightsService.{method}",
+                                  source(name)))
+    stack.enter_context(patch("services.ree_service.REEService.get_latest_price", source("latest_price")))
+    stack.enter_context(patch("services.ree_service.REEService.get_price_stats", source("price_stats")))
+    stack.enter_context(patch("services.data_ingestion.DataIngestionService", _Ingestion))
+    stack.enter_context(patch("services.hourly_optimizer_service.get_optimizer_service", lambda **_: optimizer))
+
+
+# =================================================================
+# MODO LOOPBACK (comportamiento anterior)
+# =================================================================
+
+def _loopback_providers(base_url: str):
+    import httpx
+
+    def provider(method, path, payload, key):
+        async def fetch():
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                if method == "POST":
+                    response = await client.post(f"{base_url}{path}", params=payload)
+                else:
+                    response = await client.get(f"{base_url}{path}", params=payload)
+                data = response.json()
+                return data[key] if key else data
+        return fetch
+
+    return {name: provider(*spec) for name, spec in LOOPBACK_ENDPOINTS.items()}
+
+
+def _unshared_snapshot():
+    """Snapshot sin memoización: una petición por sección, como antes."""
+    from services.chatbot_context_providers import ChatContextSnapshot
+
+    class UnsharedSnapshot(ChatContextSnapshot):
+        def get(self, source):
+            task = super().get(source)
+            self._tasks[f"{source}#{len(self._tasks)}"] = self._tasks.pop(source)
+            return task
+
+    return UnsharedSnapshot
+
+
+# =================================================================
+# SERVIDOR + MEDICIÓN
+# =================================================================
+
+def _app():
+    from fastapi import FastAPI
+    from api.routers.chatbot import limiter, router as chatbot_router
+    from api.routers.dashboard import router as dashboard_router
+    from api.routers.insights import router as insights_router
+    from api.routers.optimization import router as optimization_router
+    from api.routers.ree import router as ree_router
+
+    limiter.enabled = False
+    app = FastAPI()
+    for router in (chatbot_router, dashboard_router, insights_router, optimization_router, ree_router):
+        app.include_router(router)
+    return app
+
+
+def _serve(app):
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def _stub_llm():
+    from services.chatbot_answer_cache import ChatbotAnswerCache
+    from services.chatbot_service import get_chatbot_service
+
+    message = SimpleNamespace(content=[SimpleNamespace(text="✅ Producir 02:00-08:00h")],
+                              usage=SimpleNamespace(input_tokens=900, output_tokens=40))
+    async def create(**_):
+        return message
+
+    service = get_chatbot_service()
+    service.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    service.answer_cache = ChatbotAnswerCache(max_entries=0)  # Medir la construcción de contexto, no la caché
+    return service
+
+
+def measure(base_url: str, rounds: int):
+    import httpx
+
+    latencies = []
+    with httpx.Client(base_url=base_url, timeout=60.0) as client:
+        for question in QUESTIONS:  # Warm-up (snapshot de dashboard, imports)
+            client.post("/chat/ask", json={"question": question}).raise_for_status()
+        for _ in range(rounds):
+            for question in QUESTIONS:
+                start = time.perf_counter()
+                response = client.post("/chat/ask", json={"question": question})
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "mean": statistics.fmean(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="Rondas de las preguntas de ejemplo")
+    parser.add_argument("--source-latency", type=float, default=20.0, help="ms por fuente stub")
+    parser.add_argument("--live", action="store_true", help="Servicios reales (InfluxDB, modelos)")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    with ExitStack() as stack:
+        if not args.live:
+            _stub_sources(stack, args.source_latency / 1000)
+        server, base_url = _serve(_app())
+        chatbot = _stub_llm()
+
+        from services.chatbot_context_service import ChatbotContextService
+
+        print("=" * 72)
+        print(f"CHATBOT CONTEXT BENCHMARK - /chat/ask, LLM stub, {len(QUESTIONS)} preguntas × {args.rounds}, "
+              f"fuentes {'reales' if args.live else f'stub {args.source_latency:.0f}ms'}")
+        print("=" * 72)
+        print(f"{'mode':>10}  {'p50 ms':>8}  {'p95 ms':>8}  {'mean ms':>8}")
+
+        summary = {}
+        with patch("services.chatbot_context_service.ChatContextSnapshot", _unshared_snapshot()):
+            chatbot.context_service = ChatbotContextService(providers=_loopback_providers(base_url))
+            summary["loopback"] = measure(base_url, args.rounds)
+        chatbot.context_service = ChatbotContextService()
+        summary["in-process"] = measure(base_url, args.rounds)
+
+        for mode, row in summary.items():
+            print(f"{mode:>10}  {row['p50'] * 1000:>8.1f}  {row['p95'] * 1000:>8.1f}  {row['mean'] * 1000:>8.1f}")
+        print("-" * 72)
+        print(f"p50: {summary['loopback']['p50'] / summary['in-process']['p50']:.1f}x faster in-process")
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Flux Extraction Benchmark
+=========================
+
+Compara la extracción record-a-record (query_api.query + table.records)
+con la extracción columnar (infrastructure.influxdb.frames) sobre una
+respuesta Flux sintética del tamaño de SIAR (88k filas, 2 campos).
+
+No necesita InfluxDB: se generan los cuerpos CSV que devolvería el servidor
+- legacy: CSV anotado en formato largo (una fila por campo)
+- columnar: CSV plano ya pivotado server-side (una fila por timestamp)
+
+Cada modo se ejecuta en un proceso hijo para medir el pico de RSS aislado.
+
+Uso:
+    python scripts/benchmark_flux_extraction.py [--rows 88000] [--repeat 3]
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'fastapi-app'))
+
+FIELDS = ["temperature", "humidity"]
+START = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamps(rows):
+    for i in range(rows):
+        yield (START + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_annotated_long_csv(rows: int) -> bytes:
+    """CSV anotado (formato largo) tal y como lo consume query_api.query()."""
+    out = io.StringIO()
+    for table, field in enumerate(FIELDS):
+        out.write("#datatype,string,long,dateTime:RFC3339,dateTime:RFC3339,dateTime:RFC3339,double,string,string,string\r\n")
+        out.write("#group,false,false,true,true,false,false,true,true,true\r\n")
+        out.write("#default,_result,,,,,,,,\r\n")
+        out.write(",result,table,_start,_stop,_time,_value,_field,_measurement,station_id\r\n")
+        for i, ts in enumerate(_timestamps(rows)):
+            value = 15.0 + (i % 24) * 0.5 if field == "temperature" else 40.0 + (i % 50)
+            out.write(f",,{table},2000-01-01T00:00:00Z,2026-01-01T00:00:00Z,{ts},{value},{field},siar_weather,J09\r\n")
+        out.write("\r\n")
+    return out.getvalue().encode()
+
+
+def build_pivoted_csv(rows: int) -> bytes:
+    """CSV plano con pivot() + keep() aplicados server-side."""
+    out = io.StringIO()
+    out.write(",result,table,_time,humidity,temperature\r\n")
+    for i, ts in enumerate(_timestamps(rows)):
+        out.write(f",_result,0,{ts},{40.0 + (i % 50)},{15.0 + (i % 24) * 0.5}\r\n")
+    out.write("\r\n")
+    return out.getvalue().encode()
+
+
+def run_legacy(body: bytes):
+    """Ruta anterior: FluxRecord por valor + lista de dicts + pivot_table."""
+    import pandas as pd
+    from influxdb_client.client.flux_csv_parser import FluxCsvParser, FluxSerializationMode
+
+    with FluxCsvParser(response=io.BytesIO(body), serialization_mode=FluxSerializationMode.tables) as parser:
+        list(parser.generator())
+        tables = parser.table_list()
+
+    data = []
+    for table in tables:
+        for record in table.records:
+            data.append({
+                'timestamp': record.get_time(),
+                'field': record.get_field(),
+                'value': record.get_value()
+            })
+
+    df = pd.DataFrame(data)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df.pivot_table(index='timestamp', columns='field', values='value', aggfunc='mean').reset_index()
+
+
+def run_columnar(body: bytes):
+    """Ruta nueva: CSV plano pivotado -> columnas tipadas."""
+    from infrastructure.influxdb.frames import read_flux_csv
+
+    df = read_flux_csv(io.BytesIO(body), value_columns=FIELDS)
+    return df.groupby('timestamp', as_index=False)[FIELDS].mean()
+
+
+def child(mode: str, rows: int, repeat: int):
+    """Ejecuta un modo y devuelve métricas (proceso aislado)."""
+    import pandas  # noqa: F401  (fuera de la medición)
+    import influxdb_client  # noqa: F401
+
+    body = build_annotated_long_csv(rows) if mode == "legacy" else build_pivoted_csv(rows)
+    runner = run_legacy if mode == "legacy" else run_columnar
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = runner(body)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(json.dumps({
+        "mode": mode,
+        "rows": len(df),
+        "best_seconds": round(best, 4),
+        "rows_per_second": int(len(df) / best),
+        "payload_mb": round(len(body) / 1e6, 2),
+        "baseline_rss_mb": round(baseline_rss / 1024, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=88000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=["legacy", "columnar"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args.mode, args.rows, args.repeat)
+        return
+
+    print("=" * 80)
+    print(f"FLUX EXTRACTION BENCHMARK - {args.rows:,} timestamps x {len(FIELDS)} fields")
+    print("=" * 80)
+
+    results = {}
+    for mode in ("legacy", "columnar"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--rows", str(args.rows), "--repeat", str(args.repeat)],
+            capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        results[mode] = json.loads(output)
+        r = results[mode]
+        print(f"{mode:>9}: {r['rows_per_second']:>10,} rows/s  "
+              f"best {r['best_seconds']:.3f}s  "
+              f"peak RSS {r['peak_rss_mb']:.0f} MB (+{r['peak_rss_mb'] - r['baseline_rss_mb']:.0f} MB)  "
+              f"payload {r['payload_mb']} MB")
+
+    speedup = results["columnar"]["rows_per_second"] / max(results["legacy"]["rows_per_second"], 1)
+    print("-" * 80)
+    print(f"Speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
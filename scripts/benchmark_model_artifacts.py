@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Model Artifacts Benchmark
+=========================
+
+Compara el formato de los modelos sklearn que sirve la API
+(domain/ml/model_artifacts.py):
+
+- pickle: el RandomForest completo (``latest/energy_optimization.pkl``)
+- compact: CompactForest en joblib sin comprimir, cargado con mmap_mode='r'
+  (``latest/energy_optimization.forest.joblib``)
+
+Mide, en procesos nuevos (spawn, como un worker de uvicorn):
+
+- cold start: carga + primera predicción (sklearn ya importado)
+- memoria por worker con N workers vivos a la vez: RSS, USS (privada) y
+  PSS (las páginas compartidas se reparten entre los procesos)
+
+Entrena un bosque sintético del tamaño del de producción (100 árboles,
+max_depth 15, 10 features) si no se pasa --model.
+
+Uso:
+    python scripts/benchmark_model_artifacts.py [--workers 4] [--samples 20000] [--model models/latest/energy_optimization.pkl]
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'src' / 'fastapi-app'))
+
+
+def _memory():
+    import psutil
+    info = psutil.Process().memory_full_info()
+    return {"rss": info.rss, "uss": info.uss, "pss": getattr(info, "pss", info.uss)}
+
+
+def _worker(path: str, barrier, queue):
+    """Un 'worker de API': carga el modelo, predice y espera a los demás."""
+    import warnings
+    import joblib  # noqa: F401  (la API ya tiene sklearn/joblib importados: fuera de la medición)
+    import numpy as np
+    import sklearn.ensemble  # noqa: F401
+    from domain.ml.model_artifacts import load_artifact
+
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    before = _memory()
+    start = time.perf_counter()
+    model = load_artifact(Path(path))
+    model.predict(np.zeros((1, model.n_features_in_)))
+    elapsed = time.perf_counter() - start
+
+    barrier.wait()  # Todos cargados: PSS refleja lo compartido
+    after = _memory()
+    queue.put({"seconds": elapsed, **{k: after[k] - before[k] for k in after}})
+    barrier.wait()
+
+
+def measure(path: Path, workers: int):
+    ctx = multiprocessing.get_context("spawn")
+    barrier, queue = ctx.Barrier(workers), ctx.Queue()
+    processes = [ctx.Process(target=_worker, args=(str(path), barrier, queue)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def _synthetic_model(samples: int):
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestRegressor
+    from domain.ml.direct_ml import FEATURE_COLUMNS
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((samples, len(FEATURE_COLUMNS))) * 100, columns=list(FEATURE_COLUMNS))
+    y = 0.5 * X['price_eur_kwh'] + 0.3 * X['machine_thermal_efficiency'] + rng.normal(0, 5, samples)
+    return RandomForestRegressor(n_estimators=100, max_depth=15, min_samples_split=5,
+                                 random_state=42, n_jobs=-1).fit(X, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=None, help="Existing RandomForest pickle")
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    import pickle
+    from domain.ml.model_artifacts import write_compact_artifact, write_pickle_atomic
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = Path(tmp) / "energy_optimization.pkl"
+        if args.model:
+            with open(args.model, 'rb') as f:
+                model = pickle.load(f)
+        else:
+            model = _synthetic_model(args.samples)
+        write_pickle_atomic(model, pickle_path)
+        compact_path = write_compact_artifact(model, pickle_path)
+        nodes = sum(e.tree_.node_count for e in model.estimators_)
+
+        print("=" * 80)
+        print(f"MODEL ARTIFACTS BENCHMARK - {len(model.estimators_)} trees, {nodes:,} nodes, "
+              f"{args.workers} workers")
+        print("=" * 80)
+        print(f"{'format':>8}  {'file MB':>8}  {'cold start':>10}  {'RSS MB':>8}  {'USS MB':>8}  {'PSS MB':>8}")
+
+        summary = {}
+        for name, path in (("pickle", pickle_path), ("compact", compact_path)):
+            results = measure(path, args.workers)
+            row = {key: statistics.median(r[key] for r in results) for key in results[0]}
+            summary[name] = row
+            print(f"{name:>8}  {path.stat().st_size / 1e6:>8.2f}  {row['seconds'] * 1000:>8.1f}ms  "
+                  f"{row['rss'] / 1e6:>8.1f}  {row['uss'] / 1e6:>8.1f}  {row['pss'] / 1e6:>8.1f}")
+
+        print("-" * 80)
+        print(f"Cold start: {summary['pickle']['seconds'] / summary['compact']['seconds']:.1f}x faster")
+        print(f"Private memory per worker (USS): {summary['pickle']['uss'] / 1e6:.1f} MB → "
+              f"{summary['compact']['uss'] / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+SIAR Loader Benchmark
+=====================
+
+Compara el parseo de los CSV de SIAR (data/históricoClimaLinares):
+
+- legacy: readlines() + limpieza carácter a carácter + split(';') +
+  Point por fila (process_real_siar_csv_simple / test_siar_simple.py)
+- streaming: services.siar_loader (encoding detectado una vez, chunks
+  vectorizados con pandas, line protocol directo), en serie y con un
+  proceso por fichero
+
+Solo parseo: no necesita InfluxDB (las líneas no se escriben).
+
+Uso:
+    python scripts/benchmark_siar_loader.py [--data-dir data/históricoClimaLinares] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'src' / 'fastapi-app'))
+
+
+def _default_data_dir() -> Path:
+    # El nombre del directorio puede estar en NFD (ó descompuesta) según el sistema de ficheros
+    for entry in (ROOT / 'data').iterdir():
+        if entry.is_dir() and 'Linares' in entry.name:
+            return entry
+    return ROOT / 'data' / 'históricoClimaLinares'
+
+
+def run_legacy(files):
+    """Ruta anterior: limpieza carácter a carácter y un Point por fila."""
+    import pandas as pd
+    from influxdb_client import Point
+    from services.siar_loader import FIELD_COLUMNS
+
+    lines_out = 0
+    for path in files:
+        with open(path, 'r', encoding='latin-1') as f:
+            lines = f.readlines()
+        for line in lines[1:]:
+            clean = ''.join(c for c in line if c.isprintable() and (c.isalnum() or c in ';,/:.-'))
+            parts = clean.split(';')
+            if len(parts) < 22 or '/' not in parts[2]:
+                continue
+            station = int(parts[1])
+            point = Point("siar_weather") \
+                .tag("station_id", f"SIAR_J{station:02d}_Linares") \
+                .tag("station_name", f"SIAR_Linares_J{station:02d}") \
+                .tag("province", "Jaén") \
+                .tag("data_source", "siar_historical") \
+                .time(pd.to_datetime(parts[2], format='%d/%m/%Y').replace(tzinfo=timezone.utc))
+            for index, name in FIELD_COLUMNS.items():
+                if parts[index]:
+                    point.field(name, float(parts[index].replace(',', '.')))
+            if point.to_line_protocol():
+                lines_out += 1
+    return lines_out
+
+
+def run_streaming(files, workers: int):
+    """Ruta nueva: chunks vectorizados, opcionalmente un proceso por fichero."""
+    from services.siar_loader import parse_siar_file
+
+    if workers <= 1:
+        results = [parse_siar_file(str(path), 5000) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(parse_siar_file, [str(p) for p in files], [5000] * len(files)))
+    return sum(len(lines) for chunks, _ in results for lines in chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or _default_data_dir()
+    files = sorted(p for p in data_dir.rglob("*.csv"))
+    megabytes = sum(p.stat().st_size for p in files) / 1e6
+
+    import pandas  # noqa: F401  (fuera de la medición)
+    import influxdb_client  # noqa: F401
+
+    print("=" * 80)
+    print(f"SIAR LOADER BENCHMARK - {len(files)} files, {megabytes:.2f} MB ({data_dir})")
+    print("=" * 80)
+
+    modes = {
+        "legacy": lambda: run_legacy(files),
+        "streaming": lambda: run_streaming(files, 1),
+    }
+    if args.workers > 1:
+        modes[f"streaming x{args.workers}"] = lambda: run_streaming(files, args.workers)
+    results = {}
+    for mode, runner in modes.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            lines = runner()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        results[mode] = megabytes / best
+        print(f"{mode:>14}: {megabytes / best:>8.2f} MB/s  best {best:.3f}s  {lines:,} lines")
+
+    print("-" * 80)
+    print(f"Speedup (serie): {results['streaming'] / results['legacy']:.1f}x")
+    if args.workers > 1:
+        print(f"Speedup ({args.workers} procesos): {results[f'streaming x{args.workers}'] / results['legacy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+InfluxDB Facade Load Test
+=========================
+
+Mide la latencia de un endpoint barato (p50/p99) mientras otras peticiones
+ejecutan consultas InfluxDB lentas, comparando:
+- blocking: query_api.query() llamado directamente desde la corrutina
+- facade:   infrastructure.influxdb.client.query_tables_async()
+
+No necesita InfluxDB: el QueryApi simulado duerme ``--query-seconds``
+(equivalente a un rango SIAR largo o un servidor saturado).
+
+Uso:
+    python scripts/load_test_influx_facade.py [--slow 20] [--pings 200] [--query-seconds 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'fastapi-app'))
+
+from infrastructure.influxdb.client import query_tables_async, get_executor_stats, close_influxdb_clients  # noqa: E402
+
+
+class SlowQueryApi:
+    """Stand-in QueryApi whose query() blocks like a slow HTTP round-trip."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def query(self, query, org=None, params=None):
+        time.sleep(self.seconds)
+        return []
+
+
+async def slow_endpoint(query_api: SlowQueryApi, mode: str):
+    if mode == "blocking":
+        return query_api.query('from(bucket: "siar_historical")')
+    return await query_tables_async(query_api, 'from(bucket: "siar_historical")')
+
+
+async def cheap_endpoint(arrival: float, latencies: list):
+    """Latency measured from the moment the request was due to be served."""
+    await asyncio.sleep(0)
+    latencies.append((time.perf_counter() - arrival) * 1000)
+
+
+async def run(mode: str, slow: int, pings: int, query_seconds: float) -> dict:
+    query_api = SlowQueryApi(query_seconds)
+    latencies = []
+
+    async def pinger():
+        # Requests arrive every 5 ms; a blocked loop serves them late
+        for i in range(pings):
+            arrival = start + i * 0.005
+            await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            await cheap_endpoint(arrival, latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[slow_endpoint(query_api, mode) for _ in range(slow)], pinger())
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "wall_s": round(wall, 2),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "max_ms": round(latencies[-1], 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slow", type=int, default=20, help="Consultas lentas concurrentes")
+    parser.add_argument("--pings", type=int, default=200, help="Peticiones baratas medidas")
+    parser.add_argument("--query-seconds", type=float, default=0.2, help="Duración de cada consulta lenta")
+    args = parser.parse_args()
+
+    for mode in ("blocking", "facade"):
+        result = asyncio.run(run(mode, args.slow, args.pings, args.query_seconds))
+        print(
+            f"{result['mode']:>9}: wall={result['wall_s']}s  "
+            f"p50={result['p50_ms']}ms  p99={result['p99_ms']}ms  max={result['max_ms']}ms"
+        )
+
+    print(f"executor: {get_executor_stats()}")
+    close_influxdb_clients()
+
+
+if __name__ == "__main__":
+    main()
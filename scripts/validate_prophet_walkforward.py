@@ -21,64 +21,26 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from services.data_ingestion import DataIngestionService
+from services.feature_store import get_feature_store
 
 
-async def extract_data_until_date(end_date: str):
-    """Extract REE data from InfluxDB until end_date (exclusive)"""
-
-    async with DataIngestionService() as service:
-        query = f'''
-            from(bucket: "{service.config.bucket}")
-            |> range(start: -36mo, stop: {end_date})
-            |> filter(fn: (r) => r._measurement == "energy_prices")
-            |> filter(fn: (r) => r._field == "price_eur_kwh")
-            |> sort(columns: ["_time"])
-        '''
-
-        query_api = service.client.query_api()
-        tables = query_api.query(query)
+async def _load_prices(start, end_date: str):
+    """REE prices [start, end_date) from the local feature store (only the delta comes from InfluxDB)"""
+    df = await get_feature_store().load("ree", ["price_eur_kwh"], start=start, end=end_date)
+    df = df.rename(columns={'price_eur_kwh': 'price'})
+    if not df.empty:
+        df['timestamp'] = df['timestamp'].dt.tz_localize(None)
+    return df.sort_values('timestamp') if not df.empty else df
 
-        data = []
-        for table in tables:
-            for record in table.records:
-                data.append({
-                    'timestamp': record.get_time(),
-                    'price': record.get_value()
-                })
 
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp']).dt.tz_localize(None)
-        return df.sort_values('timestamp')
+async def extract_data_until_date(end_date: str):
+    """Extract REE data from InfluxDB until end_date (exclusive)"""
+    return await _load_prices(pd.Timestamp.now(tz='UTC') - pd.DateOffset(months=36), end_date)
 
 
 async def extract_data_range(start_date: str, end_date: str):
     """Extract REE data for specific date range"""
-
-    async with DataIngestionService() as service:
-        query = f'''
-            from(bucket: "{service.config.bucket}")
-            |> range(start: {start_date}, stop: {end_date})
-            |> filter(fn: (r) => r._measurement == "energy_prices")
-            |> filter(fn: (r) => r._field == "price_eur_kwh")
-            |> sort(columns: ["_time"])
-        '''
-
-        query_api = service.client.query_api()
-        tables = query_api.query(query)
-
-        data = []
-        for table in tables:
-            for record in table.records:
-                data.append({
-                    'timestamp': record.get_time(),
-                    'price': record.get_value()
-                })
-
-        df = pd.DataFrame(data)
-        if not df.empty:
-            df['timestamp'] = pd.to_datetime(df['timestamp']).dt.tz_localize(None)
-        return df.sort_values('timestamp') if not df.empty else df
+    return await _load_prices(start_date, end_date)
 
 
 async def main():
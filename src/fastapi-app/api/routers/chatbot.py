@@ -8,8 +8,10 @@ Endpoints para interacción con chatbot Claude Haiku.
 """
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Any, AsyncIterator, Optional, Dict
+import json
 import logging
 from datetime import datetime
 
@@ -30,6 +32,7 @@ _chatbot_stats = {
     "total_tokens_input": 0,
     "total_tokens_output": 0,
     "total_cost_usd": 0.0,
+    "total_latency_ms": 0,
     "questions_today": 0,
     "last_reset": datetime.now().date()
 }
@@ -72,6 +75,7 @@ class ChatResponse(BaseModel):
     cost_usd: float = Field(..., description="Costo en USD")
     model: str = Field(..., description="Modelo usado (claude-3-5-haiku)")
     success: bool = Field(..., description="Si la respuesta fue exitosa")
+    cached: bool = Field(False, description="Respuesta de la caché (misma pregunta, mismos datos)")
     timestamp: str = Field(..., description="Timestamp de la respuesta")
 
     model_config = {
@@ -84,6 +88,7 @@ class ChatResponse(BaseModel):
                     "cost_usd": 0.001080,
                     "model": "claude-3-5-haiku-20241022",
                     "success": True,
+                    "cached": False,
                     "timestamp": "2025-10-10T14:30:00"
                 }
             ]
@@ -100,6 +105,8 @@ class ChatStatsResponse(BaseModel):
     avg_latency_ms: Optional[int] = None
     questions_today: int
     last_reset: str
+    answer_cache: Dict[str, Any] = Field(default_factory=dict, description="Caché de respuestas: hit rate, tokens ahorrados, latencia")
+    context_compression: Dict[str, Any] = Field(default_factory=dict, description="Tokens de contexto ahorrados (duplicados, presupuesto)")
 
     model_config = {
         "json_schema_extra": {
@@ -111,7 +118,15 @@ class ChatStatsResponse(BaseModel):
                     "total_cost_usd": 2.74,
                     "avg_latency_ms": 1534,
                     "questions_today": 42,
-                    "last_reset": "2025-10-10"
+                    "last_reset": "2025-10-10",
+                    "answer_cache": {
+                        "entries": 38, "hits": 310, "misses": 937, "hit_rate": 0.2486,
+                        "saved_tokens": 297600, "saved_cost_usd": 0.41,
+                        "avg_hit_latency_ms": 14, "avg_miss_latency_ms": 1690
+                    },
+                    "context_compression": {
+                        "contexts": 1247, "tokens_before": 1120000, "tokens_after": 1012000, "saved_tokens": 108000
+                    }
                 }
             ]
         }
@@ -163,6 +178,7 @@ async def ask_chatbot(request: Request, chat_request: ChatRequest) -> ChatRespon
             cost_usd=response["cost_usd"],
             model=response["model"],
             success=response["success"],
+            cached=response.get("cached", False),
             timestamp=datetime.now().isoformat()
         )
 
@@ -174,6 +190,41 @@ async def ask_chatbot(request: Request, chat_request: ChatRequest) -> ChatRespon
         )
 
 
+@router.post("/ask/stream")
+@limiter.limit("20/minute")  # Mismo límite que /ask
+async def ask_chatbot_stream(request: Request, chat_request: ChatRequest) -> StreamingResponse:
+    """
+    Como /ask, pero la respuesta llega token a token (Server-Sent Events).
+
+    **Eventos**:
+    - `token`: `{"text": "..."}` fragmento de la respuesta
+    - `done`: mismo JSON que /ask + `first_token_ms`
+    - `error`: mismo JSON que /ask con `success: false`
+
+    El primer token llega en cuanto Claude empieza a generar, en lugar de
+    esperar la respuesta completa.
+    """
+    chatbot_service = get_chatbot_service()
+    logger.info(f"Question (stream) from {chat_request.user_id or 'anonymous'}: {chat_request.question}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for event in chatbot_service.ask_stream(
+            question=chat_request.question,
+            user_id=chat_request.user_id
+        ):
+            data = event["data"]
+            if event["event"] in ("done", "error"):
+                _update_stats(data)
+                data = {**data, "timestamp": datetime.now().isoformat()}
+            yield f"event: {event['event']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/stats", response_model=ChatStatsResponse)
 async def get_chatbot_stats() -> ChatStatsResponse:
     """
@@ -184,6 +235,8 @@ async def get_chatbot_stats() -> ChatStatsResponse:
     - Tokens usados (input/output)
     - Costo total acumulado
     - Preguntas del día actual
+    - Caché de respuestas (hit rate, tokens/USD ahorrados, latencia hit vs miss)
+    - Compresión del contexto (tokens ahorrados)
 
     **Nota**: Stats se resetean diariamente a las 00:00.
     """
@@ -193,13 +246,19 @@ async def get_chatbot_stats() -> ChatStatsResponse:
         _chatbot_stats["questions_today"] = 0
         _chatbot_stats["last_reset"] = today
 
+    chatbot_service = get_chatbot_service()
+    total_questions = _chatbot_stats["total_questions"]
+
     return ChatStatsResponse(
-        total_questions=_chatbot_stats["total_questions"],
+        total_questions=total_questions,
         total_tokens_input=_chatbot_stats["total_tokens_input"],
         total_tokens_output=_chatbot_stats["total_tokens_output"],
         total_cost_usd=round(_chatbot_stats["total_cost_usd"], 6),
+        avg_latency_ms=round(_chatbot_stats["total_latency_ms"] / total_questions) if total_questions else None,
         questions_today=_chatbot_stats["questions_today"],
-        last_reset=str(_chatbot_stats["last_reset"])
+        last_reset=str(_chatbot_stats["last_reset"]),
+        answer_cache=chatbot_service.answer_cache.get_stats(),
+        context_compression=chatbot_service.context_service.get_compression_stats()
     )
 
 
@@ -234,4 +293,5 @@ def _update_stats(response: Dict):
         _chatbot_stats["total_tokens_input"] += response["tokens"]["input"]
         _chatbot_stats["total_tokens_output"] += response["tokens"]["output"]
         _chatbot_stats["total_cost_usd"] += response["cost_usd"]
+        _chatbot_stats["total_latency_ms"] += response["latency_ms"]
         _chatbot_stats["questions_today"] += 1
@@ -3,13 +3,21 @@ Dashboard Router
 ================
 
 RESTful endpoints for dashboard data and visualizations.
+
+/complete, /summary and /alerts are served from the materialized snapshot
+(services/dashboard_snapshot.py) with ETag / If-None-Match support.
 """
 
 import logging
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 
 from services.dashboard import DashboardService
+from services.dashboard import get_dashboard_service as get_dashboard_service_singleton
+from services.dashboard_snapshot import (
+    DashboardSnapshotService,
+    get_dashboard_snapshot_service
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +29,42 @@ def get_dashboard_service() -> DashboardService:
     Dependency injection for DashboardService.
 
     Returns:
-        DashboardService: Dashboard service instance
+        DashboardService: Dashboard service instance (process singleton)
     """
     try:
-        return DashboardService()
+        return get_dashboard_service_singleton()
     except Exception as e:
         logger.error(f"Failed to initialize DashboardService: {e}")
         raise HTTPException(status_code=500, detail=f"Dashboard service initialization failed: {str(e)}")
 
 
+def _snapshot_response(
+    request: Request,
+    snapshots: DashboardSnapshotService,
+    snapshot,
+    view: str
+) -> Response:
+    """Serve a pre-serialized snapshot view, honouring If-None-Match."""
+    etag = snapshot.view_etag(view)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": snapshots.cache_control(snapshot),
+        "X-Snapshot-Version": str(snapshot.version),
+        "X-Snapshot-Age": str(int(snapshot.age_seconds))
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=snapshot.bodies[view], media_type="application/json", headers=headers)
+
+
 @router.get("/complete")
 async def get_complete_dashboard(
-    service: DashboardService = Depends(get_dashboard_service)
+    request: Request,
+    service: DashboardService = Depends(get_dashboard_service),
+    snapshots: DashboardSnapshotService = Depends(get_dashboard_snapshot_service)
 ) -> Dict[str, Any]:
     """
     🎯 Complete dashboard with information, predictions, and recommendations.
@@ -44,37 +76,15 @@ async def get_complete_dashboard(
     - Historical analytics (SIAR 88k + REE 42k records)
     - System alerts and recommendations
 
+    Served from the materialized snapshot; send If-None-Match with the
+    returned ETag to get 304 Not Modified when nothing changed.
+
     Returns:
         Dict[str, Any]: Complete dashboard data
     """
     try:
-        dashboard_data = await service.get_complete_dashboard_data()
-
-        # Add weekly heatmap with Prophet predictions
-        try:
-            weekly_heatmap = await service._get_weekly_forecast_heatmap()
-            dashboard_data["weekly_forecast"] = weekly_heatmap
-        except Exception as e:
-            logger.warning(f"Failed to add weekly heatmap: {e}")
-            dashboard_data["weekly_forecast"] = {
-                "status": "error",
-                "message": f"Heatmap generation failed: {str(e)}"
-            }
-
-        # Add historical analytics (Sprint 15: moved to legacy)
-        try:
-            from services.legacy.historical_analytics import HistoricalAnalyticsService
-            analytics_service = HistoricalAnalyticsService()
-            historical_analytics = await analytics_service.get_historical_analytics()
-            dashboard_data["historical_analytics"] = historical_analytics.model_dump()
-        except Exception as e:
-            logger.warning(f"Failed to add historical analytics: {e}")
-            dashboard_data["historical_analytics"] = {
-                "status": "error",
-                "message": f"Historical analytics failed: {str(e)}"
-            }
-
-        return dashboard_data
+        snapshot = await snapshots.get_snapshot(service)
+        return _snapshot_response(request, snapshots, snapshot, "complete")
 
     except Exception as e:
         logger.error(f"Complete dashboard failed: {e}", exc_info=True)
@@ -83,7 +93,9 @@ async def get_complete_dashboard(
 
 @router.get("/summary")
 async def get_dashboard_summary(
-    service: DashboardService = Depends(get_dashboard_service)
+    request: Request,
+    service: DashboardService = Depends(get_dashboard_service),
+    snapshots: DashboardSnapshotService = Depends(get_dashboard_snapshot_service)
 ) -> Dict[str, Any]:
     """
     📊 Quick summary for dashboard.
@@ -98,32 +110,8 @@ async def get_dashboard_summary(
         Dict[str, Any]: Dashboard summary
     """
     try:
-        full_data = await service.get_complete_dashboard_data()
-
-        # Extract essential information
-        current_info = full_data.get("current_info", {})
-        predictions = full_data.get("predictions", {})
-
-        from datetime import datetime
-
-        summary = {
-            "🏢": "Chocolate Factory - Dashboard Summary",
-            "current": {
-                "energy_price": current_info.get("energy", {}).get("price_eur_kwh", 0) if current_info.get("energy") else 0,
-                "temperature": current_info.get("weather", {}).get("temperature", 0) if current_info.get("weather") else 0,
-                "humidity": current_info.get("weather", {}).get("humidity", 0) if current_info.get("weather") else 0,
-                "production_status": current_info.get("production_status", "🔄 Cargando...")
-            },
-            "predictions": {
-                "energy_score": predictions.get("energy_optimization", {}).get("score", 0),
-                "production_class": predictions.get("production_recommendation", {}).get("class", "Unknown")
-            },
-            "alerts_count": len(full_data.get("alerts", [])),
-            "status": full_data.get("system_status", {}).get("status", "🔄 Cargando..."),
-            "timestamp": full_data.get("timestamp", datetime.now().isoformat())
-        }
-
-        return summary
+        snapshot = await snapshots.get_snapshot(service)
+        return _snapshot_response(request, snapshots, snapshot, "summary")
 
     except Exception as e:
         logger.error(f"Dashboard summary failed: {e}", exc_info=True)
@@ -132,7 +120,9 @@ async def get_dashboard_summary(
 
 @router.get("/alerts")
 async def get_dashboard_alerts(
-    service: DashboardService = Depends(get_dashboard_service)
+    request: Request,
+    service: DashboardService = Depends(get_dashboard_service),
+    snapshots: DashboardSnapshotService = Depends(get_dashboard_snapshot_service)
 ) -> Dict[str, Any]:
     """
     🚨 Active system alerts.
@@ -141,22 +131,22 @@ async def get_dashboard_alerts(
         Dict[str, Any]: Active alerts with counts by severity
     """
     try:
-        full_data = await service.get_complete_dashboard_data()
-
-        alerts = full_data.get("alerts", [])
-
-        return {
-            "🏢": "Chocolate Factory - Alertas Activas",
-            "alerts": alerts,
-            "alert_counts": {
-                "critical": len([a for a in alerts if a.get("level") == "critical"]),
-                "warning": len([a for a in alerts if a.get("level") == "warning"]),
-                "high": len([a for a in alerts if a.get("level") == "high"]),
-                "info": len([a for a in alerts if a.get("level") == "info"])
-            },
-            "timestamp": full_data.get("timestamp")
-        }
+        snapshot = await snapshots.get_snapshot(service)
+        return _snapshot_response(request, snapshots, snapshot, "alerts")
 
     except Exception as e:
         logger.error(f"Dashboard alerts failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Dashboard alerts error: {str(e)}")
+
+
+@router.get("/snapshot/status")
+async def get_dashboard_snapshot_status(
+    snapshots: DashboardSnapshotService = Depends(get_dashboard_snapshot_service)
+) -> Dict[str, Any]:
+    """
+    📸 Dashboard snapshot materializer status.
+
+    Returns:
+        Dict[str, Any]: Version, age, build time and hit/rebuild counters
+    """
+    return snapshots.get_status()
@@ -5,13 +5,17 @@ Health Check Router
 Health and readiness endpoints for Kubernetes/monitoring.
 """
 
+import asyncio
+import time
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Dict, Any
 from datetime import datetime
 
-from infrastructure.influxdb import get_influxdb_client
+from infrastructure.influxdb import get_influxdb_client, get_influxdb_pool_stats, get_ingestion_sink_stats
 from dependencies import get_telegram_alert_service
+from core.cache import get_cache_manager, get_single_flight_stats
 from core.config import settings
+from core.log_store import search_log_segments
 
 router = APIRouter(prefix="", tags=["Health"])
 
@@ -54,7 +58,11 @@ async def readiness_check() -> Dict[str, Any]:
         "timestamp": datetime.utcnow().isoformat(),
         "checks": {
             "influxdb": influx_status
-        }
+        },
+        "influxdb_pool": get_influxdb_pool_stats(),
+        "ingestion_sink": get_ingestion_sink_stats(),
+        "single_flight": get_single_flight_stats(),
+        "cache": get_cache_manager().get_stats()
     }
 
 
@@ -130,10 +138,14 @@ async def search_logs(
     module: str = None
 ) -> Dict[str, Any]:
     """
-    Search application logs (JSON structured logs only).
+    Search application logs (JSON structured logs only), newest first.
 
     **Sprint 20 Fase 2 - JSON Log Search**
 
+    Reads the hourly log segments (core/log_store.py): segments and
+    index blocks outside the time window, level or module are skipped
+    without being read.
+
     Args:
         level: Filter by log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         hours: Time window in hours (default 24)
@@ -141,81 +153,44 @@ async def search_logs(
         module: Filter by module name (e.g., "services.ree_service")
 
     Returns:
-        Filtered log entries with metadata
-
-    Note: Only works with JSON-formatted logs (LOG_FORMAT_JSON=true).
-          For development colored logs, this endpoint will return empty.
+        Filtered log entries with metadata and scan statistics
     """
-    import json
-    from pathlib import Path
-    from datetime import timedelta
-
-    log_file = Path("/app/logs/fastapi.log")
+    filters = {
+        "level": level or "all",
+        "hours": hours,
+        "module": module or "all",
+        "limit": limit
+    }
+    segments_dir = settings.LOG_DIR / "segments"
 
-    if not log_file.exists():
+    if not segments_dir.exists():
         return {
             "status": "no_logs",
-            "message": "Log file not found. File logging may be disabled.",
+            "message": "Log segments not found. File logging may be disabled.",
+            "filters": filters,
             "logs": [],
             "count": 0
         }
 
-    # Calculate time threshold
-    now = datetime.utcnow()
-    threshold = now - timedelta(hours=hours)
-
-    logs = []
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                # Skip empty lines
-                if not line.strip():
-                    continue
-
-                try:
-                    # Parse JSON log entry
-                    log_entry = json.loads(line)
-
-                    # Parse timestamp
-                    timestamp_str = log_entry.get("timestamp", "").rstrip("Z")
-                    log_time = datetime.fromisoformat(timestamp_str)
-
-                    # Filter by time window
-                    if log_time < threshold:
-                        continue
-
-                    # Filter by level
-                    if level and log_entry.get("level") != level.upper():
-                        continue
-
-                    # Filter by module
-                    if module and module not in log_entry.get("logger", ""):
-                        continue
-
-                    logs.append(log_entry)
-
-                    # Stop if limit reached
-                    if len(logs) >= limit:
-                        break
-
-                except (json.JSONDecodeError, ValueError):
-                    # Skip non-JSON lines (e.g., colored logs from development)
-                    continue
-
-    except Exception as e:
+        result = await asyncio.to_thread(
+            search_log_segments,
+            segments_dir,
+            level=level,
+            module=module,
+            since=time.time() - hours * 3600,
+            limit=limit
+        )
+    except OSError as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error reading log file: {str(e)}"
+            detail=f"Error reading log segments: {str(e)}"
         )
 
     return {
         "status": "success",
-        "filters": {
-            "level": level or "all",
-            "hours": hours,
-            "module": module or "all",
-            "limit": limit
-        },
-        "count": len(logs),
-        "logs": logs
+        "filters": filters,
+        "count": len(result["logs"]),
+        "logs": result["logs"],
+        "scan": result["scan"]
     }
@@ -120,7 +120,7 @@ async def get_node_uptime(
         Uptime percentage and timestamp
     """
     try:
-        uptime = service.calculate_uptime(hostname, hours)
+        uptime = await service.calculate_uptime(hostname, hours)
 
         if uptime is None:
             return {
@@ -339,8 +339,6 @@ async def get_latency_history(
         if not influx_client:
             raise HTTPException(status_code=503, detail="InfluxDB not available")
 
-        query_api = influx_client.query_api()
-
         # Query latency data
         query = f'''
             from(bucket: "analytics")
@@ -351,7 +349,7 @@ async def get_latency_history(
                 |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
         '''
 
-        result = query_api.query(query=query)
+        result = await influx_client.query_async(query)
 
         # Parse result
         history = []
@@ -11,12 +11,17 @@ While sklearn models are used, they learn the same formula used to generate targ
 
 For REAL ML predictions, see /predict/prices/* (Prophet forecasting).
 """
+import hashlib
+import json
 import logging
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+from domain.ml.backtesting import KIND_PROPHET, KIND_SKLEARN, spec_from_dict
 from domain.ml.direct_ml import DirectMLService
 from domain.ml.model_metrics_tracker import ModelMetricsTracker
+from services.training_pool import get_training_pool
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/predict", tags=["Optimization Scoring"])
@@ -26,6 +31,36 @@ class PredictionRequest(BaseModel):
     temperature: float
     humidity: float
 
+class BatchPredictionRequest(BaseModel):
+    """Columnar input: one list per field, same length (max 1000 rows)."""
+    timestamps: List[datetime] = Field(..., min_length=1, max_length=1000)
+    price_eur_kwh: List[float]
+    temperature: List[float]
+    humidity: List[float]
+
+    @model_validator(mode="after")
+    def check_lengths(self):
+        n = len(self.timestamps)
+        if not (len(self.price_eur_kwh) == len(self.temperature) == len(self.humidity) == n):
+            raise ValueError("timestamps, price_eur_kwh, temperature and humidity must have the same length")
+        return self
+
+class BacktestRequest(BaseModel):
+    """Walk-forward backtest: variants are ProphetSpec / SklearnSpec fields."""
+    model: str = Field(KIND_PROPHET, pattern=f"^({KIND_PROPHET}|{KIND_SKLEARN})$")
+    variants: List[Dict[str, Any]] = Field(default_factory=lambda: [{}], min_length=1, max_length=10)
+    folds: int = Field(8, ge=1, le=52)
+    horizon_hours: int = Field(168, ge=1, le=24 * 30)
+    step_hours: Optional[int] = Field(None, ge=1)
+    bucket_hours: int = Field(24, ge=1)
+    months_back: int = Field(36, ge=1, le=120)
+
+    @model_validator(mode="after")
+    def check_variants(self):
+        for values in self.variants:
+            spec_from_dict(self.model, values)
+        return self
+
 @router.post("/energy-optimization")
 async def predict_energy_optimization(request: PredictionRequest) -> Dict[str, Any]:
     """
@@ -65,6 +100,43 @@ async def predict_production_recommendation(request: PredictionRequest) -> Dict[
         logger.error(f"Production prediction failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/energy-optimization/batch")
+async def predict_energy_optimization_batch(request: BatchPredictionRequest) -> Dict[str, Any]:
+    """
+    🔮 Energy optimization scores for N hours in one model call
+
+    Columnar response (one list per field). Row i matches
+    /energy-optimization for the same timestamp and inputs.
+    """
+    try:
+        direct_ml = DirectMLService()
+        result = direct_ml.predict_energy_optimization_batch(
+            timestamps=request.timestamps,
+            prices=request.price_eur_kwh,
+            temperatures=request.temperature,
+            humidities=request.humidity
+        )
+        return {"status": "✅", "predictions": result, "model": "RandomForestRegressor"}
+    except Exception as e:
+        logger.error(f"Batch energy prediction failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/production-recommendation/batch")
+async def predict_production_recommendation_batch(request: BatchPredictionRequest) -> Dict[str, Any]:
+    """🏭 Production classes for N hours in one model call (columnar response)"""
+    try:
+        direct_ml = DirectMLService()
+        result = direct_ml.predict_production_recommendation_batch(
+            timestamps=request.timestamps,
+            prices=request.price_eur_kwh,
+            temperatures=request.temperature,
+            humidities=request.humidity
+        )
+        return {"status": "✅", "predictions": result, "model": "RandomForestClassifier"}
+    except Exception as e:
+        logger.error(f"Batch production prediction failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/train")
 async def train_sklearn_models() -> Dict[str, Any]:
     """🤖 Train sklearn models manually"""
@@ -186,3 +258,54 @@ async def get_model_metrics_history(
     except Exception as e:
         logger.error(f"Failed to get metrics history: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/models/training-jobs")
+async def get_training_jobs() -> Dict[str, Any]:
+    """
+    🏋️ Training worker pool status
+
+    Scheduled retrains run in a separate process; returns running, queued
+    and recent jobs (status, duration, training mode, error).
+    """
+    return get_training_pool().get_status()
+
+@router.post("/models/backtest")
+async def run_model_backtest(
+    request: BacktestRequest,
+    wait: bool = Query(True, description="Wait for the report (False: return the job and poll it)")
+) -> Dict[str, Any]:
+    """
+    🧪 Walk-forward backtest of Prophet / sklearn model variants
+
+    Runs in the training worker process (never in the API process); folds
+    are trained in parallel. MAE/RMSE/R² per horizon are also logged to
+    the metrics tracker as ``backtest_<variant>``.
+
+    Example body:
+        {"model": "prophet", "folds": 8, "horizon_hours": 168,
+         "variants": [{"name": "baseline"}, {"name": "cp40", "n_changepoints": 40}]}
+    """
+    options = request.model_dump()
+    kind = options.pop("model")
+    # Mismo request → mismo trabajo (se comparte si ya está en curso)
+    digest = hashlib.sha1(json.dumps(options, sort_keys=True).encode()).hexdigest()[:8]
+    name = f"backtest_{kind}_{digest}"
+    target = "domain.ml.backtesting:run_backtest_job"
+
+    pool = get_training_pool()
+    if not wait:
+        job = pool.submit(name, target, kind=kind, **options)
+        return {"status": "queued", "job": job.to_dict()}
+
+    report = await pool.run(name, target, kind=kind, **options)
+    if not report.get("success"):
+        raise HTTPException(status_code=500, detail=report.get("error", "Backtest failed"))
+    return report
+
+@router.get("/models/backtest/{job_id}")
+async def get_model_backtest(job_id: str) -> Dict[str, Any]:
+    """🧪 Status and report of a backtest submitted with ``wait=false``"""
+    job = get_training_pool().get_job(job_id)
+    if job is None or not job.name.startswith("backtest_"):
+        raise HTTPException(status_code=404, detail=f"Backtest job '{job_id}' not found")
+    return {**job.to_dict(), "report": job.result}
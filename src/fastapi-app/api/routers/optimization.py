@@ -18,7 +18,8 @@ router = APIRouter(prefix="/optimize", tags=["Production Optimization"])
 @router.post("/production/daily")
 async def optimize_daily_production(
     target_date: Optional[str] = None,
-    target_kg: Optional[float] = None
+    target_kg: Optional[float] = None,
+    mode: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     🎯 24-hour hourly optimization for chocolate production.
@@ -34,12 +35,18 @@ async def optimize_daily_production(
     Args:
         target_date: Target date ISO (default: tomorrow)
         target_kg: Target kg (default: 200kg)
+        mode: "greedy" (score-ranked first-fit) or "exact" (DP, reports
+            cost gap vs greedy). Default: settings.OPTIMIZER_MODE
 
     Returns:
         24h optimized plan with scheduled batches and estimated savings
     """
+    from services.hourly_optimizer_service import get_optimizer_service, OPTIMIZER_MODES
+
+    if mode is not None and mode not in OPTIMIZER_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {list(OPTIMIZER_MODES)}")
+
     try:
-        from services.hourly_optimizer_service import get_optimizer_service
         from services.data_ingestion import DataIngestionService
 
         # Parse target date
@@ -57,7 +64,8 @@ async def optimize_daily_production(
             # Optimize
             result = await optimizer.optimize_daily_production(
                 target_date=target_datetime,
-                target_kg=target_kg
+                target_kg=target_kg,
+                mode=mode
             )
 
             return {
@@ -71,6 +79,60 @@ async def optimize_daily_production(
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
 
+@router.post("/production/weekly")
+async def optimize_weekly_production(
+    start_date: Optional[str] = None,
+    days: int = 7,
+    target_kg: Optional[float] = None,
+    mode: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    🗓️ Multi-day rolling-horizon plan over the 168h Prophet forecast.
+
+    Batches may run across midnight (work-in-progress carried into the
+    next day). Published REE prices replace Prophet predictions for their
+    hours. Repeated calls only re-plan days whose inputs changed.
+
+    Args:
+        start_date: First day ISO (default: tomorrow)
+        days: Days to plan, 1-7
+        target_kg: Target kg per day (default: 200kg)
+        mode: "greedy" or "exact". Default: settings.OPTIMIZER_MODE
+
+    Returns:
+        Per-day plans, totals and replanned/reused days
+    """
+    from services.hourly_optimizer_service import get_optimizer_service, OPTIMIZER_MODES
+
+    if mode is not None and mode not in OPTIMIZER_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {list(OPTIMIZER_MODES)}")
+    if not 1 <= days <= 7:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 7")
+
+    try:
+        start_datetime = None
+        if start_date:
+            start_datetime = datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+
+        optimizer = get_optimizer_service()
+        result = await optimizer.optimize_weekly_production(
+            start_date=start_datetime,
+            days=days,
+            target_kg=target_kg,
+            mode=mode
+        )
+
+        return {
+            "🏭": "Chocolate Factory - Plan Multi-día (Rolling Horizon)",
+            "timestamp": datetime.now().isoformat(),
+            "optimization": result
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Error en plan semanal: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Weekly optimization failed: {str(e)}")
+
+
 @router.get("/production/summary")
 async def get_optimization_summary() -> Dict[str, Any]:
     """
@@ -108,7 +170,7 @@ async def get_optimization_summary() -> Dict[str, Any]:
                     "critical_threshold": "80%"
                 }
             },
-            "optimization_horizon": "24 hours",
+            "optimization_horizon": "24 hours (daily) / 168 hours rolling (weekly)",
             "update_frequency": "Hourly recalculation recommended",
             "data_sources": {
                 "energy_prices": "Prophet ML (REE historical + predictions)",
@@ -0,0 +1,30 @@
+"""
+Cache utilities shared by the services.
+"""
+
+from core.cache.cache_manager import (
+    CacheManager,
+    cache_key_wrapper,
+    get_cache_manager,
+    make_cache_key
+)
+from core.cache.redis_backend import RedisCacheBackend, RedisError
+from core.cache.single_flight import (
+    SingleFlight,
+    get_single_flight,
+    get_single_flight_stats,
+    single_flight
+)
+
+__all__ = [
+    "CacheManager",
+    "RedisCacheBackend",
+    "RedisError",
+    "cache_key_wrapper",
+    "get_cache_manager",
+    "make_cache_key",
+    "SingleFlight",
+    "get_single_flight",
+    "get_single_flight_stats",
+    "single_flight",
+]
@@ -0,0 +1,616 @@
+"""
+Cache Manager
+=============
+
+Result cache shared by the services:
+
+- Bounded: maximum entries and bytes (serialized size), with LRU eviction
+- Heap-based expiry (``expires_at``): purging costs O(k log n) for the k
+  expired entries, without scanning every key
+- Tag invalidation (``invalidate_tags``) instead of substring matching
+  over all keys
+- Stable keys: ``make_cache_key`` hashes (sha256) a canonical form of the
+  arguments; ``self`` can be left out (``ignore_self``) and objects without
+  a stable representation are an error, not a ``repr`` with a memory address
+- Async API (``aget`` / ``aset`` / ``aget_or_set``) with an optional shared
+  backend (Redis, ``CACHE_REDIS_URL``) so uvicorn workers share hits. The
+  local copy acts as an L1 with a short TTL (``CACHE_LOCAL_TTL_SECONDS``);
+  if Redis does not answer, the L1 is used alone and the backend is retried
+  after BACKEND_RETRY_SECONDS
+- With a backend, invalidations are published (pub/sub) and the other
+  workers drop their L1 copies immediately instead of waiting for expiry
+- ``aget_or_set`` coalesces concurrent computations of the same key
+  (single-flight), so an expired key does not trigger N computations. If
+  one of its tags is invalidated while computing (e.g. new data ingested),
+  the result is returned but not stored
+- Values are stored serialized (pickle) and every read returns a copy:
+  mutating a result does not affect other readers. Unpicklable values are
+  not cached
+- ``cache_key_wrapper`` never breaks the call when the arguments have no
+  stable key: it warns and runs the function uncached
+
+Usage:
+    from core.cache import cache_key_wrapper, get_cache_manager
+
+    class REEService:
+        @cache_key_wrapper("ree.price_stats", ignore_self=True, tags=["ree"])
+        async def get_price_stats(self, start_date, end_date): ...
+
+    await get_cache_manager().ainvalidate_tags("ree")  # after ingesting new prices
+"""
+
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import heapq
+import json
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.cache.redis_backend import RedisCacheBackend, RedisError
+from core.cache.single_flight import SingleFlight
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds before retrying an unavailable Redis backend
+BACKEND_RETRY_SECONDS = 5.0
+
+# Channel (under the backend namespace) for cross-worker invalidations
+INVALIDATION_CHANNEL = "invalidate"
+
+_MISSING = object()
+
+
+class _Entry:
+    """Cached (serialized) value with its expiry and tags."""
+    __slots__ = ("payload", "expires_at", "tags")
+
+    def __init__(self, payload: bytes, expires_at: float, tags: Tuple[str, ...]):
+        self.payload = payload
+        self.expires_at = expires_at
+        self.tags = tags
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+def _dumps(value: Any, tags: Tuple[str, ...]) -> Optional[bytes]:
+    """Serialized ``(value, tags)``, same format in L1 and backend. None if unpicklable."""
+    try:
+        return pickle.dumps((value, tags), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.debug(f"Cache: value not picklable, not cached ({e})")
+        return None
+
+
+# =================================================================
+# KEYS
+# =================================================================
+
+def _canonical(value: Any) -> Any:
+    """Stable JSON form of an argument (same value → same form)."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return {"__enum__": type(value).__qualname__, "value": _canonical(value.value)}
+    if isinstance(value, (datetime, date, dt_time)):
+        return {"__" + type(value).__name__ + "__": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"__timedelta__": value.total_seconds()}
+    if isinstance(value, (Decimal, uuid.UUID, PurePath)):
+        return {"__" + type(value).__name__ + "__": str(value)}
+    if isinstance(value, bytes):
+        return {"__bytes__": value.hex()}
+    if isinstance(value, dict):
+        return {"__dict__": sorted([_canonical(k), _canonical(v)] for k, v in value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted((_canonical(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True))}
+    if hasattr(value, "model_dump"):  # pydantic
+        return {type(value).__qualname__: _canonical(value.model_dump(mode="json"))}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {type(value).__qualname__: _canonical(dataclasses.asdict(value))}
+    raise TypeError(
+        f"Cannot build a stable cache key from {type(value).__qualname__}; "
+        "use ignore_self=True for methods or pass key_func"
+    )
+
+
+def make_cache_key(prefix: str, *args: Any, **kwargs: Any) -> str:
+    """``prefix:sha256(args, kwargs)``, stable across processes and restarts."""
+    payload = json.dumps([_canonical(list(args)), _canonical(kwargs)], sort_keys=True, separators=(",", ":"))
+    return f"{prefix}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]}"
+
+
+# =================================================================
+# CACHE MANAGER
+# =================================================================
+
+class CacheManager:
+    """
+    Bounded LRU cache with TTL, tags and an optional shared backend.
+
+    Sync operations (``get``/``set``/...) are local only; async ones
+    (``aget``/``aset``/...) also use the backend when there is one.
+
+    Args:
+        max_entries: Maximum local entries (default: CACHE_MAX_SIZE)
+        max_bytes: Maximum local bytes (default: CACHE_MAX_BYTES)
+        default_ttl: TTL in seconds when none is given (default: CACHE_TTL_SECONDS)
+        backend: Shared backend (e.g. RedisCacheBackend)
+        local_ttl: With a backend, maximum TTL of the local copy; never
+            longer than what the backend entry has left
+            (default: CACHE_LOCAL_TTL_SECONDS)
+        enabled: False → every lookup misses and nothing is stored (default: CACHE_ENABLED)
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        backend: Optional[RedisCacheBackend] = None,
+        local_ttl: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        self.max_entries = settings.CACHE_MAX_SIZE if max_entries is None else max_entries
+        self.max_bytes = settings.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.default_ttl = settings.CACHE_TTL_SECONDS if default_ttl is None else default_ttl
+        self.local_ttl = settings.CACHE_LOCAL_TTL_SECONDS if local_ttl is None else local_ttl
+        self.enabled = settings.CACHE_ENABLED if enabled is None else enabled
+        self.backend = backend
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry: List[Tuple[float, str]] = []  # heap (expires_at, key); stale items are skipped
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._flights = SingleFlight("cache_manager")
+        self._backend_retry_at = 0.0
+
+        # Per-tag (and global, for clear) generation: a computation started
+        # before an invalidation does not store its result
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+
+        # Subscription to invalidations from other workers
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_stopped = False
+        self._subscribed = False
+
+        self.stats = {
+            "hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0,
+            "invalidations": 0, "oversize": 0, "unpicklable": 0, "stale_results": 0,
+            "backend_hits": 0, "backend_misses": 0, "backend_errors": 0,
+            "remote_invalidations": 0, "listener_errors": 0
+        }
+
+    # =================================================================
+    # LOCAL (SYNC)
+    # =================================================================
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Local value of ``key``, or ``default`` if missing or expired."""
+        value = self._get_local(key)
+        if value is _MISSING:
+            self.stats["misses"] += 1
+            return default
+        self.stats["hits"] += 1
+        return value
+
+    def _get_local(self, key: str) -> Any:
+        if not self.enabled:
+            return _MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats["expirations"] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            payload = entry.payload
+        return pickle.loads(payload)[0]  # Fresh copy on every read
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        """Store ``value`` locally for ``ttl`` seconds."""
+        if not self.enabled:
+            return
+        tags = tuple(tags)
+        payload = _dumps(value, tags)
+        if payload is None:
+            self.stats["unpicklable"] += 1
+            return
+        self.stats["sets"] += 1
+        self._set_local(key, payload, self.default_ttl if ttl is None else ttl, tags)
+
+    def _set_local(self, key: str, payload: bytes, ttl: float, tags: Tuple[str, ...]):
+        if len(payload) > self.max_bytes or self.max_entries <= 0:
+            self.stats["oversize"] += 1
+            self.delete(key)
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(payload, now + ttl, tags)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            heapq.heappush(self._expiry, (entry.expires_at, key))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            self._purge_expired(now)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+            self._compact_expiry()
+
+    def delete(self, key: str) -> bool:
+        """Delete ``key`` locally. True if it existed."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Delete local entries carrying any of the tags."""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            self.stats["invalidations"] += len(keys)
+        if keys:
+            logger.debug(f"🧹 Cache: invalidated {len(keys)} keys (tags: {', '.join(tags)})")
+        return len(keys)
+
+    def cleanup_expired(self) -> int:
+        """Purge expired entries. Returns how many were removed."""
+        with self._lock:
+            return self._purge_expired(time.monotonic())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expiry.clear()
+            self._tags.clear()
+            self._bytes = 0
+            self._epoch += 1
+
+    def _generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot of the ``tags`` generations (changes on invalidate or clear)."""
+        with self._lock:
+            return (self._epoch, *(self._generations.get(tag, 0) for tag in tags))
+
+    def _remove(self, key: str):
+        """Remove ``key`` (lock held). Its heap item becomes stale."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _purge_expired(self, now: float) -> int:
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                removed += 1
+        self.stats["expirations"] += removed
+        return removed
+
+    def _compact_expiry(self):
+        """Rebuild the heap when it holds too many stale items."""
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            self._expiry = [(entry.expires_at, key) for key, entry in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    # =================================================================
+    # ASYNC (LOCAL + BACKEND)
+    # =================================================================
+
+    def _backend_available(self) -> bool:
+        return self.backend is not None and self.enabled and time.monotonic() >= self._backend_retry_at
+
+    def _backend_failed(self, operation: str, error: BaseException):
+        self.stats["backend_errors"] += 1
+        self._backend_retry_at = time.monotonic() + BACKEND_RETRY_SECONDS
+        logger.warning(
+            f"⚠️ Cache backend {self.backend.address} {operation} failed "
+            f"({type(error).__name__}: {error}); local only for {BACKEND_RETRY_SECONDS:.0f}s"
+        )
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Value of ``key``: local L1 first, then the shared backend."""
+        self._ensure_listener()
+        value = self._get_local(key)
+        if value is not _MISSING:
+            self.stats["hits"] += 1
+            return value
+
+        if self._backend_available():
+            try:
+                payload, ttl_ms = await self.backend.get_with_ttl(key)
+            except (OSError, asyncio.TimeoutError, RedisError) as e:
+                self._backend_failed("GET", e)
+            else:
+                if payload is not None:
+                    value, tags = pickle.loads(payload)
+                    self.stats["hits"] += 1
+                    self.stats["backend_hits"] += 1
+                    # The local copy never outlives the Redis entry
+                    local_ttl = min(self.local_ttl, ttl_ms / 1000) if ttl_ms >= 0 else self.local_ttl
+                    self._set_local(key, payload, local_ttl, tags)
+                    return value
+                self.stats["backend_misses"] += 1
+
+        self.stats["misses"] += 1
+        return default
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        """Store locally and in the shared backend."""
+        if not self.enabled:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        tags = tuple(tags)
+        payload = _dumps(value, tags)
+        if payload is None:
+            self.stats["unpicklable"] += 1
+            return
+        self.stats["sets"] += 1
+        self._ensure_listener()
+
+        local_ttl = min(ttl, self.local_ttl) if self.backend is not None else ttl
+        self._set_local(key, payload, local_ttl, tags)
+
+        if self._backend_available():
+            try:
+                await self.backend.set(key, payload, max(1, int(ttl * 1000)), tags)
+            except (OSError, asyncio.TimeoutError, RedisError) as e:
+                self._backend_failed("SET", e)
+
+    async def adelete(self, key: str) -> bool:
+        deleted = self.delete(key)
+        if self._backend_available():
+            try:
+                deleted = bool(await self.backend.delete([key])) or deleted
+            except (OSError, asyncio.TimeoutError, RedisError) as e:
+                self._backend_failed("DEL", e)
+        return deleted
+
+    async def ainvalidate_tags(self, *tags: str) -> int:
+        """Invalidate tags locally, in the backend and in the other workers' L1."""
+        removed = self.invalidate_tags(*tags)
+        if self._backend_available():
+            message = json.dumps({"origin": self._origin, "tags": list(tags)}).encode("utf-8")
+            try:
+                removed = max(removed, await self.backend.invalidate_tags(tags))
+                await self.backend.publish(INVALIDATION_CHANNEL, message)
+            except (OSError, asyncio.TimeoutError, RedisError) as e:
+                self._backend_failed("invalidate", e)
+        return removed
+
+    async def aget_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """
+        Cached value of ``key``, or the result of ``factory()`` (which is stored).
+
+        Concurrent calls with the same key wait for a single computation.
+        If a tag is invalidated during the computation, the result (which
+        predates the invalidation) is not stored.
+        """
+        value = await self.aget(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        tags = tuple(tags)
+
+        async def compute():
+            generation = self._generation(tags)
+            value = await factory()
+            if self._generation(tags) == generation:
+                await self.aset(key, value, ttl, tags)
+            else:
+                self.stats["stale_results"] += 1
+                logger.debug(f"Cache: {key} invalidated while computing, not stored")
+            return value
+
+        return await self._flights.do(key, compute)
+
+    # =================================================================
+    # CROSS-WORKER INVALIDATIONS (PUB/SUB)
+    # =================================================================
+
+    def _ensure_listener(self):
+        """Start the invalidation subscription (once per manager)."""
+        if self.backend is None or not self.enabled:
+            return
+        if self._listener is not None and not self._listener.done():
+            return
+        self._listener_stopped = False
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        while not self._listener_stopped:
+            try:
+                async for message in self.backend.subscribe(INVALIDATION_CHANNEL, self._on_subscribed):
+                    self._on_invalidation(message)
+                raise ConnectionError("subscription closed")
+            except (OSError, asyncio.TimeoutError, RedisError, EOFError) as e:
+                self.stats["listener_errors"] += 1
+                if self._subscribed:
+                    logger.warning(f"⚠️ Cache invalidation listener lost ({type(e).__name__}: {e}); retrying")
+                self._subscribed = False
+            if not self._listener_stopped:  # wait_for (3.11) may swallow the cancellation from aclose
+                await asyncio.sleep(BACKEND_RETRY_SECONDS)
+
+    def _on_subscribed(self):
+        if self.stats["listener_errors"]:
+            # Reconnected: invalidations may have been missed while unsubscribed
+            self.clear()
+        self._subscribed = True
+
+    def _on_invalidation(self, message: bytes):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return
+        if data.get("origin") != self._origin and data.get("tags"):
+            self.stats["remote_invalidations"] += 1
+            self.invalidate_tags(*data["tags"])
+
+    async def aclose(self):
+        """Stop the subscription and close the backend connections."""
+        if self._listener is not None:
+            self._listener_stopped = True
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._subscribed = False
+        if self.backend is not None:
+            self.backend.close()
+
+    # =================================================================
+    # STATS
+    # =================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "tags": len(self._tags),
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "coalesced": self._flights.stats["coalesced"],
+            "backend": self.backend.address if self.backend is not None else None,
+            "invalidation_listener": self._subscribed
+        }
+
+
+# =================================================================
+# SINGLETON + DECORATOR
+# =================================================================
+
+_cache_manager: Optional[CacheManager] = None
+_cache_manager_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    """Process-wide CacheManager (backed by Redis when CACHE_REDIS_URL is set)."""
+    global _cache_manager
+    if _cache_manager is None:
+        with _cache_manager_lock:
+            if _cache_manager is None:
+                backend = None
+                if settings.CACHE_REDIS_URL:
+                    backend = RedisCacheBackend(
+                        settings.CACHE_REDIS_URL,
+                        timeout_seconds=settings.CACHE_REDIS_TIMEOUT_SECONDS,
+                        namespace=settings.CACHE_REDIS_NAMESPACE
+                    )
+                    logger.info(f"🗄️ Cache backend: redis {backend.address}")
+                _cache_manager = CacheManager(backend=backend)
+    return _cache_manager
+
+
+def cache_key_wrapper(
+    prefix: str,
+    ttl: Optional[float] = None,
+    key_func: Optional[Callable[..., Any]] = None,
+    ignore_self: bool = False,
+    tags: Iterable[str] = (),
+    manager: Optional[CacheManager] = None
+):
+    """
+    Decorator: cache the result of a function (sync or async).
+
+    Entries are tagged with ``prefix`` in addition to ``tags``, so
+    ``invalidate_tags(prefix)`` drops every result of the function. If the
+    arguments have no stable key (make_cache_key → TypeError), a warning is
+    logged and the function runs uncached.
+
+    Args:
+        prefix: Key prefix (also used as a tag)
+        ttl: TTL in seconds (default: the manager's)
+        key_func: Function (same arguments) returning the variable part of
+            the key; defaults to make_cache_key over the arguments
+        ignore_self: Leave ``self`` out of the key (methods of services
+            created per request)
+        tags: Extra tags
+        manager: CacheManager (default: get_cache_manager())
+    """
+    entry_tags = (prefix, *tags)
+
+    def decorator(func):
+        def build_key(args, kwargs) -> Optional[str]:
+            try:
+                if key_func is not None:
+                    return make_cache_key(prefix, key_func(*args, **kwargs))
+                return make_cache_key(prefix, *(args[1:] if ignore_self else args), **kwargs)
+            except TypeError as e:
+                logger.warning(f"⚠️ Cache {prefix}: {e}; calling {func.__qualname__} uncached")
+                return None
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache = manager or get_cache_manager()
+                key = build_key(args, kwargs)
+                if key is None:
+                    return await func(*args, **kwargs)
+                return await cache.aget_or_set(key, lambda: func(*args, **kwargs), ttl, entry_tags)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            cache = manager or get_cache_manager()
+            key = build_key(args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value, ttl, entry_tags)
+            return value
+        return sync_wrapper
+
+    return decorator
@@ -0,0 +1,286 @@
+"""
+Redis Cache Backend
+===================
+
+Shared, out-of-process backend for CacheManager, so a result computed in
+one uvicorn worker serves the others.
+
+Minimal Redis protocol (RESP2) client over asyncio streams, with no extra
+dependencies. It implements only what the cache needs:
+
+- ``GET`` (+ ``PTTL``) / ``SET key value PX ttl`` / ``DEL``
+- Tags as sets: ``SADD tag key`` + ``PEXPIRE``, ``SMEMBERS`` on invalidation
+- Pipelining: several commands in one round trip
+- ``PUBLISH`` / ``SUBSCRIBE`` (dedicated connection) to broadcast
+  invalidations to the other workers
+
+Connections are reused per event loop (an asyncio connection cannot be
+used from another loop). Any error discards the connection.
+
+Usage:
+    backend = RedisCacheBackend("redis://localhost:6379/0")
+    await backend.set("ree:prices:ab12", b"...", ttl_ms=60000, tags=["ree"])
+    await backend.get("ree:prices:ab12")  # b"..."
+    await backend.invalidate_tags(["ree"])  # 1
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+Command = Sequence[Union[str, bytes, int]]
+
+# Idle connections kept per event loop
+MAX_IDLE_CONNECTIONS = 8
+
+
+class RedisError(Exception):
+    """Server error reply (``-ERR ...``) or invalid protocol."""
+
+
+class _Connection:
+    """A RESP2 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def _encode(command: Command) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if isinstance(arg, bytes):
+                data = arg
+            else:
+                data = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected RESP reply: {line!r}")
+
+    async def execute(self, commands: List[Command]) -> List[Any]:
+        """Send the commands in a single write and read the replies in order."""
+        self.writer.write(b"".join(self._encode(command) for command in commands))
+        await self.writer.drain()
+        return [await self._read_reply() for _ in commands]
+
+    async def send(self, command: Command):
+        self.writer.write(self._encode(command))
+        await self.writer.drain()
+
+    async def read(self) -> Any:
+        return await self._read_reply()
+
+    def close(self):
+        self.writer.close()
+
+
+class RedisCacheBackend:
+    """
+    Cache stored in Redis (or any RESP-compatible server).
+
+    Args:
+        url: ``redis://[:password@]host:port/db``
+        timeout_seconds: Per-operation limit (connecting included)
+        namespace: Prefix for every key
+    """
+
+    def __init__(self, url: str, timeout_seconds: float = 0.5, namespace: str = "chocolate:cache:"):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported cache backend URL: {url}")
+
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.timeout_seconds = timeout_seconds
+        self.namespace = namespace
+        self._idle: Dict[int, Tuple[asyncio.AbstractEventLoop, List[_Connection]]] = {}
+
+    @property
+    def address(self) -> str:
+        """host:port/db (no credentials; for logs and stats)."""
+        return f"{self.host}:{self.port}/{self.db}"
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}tag:{tag}"
+
+    def _channel(self, channel: str) -> str:
+        return f"{self.namespace}channel:{channel}"
+
+    # =================================================================
+    # CONNECTIONS
+    # =================================================================
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = _Connection(reader, writer)
+
+        setup: List[Command] = []
+        if self.password:
+            setup.append(["AUTH", self.username, self.password] if self.username else ["AUTH", self.password])
+        if self.db:
+            setup.append(["SELECT", self.db])
+        if setup:
+            for reply in await connection.execute(setup):
+                if isinstance(reply, RedisError):
+                    connection.close()
+                    raise reply
+        return connection
+
+    async def _execute(self, commands: List[Command]) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        pooled = self._idle.get(id(loop))
+        if pooled is None or pooled[0] is not loop:  # id() reused by a new loop
+            pooled = self._idle[id(loop)] = (loop, [])
+        idle = pooled[1]
+        connection = idle.pop() if idle else None
+
+        try:
+            if connection is None:
+                connection = await self._connect()
+            replies = await connection.execute(commands)
+        except BaseException:
+            # Partial reply (timeout, cancellation): the connection is unusable
+            if connection is not None:
+                connection.close()
+            raise
+
+        if len(idle) < MAX_IDLE_CONNECTIONS:
+            idle.append(connection)
+        else:
+            connection.close()
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def execute(self, *commands: Command) -> List[Any]:
+        """Run one or more commands (pipelined) under the backend timeout."""
+        return await asyncio.wait_for(self._execute(list(commands)), self.timeout_seconds)
+
+    # =================================================================
+    # CACHE OPERATIONS
+    # =================================================================
+
+    async def ping(self) -> bool:
+        return (await self.execute(["PING"]))[0] == "PONG"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await self.execute(["GET", self._key(key)]))[0]
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[bytes], int]:
+        """Value and remaining TTL in ms (``PTTL``: -1 no expiry, -2 missing)."""
+        payload, ttl_ms = await self.execute(["GET", self._key(key)], ["PTTL", self._key(key)])
+        return payload, ttl_ms
+
+    async def set(self, key: str, value: bytes, ttl_ms: int, tags: Iterable[str] = ()):
+        """
+        Store ``value`` with a TTL and add it to each tag's set.
+
+        A tag set lives at least as long as its longest-lived key: its
+        expiry (PTTL) is only extended when the new key outlives it.
+        """
+        tags = list(tags)
+        commands: List[Command] = [["SET", self._key(key), value, "PX", ttl_ms]]
+        for tag in tags:
+            commands.append(["SADD", self._tag_key(tag), self._key(key)])
+            commands.append(["PTTL", self._tag_key(tag)])
+        replies = await self.execute(*commands)
+
+        extend = [
+            ["PEXPIRE", self._tag_key(tag), ttl_ms]
+            for tag, tag_ttl in zip(tags, replies[2::2])
+            if tag_ttl < ttl_ms
+        ]
+        if extend:
+            await self.execute(*extend)
+
+    async def delete(self, keys: Iterable[str]) -> int:
+        keys = [self._key(key) for key in keys]
+        if not keys:
+            return 0
+        return (await self.execute(["DEL", *keys]))[0]
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete the keys of the tags (and the tag sets)."""
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        members = await self.execute(*[["SMEMBERS", tag_key] for tag_key in tag_keys])
+        keys = sorted({key for tag_members in members for key in tag_members})
+        replies = await self.execute(*([["DEL", *keys]] if keys else []), ["DEL", *tag_keys])
+        return replies[0] if keys else 0
+
+    # =================================================================
+    # PUB/SUB
+    # =================================================================
+
+    async def publish(self, channel: str, message: bytes) -> int:
+        """Publish ``message``; returns how many subscribers received it."""
+        return (await self.execute(["PUBLISH", self._channel(channel), message]))[0]
+
+    async def subscribe(
+        self,
+        channel: str,
+        on_subscribed: Optional[Callable[[], None]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Messages from ``channel`` as they arrive (own connection, outside the pool).
+
+        Waiting for messages has no timeout; a connection error ends the
+        iteration with the exception.
+        """
+        connection = await asyncio.wait_for(self._connect(), self.timeout_seconds)
+        try:
+            await connection.send(["SUBSCRIBE", self._channel(channel)])
+            while True:
+                reply = await connection.read()
+                if isinstance(reply, RedisError):
+                    raise reply
+                if not isinstance(reply, list) or len(reply) != 3:
+                    continue
+                if reply[0] == b"subscribe":
+                    if on_subscribed is not None:
+                        on_subscribed()
+                elif reply[0] == b"message":
+                    yield reply[2]
+        finally:
+            connection.close()
+
+    def close(self):
+        """Close idle connections."""
+        for _, connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
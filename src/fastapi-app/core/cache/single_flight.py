@@ -0,0 +1,166 @@
+"""
+Single-Flight (request coalescing)
+==================================
+
+Concurrent calls with the same key (function + arguments) wait for a
+single in-flight computation instead of each running it:
+
+- Not a cache: once the computation finishes the key is released and the
+  next call runs the function again
+- The computation runs in its own task: if the first caller is cancelled
+  (client disconnected, section timeout) the others keep waiting for it
+- Exceptions reach every caller of that flight
+- When other callers joined, each of them (the first one included) gets
+  its own deep copy of the result, so no caller mutates another's
+
+Usage:
+    from core.cache import single_flight
+
+    class WeatherAggregationService:
+        @single_flight("weather.current", ignore_self=True)
+        async def get_current_weather(self, prefer_source=None): ...
+
+    get_single_flight_stats()  # {"weather.current": {"calls": 12, "coalesced": 9, ...}}
+"""
+
+import asyncio
+import copy
+import functools
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """An in-flight computation and how many callers joined it."""
+    __slots__ = ("task", "joined")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.joined = 0
+
+
+class SingleFlight:
+    """
+    In-flight calls of one group (usually one decorated function).
+
+    Args:
+        name: Group name (key in get_single_flight_stats)
+        copy_result: Copy the result when it is shared between callers
+    """
+
+    def __init__(self, name: str, copy_result: bool = True):
+        self.name = name
+        self.copy_result = copy_result
+        self._inflight: Dict[Tuple[int, Hashable], _Flight] = {}
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``factory()``, or join the in-flight call with the same ``key``."""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        self.stats["calls"] += 1
+
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            flight.joined += 1
+            self.stats["coalesced"] += 1
+            logger.debug(f"🛬 {self.name}: joined in-flight call ({flight.joined} waiting)")
+        else:
+            self.stats["executions"] += 1
+            flight = _Flight(loop.create_task(self._run(factory)))
+            self._inflight[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._release(flight_key, flight))
+
+        result = await asyncio.shield(flight.task)
+        if self.copy_result and flight.joined:
+            return copy.deepcopy(result)
+        return result
+
+    async def _run(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await factory()
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    def _release(self, flight_key: Tuple[int, Hashable], flight: _Flight):
+        if self._inflight.get(flight_key) is flight:
+            del self._inflight[flight_key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # Retrieved: no "never retrieved" warning if every caller left
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "in_flight": len(self._inflight)}
+
+
+# =================================================================
+# REGISTRY
+# =================================================================
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str, copy_result: bool = True) -> SingleFlight:
+    """Group ``name`` from the process registry (created on first use)."""
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.setdefault(name, SingleFlight(name, copy_result))
+    return group
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-group counters: calls, actual executions and coalesced calls."""
+    return {name: group.get_stats() for name, group in sorted(_groups.items())}
+
+
+def _freeze(value: Any) -> Hashable:
+    """Arguments → hashable key (dicts/lists by content)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def single_flight(
+    name: Optional[str] = None,
+    ignore_self: bool = False,
+    key: Optional[Callable[..., Hashable]] = None,
+    copy_result: bool = True
+):
+    """
+    Single-flight decorator for async functions and methods.
+
+    Args:
+        name: Registry group (default: module.qualname)
+        ignore_self: Leave ``self`` out of the key, so different service
+            instances share flights (services are created per request)
+        key: Function (same arguments) returning the key; defaults to all
+            the arguments
+        copy_result: See SingleFlight
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        group = get_single_flight(name or f"{func.__module__}.{func.__qualname__}", copy_result)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key is not None:
+                flight_key = key(*args, **kwargs)
+            else:
+                key_args = args[1:] if ignore_self else args
+                flight_key = _freeze((key_args, kwargs))
+            return await group.do(flight_key, lambda: func(*args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
@@ -79,6 +79,9 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT_JSON: bool = False  # Sprint 20 Fase 2: JSON structured logging
+    LOG_DIR: Path = Path("/app/logs")
+    LOG_INDEX_BLOCK_RECORDS: int = 256  # Registros por entrada del índice de segmentos
+    LOG_SEGMENT_RETENTION_HOURS: int = 168  # Segmentos horarios conservados (0 = sin borrado)
     TZ: str = "Europe/Madrid"
     API_VERSION: str = "0.41.0"
 
@@ -95,6 +98,23 @@ class Settings(BaseSettings):
     INFLUXDB_TIMEOUT: int = 10000  # milliseconds
     INFLUXDB_VERIFY_SSL: bool = False
     INFLUXDB_ENABLE_GZIP: bool = True
+    INFLUXDB_POOL_MAXSIZE: int = 20  # urllib3 connections kept for reuse per client
+    INFLUXDB_HEALTH_TTL: int = 60  # seconds a successful health probe is trusted
+    INFLUXDB_QUERY_TIMEOUT: float = 30.0  # seconds per async query/write before cancelling
+    INFLUXDB_QUERY_CONCURRENCY: int = 8  # worker threads running blocking InfluxDB calls
+    INFLUXDB_WRITE_TIMEOUT: float = 30.0  # base seconds per ingestion sink write before cancelling
+    INFLUXDB_WRITE_TIMEOUT_PER_1K_POINTS: float = 5.0  # extra seconds per 1000 points in the write
+    COVERAGE_INDEX_PATH: Path = Path("/app/data/coverage_index.npz")  # hourly coverage bitmaps (gap detection)
+    COVERAGE_RECHECK_HOURS: int = 48  # recent hours always re-verified in Flux (late data)
+    COVERAGE_SAVE_DELAY_SECONDS: float = 5.0  # writes within this window share one save (background thread)
+
+    # Ingestion sink (shared batched writer for every ingest path)
+    INGESTION_BATCH_SIZE: int = 5000  # points per line protocol write
+    INGESTION_FLUSH_INTERVAL: float = 0.2  # seconds a batch waits for more producers
+    INGESTION_MAX_QUEUE_POINTS: int = 50000  # producers wait above this queue depth
+    INGESTION_MAX_RETRIES: int = 3  # retries per batch (exponential backoff)
+    INGESTION_RETRY_BACKOFF: float = 1.0  # seconds before the first retry
+    INGESTION_DEDUP_CAPACITY: int = 200000  # (series, timestamp) keys remembered for dedup
 
     # =================================================================
     # EXTERNAL API KEYS
@@ -122,6 +142,21 @@ class Settings(BaseSettings):
     ML_PROPHET_TRAINING_INTERVAL_MINUTES: int = 60
     ML_MIN_TRAINING_SAMPLES: int = 100
 
+    # Incremental (warm-start) retraining of scheduled jobs
+    ML_INCREMENTAL_MIN_NEW_SAMPLES: int = 24  # Filas nuevas desde el último artefacto para reentrenar
+    ML_INCREMENTAL_WINDOW_HOURS: int = 168  # Ventana reciente con la que se ajustan los árboles nuevos
+    ML_INCREMENTAL_TREES: int = 20  # Árboles añadidos por reentrenamiento incremental
+    ML_INCREMENTAL_MAX_TREES: int = 300  # Por encima, refit completo
+    ML_FULL_REFIT_EVERY: int = 12  # Reentrenamientos incrementales entre refits completos
+
+    # Training worker pool (retrains out of the API process)
+    ML_TRAINING_OUT_OF_PROCESS: bool = True  # False: entrenar en el proceso de la API (desarrollo)
+    ML_TRAINING_WORKERS: int = 1  # Entrenamientos simultáneos
+    ML_TRAINING_TIMEOUT_SECONDS: int = 3600  # Pasado este tiempo se termina el proceso
+    ML_TRAINING_MAX_MEMORY_MB: int = 4096  # RLIMIT_AS por trabajo (0 = sin límite)
+    ML_TRAINING_CPUS: int = 2  # Núcleos por trabajo: afinidad + hilos BLAS/OpenMP (0 = todos)
+    ML_TRAINING_NICE: int = 10  # Prioridad del proceso de entrenamiento
+
     # =================================================================
     # SCHEDULER SETTINGS (APScheduler)
     # =================================================================
@@ -165,6 +200,21 @@ class Settings(BaseSettings):
     GAP_MAX_HOURS: float = 6.0
     BACKFILL_BATCH_SIZE: int = 100
     BACKFILL_AUTO_RUN: bool = True
+    BACKFILL_MAX_CONCURRENCY: int = 4  # Tareas de backfill simultáneas (todas las fuentes)
+    BACKFILL_REE_REQUESTS_PER_MINUTE: float = 30.0  # Presupuesto REE (precios + generación)
+    BACKFILL_AEMET_REQUESTS_PER_MINUTE: float = 20.0
+    BACKFILL_API_BURST: int = 2  # Ráfaga máxima por API
+    BACKFILL_REE_MAX_RANGE_DAYS: int = 7  # Días por petición de rango PVPC
+    BACKFILL_CHECKPOINT_PATH: Path = Path("/app/data/backfill_checkpoint.json")
+    BACKFILL_CHECKPOINT_TTL_HOURS: float = 24.0  # Checkpoints más antiguos se ignoran
+
+    # Carga histórica SIAR (CSV)
+    SIAR_LOADER_WORKERS: int = 0  # Procesos de parseo (0 = nº de CPUs)
+    SIAR_LOADER_CHUNK_ROWS: int = 5000  # Filas por chunk (memoria acotada)
+
+    # Feature store (histórico de entrenamiento en Parquet local)
+    FEATURE_STORE_PATH: Path = Path("/app/data/feature_store")
+    FEATURE_STORE_OVERLAP_HOURS: int = 48  # Horas antes de la marca de agua que se vuelven a pedir
 
     # =================================================================
     # CORS & SECURITY
@@ -195,13 +245,27 @@ class Settings(BaseSettings):
     # =================================================================
     CACHE_ENABLED: bool = True
     CACHE_TTL_SECONDS: int = 300  # 5 minutes
-    CACHE_MAX_SIZE: int = 1000
+    CACHE_MAX_SIZE: int = 1000  # Entradas locales (LRU)
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Bytes locales (tamaño serializado)
+    CACHE_REDIS_URL: Optional[str] = None  # redis://host:6379/0 → caché compartida entre workers
+    CACHE_REDIS_TIMEOUT_SECONDS: float = 0.5  # Límite por operación; si falla, solo caché local
+    CACHE_REDIS_NAMESPACE: str = "chocolate:cache:"
+    CACHE_LOCAL_TTL_SECONDS: int = 5  # Con Redis, vida máxima de la copia local (L1)
 
     # =================================================================
     # DASHBOARD SETTINGS
     # =================================================================
     STATIC_FILES_DIR: Path = Path("/app/static")
     DASHBOARD_REFRESH_INTERVAL: int = 30  # seconds
+    DASHBOARD_SNAPSHOT_INTERVAL: int = 5  # minutes between scheduled snapshot rebuilds
+    DASHBOARD_SNAPSHOT_MAX_AGE: int = 300  # seconds a snapshot is considered fresh
+    DASHBOARD_SNAPSHOT_MAX_STALE: int = 900  # seconds a stale snapshot may be served while rebuilding
+    DASHBOARD_SECTION_TIMEOUTS: dict = {  # seconds per dashboard section before falling back
+        "current_info": 8.0,
+        "predictions": 20.0,
+        "weekly_forecast": 15.0,
+        "siar_analysis": 12.0
+    }
 
     # =================================================================
     # BUSINESS LOGIC SETTINGS
@@ -211,6 +275,8 @@ class Settings(BaseSettings):
     # Production optimization settings
     PRODUCTION_TARGET_KG_PER_DAY: int = 200
     PRODUCTION_BATCH_DURATION_HOURS: int = 6
+    OPTIMIZER_MODE: str = "greedy"  # greedy | exact (DP batch placement)
+    OPTIMIZER_WEATHER_TTL_SECONDS: int = 1800  # Forecast OWM reutilizado entre planes semanales
     PRODUCTION_PROCESSES: List[str] = [
         "Molienda de cacao",
         "Conchado Premium",
@@ -232,6 +298,10 @@ class Settings(BaseSettings):
     CHATBOT_MAX_TOKENS: int = 500  # Respuestas completas (aumentado Oct 22, 2025)
     CHATBOT_RATE_LIMIT: str = "20/minute"  # Max requests per minute
     CHATBOT_CONTEXT_MAX_TOKENS: int = 2000  # Max tokens for context
+    CHATBOT_CONTEXT_SOURCE_TIMEOUT_SECONDS: float = 10.0  # Por fuente de contexto (dashboard, insights, REE...)
+    CHATBOT_API_BASE_URL: Optional[str] = None  # API compatible con Anthropic (p.ej. stub LLM local); None = api.anthropic.com
+    CHATBOT_ANSWER_CACHE_MAX_ENTRIES: int = 256  # Respuestas guardadas (pregunta normalizada + datos del contexto)
+    CHATBOT_ANSWER_CACHE_TTL_SECONDS: int = 900  # Edad máxima aunque los datos no cambien
 
     # =================================================================
     # FEATURE FLAGS (Sprint control)
@@ -20,6 +20,10 @@ Exception Hierarchy:
     │   └── OpenWeatherMapError
     ├── DataGapError
     ├── InfluxDBError
+    │   ├── InfluxDBConnectionError
+    │   ├── InfluxDBQueryError
+    │   │   └── InfluxDBQueryTimeoutError
+    │   └── InfluxDBWriteError
     └── ValidationError
 
 Usage:
@@ -264,6 +268,15 @@ class InfluxDBQueryError(InfluxDBError):
         )
 
 
+class InfluxDBQueryTimeoutError(InfluxDBQueryError):
+    """InfluxDB query exceeded its time budget (and was cancelled)."""
+
+    def __init__(self, query: str, timeout_seconds: float):
+        super().__init__(query, f"timeout after {timeout_seconds}s")
+        self.error_code = "INFLUXDB_QUERY_TIMEOUT"
+        self.details["timeout_seconds"] = timeout_seconds
+
+
 class InfluxDBWriteError(InfluxDBError):
     """InfluxDB write operation error."""
 
@@ -343,6 +356,7 @@ def to_http_exception(exc: ChocolateFactoryException) -> HTTPException:
         APIRateLimitError: status.HTTP_429_TOO_MANY_REQUESTS,
         InsufficientDataError: status.HTTP_400_BAD_REQUEST,
         DataGapError: status.HTTP_409_CONFLICT,
+        InfluxDBQueryTimeoutError: status.HTTP_504_GATEWAY_TIMEOUT,
     }
 
     status_code = status_map.get(type(exc), status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,308 @@
+"""
+Segmented Log Store
+===================
+
+Writes JSON logs to hourly, per-process segments with a sparse index so
+/logs/search can seek to a time window instead of parsing a single
+unrotated log file from the start.
+
+Layout (under settings.LOG_DIR / "segments"):
+
+    fastapi-2026101614-p812.jsonl   # one JSON line per record
+    fastapi-2026101614-p812.idx     # one index entry every N records
+
+Each index entry describes a block of ``LOG_INDEX_BLOCK_RECORDS`` lines:
+byte offset and length, first/last timestamp, and the levels and loggers
+it contains. Searching:
+
+- Skips segments by the hour in their name (time window)
+- Skips blocks by time, level and module without reading them
+- Reads candidate blocks newest-first (seek + read) and stops once it has
+  ``limit`` entries newer than any pending block
+- Within a block, the level filter is checked on the raw bytes before
+  parsing the line
+
+One segment per process: each uvicorn worker writes its own files (own
+offsets, no interleaved writes). Segments older than
+``LOG_SEGMENT_RETENTION_HOURS`` are removed on hour rollover. The
+not-yet-indexed tail of a segment (less than one block) is always read.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+
+_SEGMENT_NAME = re.compile(r"^(?P<prefix>.+)-(?P<hour>\d{10})-p(?P<pid>\d+)\.jsonl$")
+_HOUR_FORMAT = "%Y%m%d%H"
+
+
+def _hour_label(hour: int) -> str:
+    return datetime.fromtimestamp(hour * 3600, tz=timezone.utc).strftime(_HOUR_FORMAT)
+
+
+def _hour_from_label(label: str) -> int:
+    return int(datetime.strptime(label, _HOUR_FORMAT).replace(tzinfo=timezone.utc).timestamp()) // 3600
+
+
+# =================================================================
+# WRITING
+# =================================================================
+
+class _Block:
+    """Open block of the current segment (not indexed yet)."""
+    __slots__ = ("offset", "length", "count", "first", "last", "levels", "loggers")
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        self.length = 0
+        self.count = 0
+        self.first = float("inf")
+        self.last = float("-inf")
+        self.levels = set()
+        self.loggers = set()
+
+    def add(self, size: int, created: float, level: str, logger_name: str):
+        self.length += size
+        self.count += 1
+        self.first = min(self.first, created)
+        self.last = max(self.last, created)
+        self.levels.add(level)
+        self.loggers.add(logger_name)
+
+    def to_index(self) -> Dict[str, Any]:
+        return {
+            "offset": self.offset, "length": self.length, "count": self.count,
+            "first": self.first, "last": self.last,
+            "levels": sorted(self.levels), "loggers": sorted(self.loggers)
+        }
+
+
+class SegmentedLogHandler(logging.Handler):
+    """
+    Handler that writes formatted lines (usually JSON) to hourly segments
+    with a sparse index.
+
+    Args:
+        directory: Segment directory
+        prefix: File name prefix
+        block_records: Records per index entry
+            (default: LOG_INDEX_BLOCK_RECORDS)
+        retention_hours: Hours segments are kept
+            (default: LOG_SEGMENT_RETENTION_HOURS; 0 = keep forever)
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        prefix: str = "fastapi",
+        block_records: Optional[int] = None,
+        retention_hours: Optional[int] = None
+    ):
+        super().__init__()
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.block_records = block_records or settings.LOG_INDEX_BLOCK_RECORDS
+        self.retention_hours = (
+            settings.LOG_SEGMENT_RETENTION_HOURS if retention_hours is None else retention_hours
+        )
+        self._hour: Optional[int] = None
+        self._stream = None
+        self._index = None
+        self._block: Optional[_Block] = None
+        self._offset = 0
+
+    def _segment_path(self, hour: int, suffix: str) -> Path:
+        return self.directory / f"{self.prefix}-{_hour_label(hour)}-p{os.getpid()}{suffix}"
+
+    def _roll(self, hour: int):
+        """Close the current segment and open the one for ``hour``."""
+        self._close_segment()
+        self._hour = hour
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stream = open(self._segment_path(hour, ".jsonl"), "ab")
+        self._index = open(self._segment_path(hour, ".idx"), "a", encoding="utf-8")
+        self._offset = self._stream.seek(0, os.SEEK_END)
+        self._block = _Block(self._offset)
+        if self.retention_hours:
+            self._remove_expired(hour - self.retention_hours)
+
+    def _remove_expired(self, oldest_hour: int):
+        for path in self.directory.glob(f"{self.prefix}-*"):
+            match = _SEGMENT_NAME.match(path.with_suffix(".jsonl").name)
+            if match and _hour_from_label(match["hour"]) < oldest_hour:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass  # Already removed by another worker
+
+    def _close_block(self):
+        if self._block is not None and self._block.count:
+            self._index.write(json.dumps(self._block.to_index(), ensure_ascii=False) + "\n")
+            self._index.flush()
+            self._block = _Block(self._offset)
+
+    def _close_segment(self):
+        if self._stream is None:
+            return
+        self._close_block()
+        self._stream.close()
+        self._index.close()
+        self._stream = self._index = self._block = None
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = (self.format(record) + "\n").encode("utf-8")
+            hour = int(record.created // 3600)
+            if self._hour is None or hour > self._hour:  # Late records go to the current segment
+                self._roll(hour)
+
+            self._stream.write(line)
+            self._stream.flush()
+            self._offset += len(line)
+            self._block.add(len(line), record.created, record.levelname, record.name)
+            if self._block.count >= self.block_records:
+                self._close_block()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Index the open block (searchable without rereading the segment tail)."""
+        with self.lock:
+            if self._stream is not None:
+                self._close_block()
+
+    def close(self):
+        with self.lock:
+            self._close_segment()
+        super().close()
+
+
+# =================================================================
+# SEARCH
+# =================================================================
+
+def _read_index(path: Path) -> List[Dict[str, Any]]:
+    blocks = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n"):  # Skip a partially written last line
+                    blocks.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return blocks
+
+
+def _segment_blocks(path: Path, hour: int) -> List[Dict[str, Any]]:
+    """Indexed blocks of a segment plus its unindexed tail (unknown metadata)."""
+    blocks = _read_index(path.with_suffix(".idx"))
+    indexed_end = max((b["offset"] + b["length"] for b in blocks), default=0)
+    size = path.stat().st_size
+    if size > indexed_end:
+        blocks.append({
+            "offset": indexed_end, "length": size - indexed_end,
+            "first": float("-inf"), "last": (hour + 1) * 3600,
+            "levels": None, "loggers": None
+        })
+    for block in blocks:
+        block["path"] = path
+    return blocks
+
+
+def _timestamp(entry: Dict[str, Any]) -> float:
+    return datetime.fromisoformat(entry["timestamp"].rstrip("Z")).replace(tzinfo=timezone.utc).timestamp()
+
+
+def search_log_segments(
+    directory: Path,
+    level: Optional[str] = None,
+    module: Optional[str] = None,
+    since: Optional[float] = None,
+    limit: int = 100,
+    prefix: str = "fastapi"
+) -> Dict[str, Any]:
+    """
+    Search log entries, newest first.
+
+    Args:
+        directory: Segment directory
+        level: Exact level (INFO, ERROR...)
+        module: Substring of the logger name
+        since: Minimum epoch (seconds)
+        limit: Maximum number of entries
+
+    Returns:
+        {"logs": [...], "scan": {segments, blocks, blocks_read, lines_parsed, bytes_read}}
+    """
+    level = level.upper() if level else None
+    since = since if since is not None else float("-inf")
+    level_marker = json.dumps({"level": level})[1:-1].encode("utf-8") if level else None
+
+    scan = {"segments": 0, "blocks": 0, "blocks_read": 0, "lines_parsed": 0, "bytes_read": 0}
+    candidates = []
+    for path in Path(directory).glob(f"{prefix}-*.jsonl"):
+        match = _SEGMENT_NAME.match(path.name)
+        if not match or match["prefix"] != prefix:
+            continue
+        hour = _hour_from_label(match["hour"])
+        if (hour + 1) * 3600 <= since:
+            continue
+        try:
+            blocks = _segment_blocks(path, hour)
+        except FileNotFoundError:
+            continue  # Removed by retention during the search
+        scan["segments"] += 1
+        scan["blocks"] += len(blocks)
+        for block in blocks:
+            if block["last"] < since:
+                continue
+            if level and block["levels"] is not None and level not in block["levels"]:
+                continue
+            if module and block["loggers"] is not None and not any(module in name for name in block["loggers"]):
+                continue
+            candidates.append(block)
+
+    candidates.sort(key=lambda b: b["last"], reverse=True)
+    found: List[Tuple[float, Dict[str, Any]]] = []
+    for block in candidates:
+        if len(found) >= limit:
+            found.sort(key=lambda item: item[0], reverse=True)
+            del found[limit:]
+            if found[-1][0] >= block["last"]:
+                break  # No pending block has newer entries
+
+        try:
+            with open(block["path"], "rb") as f:
+                f.seek(block["offset"])
+                data = f.read(block["length"])
+        except FileNotFoundError:
+            continue
+        scan["blocks_read"] += 1
+        scan["bytes_read"] += len(data)
+
+        for line in data.split(b"\n"):
+            if not line or (level_marker and level_marker not in line):
+                continue
+            scan["lines_parsed"] += 1
+            try:
+                entry = json.loads(line)
+                created = _timestamp(entry)
+            except (ValueError, KeyError, AttributeError):
+                continue  # Incomplete or non-JSON line
+            if created < since:
+                continue
+            if level and entry.get("level") != level:
+                continue
+            if module and module not in entry.get("logger", ""):
+                continue
+            found.append((created, entry))
+
+    found.sort(key=lambda item: item[0], reverse=True)
+    return {"logs": [entry for _, entry in found[:limit]], "scan": scan}
+
@@ -10,7 +10,7 @@ Features:
 - JSON structured logs for production
 - Color-coded console logs for development
 - Request ID tracking for distributed tracing
-- Log rotation and file output
+- Hourly log segments with a sparse index (core/log_store.py)
 - Performance metrics logging
 """
 
@@ -19,9 +19,10 @@ import sys
 from pathlib import Path
 from typing import Optional
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
 from core.config import settings
+from core.log_store import SegmentedLogHandler
 
 
 # =================================================================
@@ -45,7 +46,7 @@ class StructuredFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -140,26 +141,30 @@ def get_console_handler() -> logging.StreamHandler:
     return handler
 
 
-def get_file_handler(log_file: Path) -> logging.FileHandler:
+def get_file_handler(log_dir: Path) -> Optional[SegmentedLogHandler]:
     """
-    Get file handler with JSON formatter.
+    Get segmented file handler with JSON formatter.
+
+    Logs are written to hourly segments with a sparse index
+    (see core/log_store.py), searchable via /logs/search.
 
     Args:
-        log_file: Path to log file
+        log_dir: Directory for the log segments
 
     Returns:
-        FileHandler: File handler for JSON logs
+        SegmentedLogHandler: File handler for JSON logs (None if the
+        directory cannot be created)
     """
     # Ensure log directory exists with proper permissions
     try:
-        log_file.parent.mkdir(parents=True, exist_ok=True, mode=0o777)
+        log_dir.mkdir(parents=True, exist_ok=True, mode=0o775)
     except (OSError, PermissionError) as e:
         # If we can't create the log directory, skip file logging
         import warnings
         warnings.warn(f"Could not create log directory: {e}. File logging disabled.")
         return None
 
-    handler = logging.FileHandler(log_file, encoding="utf-8")
+    handler = SegmentedLogHandler(log_dir)
     handler.setFormatter(StructuredFormatter())
 
     return handler
@@ -171,7 +176,7 @@ def get_file_handler(log_file: Path) -> logging.FileHandler:
 
 def setup_logging(
     log_level: Optional[str] = None,
-    log_file: Optional[Path] = None,
+    log_dir: Optional[Path] = None,
     enable_file_logging: bool = True
 ) -> None:
     """
@@ -180,7 +185,8 @@ def setup_logging(
     Args:
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
                   Defaults to settings.LOG_LEVEL
-        log_file: Path to log file. Defaults to /app/logs/fastapi.log
+        log_dir: Directory for the JSON log segments.
+                 Defaults to settings.LOG_DIR / "segments"
         enable_file_logging: Whether to enable file logging
 
     Example:
@@ -205,10 +211,10 @@ def setup_logging(
 
     # Add file handler if enabled
     if enable_file_logging:
-        if log_file is None:
-            log_file = Path("/app/logs/fastapi.log")
+        if log_dir is None:
+            log_dir = settings.LOG_DIR / "segments"
 
-        file_handler = get_file_handler(log_file)
+        file_handler = get_file_handler(log_dir)
         if file_handler:  # Only add if handler was created successfully
             root_logger.addHandler(file_handler)
 
@@ -222,7 +228,7 @@ def setup_logging(
     logger = logging.getLogger(__name__)
     logger.info(f"🔧 Logging configured: level={level}, environment={settings.ENVIRONMENT}")
     if enable_file_logging:
-        logger.info(f"📝 File logging enabled: {log_file}")
+        logger.info(f"📝 File logging enabled: {log_dir}")
 
 
 # =================================================================
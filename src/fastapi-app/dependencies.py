@@ -14,7 +14,6 @@ Usage in routers:
         ...
 """
 
-from functools import lru_cache
 from typing import Generator, Optional
 import logging
 
@@ -30,32 +29,24 @@ logger = logging.getLogger(__name__)
 # INFLUXDB CLIENT
 # =================================================================
 
-@lru_cache()
 def get_influxdb_client() -> InfluxDBClient:
     """
-    Get InfluxDB client instance (singleton pattern).
+    Get InfluxDB client instance (shared, connection-pooled).
+
+    Returns the client owned by the process-wide InfluxDBClientWrapper so
+    routers, jobs and services reuse one urllib3 pool. Health is probed
+    lazily (see InfluxDBClientWrapper.ensure_healthy).
 
     Returns:
         InfluxDBClient: Configured InfluxDB client
 
     Raises:
-        ConnectionError: If InfluxDB is unreachable
+        ConnectionError: If the client cannot be created
     """
-    try:
-        client = InfluxDBClient(
-            url=settings.INFLUXDB_URL,
-            token=settings.INFLUXDB_TOKEN,
-            org=settings.INFLUXDB_ORG,
-            timeout=settings.INFLUXDB_TIMEOUT,
-            verify_ssl=settings.INFLUXDB_VERIFY_SSL,
-            enable_gzip=settings.INFLUXDB_ENABLE_GZIP
-        )
-
-        # Test connection
-        health = client.health()
-        logger.info(f"✅ InfluxDB connected: {health.status} - {settings.INFLUXDB_URL}")
+    from infrastructure.influxdb.client import get_influxdb_client as get_shared_influxdb_client
 
-        return client
+    try:
+        return get_shared_influxdb_client().client
     except Exception as e:
         logger.error(f"❌ Failed to connect to InfluxDB: {e}")
         raise ConnectionError(f"InfluxDB connection failed: {e}")
@@ -216,7 +207,12 @@ def get_dashboard_service():
 
     if _dashboard_service_instance is None:
         from services.dashboard import DashboardService
+        from services.training_pool import get_training_pool
         _dashboard_service_instance = DashboardService()
+        # Hot reload del Prophet que publica el training worker
+        get_training_pool().register_reload_hook(
+            "prophet", _dashboard_service_instance.price_forecasting.reload_model
+        )
         logger.info("✅ Dashboard Service initialized")
 
     return _dashboard_service_instance
@@ -351,7 +347,9 @@ async def init_scheduler():
     if not scheduler.running:
         # Import and register all jobs
         from tasks.scheduler_config import register_all_jobs
+        from services.feature_store import watch_ingestion
         await register_all_jobs(scheduler)
+        watch_ingestion()
 
         # Start scheduler
         scheduler.start()
@@ -386,12 +384,34 @@ async def cleanup_dependencies():
     # Shutdown scheduler
     await shutdown_scheduler()
 
-    # Close InfluxDB client
+    # Terminate running training processes
+    try:
+        from services.training_pool import get_training_pool
+        await get_training_pool().shutdown()
+        logger.info("✅ Training worker pool stopped")
+    except Exception as e:
+        logger.error(f"❌ Error stopping training worker pool: {e}")
+
+    # Stop the cache invalidation listener (Redis pub/sub)
+    try:
+        from core.cache import get_cache_manager
+        await get_cache_manager().aclose()
+    except Exception as e:
+        logger.error(f"❌ Error closing cache manager: {e}")
+
+    # Persist coverage updates still waiting for their debounced save
+    try:
+        from infrastructure.influxdb.coverage import get_coverage_index
+        get_coverage_index().flush()
+    except Exception as e:
+        logger.error(f"❌ Error saving coverage index: {e}")
+
+    # Close shared InfluxDB clients
     try:
-        client = get_influxdb_client()
-        client.close()
-        logger.info("✅ InfluxDB client closed")
+        from infrastructure.influxdb.client import close_influxdb_clients
+        close_influxdb_clients()
+        logger.info("✅ InfluxDB clients closed")
     except Exception as e:
-        logger.error(f"❌ Error closing InfluxDB client: {e}")
+        logger.error(f"❌ Error closing InfluxDB clients: {e}")
 
     logger.info("🧹 All dependencies cleaned up")
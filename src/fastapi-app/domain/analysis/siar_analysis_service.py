@@ -24,7 +24,9 @@ import numpy as np
 from scipy import stats
 from influxdb_client import InfluxDBClient
 
+from core.cache import single_flight
 from services.data_ingestion import DataIngestionService
+from infrastructure.influxdb.frames import build_frame_query, query_frame_async
 
 logger = logging.getLogger(__name__)
 
@@ -100,57 +102,36 @@ class SIARAnalysisService:
         logger.info("📊 Extrayendo historial completo SIAR (88,935 registros, 2000-2025)")
 
         async with DataIngestionService() as service:
-            # Query temperatura (todos los datos SIAR)
+            # Temperatura + humedad en una sola query, pivotadas server-side
             # IMPORTANTE: measurement es "siar_weather" no "weather_data"
-            query_temp = '''
-                from(bucket: "siar_historical")
-                |> range(start: 2000-01-01T00:00:00Z, stop: now())
-                |> filter(fn: (r) => r._measurement == "siar_weather")
-                |> filter(fn: (r) => r._field == "temperature")
-                |> filter(fn: (r) => r.data_source == "siar_historical")
-                |> sort(columns: ["_time"])
-            '''
-
-            # Query humedad (todos los datos SIAR)
-            # IMPORTANTE: measurement es "siar_weather" no "weather_data"
-            query_humidity = '''
-                from(bucket: "siar_historical")
-                |> range(start: 2000-01-01T00:00:00Z, stop: now())
-                |> filter(fn: (r) => r._measurement == "siar_weather")
-                |> filter(fn: (r) => r._field == "humidity")
-                |> filter(fn: (r) => r.data_source == "siar_historical")
-                |> sort(columns: ["_time"])
-            '''
+            query = build_frame_query(
+                bucket="siar_historical",
+                measurement="siar_weather",
+                fields=["temperature", "humidity"],
+                start="2000-01-01T00:00:00Z",
+                stop="now()",
+                tags={"data_source": "siar_historical"},
+                keep_tags=["station_id"]
+            )
 
             try:
                 query_api = service.client.query_api()
 
-                # Extraer temperatura
-                logger.info("🌡️ Extrayendo temperatura SIAR (25 años)...")
-                temp_tables = query_api.query(query_temp)
-                temp_data = []
-                for table in temp_tables:
-                    for record in table.records:
-                        temp_data.append({
-                            'timestamp': record.get_time(),
-                            'temperature': record.get_value(),
-                            'station_id': record.values.get('station_id', 'unknown')
-                        })
-
-                # Extraer humedad
-                logger.info("💧 Extrayendo humedad SIAR (25 años)...")
-                humidity_tables = query_api.query(query_humidity)
-                humidity_data = []
-                for table in humidity_tables:
-                    for record in table.records:
-                        humidity_data.append({
-                            'timestamp': record.get_time(),
-                            'humidity': record.get_value(),
-                            'station_id': record.values.get('station_id', 'unknown')
-                        })
-
-                df_temp = pd.DataFrame(temp_data)
-                df_humidity = pd.DataFrame(humidity_data)
+                logger.info("🌡️💧 Extrayendo temperatura y humedad SIAR (25 años)...")
+                df_siar = await query_frame_async(
+                    query_api,
+                    query,
+                    value_columns=["temperature", "humidity"],
+                    tag_columns=["station_id"]
+                )
+                df_siar['station_id'] = df_siar['station_id'].fillna('unknown')
+
+                df_temp = df_siar.loc[
+                    df_siar['temperature'].notna(), ['timestamp', 'temperature', 'station_id']
+                ].reset_index(drop=True)
+                df_humidity = df_siar.loc[
+                    df_siar['humidity'].notna(), ['timestamp', 'humidity', 'station_id']
+                ].reset_index(drop=True)
 
                 logger.info(
                     f"✅ Datos SIAR extraídos: {len(df_temp)} registros temperatura, "
@@ -575,6 +556,7 @@ class SIARAnalysisService:
         else:
             return "⚠️ PRECAUCIÓN: Condiciones subóptimas. Monitorear calidad templado"
 
+    @single_flight("siar.analysis_summary", ignore_self=True)
     async def get_analysis_summary(self) -> Dict[str, Any]:
         """
         Obtiene resumen completo del análisis histórico SIAR.
@@ -4,7 +4,9 @@ Machinery domain module
 
 from .specs import (
     MACHINERY_SPECS,
+    HourlyMachineTables,
     determine_active_process,
+    get_hourly_machine_tables,
     get_machine_specs,
     calculate_process_energy,
     calculate_process_cost
@@ -12,7 +14,9 @@ from .specs import (
 
 __all__ = [
     'MACHINERY_SPECS',
+    'HourlyMachineTables',
     'determine_active_process',
+    'get_hourly_machine_tables',
     'get_machine_specs',
     'calculate_process_energy',
     'calculate_process_cost'
@@ -11,8 +11,12 @@ Real machine specifications based on:
 Source: .claude/rules/machinery_specs.md
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any
 
+import numpy as np
+
 # Machine specifications (REAL, not synthetic)
 MACHINERY_SPECS: Dict[str, Dict[str, Any]] = {
     'Conchado': {
@@ -76,6 +80,48 @@ def determine_active_process(hour: int) -> str:
         return 'Mezclado'  # Afternoon/evening mixing
 
 
+@dataclass(frozen=True)
+class HourlyMachineTables:
+    """
+    Machinery specs compiled into 24-entry arrays indexed by hour of day.
+
+    Lets feature engineering derive per-row machine columns with a NumPy
+    gather (``tables.power_kw[hours]``) instead of a per-row lookup.
+    """
+    process: np.ndarray            # object: active process name
+    power_kw: np.ndarray           # int64
+    duration_hours: np.ndarray     # float64
+    optimal_temp: np.ndarray       # float64: midpoint of optimal_temp_range
+    optimal_humidity: np.ndarray   # int64
+
+
+@lru_cache(maxsize=1)
+def get_hourly_machine_tables() -> HourlyMachineTables:
+    """
+    Compile MACHINERY_SPECS + determine_active_process() into hour lookup tables.
+
+    Values and dtypes match the row-wise lookups they replace, e.g.
+    ``np.mean(optimal_temp_range)`` and ``duration_minutes / 60``.
+
+    Returns:
+        HourlyMachineTables (cached, arrays are read-only)
+    """
+    processes = [determine_active_process(hour) for hour in range(24)]
+    specs = [MACHINERY_SPECS[p] for p in processes]
+
+    tables = HourlyMachineTables(
+        process=np.array(processes, dtype=object),
+        power_kw=np.array([s['power_kw'] for s in specs], dtype=np.int64),
+        duration_hours=np.array([s['duration_minutes'] / 60 for s in specs], dtype=np.float64),
+        optimal_temp=np.array([np.mean(s['optimal_temp_range']) for s in specs], dtype=np.float64),
+        optimal_humidity=np.array([s['optimal_humidity'] for s in specs], dtype=np.int64)
+    )
+    for array in (tables.process, tables.power_kw, tables.duration_hours,
+                  tables.optimal_temp, tables.optimal_humidity):
+        array.flags.writeable = False
+    return tables
+
+
 def get_machine_specs(process_name: str) -> Dict[str, Any]:
     """
     Get specifications for a given process.
@@ -0,0 +1,475 @@
+"""
+Walk-Forward Backtesting
+========================
+
+Backtesting rolling-origin para Prophet (precio REE) y el RandomForest de
+optimización energética (sklearn), sustituyendo a los scripts
+``validate_prophet_walkforward*.py`` / ``test_prophet_*_walkforward.py``:
+
+- Spec del modelo: regresores, changepoints, ventana de entrenamiento,
+  inercia (Prophet) o features/hiperparámetros (sklearn)
+- Folds rolling-origin: cada origen entrena con lo anterior y predice las
+  ``horizon_hours`` siguientes; los orígenes retroceden ``step_hours``
+- Un único extract de datos (feature store) compartido por todos los folds
+  y variantes; los folds se entrenan en paralelo (un proceso por núcleo)
+- MAE/RMSE/R² por horizonte (bloques de ``bucket_hours``) registrados en
+  ModelMetricsTracker como ``backtest_<spec>``
+
+Sin fugas de información: los regresores que no se conocen de antemano
+(gas) se congelan en su último valor de entrenamiento, igual que en
+producción; la inercia usa solo precios anteriores al origen. En sklearn,
+las features que dependen de precio o clima reales del periodo de test
+usan el último valor de la misma hora antes del origen (persistencia
+diaria); solo calendario y tarifa se toman del periodo de test.
+
+Uso:
+    report = await run_backtest([ProphetSpec(), ProphetSpec(name="cp40", n_changepoints=40)],
+                                folds=8, horizon_hours=168)
+    report["variants"]["cp40"]["horizons"]   # [{"horizon": "1-24h", "mae": ...}, ...]
+
+CLI: ``scripts/backtest.py``; API: ``POST /predict/models/backtest``.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from domain.ml.direct_ml import FEATURE_COLUMNS
+from domain.ml.model_metrics_tracker import ModelMetricsTracker
+
+logger = logging.getLogger(__name__)
+
+KIND_PROPHET = "prophet"
+KIND_SKLEARN = "sklearn"
+
+# Regresores cuyo valor futuro no se conoce en el origen: se congelan
+FUTURE_UNKNOWN_REGRESSORS = ("gas_gen_scaled",)
+
+# Features sklearn derivadas de precio/clima del propio periodo: en el test
+# se sustituyen por la última observación de la misma hora antes del origen
+FUTURE_UNKNOWN_FEATURES = (
+    "price_eur_kwh", "temperature", "humidity",
+    "estimated_cost_eur", "machine_thermal_efficiency", "machine_humidity_efficiency",
+)
+
+
+def _default_prophet_regressors() -> Dict[str, float]:
+    from services.price_forecasting_service import PROPHET_REGRESSORS
+    return dict(PROPHET_REGRESSORS)
+
+
+@dataclass
+class ProphetSpec:
+    """Variante Prophet a evaluar (por defecto, el modelo de producción)."""
+    name: str = "prophet"
+    regressors: Dict[str, float] = field(default_factory=_default_prophet_regressors)
+    n_changepoints: int = 25
+    changepoint_prior_scale: float = 0.08
+    seasonality_prior_scale: float = 10.0
+    seasonality_mode: str = "multiplicative"
+    training_window_days: Optional[int] = None  # None = toda la historia anterior al origen
+    inertia_hours: Optional[int] = None  # Corrección por inercia (producción: 3h)
+
+    kind = KIND_PROPHET
+
+    def build(self):
+        from services.price_forecasting_service import PROPHET_CONFIG, build_prophet_model
+        config = {
+            **PROPHET_CONFIG,
+            "n_changepoints": self.n_changepoints,
+            "changepoint_prior_scale": self.changepoint_prior_scale,
+            "seasonality_prior_scale": self.seasonality_prior_scale,
+            "seasonality_mode": self.seasonality_mode,
+            "uncertainty_samples": 0,  # Solo yhat: sin muestreo de intervalos (lento)
+        }
+        return build_prophet_model(config, regressors=self.regressors)
+
+
+@dataclass
+class SklearnSpec:
+    """Variante del RandomForest de optimización energética."""
+    name: str = "sklearn_energy"
+    features: List[str] = field(default_factory=lambda: list(FEATURE_COLUMNS))
+    target: str = "energy_optimization_score"
+    n_estimators: int = 100
+    max_depth: Optional[int] = 15
+    min_samples_split: int = 5
+    training_window_days: Optional[int] = None
+
+    kind = KIND_SKLEARN
+
+    def build(self):
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(
+            n_estimators=self.n_estimators,
+            max_depth=self.max_depth,
+            min_samples_split=self.min_samples_split,
+            random_state=42,
+            n_jobs=1  # El paralelismo está en los folds
+        )
+
+
+ModelSpec = Union[ProphetSpec, SklearnSpec]
+
+
+def spec_from_dict(kind: str, values: Dict[str, Any]) -> ModelSpec:
+    """Construir una spec desde JSON (CLI / API); claves desconocidas → ValueError."""
+    spec_class = {KIND_PROPHET: ProphetSpec, KIND_SKLEARN: SklearnSpec}.get(kind)
+    if spec_class is None:
+        raise ValueError(f"Unknown model kind '{kind}' (expected '{KIND_PROPHET}' or '{KIND_SKLEARN}')")
+    try:
+        return spec_class(**values)
+    except TypeError as e:
+        raise ValueError(f"Invalid {kind} spec: {e}") from e
+
+
+# =================================================================
+# FOLDS
+# =================================================================
+
+@dataclass(frozen=True)
+class Fold:
+    """Un origen: entrenar con lo anterior a ``origin``, predecir [origin, end)."""
+    index: int
+    origin: pd.Timestamp
+    end: pd.Timestamp
+
+
+def make_folds(
+    timestamps: Sequence,
+    folds: int = 8,
+    horizon_hours: int = 168,
+    step_hours: Optional[int] = None
+) -> List[Fold]:
+    """
+    Orígenes rolling-origin, del más antiguo al más reciente.
+
+    El último fold termina en el último dato; cada origen anterior
+    retrocede ``step_hours`` (por defecto, un horizonte: folds sin solape).
+    """
+    if folds < 1 or horizon_hours < 1:
+        raise ValueError("folds and horizon_hours must be >= 1")
+    step = pd.Timedelta(hours=step_hours or horizon_hours)
+    horizon = pd.Timedelta(hours=horizon_hours)
+    ts = pd.to_datetime(pd.Series(timestamps))
+    first, last = ts.min(), ts.max() + pd.Timedelta(hours=1)
+
+    result = []
+    for i in range(folds):
+        origin = last - horizon - step * (folds - 1 - i)
+        if origin <= first:
+            continue
+        result.append(Fold(len(result), origin, origin + horizon))
+    if not result:
+        raise ValueError(f"Not enough history for {folds} folds of {horizon_hours}h")
+    return result
+
+
+def _split(frame: pd.DataFrame, fold: Fold, training_window_days: Optional[int]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    ds = frame["ds"]
+    train_mask = ds < fold.origin
+    if training_window_days:
+        train_mask &= ds >= fold.origin - pd.Timedelta(days=training_window_days)
+    test_mask = (ds >= fold.origin) & (ds < fold.end)
+    return frame[train_mask], frame[test_mask]
+
+
+# =================================================================
+# FOLD EVALUATION (runs in worker processes)
+# =================================================================
+
+_worker_frame: Optional[pd.DataFrame] = None
+
+
+def _init_worker(frame: pd.DataFrame):
+    """Cada proceso recibe el extract una sola vez (no por fold)."""
+    global _worker_frame
+    _worker_frame = frame
+    logging.getLogger("prophet").setLevel(logging.WARNING)
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+
+def _fit_predict(spec: ModelSpec, train: pd.DataFrame, test: pd.DataFrame) -> np.ndarray:
+    if spec.kind == KIND_PROPHET:
+        columns = ["ds"] + list(spec.regressors)
+        future = test[columns].copy()
+        for name in FUTURE_UNKNOWN_REGRESSORS:
+            if name in future.columns:
+                future[name] = train[name].iloc[-1]
+        model = spec.build()
+        model.fit(train[columns + ["y"]])
+        yhat = model.predict(future)["yhat"].to_numpy()
+        if spec.inertia_hours:
+            from services.price_forecasting_service import INERTIA_BASELINE_EUR_KWH
+            yhat = yhat + (train["y"].tail(spec.inertia_hours).mean() - INERTIA_BASELINE_EUR_KWH)
+        return yhat
+
+    model = spec.build()
+    X_train = train[spec.features]
+    model.fit(X_train.fillna(X_train.mean()), train[spec.target])
+    X_test = _features_at_origin(train, test, spec.features)
+    return model.predict(X_test.fillna(X_train.mean()))
+
+
+def _features_at_origin(train: pd.DataFrame, test: pd.DataFrame, features: Sequence[str]) -> pd.DataFrame:
+    """
+    Features del test conocidas en el origen: las de FUTURE_UNKNOWN_FEATURES
+    toman el último valor de la misma hora del día anterior al origen.
+    """
+    X_test = test[list(features)].copy()
+    unknown = [name for name in features if name in FUTURE_UNKNOWN_FEATURES]
+    if unknown:
+        last_by_hour = train.groupby(train["ds"].dt.hour)[unknown].last()
+        X_test[unknown] = last_by_hour.reindex(test["ds"].dt.hour).to_numpy()
+    return X_test
+
+
+def _evaluate_fold(spec: ModelSpec, fold: Fold, frame: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Entrenar y predecir un fold; devuelve las predicciones con su horizonte."""
+    frame = _worker_frame if frame is None else frame
+    train, test = _split(frame, fold, spec.training_window_days)
+    start = time.perf_counter()
+    target = "y" if spec.kind == KIND_PROPHET else spec.target
+    if len(train) < 48 or test.empty:
+        return {"spec": spec.name, "fold": fold.index, "error": f"train={len(train)} test={len(test)} rows"}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        y_pred = _fit_predict(spec, train, test)
+
+    horizon = ((test["ds"] - fold.origin) / pd.Timedelta(hours=1)).to_numpy().astype(int) + 1
+    return {
+        "spec": spec.name,
+        "fold": fold.index,
+        "origin": fold.origin.isoformat(),
+        "train_samples": len(train),
+        "fit_seconds": round(time.perf_counter() - start, 3),
+        "horizon": horizon,
+        "y_true": test[target].to_numpy(dtype=float),
+        "y_pred": np.asarray(y_pred, dtype=float),
+    }
+
+
+# =================================================================
+# METRICS
+# =================================================================
+
+def _metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, Optional[float]]:
+    r2 = None
+    if len(y_true) > 1 and np.ptp(y_true) > 0:
+        r2 = float(r2_score(y_true, y_pred))
+    return {
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "r2": r2,
+        "samples": int(len(y_true)),
+    }
+
+
+def horizon_metrics(fold_results: List[Dict[str, Any]], bucket_hours: int = 24) -> List[Dict[str, Any]]:
+    """MAE/RMSE/R² por bloque de horizonte, juntando los puntos de todos los folds."""
+    valid = [r for r in fold_results if "error" not in r]
+    if not valid:
+        return []
+    horizon = np.concatenate([r["horizon"] for r in valid])
+    y_true = np.concatenate([r["y_true"] for r in valid])
+    y_pred = np.concatenate([r["y_pred"] for r in valid])
+
+    rows = []
+    bucket = (horizon - 1) // bucket_hours
+    for b in np.unique(bucket):
+        mask = bucket == b
+        label = f"{b * bucket_hours + 1}-{(b + 1) * bucket_hours}h"
+        rows.append({"horizon": label, **_metrics(y_true[mask], y_pred[mask])})
+    rows.append({"horizon": "all", **_metrics(y_true, y_pred)})
+    return rows
+
+
+# =================================================================
+# DATA EXTRACT (one per run, shared by every fold and variant)
+# =================================================================
+
+async def load_backtest_frame(kind: str, months_back: int = 36) -> pd.DataFrame:
+    """
+    Extract horario con columna ``ds`` (UTC naive), features y target.
+
+    Prophet: precio REE (``y``) + features de calendario + gas, igual que
+    PriceForecastingService.train_model. sklearn: datos y features de
+    DirectMLService.train_models.
+    """
+    if kind == KIND_PROPHET:
+        from services.feature_store import get_feature_store
+        from services.gas_generation_service import GasGenerationService
+        from services.price_forecasting_service import PriceForecastingService
+
+        start = pd.Timestamp.now(tz="UTC") - pd.DateOffset(months=months_back)
+        prices = await get_feature_store().load("ree", ["price_eur_kwh"], start=start)
+        if prices.empty:
+            return pd.DataFrame()
+        frame = prices.rename(columns={"timestamp": "ds", "price_eur_kwh": "y"}).dropna(subset=["y"])
+        frame["ds"] = pd.to_datetime(frame["ds"]).dt.tz_localize(None)
+        frame = PriceForecastingService._add_prophet_features(frame)
+        try:
+            gas = await GasGenerationService().get_historical(months=months_back)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load gas data for backtest: {e}")
+            gas = pd.DataFrame()
+        frame = PriceForecastingService._merge_gas_regressor(frame, gas)
+        return frame.sort_values("ds").reset_index(drop=True)
+
+    if kind == KIND_SKLEARN:
+        from domain.ml.direct_ml import DirectMLService
+
+        service = DirectMLService()
+        frame = await service.extract_data_from_influxdb(use_all_data=True)
+        if frame.empty:
+            return frame
+        frame = service.engineer_features(frame).dropna(subset=["price_eur_kwh"])
+        for column, default in (("temperature", 20.0), ("humidity", 50.0)):
+            if column not in frame.columns:
+                frame[column] = default
+        frame["ds"] = pd.to_datetime(frame["timestamp"], utc=True).dt.tz_localize(None)
+        return frame.sort_values("ds").reset_index(drop=True)
+
+    raise ValueError(f"Unknown model kind '{kind}'")
+
+
+# =================================================================
+# RUNNER
+# =================================================================
+
+def _default_workers() -> int:
+    # Respeta la afinidad de CPU (p. ej. dentro del training worker)
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+
+async def run_backtest(
+    specs: Union[ModelSpec, Sequence[ModelSpec]],
+    folds: int = 8,
+    horizon_hours: int = 168,
+    step_hours: Optional[int] = None,
+    bucket_hours: int = 24,
+    workers: Optional[int] = None,
+    months_back: int = 36,
+    frame: Optional[pd.DataFrame] = None,
+    tracker: Optional[ModelMetricsTracker] = None,
+    log_metrics: bool = True
+) -> Dict[str, Any]:
+    """
+    Backtest walk-forward de una o varias variantes del mismo tipo.
+
+    Args:
+        specs: Variante(s) a comparar (mismo tipo: todas Prophet o todas sklearn)
+        folds: Número de orígenes
+        horizon_hours: Horas predichas desde cada origen
+        step_hours: Separación entre orígenes (default: horizon_hours)
+        bucket_hours: Tamaño de los bloques de horizonte de las métricas
+        workers: Procesos en paralelo (default: núcleos disponibles; 1 = en proceso)
+        months_back: Historia a extraer si no se pasa ``frame``
+        frame: Extract ya cargado (load_backtest_frame)
+        tracker: ModelMetricsTracker donde registrar las métricas
+        log_metrics: Registrar MAE/RMSE/R² por horizonte como ``backtest_<spec>``
+
+    Returns:
+        Dict con la configuración, el extract y, por variante, métricas por
+        horizonte y por fold
+    """
+    specs = [specs] if isinstance(specs, (ProphetSpec, SklearnSpec)) else list(specs)
+    if not specs:
+        raise ValueError("At least one model spec is required")
+    kinds = {spec.kind for spec in specs}
+    if len(kinds) > 1:
+        raise ValueError("All specs of a backtest must be of the same kind")
+    if len({spec.name for spec in specs}) != len(specs):
+        raise ValueError("Spec names must be unique")
+    kind = kinds.pop()
+    run_start = time.perf_counter()
+
+    if frame is None:
+        frame = await load_backtest_frame(kind, months_back)
+    if frame.empty:
+        return {"success": False, "error": "No data available for backtesting"}
+
+    fold_plan = make_folds(frame["ds"], folds, horizon_hours, step_hours)
+    tasks = [(spec, fold) for spec in specs for fold in fold_plan]
+    workers = max(1, min(workers or _default_workers(), len(tasks)))
+    logger.info(
+        f"🧪 Backtest {kind}: {len(specs)} variant(s) × {len(fold_plan)} folds, "
+        f"{horizon_hours}h horizon, {len(frame)} rows, {workers} worker(s)"
+    )
+
+    if workers == 1:
+        _init_worker(frame)
+        fold_results = [await asyncio.to_thread(_evaluate_fold, spec, fold) for spec, fold in tasks]
+    else:
+        import multiprocessing
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(frame,)
+        ) as pool:
+            fold_results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _evaluate_fold, spec, fold) for spec, fold in tasks
+            ))
+
+    duration = time.perf_counter() - run_start
+    tracker = tracker or (ModelMetricsTracker() if log_metrics else None)
+    variants = {}
+    for spec in specs:
+        results = [r for r in fold_results if r["spec"] == spec.name]
+        horizons = horizon_metrics(results, bucket_hours)
+        variants[spec.name] = {
+            "spec": asdict(spec),
+            "horizons": horizons,
+            "folds": [
+                {key: value for key, value in r.items() if key not in ("horizon", "y_true", "y_pred", "spec")}
+                | ({} if "error" in r else _metrics(r["y_true"], r["y_pred"]))
+                for r in results
+            ],
+        }
+        if log_metrics and horizons:
+            fit_seconds = sum(r.get("fit_seconds", 0) for r in results)
+            for row in horizons:
+                tracker.log_metrics(
+                    f"backtest_{spec.name}",
+                    {**row, "duration_seconds": round(fit_seconds, 3)},
+                    notes=f"backtest {kind} horizon={row['horizon']} folds={len(fold_plan)}"
+                )
+
+    logger.info(f"✅ Backtest finished in {duration:.1f}s")
+    return {
+        "success": True,
+        "kind": kind,
+        "folds": len(fold_plan),
+        "horizon_hours": horizon_hours,
+        "step_hours": step_hours or horizon_hours,
+        "bucket_hours": bucket_hours,
+        "workers": workers,
+        "data": {
+            "rows": len(frame),
+            "start": frame["ds"].min().isoformat(),
+            "end": frame["ds"].max().isoformat(),
+        },
+        "origins": [fold.origin.isoformat() for fold in fold_plan],
+        "duration_seconds": round(duration, 3),
+        "generated_at": datetime.now().isoformat(),
+        "variants": variants,
+    }
+
+
+async def run_backtest_job(kind: str, variants: Optional[List[Dict[str, Any]]] = None, **options) -> Dict[str, Any]:
+    """Punto de entrada para el training worker (specs como dicts JSON)."""
+    specs = [spec_from_dict(kind, values) for values in (variants or [{}])]
+    return await run_backtest(specs, **options)
@@ -6,8 +6,9 @@ Implementación simplificada sin MLflow usando patrones probados de InfluxDB
 import pickle
 import logging
 import json
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
@@ -19,15 +20,57 @@ from sklearn.metrics import r2_score, accuracy_score, classification_report, mea
 from influxdb_client import InfluxDBClient
 
 from services.data_ingestion import DataIngestionService
+from services.feature_store import get_feature_store
+from domain.ml.incremental_training import (
+    MODE_FULL,
+    MODE_INCREMENTAL,
+    MODE_SKIP,
+    get_incremental_state,
+    warm_start_forest
+)
+from domain.ml.model_artifacts import (
+    COMPACT_SUFFIX,
+    get_model_registry,
+    publish_latest,
+    write_compact_artifact,
+    write_pickle_atomic
+)
+from domain.ml.model_metrics_tracker import ModelMetricsTracker
+from infrastructure.influxdb.frames import build_frame_query, query_frame_async
 from domain.machinery.specs import (
-    MACHINERY_SPECS,
-    determine_active_process,
+    get_hourly_machine_tables,
     calculate_process_energy,
     calculate_process_cost
 )
 
 logger = logging.getLogger(__name__)
 
+# Tariff periods (training targets and live predictions share these)
+TARIFF_MULTIPLIERS = {
+    'P1_Punta': 1.3,   # +30% penalty
+    'P2_Llano': 1.0,   # neutral
+    'P3_Valle': 0.8    # -20% bonus
+}
+TARIFF_PERIOD_BY_HOUR = np.array([
+    'P1_Punta' if h in [10, 11, 12, 18, 19, 20] else
+    'P2_Llano' if h in [8, 9, 14, 15, 16, 17, 22, 23] else
+    'P3_Valle'
+    for h in range(24)
+], dtype=object)
+TARIFF_MULTIPLIER_BY_HOUR = np.array([TARIFF_MULTIPLIERS[p] for p in TARIFF_PERIOD_BY_HOUR])
+VALLE_BY_HOUR = TARIFF_PERIOD_BY_HOUR == 'P3_Valle'
+
+# Features de ambos modelos (precio, calendario, clima y specs de maquinaria)
+FEATURE_COLUMNS = (
+    'price_eur_kwh', 'hour', 'day_of_week', 'temperature', 'humidity',
+    'machine_power_kw', 'machine_thermal_efficiency', 'machine_humidity_efficiency',
+    'estimated_cost_eur', 'tariff_multiplier'
+)
+
+# Clave de estado incremental y nombre en el metrics tracker
+INCREMENTAL_STATE_KEY = "direct_ml"
+ENERGY_METRICS_NAME = "sklearn_energy_optimization"
+
 class DirectMLService:
     """Servicio de ML directo sin dependencias de MLflow"""
     
@@ -48,6 +91,9 @@ class DirectMLService:
         
         # Current model info
         self.current_timestamp = None
+
+        # Training time / drift of incremental vs full refits
+        self.metrics_tracker = ModelMetricsTracker()
         
     def _generate_model_timestamp(self) -> str:
         """Generate timestamp for model versioning"""
@@ -61,14 +107,18 @@ class DirectMLService:
         versioned_path = self.models_dir / versioned_filename
         
         # Save versioned model
-        with open(versioned_path, 'wb') as f:
-            pickle.dump(model, f)
+        write_pickle_atomic(model, versioned_path)
         
-        # Create symlink in latest/ directory
-        latest_path = self.latest_dir / f"{model_type}.pkl"
-        if latest_path.exists() or latest_path.is_symlink():
-            latest_path.unlink()
-        latest_path.symlink_to(f"../{versioned_filename}")
+        # Compact (mmap) copy for serving; the pickle stays for warm-start retrains
+        compact_path = write_compact_artifact(model, versioned_path)
+        compact_latest = self.latest_dir / f"{model_type}{COMPACT_SUFFIX}"
+        if compact_path is not None:
+            publish_latest(compact_latest, f"../{compact_path.name}")
+        elif compact_latest.is_symlink():
+            compact_latest.unlink()  # Never serve a compact copy older than the pickle
+        
+        # Point latest/ symlink at it (atomic swap: the API may be reading it)
+        publish_latest(self.latest_dir / f"{model_type}.pkl", f"../{versioned_filename}")
         
         # Update registry
         self._update_model_registry(model_type, timestamp, versioned_filename, metrics)
@@ -124,61 +174,30 @@ class DirectMLService:
         """
         logger.info("📚 Extrayendo SIAR históricos (88k registros, 2000-2025)...")
 
-        async with DataIngestionService() as service:
-            siar_query = '''
-                from(bucket: "siar_historical")
-                |> range(start: 2000-01-01T00:00:00Z)
-                |> filter(fn: (r) => r._measurement == "siar_weather")
-                |> filter(fn: (r) => r._field == "temperature" or r._field == "humidity")
-            '''
-
-            try:
-                query_api = service.client.query_api()
-                tables = query_api.query(siar_query)
-
-                siar_data = []
-                for table in tables:
-                    for record in table.records:
-                        field_name = record.get_field()
-                        if 'temperatura' in field_name.lower():
-                            field_name = 'temperature'
-                        elif 'humedad' in field_name.lower():
-                            field_name = 'humidity'
-
-                        siar_data.append({
-                            'timestamp': record.get_time(),
-                            'field': field_name,
-                            'value': record.get_value()
-                        })
-
-                if not siar_data:
-                    logger.warning("⚠️ No SIAR data found")
-                    return pd.DataFrame()
-
-                siar_df = pd.DataFrame(siar_data)
-                siar_df['timestamp'] = pd.to_datetime(siar_df['timestamp'])
+        try:
+            # Feature store: solo el delta desde la última marca de agua va a InfluxDB
+            siar_pivot = await get_feature_store().load(
+                "siar", ["temperature", "humidity"], start="2000-01-01T00:00:00Z"
+            )
 
-                # Pivot to get temperature and humidity
-                siar_pivot = siar_df.pivot_table(
-                    index='timestamp',
-                    columns='field',
-                    values='value',
-                    aggfunc='mean'
-                ).reset_index()
+            if siar_pivot.empty:
+                logger.warning("⚠️ No SIAR data found")
+                return pd.DataFrame()
 
-                # Ensure column names are lowercase
-                siar_pivot.columns = siar_pivot.columns.str.lower()
+            # Una fila por timestamp (media de estaciones, ya hecha en el store)
+            siar_pivot = siar_pivot[['timestamp', 'humidity', 'temperature']]
+            siar_pivot = siar_pivot.dropna(subset=['humidity', 'temperature'], how='all')
 
-                # Add day_of_year for seasonal patterns
-                siar_pivot['day_of_year'] = siar_pivot['timestamp'].dt.dayofyear
+            # Add day_of_year for seasonal patterns
+            siar_pivot['day_of_year'] = siar_pivot['timestamp'].dt.dayofyear
 
-                logger.info(f"✅ SIAR extraído: {len(siar_pivot)} registros ({siar_pivot['timestamp'].min()} → {siar_pivot['timestamp'].max()})")
-                logger.info(f"📋 Columnas disponibles: {list(siar_pivot.columns)}")
-                return siar_pivot
+            logger.info(f"✅ SIAR extraído: {len(siar_pivot)} registros ({siar_pivot['timestamp'].min()} → {siar_pivot['timestamp'].max()})")
+            logger.info(f"📋 Columnas disponibles: {list(siar_pivot.columns)}")
+            return siar_pivot
 
-            except Exception as e:
-                logger.error(f"❌ Error extrayendo SIAR: {e}")
-                return pd.DataFrame()
+        except Exception as e:
+            logger.error(f"❌ Error extrayendo SIAR: {e}")
+            return pd.DataFrame()
 
     async def extract_ree_recent(self, days_back: int = 100) -> pd.DataFrame:
         """
@@ -192,41 +211,20 @@ class DirectMLService:
         """
         logger.info(f"⚡ Extrayendo REE reciente ({days_back} días)...")
 
-        async with DataIngestionService() as service:
-            energy_query = f'''
-                from(bucket: "{service.config.bucket}")
-                |> range(start: -{days_back}d)
-                |> filter(fn: (r) => r._measurement == "energy_prices")
-                |> filter(fn: (r) => r._field == "price_eur_kwh")
-                |> sort(columns: ["_time"])
-            '''
-
-            try:
-                query_api = service.client.query_api()
-                tables = query_api.query(energy_query)
-
-                energy_data = []
-                for table in tables:
-                    for record in table.records:
-                        energy_data.append({
-                            'timestamp': record.get_time(),
-                            'price_eur_kwh': record.get_value()
-                        })
-
-                if not energy_data:
-                    logger.warning("⚠️ No REE data found")
-                    return pd.DataFrame()
+        try:
+            start = pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=days_back)
+            ree_df = await get_feature_store().load("ree", ["price_eur_kwh"], start=start)
 
-                ree_df = pd.DataFrame(energy_data)
-                ree_df['timestamp'] = pd.to_datetime(ree_df['timestamp'])
-                ree_df = ree_df.drop_duplicates(subset=['timestamp']).sort_values('timestamp')
+            if ree_df.empty:
+                logger.warning("⚠️ No REE data found")
+                return pd.DataFrame()
 
-                logger.info(f"✅ REE extraído: {len(ree_df)} registros ({ree_df['timestamp'].min()} → {ree_df['timestamp'].max()})")
-                return ree_df
+            logger.info(f"✅ REE extraído: {len(ree_df)} registros ({ree_df['timestamp'].min()} → {ree_df['timestamp'].max()})")
+            return ree_df
 
-            except Exception as e:
-                logger.error(f"❌ Error extrayendo REE: {e}")
-                return pd.DataFrame()
+        except Exception as e:
+            logger.error(f"❌ Error extrayendo REE: {e}")
+            return pd.DataFrame()
 
     async def extract_data_from_influxdb(self, hours_back: int = 2160, use_all_data: bool = False) -> pd.DataFrame:
         """
@@ -247,149 +245,85 @@ class DirectMLService:
         """
         async with DataIngestionService() as service:
             # Usar rango expandido para training o rango limitado para testing
+            # Límites en filas totales (timestamp × estación), no por serie
             if use_all_data:
-                time_range = "start: 0"  # Todos los datos disponibles
+                range_start = "0"  # Todos los datos disponibles
                 energy_limit = 50000  # REE: 42k+ registros disponibles
                 weather_limit = 100000  # SIAR + Weather: 88k+ registros
                 logger.info("🔥 MAXIMIZED mode: Usando TODOS los datos históricos (REE + SIAR)")
             else:
-                time_range = f"start: -{hours_back}h"
+                range_start = f"-{hours_back}h"
                 energy_limit = 200
-                weather_limit = 400
+                weather_limit = 400  # ~200h de las dos fuentes de clima (AEMET + OpenWeatherMap)
 
             # Query REE data - RANGO EXPANDIDO para acceder datos históricos
-            energy_query = f'''
-                from(bucket: "{service.config.bucket}")
-                |> range({time_range})
-                |> filter(fn: (r) => r._measurement == "energy_prices")
-                |> filter(fn: (r) => r._field == "price_eur_kwh")
-                |> sort(columns: ["_time"], desc: true)
-                |> limit(n: {energy_limit})
-            '''
+            energy_query = build_frame_query(
+                bucket=service.config.bucket,
+                measurement="energy_prices",
+                fields=["price_eur_kwh"],
+                start=range_start,
+                descending=True,
+                limit=energy_limit
+            )
 
             # Query Weather data - RANGO EXPANDIDO para acceder datos históricos
-            weather_query = f'''
-                from(bucket: "{service.config.bucket}")
-                |> range({time_range})
-                |> filter(fn: (r) => r._measurement == "weather_data")
-                |> filter(fn: (r) => r._field == "temperature" or r._field == "humidity")
-                |> sort(columns: ["_time"], desc: true)
-                |> limit(n: {weather_limit})
-            '''
+            weather_query = build_frame_query(
+                bucket=service.config.bucket,
+                measurement="weather_data",
+                fields=["temperature", "humidity"],
+                start=range_start,
+                descending=True,
+                limit=weather_limit
+            )
 
             # Query SIAR historical data (25 años si use_all_data)
             siar_query = None
             if use_all_data:
-                siar_query = f'''
-                    from(bucket: "siar_historical")
-                    |> range(start: 2000-01-01T00:00:00Z)
-                    |> filter(fn: (r) => r._measurement == "siar_weather")
-                    |> filter(fn: (r) => r._field == "temperatura_media" or r._field == "humedad_relativa_media")
-                    |> limit(n: 100000)
-                '''
-            
+                siar_query = build_frame_query(
+                    bucket="siar_historical",
+                    measurement="siar_weather",
+                    fields=["temperatura_media", "humedad_relativa_media"],
+                    start="2000-01-01T00:00:00Z",
+                    sort=False,
+                    limit=100000
+                )
+
             try:
                 # Execute queries usando el mismo cliente que funciona
                 query_api = service.client.query_api()
-                energy_tables = query_api.query(energy_query)
-                weather_tables = query_api.query(weather_query)
-
-                # Process energy data
-                energy_data = []
-                for table in energy_tables:
-                    for record in table.records:
-                        energy_data.append({
-                            'timestamp': record.get_time(),
-                            'price_eur_kwh': record.get_value()
-                        })
-
-                # Process weather data (current + SIAR historical)
-                weather_data = []
-                for table in weather_tables:
-                    for record in table.records:
-                        weather_data.append({
-                            'timestamp': record.get_time(),
-                            'field': record.get_field(),
-                            'value': record.get_value()
-                        })
-
-                # Process SIAR historical data if available
+                energy_df = await query_frame_async(query_api, energy_query, value_columns=["price_eur_kwh"])
+                weather_frames = [
+                    await query_frame_async(query_api, weather_query, value_columns=["temperature", "humidity"])
+                ]
+
+                # Process SIAR historical data if available (map SIAR field names to standard names)
                 if siar_query:
                     try:
-                        siar_tables = query_api.query(siar_query)
-                        for table in siar_tables:
-                            for record in table.records:
-                                # Map SIAR field names to standard names
-                                field_name = record.get_field()
-                                if 'temperatura' in field_name.lower():
-                                    field_name = 'temperature'
-                                elif 'humedad' in field_name.lower():
-                                    field_name = 'humidity'
-
-                                weather_data.append({
-                                    'timestamp': record.get_time(),
-                                    'field': field_name,
-                                    'value': record.get_value()
-                                })
-                        logger.info(f"✅ SIAR historical data integrated ({len(siar_tables)} tables)")
+                        siar_df = await query_frame_async(
+                            query_api,
+                            siar_query,
+                            value_columns=["temperatura_media", "humedad_relativa_media"],
+                            rename={"temperatura_media": "temperature", "humedad_relativa_media": "humidity"}
+                        )
+                        weather_frames.append(siar_df)
+                        logger.info(f"✅ SIAR historical data integrated ({len(siar_df)} rows)")
                     except Exception as e:
                         logger.warning(f"⚠️ SIAR query failed (non-critical): {e}")
 
-                logger.info(f"Extracted {len(energy_data)} energy records, {len(weather_data)} weather records")
-                
-                # Convert to DataFrames
-                energy_df = pd.DataFrame(energy_data)
-                weather_df = pd.DataFrame(weather_data)
-                
+                weather_frames = [f for f in weather_frames if not f.empty]
+                weather_df = pd.concat(weather_frames, ignore_index=True) if weather_frames else pd.DataFrame()
+
+                logger.info(f"Extracted {len(energy_df)} energy records, {len(weather_df)} weather records")
+
                 if energy_df.empty or weather_df.empty:
                     logger.error("No data extracted from InfluxDB")
                     return pd.DataFrame()
-                
-                # OPCIÓN 2: RESAMPLE weather to hourly granularity
-                # Convert weather timestamp to datetime
-                weather_df['timestamp'] = pd.to_datetime(weather_df['timestamp'])
-
-                # Extract hour and round to hourly level
-                weather_df['hour'] = weather_df['timestamp'].dt.floor('H')
-
-                # Aggregate weather by hour (mean, max, min)
-                weather_hourly = weather_df.groupby('hour').agg({
-                    'field': 'first',  # Keep field name
-                    'value': ['mean', 'max', 'min']
-                }).reset_index()
-
-                # Flatten and rename columns for better readability
-                weather_hourly.columns = ['_'.join(col).strip('_') if col[1] else col[0]
-                                         for col in weather_hourly.columns.values]
-
-                # Pivot to get temperature and humidity stats
-                weather_pivoted = []
-                for field in ['temperature', 'humidity']:
-                    field_data = weather_df[weather_df['field'] == field].copy()
-                    if not field_data.empty:
-                        field_hourly = field_data.groupby('hour').agg({
-                            'value': ['mean', 'max', 'min']
-                        }).reset_index()
-                        field_hourly.columns = ['timestamp', f'{field}_mean', f'{field}_max', f'{field}_min']
-                        weather_pivoted.append(field_hourly)
-
-                # Merge all weather fields
-                if weather_pivoted:
-                    weather_hourly = weather_pivoted[0]
-                    for wf in weather_pivoted[1:]:
-                        weather_hourly = pd.merge(weather_hourly, wf, on='timestamp', how='outer')
-                else:
-                    # Fallback to original pivot if no data
-                    weather_hourly = weather_df.pivot_table(
-                        index='timestamp',
-                        columns='field',
-                        values='value',
-                        aggfunc='mean'
-                    ).reset_index()
-                    weather_hourly.rename(columns={'timestamp': 'timestamp'}, inplace=True)
-
-                # Convert energy timestamp to datetime for merge
-                energy_df['timestamp'] = pd.to_datetime(energy_df['timestamp'])
+
+                # OPCIÓN 2: RESAMPLE weather to hourly granularity (mean, max, min per field)
+                weather_df['timestamp'] = weather_df['timestamp'].dt.floor('h')
+                weather_hourly = weather_df.groupby('timestamp')[['temperature', 'humidity']].agg(['mean', 'max', 'min'])
+                weather_hourly.columns = [f'{field}_{stat}' for field, stat in weather_hourly.columns]
+                weather_hourly = weather_hourly.dropna(axis=1, how='all').reset_index()
 
                 # Merge datasets on timestamp (now both are at hourly granularity)
                 df = pd.merge(energy_df, weather_hourly, on='timestamp', how='inner')
@@ -397,7 +331,7 @@ class DirectMLService:
                 # Fill any remaining NaN with forward/backward fill
                 for col in df.columns:
                     if df[col].dtype in ['float64', 'float32']:
-                        df[col] = df[col].fillna(method='ffill').fillna(method='bfill')
+                        df[col] = df[col].ffill().bfill()
 
                 # Rename weather columns to match expected names
                 if 'temperature_mean' in df.columns:
@@ -407,11 +341,11 @@ class DirectMLService:
 
                 logger.info(f"Final merged dataset: {len(df)} records (resampled from {len(weather_df)} weather records)")
                 return df
-                
+
             except Exception as e:
                 logger.error(f"Error extracting data: {e}")
                 return pd.DataFrame()
-    
+
     def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Feature engineering simplificado
@@ -425,19 +359,14 @@ class DirectMLService:
             df['day_of_week'] = pd.to_datetime(df['timestamp']).dt.dayofweek
 
             # Machine-specific features based on REAL machinery specifications
-            df['active_process'] = df['hour'].apply(determine_active_process)
-            df['machine_power_kw'] = df['active_process'].apply(
-                lambda p: MACHINERY_SPECS[p]['power_kw']
-            )
-            df['machine_duration_hours'] = df['active_process'].apply(
-                lambda p: MACHINERY_SPECS[p]['duration_minutes'] / 60
-            )
-            df['machine_optimal_temp'] = df['active_process'].apply(
-                lambda p: np.mean(MACHINERY_SPECS[p]['optimal_temp_range'])
-            )
-            df['machine_optimal_humidity'] = df['active_process'].apply(
-                lambda p: MACHINERY_SPECS[p]['optimal_humidity']
-            )
+            # (hour-indexed lookup tables compiled from domain/machinery/specs.py)
+            hours = df['hour'].to_numpy()
+            tables = get_hourly_machine_tables()
+            df['active_process'] = tables.process[hours]
+            df['machine_power_kw'] = tables.power_kw[hours]
+            df['machine_duration_hours'] = tables.duration_hours[hours]
+            df['machine_optimal_temp'] = tables.optimal_temp[hours]
+            df['machine_optimal_humidity'] = tables.optimal_humidity[hours]
 
             # Calculate deviations and efficiencies
             df['temp_machine_deviation'] = np.abs(
@@ -462,17 +391,8 @@ class DirectMLService:
             )
 
             # Tariff adjustments
-            df['tariff_period'] = df['hour'].apply(lambda h:
-                'P1_Punta' if h in [10, 11, 12, 18, 19, 20] else
-                'P2_Llano' if h in [8, 9, 14, 15, 16, 17, 22, 23] else
-                'P3_Valle'
-            )
-            tariff_multipliers = {
-                'P1_Punta': 1.3,   # +30% penalty
-                'P2_Llano': 1.0,   # neutral
-                'P3_Valle': 0.8    # -20% bonus
-            }
-            df['tariff_multiplier'] = df['tariff_period'].map(tariff_multipliers)
+            df['tariff_period'] = TARIFF_PERIOD_BY_HOUR[hours]
+            df['tariff_multiplier'] = TARIFF_MULTIPLIER_BY_HOUR[hours]
             df['cost_with_tariff'] = df['estimated_cost_eur'] * df['tariff_multiplier']
 
             # Price normalization for scoring
@@ -496,10 +416,10 @@ class DirectMLService:
             )
 
             # Adjust for extreme tariff periods
-            df['production_suitability'] = df.apply(
-                lambda row: row['production_suitability'] * row['tariff_multiplier']
-                if row['tariff_period'] == 'P3_Valle' else row['production_suitability'],
-                axis=1
+            df['production_suitability'] = np.where(
+                VALLE_BY_HOUR[hours],
+                df['production_suitability'] * df['tariff_multiplier'],
+                df['production_suitability']
             )
 
             # Classification based on production suitability thresholds
@@ -617,11 +537,7 @@ class DirectMLService:
             logger.info("STEP 5: Prepare features for classification")
             logger.info("="*60)
 
-            feature_columns = [
-                'price_eur_kwh', 'hour', 'day_of_week', 'temperature', 'humidity',
-                'machine_power_kw', 'machine_thermal_efficiency', 'machine_humidity_efficiency',
-                'estimated_cost_eur', 'tariff_multiplier'
-            ]
+            feature_columns = list(FEATURE_COLUMNS)
 
             X = merged_df[feature_columns].copy()
             X = X.fillna(X.mean())
@@ -774,11 +690,18 @@ class DirectMLService:
             logger.error(f"❌ Error in training: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
-    async def train_models(self) -> Dict[str, Any]:
+    async def train_models(self, incremental: bool = False) -> Dict[str, Any]:
         """
         Entrena ambos modelos directamente
+
+        Args:
+            incremental: Modo de los jobs programados. Sin datos nuevos
+                suficientes no se reentrena; si los hay, se añaden árboles
+                (warm start) a los modelos actuales con la ventana reciente.
+                Periódicamente (o si no es posible) se hace un refit completo.
         """
-        logger.info("Starting direct ML training...")
+        logger.info(f"Starting direct ML training{' (incremental)' if incremental else ''}...")
+        training_start = time.perf_counter()
 
         # Extract data using expanded range to access historical data
         df = await self.extract_data_from_influxdb(use_all_data=True)  # All available data
@@ -795,11 +718,7 @@ class DirectMLService:
             return {"success": False, "error": "Feature engineering failed"}
         
         # Prepare features - EXPANDED with machinery specs (10 features)
-        feature_columns = [
-            'price_eur_kwh', 'hour', 'day_of_week', 'temperature', 'humidity',
-            'machine_power_kw', 'machine_thermal_efficiency', 'machine_humidity_efficiency',
-            'estimated_cost_eur', 'tariff_multiplier'
-        ]
+        feature_columns = list(FEATURE_COLUMNS)
 
         # Clean data: remove rows with NaN in critical columns and fill remaining
         df_clean = df.dropna(subset=['price_eur_kwh']).copy()
@@ -813,6 +732,35 @@ class DirectMLService:
             df_clean['humidity'] = 50.0  # Default comfortable humidity
 
         X = df_clean[feature_columns].fillna(df_clean[feature_columns].mean())
+
+        state = get_incremental_state()
+        if incremental:
+            if not all(hasattr(m, "estimators_") for m in (self.energy_model, self.production_model)):
+                self.load_models(for_training=True)  # Not the compact serving copies
+            plan = state.plan(
+                INCREMENTAL_STATE_KEY, df_clean['timestamp'],
+                model_available=self.energy_model is not None and self.production_model is not None
+            )
+            logger.info(f"🧭 Training plan: {plan.mode} ({plan.reason})")
+
+            if plan.mode == MODE_SKIP:
+                return {
+                    "success": True,
+                    "skipped": True,
+                    "training_mode": MODE_SKIP,
+                    "reason": plan.reason,
+                    "new_samples": plan.new_samples,
+                    "timestamp": datetime.now().isoformat()
+                }
+            if plan.mode == MODE_INCREMENTAL:
+                try:
+                    results = self._train_incremental(df_clean, X, feature_columns, plan, training_start)
+                except Exception as e:
+                    logger.warning(f"⚠️ Incremental update failed ({e})")
+                    results = None
+                if results is not None:
+                    return results
+                logger.info("🔁 Incremental update not possible, falling back to full refit")
         
         results = {}
         
@@ -1020,34 +968,152 @@ class DirectMLService:
                     logger.info(f"✅ Production model trained and validated (saved as {timestamp})")
             
             results['success'] = True
+            results['training_mode'] = MODE_FULL
             results['total_samples'] = len(df)
             results['features_used'] = feature_columns
             results['timestamp'] = datetime.now().isoformat()
+
+            # Referencia para la deriva de los reentrenamientos incrementales
+            if 'energy_model' in results and 'production_model' in results:
+                state.record(INCREMENTAL_STATE_KEY, MODE_FULL, df_clean['timestamp'].max())
+                self._log_training_run(results, MODE_FULL, time.perf_counter() - training_start)
             
             return results
             
         except Exception as e:
             logger.error(f"Error training models: {e}")
             return {"success": False, "error": str(e)}
+
+    def _train_incremental(
+        self,
+        df_clean: pd.DataFrame,
+        X: pd.DataFrame,
+        feature_columns: List[str],
+        plan,
+        training_start: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Warm start de ambos RandomForest con la ventana reciente.
+
+        Returns:
+            Resultados, o None si hace falta un refit completo
+        """
+        window = get_incremental_state().recent_window(plan, df_clean['timestamp'])
+        X_window = X[window]
+        if len(X_window) < 10:
+            return None
+
+        y_energy = df_clean['energy_optimization_score'].fillna(df_clean['energy_optimization_score'].mean())[window]
+        X_train, X_test, y_train, y_test = train_test_split(X_window, y_energy, test_size=0.2, random_state=42)
+        if not warm_start_forest(self.energy_model, X_train, y_train):
+            return None
+
+        production_data = df_clean[window].dropna(subset=['production_class'])
+        X_prod = X[window].loc[production_data.index]
+        y_production = production_data['production_class']
+        if len(y_production) < 10:
+            return None
+        Xp_train, Xp_test, yp_train, yp_test = train_test_split(X_prod, y_production, test_size=0.2, random_state=42)
+        if not warm_start_forest(self.production_model, Xp_train, yp_train):
+            return None
+
+        y_pred = self.energy_model.predict(X_test)
+        accuracy = accuracy_score(yp_test, self.production_model.predict(Xp_test))
+        timestamp = self._generate_model_timestamp()
+        self.current_timestamp = timestamp
+
+        energy_metrics = {
+            'r2_test': float(r2_score(y_test, y_pred)),
+            'mae_test': float(mean_absolute_error(y_test, y_pred)),
+            'rmse_test': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+            'training_samples': len(X_train),
+            'test_samples': len(X_test),
+            'n_estimators': self.energy_model.n_estimators,
+            'training_mode': MODE_INCREMENTAL
+        }
+        production_metrics = {
+            'accuracy_test': float(accuracy),
+            'training_samples': len(Xp_train),
+            'test_samples': len(Xp_test),
+            'classes': list(self.production_model.classes_),
+            'n_estimators': self.production_model.n_estimators,
+            'training_mode': MODE_INCREMENTAL
+        }
+        results = {
+            'energy_model': {
+                **energy_metrics,
+                'saved': True,
+                'model_path': self._save_model_with_version(self.energy_model, 'energy_optimization', timestamp, energy_metrics),
+                'timestamp': timestamp
+            },
+            'production_model': {
+                **production_metrics,
+                'saved': True,
+                'model_path': self._save_model_with_version(self.production_model, 'production_classifier', timestamp, production_metrics),
+                'timestamp': timestamp
+            },
+            'success': True,
+            'training_mode': MODE_INCREMENTAL,
+            'new_samples': plan.new_samples,
+            'total_samples': int(window.sum()),
+            'features_used': feature_columns,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        get_incremental_state().record(INCREMENTAL_STATE_KEY, MODE_INCREMENTAL, df_clean['timestamp'].max())
+        results['drift_vs_full_refit'] = self._log_training_run(results, MODE_INCREMENTAL, time.perf_counter() - training_start)
+
+        logger.info(
+            f"🌲 Incremental update: {energy_metrics['n_estimators']} trees, "
+            f"{plan.new_samples} new samples, R² {energy_metrics['r2_test']:.4f}, accuracy {accuracy:.4f}"
+        )
+        return results
+
+    def _log_training_run(self, results: Dict[str, Any], mode: str, duration: float) -> Dict[str, float]:
+        """Métricas del modelo de energía (y accuracy del clasificador) al tracker."""
+        energy = results['energy_model']
+        return self.metrics_tracker.log_training_run(
+            ENERGY_METRICS_NAME,
+            {
+                "mae": energy.get('mae_test'),
+                "rmse": energy.get('rmse_test'),
+                "r2": energy.get('r2_test'),
+                "samples": energy.get('training_samples'),
+                "duration_seconds": round(duration, 3)
+            },
+            mode=mode,
+            notes=f"production_accuracy={results['production_model'].get('accuracy_test', 0):.4f}"
+        )
     
-    def load_models(self) -> bool:
+    def load_models(self, for_training: bool = False) -> bool:
         """
         Carga modelos más recientes desde disco (versionado)
+
+        Para servir se usa la copia compacta memory-mapped (``*.forest.joblib``)
+        del registro de modelos compartido: todas las instancias del proceso
+        reutilizan el mismo objeto. ``for_training`` carga los estimadores
+        sklearn completos y privados (warm start los modifica).
         """
         try:
-            # Try to load from latest/ directory (symlinks to current models)
-            energy_latest = self.latest_dir / "energy_optimization.pkl"
-            production_latest = self.latest_dir / "production_classifier.pkl"
-            
-            if energy_latest.exists():
-                with open(energy_latest, 'rb') as f:
-                    self.energy_model = pickle.load(f)
-                logger.info("Energy model loaded (latest version)")
-            
-            if production_latest.exists():
-                with open(production_latest, 'rb') as f:
-                    self.production_model = pickle.load(f)
-                logger.info("Production model loaded (latest version)")
+            registry = get_model_registry()
+            for attribute, model_type in (
+                ("energy_model", "energy_optimization"),
+                ("production_model", "production_classifier")
+            ):
+                pickle_latest = self.latest_dir / f"{model_type}.pkl"
+                compact_latest = self.latest_dir / f"{model_type}{COMPACT_SUFFIX}"
+
+                if for_training:
+                    if pickle_latest.exists():
+                        with open(pickle_latest, 'rb') as f:
+                            setattr(self, attribute, pickle.load(f))
+                elif compact_latest.exists():
+                    setattr(self, attribute, registry.get(compact_latest))
+                elif pickle_latest.exists():
+                    setattr(self, attribute, registry.get(pickle_latest))
+                else:
+                    continue
+                logger.info(f"{model_type} model loaded (latest version)")
             
             return True
             
@@ -1068,9 +1134,75 @@ class DirectMLService:
             logger.error(f"Error loading model registry: {e}")
             return {}
     
-    def predict_energy_optimization(self, price_eur_kwh: float, temperature: float = 20, humidity: float = 50) -> Dict[str, Any]:
+    def build_feature_matrix(
+        self,
+        timestamps: Sequence[Any],
+        prices: Sequence[float],
+        temperatures: Sequence[float],
+        humidities: Sequence[float]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Construye la matriz de features (n, 10) para predicción, vectorizada.
+
+        Mismas columnas y orden que en entrenamiento; machinery y tarifa
+        salen de las tablas horarias compiladas.
+
+        Args:
+            timestamps: Datetimes (o ISO strings) de cada fila
+            prices: Precios €/kWh
+            temperatures: Temperaturas °C
+            humidities: Humedades %
+
+        Returns:
+            (features, hours) - matriz float64 y hora de cada fila
+
+        Raises:
+            ValueError: Si las longitudes no coinciden
+        """
+        n = len(timestamps)
+        if not (len(prices) == len(temperatures) == len(humidities) == n):
+            raise ValueError("timestamps, prices, temperatures and humidities must have the same length")
+
+        index = pd.DatetimeIndex(pd.to_datetime(list(timestamps)))
+        hours = index.hour.to_numpy()
+        price = np.asarray(prices, dtype=np.float64)
+        temperature = np.asarray(temperatures, dtype=np.float64)
+        humidity = np.asarray(humidities, dtype=np.float64)
+
+        tables = get_hourly_machine_tables()
+        machine_power_kw = tables.power_kw[hours]
+        machine_thermal_efficiency = np.maximum(0, 100 - np.abs(temperature - tables.optimal_temp[hours]) * 5)
+        machine_humidity_efficiency = np.maximum(0, 100 - np.abs(humidity - tables.optimal_humidity[hours]) * 2)
+        estimated_cost_eur = machine_power_kw * tables.duration_hours[hours] * price
+
+        # Prepare features - match training features (10 features with machinery specs)
+        features = np.column_stack([
+            price,
+            hours,
+            index.dayofweek.to_numpy(),
+            temperature,
+            humidity,
+            machine_power_kw,
+            machine_thermal_efficiency,
+            machine_humidity_efficiency,
+            estimated_cost_eur,
+            TARIFF_MULTIPLIER_BY_HOUR[hours]
+        ]).astype(np.float64)
+
+        return features, hours
+
+    def predict_energy_optimization_batch(
+        self,
+        timestamps: Sequence[Any],
+        prices: Sequence[float],
+        temperatures: Sequence[float],
+        humidities: Sequence[float]
+    ) -> Dict[str, Any]:
         """
-        Predicción de optimización energética
+        Predicción de optimización energética para N filas en un solo model.predict
+
+        Returns:
+            Dict columnar (una lista por campo, mismo orden que la entrada)
         """
         if not self.energy_model:
             self.load_models()
@@ -1079,66 +1211,40 @@ class DirectMLService:
             return {"error": "Energy model not available"}
 
         try:
-            # Calculate machinery features based on current hour
-            now = datetime.now()
-            active_process = determine_active_process(now.hour)
-            machine_specs = MACHINERY_SPECS[active_process]
-
-            machine_power_kw = machine_specs['power_kw']
-            machine_duration_hours = machine_specs['duration_minutes'] / 60
-            machine_optimal_temp = np.mean(machine_specs['optimal_temp_range'])
-            machine_optimal_humidity = machine_specs['optimal_humidity']
-
-            # Calculate efficiencies
-            temp_deviation = abs(temperature - machine_optimal_temp)
-            humidity_deviation = abs(humidity - machine_optimal_humidity)
-            machine_thermal_efficiency = max(0, 100 - temp_deviation * 5)
-            machine_humidity_efficiency = max(0, 100 - humidity_deviation * 2)
-
-            # Calculate cost
-            estimated_energy_kwh = machine_power_kw * machine_duration_hours
-            estimated_cost_eur = estimated_energy_kwh * price_eur_kwh
-
-            # Tariff multiplier
-            if now.hour in [10, 11, 12, 18, 19, 20]:
-                tariff_multiplier = 1.3  # P1_Punta
-            elif now.hour in [8, 9, 14, 15, 16, 17, 22, 23]:
-                tariff_multiplier = 1.0  # P2_Llano
-            else:
-                tariff_multiplier = 0.8  # P3_Valle
-
-            # Prepare features - match training features (10 features with machinery specs)
-            features = np.array([[
-                price_eur_kwh,
-                now.hour,
-                now.weekday(),
-                temperature,
-                humidity,
-                machine_power_kw,
-                machine_thermal_efficiency,
-                machine_humidity_efficiency,
-                estimated_cost_eur,
-                tariff_multiplier
-            ]])
-
-            # Get prediction from model
-            prediction = self.energy_model.predict(features)[0]
+            features, hours = self.build_feature_matrix(timestamps, prices, temperatures, humidities)
+            predictions = self.energy_model.predict(features) if len(features) else np.empty(0)
+
+            recommendations = np.select(
+                [predictions > 70, predictions > 40], ["Optimal", "Moderate"], default="Reduced"
+            )
 
             return {
-                "energy_optimization_score": round(prediction, 2),
-                "recommendation": "Optimal" if prediction > 70 else "Moderate" if prediction > 40 else "Reduced",
-                "timestamp": now.isoformat(),
-                "active_process": active_process,
-                "machine_thermal_efficiency": round(machine_thermal_efficiency, 2)
+                "count": len(features),
+                "timestamp": [ts.isoformat() for ts in pd.to_datetime(list(timestamps))],
+                "energy_optimization_score": np.round(predictions, 2).tolist(),
+                "recommendation": recommendations.tolist(),
+                "active_process": get_hourly_machine_tables().process[hours].tolist(),
+                "machine_thermal_efficiency": np.round(features[:, 6], 2).tolist()
             }
-            
+
         except Exception as e:
-            logger.error(f"Error in energy prediction: {e}")
+            logger.error(f"Error in batch energy prediction: {e}")
             return {"error": str(e)}
-    
-    def predict_production_recommendation(self, price_eur_kwh: float, temperature: float = 20, humidity: float = 50) -> Dict[str, Any]:
+
+    def predict_production_recommendation_batch(
+        self,
+        timestamps: Sequence[Any],
+        prices: Sequence[float],
+        temperatures: Sequence[float],
+        humidities: Sequence[float]
+    ) -> Dict[str, Any]:
         """
-        Predicción de recomendación de producción
+        Predicción de recomendación de producción para N filas en un solo predict_proba
+
+        La clase es la de mayor probabilidad (equivalente a model.predict).
+
+        Returns:
+            Dict columnar; probabilities es {clase: [p_0, ..., p_n]}
         """
         if not self.production_model:
             self.load_models()
@@ -1147,68 +1253,85 @@ class DirectMLService:
             return {"error": "Production model not available"}
 
         try:
-            # Calculate machinery features based on current hour
-            now = datetime.now()
-            active_process = determine_active_process(now.hour)
-            machine_specs = MACHINERY_SPECS[active_process]
-
-            machine_power_kw = machine_specs['power_kw']
-            machine_duration_hours = machine_specs['duration_minutes'] / 60
-            machine_optimal_temp = np.mean(machine_specs['optimal_temp_range'])
-            machine_optimal_humidity = machine_specs['optimal_humidity']
-
-            # Calculate efficiencies
-            temp_deviation = abs(temperature - machine_optimal_temp)
-            humidity_deviation = abs(humidity - machine_optimal_humidity)
-            machine_thermal_efficiency = max(0, 100 - temp_deviation * 5)
-            machine_humidity_efficiency = max(0, 100 - humidity_deviation * 2)
-
-            # Calculate cost
-            estimated_energy_kwh = machine_power_kw * machine_duration_hours
-            estimated_cost_eur = estimated_energy_kwh * price_eur_kwh
-
-            # Tariff multiplier
-            if now.hour in [10, 11, 12, 18, 19, 20]:
-                tariff_multiplier = 1.3  # P1_Punta
-            elif now.hour in [8, 9, 14, 15, 16, 17, 22, 23]:
-                tariff_multiplier = 1.0  # P2_Llano
-            else:
-                tariff_multiplier = 0.8  # P3_Valle
-
-            # Prepare features - match training features (10 features with machinery specs)
-            features = np.array([[
-                price_eur_kwh,
-                now.hour,
-                now.weekday(),
-                temperature,
-                humidity,
-                machine_power_kw,
-                machine_thermal_efficiency,
-                machine_humidity_efficiency,
-                estimated_cost_eur,
-                tariff_multiplier
-            ]])
-
-            prediction = self.production_model.predict(features)[0]
-            probabilities = self.production_model.predict_proba(features)[0]
-
-            # Get class probabilities
+            features, hours = self.build_feature_matrix(timestamps, prices, temperatures, humidities)
             classes = self.production_model.classes_
-            prob_dict = {classes[i]: round(prob, 3) for i, prob in enumerate(probabilities)}
+            probabilities = (
+                self.production_model.predict_proba(features) if len(features)
+                else np.empty((0, len(classes)))
+            )
+            predictions = classes.take(np.argmax(probabilities, axis=1)) if len(features) else np.empty(0)
 
             return {
-                "production_recommendation": prediction,
-                "confidence": round(max(probabilities), 3),
-                "probabilities": prob_dict,
-                "timestamp": now.isoformat(),
-                "active_process": active_process,
-                "machine_thermal_efficiency": round(machine_thermal_efficiency, 2)
+                "count": len(features),
+                "timestamp": [ts.isoformat() for ts in pd.to_datetime(list(timestamps))],
+                "production_recommendation": predictions.tolist(),
+                "confidence": np.round(probabilities.max(axis=1, initial=0), 3).tolist(),
+                "probabilities": {
+                    cls: np.round(probabilities[:, i], 3).tolist() for i, cls in enumerate(classes)
+                },
+                "active_process": get_hourly_machine_tables().process[hours].tolist(),
+                "machine_thermal_efficiency": np.round(features[:, 6], 2).tolist()
             }
-            
+
         except Exception as e:
-            logger.error(f"Error in production prediction: {e}")
+            logger.error(f"Error in batch production prediction: {e}")
             return {"error": str(e)}
-    
+
+    @staticmethod
+    def _first_row(batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Fila 0 de un resultado batch columnar."""
+        row = {}
+        for key, value in batch.items():
+            if key == "count":
+                continue
+            if isinstance(value, dict):
+                row[key] = {k: v[0] for k, v in value.items()}
+            else:
+                row[key] = value[0]
+        return row
+
+    def predict_energy_optimization(
+        self,
+        price_eur_kwh: float,
+        temperature: float = 20,
+        humidity: float = 50,
+        timestamp: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Predicción de optimización energética (una fila, hora actual por defecto)
+        """
+        batch = self.predict_energy_optimization_batch(
+            [timestamp or datetime.now()], [price_eur_kwh], [temperature], [humidity]
+        )
+        if "error" in batch:
+            return batch
+        return self._first_row(batch)
+
+    def predict_production_recommendation(
+        self,
+        price_eur_kwh: float,
+        temperature: float = 20,
+        humidity: float = 50,
+        timestamp: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Predicción de recomendación de producción (una fila, hora actual por defecto)
+        """
+        batch = self.predict_production_recommendation_batch(
+            [timestamp or datetime.now()], [price_eur_kwh], [temperature], [humidity]
+        )
+        if "error" in batch:
+            return batch
+        row = self._first_row(batch)
+        return {
+            "production_recommendation": row["production_recommendation"],
+            "confidence": row["confidence"],
+            "probabilities": row["probabilities"],
+            "timestamp": row["timestamp"],
+            "active_process": row["active_process"],
+            "machine_thermal_efficiency": row["machine_thermal_efficiency"]
+        }
+
     def get_models_status(self) -> Dict[str, Any]:
         """
         Estado de los modelos con información de versionado
@@ -1228,6 +1351,7 @@ class DirectMLService:
         return {
             "energy_model": {
                 "loaded": self.energy_model is not None,
+                "format": type(self.energy_model).__name__ if self.energy_model is not None else None,
                 "latest_exists": energy_latest.exists(),
                 "current_version": registry.get("energy_optimization", {}).get("latest", {}).get("timestamp", "unknown"),
                 "total_versions": len(energy_versions),
@@ -1236,6 +1360,7 @@ class DirectMLService:
             },
             "production_model": {
                 "loaded": self.production_model is not None,
+                "format": type(self.production_model).__name__ if self.production_model is not None else None,
                 "latest_exists": production_latest.exists(),
                 "current_version": registry.get("production_classifier", {}).get("latest", {}).get("timestamp", "unknown"),
                 "total_versions": len(production_versions),
@@ -1248,6 +1373,7 @@ class DirectMLService:
                 "registry_exists": self.registry_path.exists(),
                 "total_versioned_models": len(versioned_models)
             },
+            "artifact_cache": get_model_registry().get_status(),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -13,9 +13,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from services.data_ingestion import DataIngestionService
+from infrastructure.influxdb.client import query_tables_async
 from domain.machinery.specs import (
-    MACHINERY_SPECS,
-    determine_active_process,
+    get_hourly_machine_tables,
     calculate_process_energy,
     calculate_process_cost
 )
@@ -115,13 +115,13 @@ class ChocolateFeatureEngine:
                 
                 # Execute queries with debug logging
                 logger.info(f"🔍 Executing energy query...")
-                energy_results = query_api.query(energy_query)
+                energy_results = await query_tables_async(query_api, energy_query)
                 
                 logger.info(f"🔍 Executing temperature query...")
-                temp_results = query_api.query(temp_query)
+                temp_results = await query_tables_async(query_api, temp_query)
                 
                 logger.info(f"🔍 Executing humidity query...")
-                humidity_results = query_api.query(humidity_query)
+                humidity_results = await query_tables_async(query_api, humidity_query)
                 
                 # Process energy data
                 energy_data = []
@@ -303,22 +303,14 @@ class ChocolateFeatureEngine:
         if df.empty:
             return df
 
-        # Determine active process for each hour
-        df['active_process'] = df['hour'].apply(determine_active_process)
-
-        # Get machine specs for active process
-        df['machine_power_kw'] = df['active_process'].apply(
-            lambda p: MACHINERY_SPECS[p]['power_kw']
-        )
-        df['machine_duration_hours'] = df['active_process'].apply(
-            lambda p: MACHINERY_SPECS[p]['duration_minutes'] / 60
-        )
-        df['machine_optimal_temp'] = df['active_process'].apply(
-            lambda p: np.mean(MACHINERY_SPECS[p]['optimal_temp_range'])
-        )
-        df['machine_optimal_humidity'] = df['active_process'].apply(
-            lambda p: MACHINERY_SPECS[p]['optimal_humidity']
-        )
+        # Machine specs per row via hour-indexed lookup tables
+        hours = df['hour'].to_numpy()
+        tables = get_hourly_machine_tables()
+        df['active_process'] = tables.process[hours]
+        df['machine_power_kw'] = tables.power_kw[hours]
+        df['machine_duration_hours'] = tables.duration_hours[hours]
+        df['machine_optimal_temp'] = tables.optimal_temp[hours]
+        df['machine_optimal_humidity'] = tables.optimal_humidity[hours]
 
         # Calculate deviation from machine optimal temperature
         df['temp_machine_deviation'] = np.abs(
@@ -0,0 +1,238 @@
+"""
+Incremental Training
+====================
+
+Reentrenamiento incremental (warm start) para los jobs programados, en
+lugar de un refit completo sobre toda la historia en cada ejecución:
+
+- Sin reentrenar si desde el último artefacto han llegado menos de
+  ``ML_INCREMENTAL_MIN_NEW_SAMPLES`` filas nuevas (marca de agua por modelo)
+- RandomForest: ``warm_start`` añade ``ML_INCREMENTAL_TREES`` árboles
+  ajustados sobre la ventana reciente (``ML_INCREMENTAL_WINDOW_HOURS``);
+  los árboles existentes no se tocan
+- Prophet: se reajusta inicializando el optimizador con los parámetros
+  del modelo anterior (``init`` = stan_init), que converge en pocas
+  iteraciones
+- Refit completo cada ``ML_FULL_REFIT_EVERY`` incrementales, al superar
+  ``ML_INCREMENTAL_MAX_TREES`` o si cambian clases/features; las métricas
+  del refit son la referencia para medir la deriva de los incrementales
+  (``ModelMetricsTracker.log_training_run``)
+
+Uso:
+    state = get_incremental_state()
+    plan = state.plan("energy_optimization", df["timestamp"], model_available=model is not None)
+    if plan.mode == "skip":
+        return
+    if plan.mode == "incremental" and warm_start_forest(model, X_new, y_new):
+        ...
+    state.record("energy_optimization", plan.mode, df["timestamp"].max())
+"""
+
+import json
+import logging
+import os
+import threading
+import warnings
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import is_classifier
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODE_SKIP = "skip"
+MODE_INCREMENTAL = "incremental"
+MODE_FULL = "full_refit"
+
+
+@dataclass
+class TrainingPlan:
+    """Qué hacer en esta ejecución y por qué."""
+    mode: str
+    reason: str
+    new_samples: int = 0
+    watermark: Optional[pd.Timestamp] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "reason": self.reason,
+            "new_samples": self.new_samples,
+            "watermark": self.watermark.isoformat() if self.watermark is not None else None
+        }
+
+
+def _utc(values) -> pd.Series:
+    return pd.to_datetime(pd.Series(values), utc=True)
+
+
+def _utc_timestamp(value) -> pd.Timestamp:
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+class IncrementalTrainingState:
+    """Marca de agua e incrementales desde el último refit, por modelo (JSON)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.ML_MODELS_DIR / "incremental_state.json")
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._state is None:
+            try:
+                self._state = json.loads(self.path.read_text()) if self.path.exists() else {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Incremental training state unreadable ({e}), next runs are full refits")
+                self._state = {}
+        return self._state
+
+    def get(self, model_name: str) -> Dict[str, Any]:
+        return dict(self._load().get(model_name) or {})
+
+    def plan(
+        self,
+        model_name: str,
+        timestamps,
+        model_available: bool,
+        force_full: bool = False
+    ) -> TrainingPlan:
+        """
+        Decidir skip / incremental / refit completo.
+
+        Args:
+            model_name: Identificador del modelo
+            timestamps: Timestamps de los datos de entrenamiento disponibles
+            model_available: Hay un modelo anterior cargado sobre el que continuar
+            force_full: Forzar refit completo
+        """
+        entry = self.get(model_name)
+        watermark = _utc_timestamp(entry["watermark"]) if entry.get("watermark") else None
+        timestamps = _utc(timestamps)
+        new_samples = int((timestamps > watermark).sum()) if watermark is not None else len(timestamps)
+
+        if force_full:
+            return TrainingPlan(MODE_FULL, "forced", new_samples, watermark)
+        if watermark is None or not model_available:
+            return TrainingPlan(MODE_FULL, "no previous artifact", new_samples, watermark)
+        if new_samples < settings.ML_INCREMENTAL_MIN_NEW_SAMPLES:
+            return TrainingPlan(
+                MODE_SKIP,
+                f"{new_samples} new samples (< {settings.ML_INCREMENTAL_MIN_NEW_SAMPLES})",
+                new_samples, watermark
+            )
+        if entry.get("incremental_runs", 0) >= settings.ML_FULL_REFIT_EVERY:
+            return TrainingPlan(
+                MODE_FULL, f"{entry['incremental_runs']} incremental runs since last full refit",
+                new_samples, watermark
+            )
+        return TrainingPlan(MODE_INCREMENTAL, f"{new_samples} new samples", new_samples, watermark)
+
+    def recent_window(self, plan: TrainingPlan, timestamps) -> np.ndarray:
+        """
+        Máscara de filas para el ajuste incremental: todo lo posterior a la
+        marca de agua y, como mínimo, las últimas ``ML_INCREMENTAL_WINDOW_HOURS``.
+        """
+        timestamps = _utc(timestamps)
+        cutoff = timestamps.max() - pd.Timedelta(hours=settings.ML_INCREMENTAL_WINDOW_HOURS)
+        if plan.watermark is not None:
+            cutoff = min(cutoff, plan.watermark)
+        return (timestamps > cutoff).to_numpy()
+
+    def record(self, model_name: str, mode: str, watermark):
+        """Guardar la marca de agua tras entrenar (``mode``: incremental o full_refit)."""
+        with self._lock:
+            state = self._load()
+            entry = dict(state.get(model_name) or {})
+            entry["watermark"] = _utc_timestamp(watermark).isoformat()
+            entry["last_mode"] = mode
+            entry["trained_at"] = datetime.now(timezone.utc).isoformat()
+            if mode == MODE_FULL:
+                entry["incremental_runs"] = 0
+                entry["full_refit_at"] = entry["trained_at"]
+            else:
+                entry["incremental_runs"] = entry.get("incremental_runs", 0) + 1
+            state[model_name] = entry
+
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"❌ Could not persist incremental training state: {e}")
+
+
+def warm_start_forest(model, X, y, add_trees: Optional[int] = None, max_trees: Optional[int] = None) -> bool:
+    """
+    Añadir árboles a un RandomForest ya entrenado, ajustados sobre (X, y).
+
+    Returns:
+        False si hace falta un refit completo (máximo de árboles, features
+        o clases distintas); el modelo no se modifica en ese caso.
+    """
+    add_trees = add_trees or settings.ML_INCREMENTAL_TREES
+    max_trees = max_trees or settings.ML_INCREMENTAL_MAX_TREES
+
+    if not hasattr(model, "estimators_"):
+        return False
+    if model.n_estimators + add_trees > max_trees:
+        logger.info(f"🌲 {model.n_estimators} trees + {add_trees} > {max_trees}: full refit")
+        return False
+    columns = list(getattr(X, "columns", []))
+    previous = list(getattr(model, "feature_names_in_", columns))
+    if getattr(model, "n_features_in_", np.shape(X)[1]) != np.shape(X)[1] or previous != columns:
+        logger.info("🌲 Feature set changed: full refit")
+        return False
+    if is_classifier(model) and set(np.unique(y)) != set(model.classes_):
+        logger.info("🌲 Class set changed in the recent window: full refit")
+        return False
+
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + add_trees)
+    try:
+        with warnings.catch_warnings():
+            # class_weight="balanced" se calcula sobre la ventana: solo afecta a los árboles nuevos
+            warnings.filterwarnings("ignore", message="class_weight presets", category=UserWarning)
+            model.fit(X, y)
+    finally:
+        model.set_params(warm_start=False)
+    return True
+
+
+def prophet_warm_start_params(model) -> Optional[Dict[str, Any]]:
+    """
+    Parámetros ajustados de un Prophet como ``init`` (stan_init) del siguiente fit.
+
+    Prophet descarta ``delta``/``beta`` si su forma no coincide (otro nº de
+    changepoints o regresores) y usa su inicialización por defecto.
+    """
+    params = getattr(model, "params", None)
+    if not params:
+        return None
+    mcmc = getattr(model, "mcmc_samples", 0) > 0
+    init: Dict[str, Any] = {}
+    for name in ("k", "m", "sigma_obs"):
+        init[name] = float(np.mean(params[name])) if mcmc else float(params[name][0][0])
+    for name in ("delta", "beta"):
+        init[name] = np.mean(params[name], axis=0) if mcmc else params[name][0]
+    return init
+
+
+_incremental_state: Optional[IncrementalTrainingState] = None
+_incremental_state_lock = threading.Lock()
+
+
+def get_incremental_state() -> IncrementalTrainingState:
+    """Estado compartido de reentrenamiento incremental (singleton)."""
+    global _incremental_state
+    with _incremental_state_lock:
+        if _incremental_state is None:
+            _incremental_state = IncrementalTrainingState()
+        return _incremental_state
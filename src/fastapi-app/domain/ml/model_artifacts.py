@@ -0,0 +1,320 @@
+"""
+Model Artifacts
+===============
+
+Publicación atómica de artefactos de modelo. Los entrenamientos corren en
+un proceso worker (services/training_pool.py) mientras la API lee los
+mismos ficheros, así que un lector nunca debe ver un pickle a medio
+escribir ni un hueco entre borrar y recrear el symlink de ``latest/``:
+
+- write_pickle_atomic: pickle a un fichero temporal + os.replace
+- publish_latest: symlink temporal + os.replace (rename atómico en POSIX)
+
+Para servir predicciones:
+
+- CompactForest: RandomForest aplanado en unos pocos arrays contiguos
+  (nodos de todos los árboles). Se guarda con joblib sin comprimir
+  (``*.forest.joblib``) y se carga con ``mmap_mode='r'``: los workers de la
+  API comparten las mismas páginas del page cache en vez de tener cada uno
+  su copia (los ``Tree`` de sklearn copian sus nodos al deserializar, así
+  que un pickle de sklearn no se puede compartir aunque se mapee).
+- ModelRegistry: caché en proceso de artefactos cargados, indexada por el
+  hash del contenido; todas las instancias de servicio comparten el mismo
+  objeto y una versión nueva del symlink ``latest/`` sustituye a la vieja.
+
+Benchmark: ``scripts/benchmark_model_artifacts.py``.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COMPACT_SUFFIX = ".forest.joblib"
+
+
+def write_pickle_atomic(obj: Any, path: Path) -> Path:
+    """Serializar ``obj`` en ``path`` sin exponer nunca un fichero parcial."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def publish_latest(latest_path: Path, target: str) -> None:
+    """
+    Apuntar ``latest_path`` a ``target`` (ruta relativa del symlink).
+
+    El symlink nuevo se crea al lado y sustituye al anterior con un rename:
+    los lectores ven la versión vieja o la nueva, nunca ninguna.
+    """
+    latest_path = Path(latest_path)
+    tmp_link = latest_path.with_name(f".{latest_path.name}.{os.getpid()}.tmp")
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    tmp_link.symlink_to(target)
+    os.replace(tmp_link, latest_path)
+
+
+def write_joblib_atomic(obj: Any, path: Path) -> Path:
+    """Como write_pickle_atomic, con joblib sin comprimir (cargable con mmap)."""
+    import joblib
+
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        joblib.dump(obj, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+def load_artifact(path: Path, mmap: bool = True) -> Any:
+    """Cargar un artefacto: ``*.joblib`` (memory-mapped) o pickle."""
+    path = Path(path)
+    if path.name.endswith(".joblib"):
+        import joblib
+        return joblib.load(path, mmap_mode="r" if mmap else None)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+# =================================================================
+# COMPACT FOREST
+# =================================================================
+
+class CompactForest:
+    """
+    RandomForest de sklearn (regresor o clasificador, una salida) para inferencia.
+
+    Todos los árboles se concatenan en arrays planos (hijos, feature,
+    umbral, valor de cada nodo); las hojas apuntan a sí mismas, así que la
+    predicción avanza todos los árboles y filas a la vez ``max_depth`` pasos.
+    Mismos resultados que el estimador original (misma comparación
+    float32 <= umbral que sklearn).
+    """
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        value: np.ndarray,
+        max_depth: int,
+        n_features_in_: int,
+        classes_: Optional[List[Any]] = None,
+        feature_names_in_: Optional[List[str]] = None
+    ):
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features_in_
+        self.classes_ = None if classes_ is None else np.asarray(classes_)
+        self.feature_names_in_ = feature_names_in_
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def is_classifier(self) -> bool:
+        return self.classes_ is not None
+
+    @classmethod
+    def from_estimator(cls, model) -> "CompactForest":
+        """
+        Aplanar un RandomForestRegressor/Classifier entrenado.
+
+        Raises:
+            ValueError: Si no es un bosque entrenado de una sola salida
+        """
+        estimators = getattr(model, "estimators_", None)
+        if not estimators or getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError(f"{type(model).__name__} is not a fitted single-output forest")
+        classes = getattr(model, "classes_", None)
+
+        roots, left, right, feature, threshold, value = [], [], [], [], [], []
+        offset = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            if classes is None:
+                value.append(tree.value[:, 0, 0])
+            else:
+                proba = tree.value[:, 0, :].astype(np.float64)
+                normalizer = proba.sum(axis=1, keepdims=True)
+                normalizer[normalizer == 0] = 1
+                value.append(proba / normalizer)
+            offset += tree.node_count
+
+        names = getattr(model, "feature_names_in_", None)
+        return cls(
+            roots=np.asarray(roots, dtype=np.int64),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            value=np.concatenate(value).astype(np.float64),
+            max_depth=max(estimator.tree_.max_depth for estimator in estimators),
+            n_features_in_=int(model.n_features_in_),
+            classes_=None if classes is None else list(classes),
+            feature_names_in_=None if names is None else list(names)
+        )
+
+    def _leaf_values(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has shape {X.shape}, expected (n, {self.n_features_in_})")
+        rows = np.arange(X.shape[0])
+        node = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node]
+
+    def predict(self, X) -> np.ndarray:
+        if self.is_classifier:
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+        return self._leaf_values(X).mean(axis=0)
+
+    def predict_proba(self, X) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._leaf_values(X).mean(axis=0)
+
+
+def compact_artifact_path(path: Path) -> Path:
+    """``energy_optimization_<ts>.pkl`` → ``energy_optimization_<ts>.forest.joblib``."""
+    path = Path(path)
+    return path.with_name(path.name[:-len(path.suffix)] + COMPACT_SUFFIX)
+
+
+def write_compact_artifact(model, pickle_path: Path) -> Optional[Path]:
+    """
+    Escribir la versión CompactForest de ``model`` junto a su pickle.
+
+    Returns:
+        Ruta escrita, o None si el modelo no es un bosque convertible
+    """
+    try:
+        forest = CompactForest.from_estimator(model)
+    except ValueError as e:
+        logger.info(f"ℹ️ No compact artifact for {Path(pickle_path).name}: {e}")
+        return None
+    return write_joblib_atomic(forest, compact_artifact_path(pickle_path))
+
+
+# =================================================================
+# MODEL REGISTRY
+# =================================================================
+
+class ModelRegistry:
+    """
+    Caché en proceso de modelos cargados, indexada por hash de contenido.
+
+    El hash de cada fichero se calcula una vez por (ruta real, mtime,
+    tamaño), así que un ``get`` repetido cuesta un ``stat``. Cada ruta
+    pedida (p. ej. ``latest/energy_optimization.pkl``) ocupa un hueco: al
+    publicarse una versión nueva, la anterior se suelta si nadie más la usa.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Any] = {}
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._slots: Dict[str, str] = {}
+        self.hits = 0
+        self.loads = 0
+
+    def artifact_hash(self, path: Path) -> str:
+        resolved = Path(path).resolve(strict=True)
+        stat = resolved.stat()
+        key = (str(resolved), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            with open(resolved, 'rb') as f:
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            self._digests[key] = digest
+        return digest
+
+    def get(self, path: Path, loader: Callable[[Path], Any] = load_artifact) -> Any:
+        """
+        Modelo de ``path`` (cargado una sola vez por contenido).
+
+        Raises:
+            FileNotFoundError: Si ``path`` no existe
+        """
+        slot = str(path)
+        with self._lock:
+            digest = self.artifact_hash(path)
+            model = self._models.get(digest)
+            if model is None:
+                model = loader(Path(path))
+                self._models[digest] = model
+                self.loads += 1
+                logger.info(f"📦 Loaded model artifact {Path(path).name} ({digest[:12]})")
+            else:
+                self.hits += 1
+
+            previous = self._slots.get(slot)
+            self._slots[slot] = digest
+            if previous and previous != digest and previous not in self._slots.values():
+                self._models.pop(previous, None)
+                self._digests = {k: v for k, v in self._digests.items() if v != previous}
+            return model
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "slots": {slot: digest[:12] for slot, digest in self._slots.items()},
+                "hits": self.hits,
+                "loads": self.loads
+            }
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._digests.clear()
+            self._slots.clear()
+
+
+_model_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Registro de modelos compartido por todos los servicios del proceso."""
+    global _model_registry
+    if _model_registry is None:
+        with _registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry()
+    return _model_registry
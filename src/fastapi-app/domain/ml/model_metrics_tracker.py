@@ -9,6 +9,7 @@ Features:
 - Get baseline metrics (median over time window)
 - Detect degradation (>2x baseline)
 - Support multiple models (Prophet, sklearn)
+- Incremental (warm-start) runs: training time and metric drift vs the last full refit
 
 Usage:
     tracker = ModelMetricsTracker()
@@ -129,17 +130,59 @@ class ModelMetricsTracker:
                 writer = csv.DictWriter(f, fieldnames=self.columns)
                 writer.writerow(row)
 
-            logger.info(
-                f"📊 Metrics logged: {model_name} - "
-                f"MAE={metrics.get('mae'):.4f}, "
-                f"RMSE={metrics.get('rmse'):.4f}, "
-                f"R²={metrics.get('r2'):.4f}"
+            summary = ", ".join(
+                f"{label}={metrics[key]:.4f}"
+                for key, label in (("mae", "MAE"), ("rmse", "RMSE"), ("r2", "R²"))
+                if metrics.get(key) is not None
             )
+            logger.info(f"📊 Metrics logged: {model_name} - {summary}")
 
         except Exception as e:
             logger.error(f"Failed to log metrics for {model_name}: {e}")
             # Don't raise - metrics tracking shouldn't break training
 
+    def log_training_run(
+        self,
+        model_name: str,
+        metrics: Dict[str, Any],
+        mode: str,
+        notes: str = ""
+    ) -> Dict[str, float]:
+        """
+        Log a training run tagged with its mode ("full_refit" / "incremental").
+
+        Incremental runs also record the drift of each metric (and of the
+        training time) against the last full refit of the same model, in
+        the notes column.
+
+        Returns:
+            Drift per metric (current - full refit), empty for full refits
+        """
+        drift: Dict[str, float] = {}
+        if mode != "full_refit":
+            reference = self.get_last_full_refit(model_name)
+            for key in ("mae", "rmse", "r2", "duration_seconds"):
+                try:
+                    drift[key] = float(metrics[key]) - float(reference[key])
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+        parts = [mode]
+        if notes:
+            parts.append(notes)
+        if drift:
+            parts.append("drift_vs_full_refit " + " ".join(f"{k}={v:+.4f}" for k, v in drift.items()))
+
+        self.log_metrics(model_name, metrics, notes="; ".join(parts))
+        return drift
+
+    def get_last_full_refit(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """Most recent entry logged as a full refit, or None."""
+        for entry in reversed(self._read_history(model_name)):
+            if (entry.get("notes") or "").startswith("full_refit"):
+                return entry
+        return None
+
     def get_baseline(
         self,
         model_name: str,
@@ -0,0 +1,29 @@
+"""
+Optimization Domain Logic
+
+Production batch placement over hourly price horizons:
+- batch_scheduler: cost tables, greedy first-fit and exact DP placement
+- rolling_horizon: multi-day planning with midnight carry-over and per-day re-plan
+"""
+
+from .batch_scheduler import (
+    BatchProfile,
+    SchedulePlan,
+    build_batch_profile,
+    batch_cost_table,
+    greedy_schedule,
+    exact_schedule
+)
+from .rolling_horizon import DayPlan, RollingPlanResult, RollingHorizonPlanner
+
+__all__ = [
+    "BatchProfile",
+    "SchedulePlan",
+    "build_batch_profile",
+    "batch_cost_table",
+    "greedy_schedule",
+    "exact_schedule",
+    "DayPlan",
+    "RollingPlanResult",
+    "RollingHorizonPlanner",
+]
@@ -0,0 +1,293 @@
+"""
+Batch Scheduler (Domain Logic)
+===============================
+
+Pure placement logic for production batches over an hourly horizon.
+Framework-agnostic, testable, and reusable.
+
+- Cost tables: cost of starting a batch at each hour, from price prefix sums
+- greedy_schedule: score-ranked first-fit (HourlyOptimizerService default)
+- exact_schedule: dynamic programming over hour slots, minimum-cost plan
+
+Usage:
+    from domain.optimization.batch_scheduler import build_batch_profile, exact_schedule
+
+    premium = build_batch_profile("premium", [(7, 3.5), (17, 11.9), (600, 480.0), (37, 22.2), (25, 10.0)])
+    plan = exact_schedule(prices, valid_starts, [(premium, 2)], cyclic=True)
+"""
+
+import time
+from dataclasses import dataclass, field
+from itertools import product
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class BatchProfile:
+    """
+    Hour footprint of one batch type.
+
+    Attributes:
+        quality_type: "standard" / "premium"
+        required_hours: Contiguous hours the batch occupies
+        process_ranges: (first_hour_offset, last_hour_offset, energy_kwh) per
+            process; a process is charged the mean price of its hours
+    """
+    quality_type: str
+    required_hours: int
+    process_ranges: Tuple[Tuple[int, int, float], ...]
+
+
+@dataclass
+class SchedulePlan:
+    """Placement result: (quality_type, start_hour) per scheduled batch."""
+    solver: str
+    placements: List[Tuple[str, int]] = field(default_factory=list)
+    total_cost: float = 0.0
+    unscheduled: dict = field(default_factory=dict)
+    solve_seconds: float = 0.0
+
+    def count(self, quality_type: str) -> int:
+        return sum(1 for q, _ in self.placements if q == quality_type)
+
+
+def build_batch_profile(quality_type: str, processes: Sequence[Tuple[int, float]]) -> BatchProfile:
+    """
+    Build a profile from the ordered process list.
+
+    Args:
+        quality_type: Batch quality
+        processes: (duration_minutes, energy_kwh) per process, in sequence
+
+    Returns:
+        BatchProfile with hour offsets matching the optimizer's pricing
+        (a process spans int(start_min/60) .. int(end_min/60))
+    """
+    ranges = []
+    minute = 0
+    for duration, energy in processes:
+        ranges.append((minute // 60, (minute + duration) // 60, float(energy)))
+        minute += duration
+
+    return BatchProfile(
+        quality_type=quality_type,
+        required_hours=int(np.ceil(minute / 60)),
+        process_ranges=tuple(ranges)
+    )
+
+
+def batch_cost_table(prices: Sequence[float], profile: BatchProfile, cyclic: bool = True) -> np.ndarray:
+    """
+    Energy cost of starting a batch at each hour, via price prefix sums.
+
+    Args:
+        prices: €/kWh per hour of the horizon
+        profile: Batch type
+        cyclic: Horizon wraps (24h day plan); otherwise a batch must end
+            inside the horizon
+
+    Returns:
+        float array (len(prices),); np.inf where the batch does not fit
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    horizon = len(prices)
+    extended = np.concatenate([prices, prices]) if cyclic else prices
+    prefix = np.concatenate([[0.0], np.cumsum(extended)])
+
+    starts = np.arange(horizon)
+    costs = np.zeros(horizon)
+    for first, last, energy in profile.process_ranges:
+        lo = starts + first
+        hi = starts + last
+        if not cyclic:
+            hi = np.minimum(hi, horizon - 1)
+            lo = np.minimum(lo, hi)
+        costs += energy * (prefix[hi + 1] - prefix[lo]) / (hi - lo + 1)
+
+    if not cyclic:
+        costs[starts + profile.required_hours > horizon] = np.inf
+    return costs
+
+
+def _window(start: int, required_hours: int, horizon: int, cyclic: bool) -> List[int]:
+    if cyclic:
+        return [(start + h) % horizon for h in range(required_hours)]
+    return list(range(start, start + required_hours))
+
+
+def greedy_schedule(
+    scores: Sequence[float],
+    valid_starts: Sequence[bool],
+    demands: Sequence[Tuple[BatchProfile, int]],
+    prices: Sequence[float],
+    cyclic: bool = True
+) -> SchedulePlan:
+    """
+    Score-ranked first-fit (the optimizer's original heuristic).
+
+    Hours are ranked by score (stable, highest first); each batch, in
+    demand order, takes the first ranked start whose window is free.
+
+    Args:
+        scores: Score per hour (higher is better)
+        valid_starts: Hours with forecast data (allowed starts)
+        demands: (profile, count) in placement priority
+        prices: €/kWh per hour, for the plan cost
+        cyclic: Horizon wraps
+
+    Returns:
+        SchedulePlan (placements in scheduling order)
+    """
+    start_time = time.perf_counter()
+    horizon = len(scores)
+    ranked = sorted((h for h in range(horizon) if valid_starts[h]), key=lambda h: scores[h], reverse=True)
+    used = np.zeros(horizon, dtype=bool)
+    plan = SchedulePlan(solver="greedy")
+
+    for profile, count in demands:
+        costs = batch_cost_table(prices, profile, cyclic)
+        for _ in range(count):
+            for start in ranked:
+                if not cyclic and start + profile.required_hours > horizon:
+                    continue
+                window = _window(start, profile.required_hours, horizon, cyclic)
+                if used[window].any():
+                    continue
+                used[window] = True
+                plan.placements.append((profile.quality_type, start))
+                plan.total_cost += float(costs[start])
+                break
+            else:
+                plan.unscheduled[profile.quality_type] = plan.unscheduled.get(profile.quality_type, 0) + 1
+
+    plan.solve_seconds = time.perf_counter() - start_time
+    return plan
+
+
+def _solve_linear(
+    cost_tables: List[np.ndarray],
+    lengths: List[int],
+    counts: Tuple[int, ...]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forward DP over hour slots.
+
+    best[t][c] = minimum cost over hours [0, t) having placed exactly c
+    batches of each type. Move 0 leaves hour t-1 idle; move k+1 ends a
+    type-k batch at t.
+
+    Returns:
+        (best, move) arrays of shape (T+1, *counts+1)
+    """
+    horizon = len(cost_tables[0])
+    shape = tuple(c + 1 for c in counts)
+    best = np.full((horizon + 1,) + shape, np.inf)
+    move = np.zeros((horizon + 1,) + shape, dtype=np.int8)
+    best[0][(0,) * len(counts)] = 0.0
+
+    for t in range(1, horizon + 1):
+        candidates = [best[t - 1]]
+        for k, (costs, length) in enumerate(zip(cost_tables, lengths)):
+            shifted = np.full(shape, np.inf)
+            start = t - length
+            if start >= 0 and np.isfinite(costs[start]):
+                dst = [slice(None)] * len(counts)
+                src = [slice(None)] * len(counts)
+                dst[k] = slice(1, None)
+                src[k] = slice(None, -1)
+                shifted[tuple(dst)] = best[start][tuple(src)] + costs[start]
+            candidates.append(shifted)
+        stacked = np.stack(candidates)
+        move[t] = np.argmin(stacked, axis=0)
+        best[t] = np.min(stacked, axis=0)
+
+    return best, move
+
+
+def exact_schedule(
+    prices: Sequence[float],
+    valid_starts: Sequence[bool],
+    demands: Sequence[Tuple[BatchProfile, int]],
+    cyclic: bool = True
+) -> SchedulePlan:
+    """
+    Minimum-cost placement by dynamic programming over hour slots.
+
+    Objective (lexicographic): schedule as many batches as fit (output kg),
+    then prefer demand types in the given order (premium first, as in the
+    greedy pass), then minimize total energy cost. Cyclic horizons are solved as linear
+    ones for every rotation (some hour boundary is never crossed by a batch).
+
+    Complexity: O(rotations * T * prod(count+1) * types) with NumPy vectors
+    over the count grid.
+
+    Args:
+        prices: €/kWh per hour
+        valid_starts: Hours allowed as batch start
+        demands: (profile, count) in priority order
+        cyclic: Horizon wraps
+
+    Returns:
+        SchedulePlan (placements sorted by start hour)
+    """
+    start_time = time.perf_counter()
+    horizon = len(prices)
+    valid = np.asarray(valid_starts, dtype=bool)
+    profiles = [p for p, _ in demands]
+    counts = tuple(c for _, c in demands)
+    lengths = [p.required_hours for p in profiles]
+    base_costs = []
+    for profile in profiles:
+        costs = batch_cost_table(prices, profile, cyclic)
+        costs[~valid] = np.inf
+        base_costs.append(costs)
+
+    def priority(cell):
+        return (-sum(cell),) + tuple(-x for x in cell)
+
+    # Cells in priority order: most batches, then more of type 0, type 1, ...
+    cells = sorted(product(*[range(c + 1) for c in counts]), key=priority)
+
+    best_key, best_solution = None, None
+    for rotation in (range(horizon) if cyclic else [0]):
+        order = (np.arange(horizon) + rotation) % horizon
+        # Batches must end by the rotation cut (enforced by the linear DP)
+        tables = [costs[order] for costs in base_costs]
+        best, move = _solve_linear(tables, lengths, counts)
+
+        for cell in cells:
+            cost = best[horizon][cell]
+            if np.isfinite(cost):
+                key = (priority(cell), cost)
+                if best_key is None or key < best_key:
+                    best_key, best_solution = key, (rotation, move, cell)
+                break
+
+    plan = SchedulePlan(solver="exact_dp")
+    if best_solution is not None:
+        rotation, move, cell = best_solution
+        cell = list(cell)
+        t = horizon
+        while t > 0:
+            choice = move[t][tuple(cell)]
+            if choice == 0:
+                t -= 1
+                continue
+            k = choice - 1
+            t -= lengths[k]
+            cell[k] -= 1
+            plan.placements.append((profiles[k].quality_type, int((t + rotation) % horizon)))
+        plan.total_cost = float(best_key[1])
+        placed = [-x for x in best_key[0][1:]]
+    else:
+        placed = [0] * len(counts)
+
+    plan.placements.sort(key=lambda placement: placement[1])
+    plan.unscheduled = {
+        profile.quality_type: count - done
+        for profile, count, done in zip(profiles, counts, placed) if count > done
+    }
+    plan.solve_seconds = time.perf_counter() - start_time
+    return plan
@@ -0,0 +1,222 @@
+"""
+Rolling-Horizon Planner (Domain Logic)
+=======================================
+
+Multi-day batch planning over an hourly forecast (e.g. the 168h Prophet
+forecast), one day at a time:
+
+- Each day places its own demand; a batch may start late and finish the
+  next morning (work-in-progress carried across midnight)
+- The next day only starts batches once the carried-over batch is done
+- Day plans are cached by a fingerprint of the hours they read (own day +
+  look-ahead), their carry-in and demand; a re-plan after a new forecast
+  or price update only re-solves days whose inputs changed
+
+Usage:
+    from domain.optimization.rolling_horizon import RollingHorizonPlanner
+
+    planner = RollingHorizonPlanner()
+    result = planner.plan(horizon_start, prices, scores, valid, demands, mode="exact")
+    result.replanned  # dates re-solved in this call
+"""
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_scheduler import BatchProfile, exact_schedule, greedy_schedule
+
+HOURS_PER_DAY = 24
+
+
+@dataclass
+class DayPlan:
+    """
+    Placement for one calendar day of the horizon.
+
+    Attributes:
+        day: Calendar date
+        placements: (quality_type, start_hour) with start_hour 0-23 of `day`
+        carry_in_hours: Hours at the start of the day still busy with the
+            previous day's last batch
+        spill_hours: Hours of the next day used by this day's last batch
+        total_cost: Energy cost (€) of the day's batches
+        unscheduled: Batches per quality that did not fit
+        solve_seconds: Solver time
+        fingerprint: Hash of the inputs the plan was solved from
+    """
+    day: date
+    placements: List[Tuple[str, int]] = field(default_factory=list)
+    carry_in_hours: int = 0
+    spill_hours: int = 0
+    total_cost: float = 0.0
+    unscheduled: Dict[str, int] = field(default_factory=dict)
+    solve_seconds: float = 0.0
+    fingerprint: str = ""
+
+
+@dataclass
+class RollingPlanResult:
+    """Result of one planning pass."""
+    horizon_start: datetime
+    days: List[DayPlan]
+    replanned: List[date]
+    reused: List[date]
+
+    @property
+    def total_cost(self) -> float:
+        return sum(d.total_cost for d in self.days)
+
+
+class RollingHorizonPlanner:
+    """
+    Day-by-day planner with per-day memoization.
+
+    Keeps the last plan for each date, so consecutive calls (new forecast,
+    new REE prices, or the horizon rolling forward one day) reuse every
+    day whose inputs are unchanged. The plan of the day before the horizon
+    start is kept too, as it defines the carry-in of the first day.
+    """
+
+    def __init__(self):
+        self._day_plans: Dict[date, DayPlan] = {}
+
+    def invalidate(self, from_day: Optional[date] = None):
+        """Forget cached day plans (all, or from `from_day` onwards)."""
+        if from_day is None:
+            self._day_plans.clear()
+        else:
+            for day in [d for d in self._day_plans if d >= from_day]:
+                del self._day_plans[day]
+
+    def plan(
+        self,
+        horizon_start: datetime,
+        prices: Sequence[float],
+        scores: Sequence[float],
+        valid_starts: Sequence[bool],
+        demands: Sequence[Tuple[BatchProfile, int]],
+        mode: str = "greedy",
+        days: Optional[int] = None
+    ) -> RollingPlanResult:
+        """
+        Plan consecutive days over an hourly horizon.
+
+        Args:
+            horizon_start: Midnight of the first day (hour 0 of the arrays)
+            prices: €/kWh per horizon hour
+            scores: Greedy score per horizon hour (higher is better)
+            valid_starts: Hours with forecast data (allowed starts)
+            demands: (profile, count) per day, in placement priority
+            mode: "greedy" or "exact"
+            days: Days to plan (default: full days covered by `prices`)
+
+        Returns:
+            RollingPlanResult with one DayPlan per day
+
+        Raises:
+            ValueError: Misaligned inputs or horizon_start not at midnight
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        scores = np.asarray(scores, dtype=np.float64)
+        valid = np.asarray(valid_starts, dtype=bool)
+        if not (len(prices) == len(scores) == len(valid)):
+            raise ValueError(f"Length mismatch: prices={len(prices)}, scores={len(scores)}, valid={len(valid)}")
+        if (horizon_start.hour, horizon_start.minute, horizon_start.second) != (0, 0, 0):
+            raise ValueError(f"horizon_start must be midnight, got {horizon_start.isoformat()}")
+
+        if days is None:
+            days = len(prices) // HOURS_PER_DAY
+        first_day = horizon_start.date()
+        lookahead = max(p.required_hours for p, _ in demands) - 1 if demands else 0
+        demand_key = tuple((p.quality_type, p.required_hours, p.process_ranges, c) for p, c in demands)
+
+        # Work-in-progress from the day before the horizon (previous pass)
+        previous = self._day_plans.get(first_day - timedelta(days=1))
+        carry_in = previous.spill_hours if previous else 0
+
+        result = RollingPlanResult(horizon_start=horizon_start, days=[], replanned=[], reused=[])
+        for index in range(days):
+            day = first_day + timedelta(days=index)
+            day_start = index * HOURS_PER_DAY
+            window = slice(day_start, min(day_start + HOURS_PER_DAY + lookahead, len(prices)))
+
+            fingerprint = self._fingerprint(
+                prices[window], scores[window], valid[window], carry_in, demand_key, mode
+            )
+            cached = self._day_plans.get(day)
+            if cached is not None and cached.fingerprint == fingerprint:
+                day_plan = cached
+                result.reused.append(day)
+            else:
+                day_plan = self._solve_day(
+                    day, prices[window], scores[window], valid[window], carry_in, demands, mode
+                )
+                day_plan.fingerprint = fingerprint
+                self._day_plans[day] = day_plan
+                result.replanned.append(day)
+
+            result.days.append(day_plan)
+            carry_in = day_plan.spill_hours
+
+        # Prune by age only: keep the day before the horizon (carry-in of the
+        # next pass) and everything after it, so a shorter call keeps later days
+        self._day_plans = {
+            d: p for d, p in self._day_plans.items()
+            if d >= first_day - timedelta(days=1)
+        }
+        return result
+
+    @staticmethod
+    def _fingerprint(prices, scores, valid, carry_in, demand_key, mode) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (prices, scores, valid):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(repr((carry_in, demand_key, mode)).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _solve_day(
+        day: date,
+        prices: np.ndarray,
+        scores: np.ndarray,
+        valid: np.ndarray,
+        carry_in: int,
+        demands: Sequence[Tuple[BatchProfile, int]],
+        mode: str
+    ) -> DayPlan:
+        """
+        Solve one day as a linear horizon.
+
+        The window starts after the carried-over batch and runs into the
+        next day (look-ahead) so late batches can finish after midnight;
+        starts are only allowed within the day itself.
+        """
+        start_time = time.perf_counter()
+        offset = min(carry_in, len(prices))
+        window_prices = prices[offset:]
+        window_valid = valid[offset:].copy()
+        window_valid[max(HOURS_PER_DAY - offset, 0):] = False
+
+        if mode == "exact":
+            plan = exact_schedule(window_prices, window_valid, demands, cyclic=False)
+        else:
+            plan = greedy_schedule(scores[offset:], window_valid, demands, window_prices, cyclic=False)
+
+        lengths = {p.quality_type: p.required_hours for p, _ in demands}
+        placements = sorted(((q, start + offset) for q, start in plan.placements), key=lambda p: p[1])
+        day_end = max([start + lengths[q] for q, start in placements], default=0)
+
+        return DayPlan(
+            day=day,
+            placements=placements,
+            carry_in_hours=carry_in,
+            spill_hours=max(day_end - HOURS_PER_DAY, 0),
+            total_cost=plan.total_cost,
+            unscheduled=plan.unscheduled,
+            solve_seconds=time.perf_counter() - start_time
+        )
@@ -54,6 +54,8 @@ class AEMETAPIClient:
     BASE_URL = settings.AEMET_API_BASE_URL
     TOKEN_CACHE_PATH = Path("/app/data/aemet_token_cache.json")
     TOKEN_VALIDITY_DAYS = 6
+    # _make_request: metadata request + datos URL
+    HTTP_CALLS_PER_REQUEST = 2
 
     def __init__(
         self,
@@ -149,13 +149,16 @@ class REEAPIClient:
 
     async def get_pvpc_prices(
         self,
-        target_date: Optional[date] = None
+        target_date: Optional[date] = None,
+        end_date: Optional[date] = None
     ) -> List[Dict[str, Any]]:
         """
         Get PVPC (Precio Voluntario Pequeño Consumidor) electricity prices.
 
         Args:
             target_date: Date to fetch prices for (defaults to today)
+            end_date: Optional last date (inclusive) to fetch a range of days
+                in a single request
 
         Returns:
             List of price records with timestamp and price
@@ -169,8 +172,11 @@ class REEAPIClient:
         if target_date is None:
             target_date = date.today()
 
+        if end_date is None or end_date < target_date:
+            end_date = target_date
+
         start_dt = datetime.combine(target_date, datetime.min.time())
-        end_dt = start_dt + timedelta(days=1)
+        end_dt = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
 
         params = {
             "start_date": self._format_date(start_dt),
@@ -178,16 +184,17 @@ class REEAPIClient:
             "time_trunc": "hour"
         }
 
-        logger.info(f"📊 Fetching REE PVPC prices for {target_date.isoformat()}")
+        period = target_date.isoformat() if end_date == target_date else f"{target_date} - {end_date}"
+        logger.info(f"📊 Fetching REE PVPC prices for {period}")
 
         try:
             data = await self._make_request(self.PVPC_ENDPOINT, params)
             prices = self._parse_pvpc_response(data)
 
             if prices:
-                logger.info(f"✅ Retrieved {len(prices)} PVPC prices for {target_date}")
+                logger.info(f"✅ Retrieved {len(prices)} PVPC prices for {period}")
             else:
-                logger.warning(f"⚠️ No PVPC prices found for {target_date}")
+                logger.warning(f"⚠️ No PVPC prices found for {period}")
 
             return prices
 
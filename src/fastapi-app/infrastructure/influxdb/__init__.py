@@ -2,12 +2,18 @@
 InfluxDB Infrastructure Module
 ===============================
 
-Provides InfluxDB client and query utilities.
+Provides InfluxDB client, async query facade, query utilities, columnar extraction,
+the hourly coverage index used by gap detection and the shared ingestion sink.
 """
 
 from .client import (
     InfluxDBClientWrapper,
-    get_influxdb_client
+    get_influxdb_client,
+    get_influxdb_pool_stats,
+    close_influxdb_clients,
+    run_blocking,
+    query_tables_async,
+    write_records_async
 )
 
 from .queries import (
@@ -15,17 +21,53 @@ from .queries import (
     get_latest_prices,
     get_weather_data,
     get_data_gap_query,
+    get_coverage_query,
     get_historical_data_query,
     get_aggregated_stats_query
 )
 
+from .frames import (
+    build_frame_query,
+    query_frame,
+    query_frame_async,
+    read_flux_csv
+)
+
+from .coverage import (
+    CoverageIndex,
+    get_coverage_index
+)
+
+from .sink import (
+    IngestionSink,
+    add_write_listener,
+    get_ingestion_sink,
+    get_ingestion_sink_stats
+)
+
 __all__ = [
     "InfluxDBClientWrapper",
     "get_influxdb_client",
+    "get_influxdb_pool_stats",
+    "close_influxdb_clients",
+    "run_blocking",
+    "query_tables_async",
+    "write_records_async",
     "QueryBuilder",
     "get_latest_prices",
     "get_weather_data",
     "get_data_gap_query",
+    "get_coverage_query",
     "get_historical_data_query",
     "get_aggregated_stats_query",
+    "build_frame_query",
+    "query_frame",
+    "query_frame_async",
+    "read_flux_csv",
+    "CoverageIndex",
+    "get_coverage_index",
+    "IngestionSink",
+    "add_write_listener",
+    "get_ingestion_sink",
+    "get_ingestion_sink_stats",
 ]
@@ -9,19 +9,36 @@ Provides a robust InfluxDB client wrapper with:
 - Health checks and connection pooling
 - Error handling and retries
 
+One wrapper (and one urllib3 connection pool) is shared per
+(url, token, org, timeout) for the whole process. Services borrow it with
+``acquire()``/``release()`` instead of building their own ``InfluxDBClient``;
+health is probed lazily and cached for ``INFLUXDB_HEALTH_TTL`` seconds.
+
+The influxdb-client query/write APIs are blocking. Code running on the event
+loop must use the async facade (``query_async``, ``query_records_async``,
+``query_frame_async``, ``write_async``), which runs the call on a bounded
+executor with a per-call timeout and cooperative cancellation.
+
 Usage:
     from infrastructure.influxdb.client import get_influxdb_client
 
     client = get_influxdb_client()
-    query_api = client.query_api()
-    results = query_api.query('from(bucket:"energy_data") |> range(start: -1h)')
+    tables = await client.query_async('from(bucket:"energy_data") |> range(start: -1h)')
 """
 
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from enum import Enum
+import asyncio
 import logging
+import threading
+import time
 
 from influxdb_client import InfluxDBClient, Point, WritePrecision
+from influxdb_client.client.flux_csv_parser import FluxCsvParser, FluxSerializationMode
+from influxdb_client.client.flux_table import TableList
 from influxdb_client.client.write_api import SYNCHRONOUS, ASYNCHRONOUS
 from influxdb_client.client.exceptions import InfluxDBError
 from tenacity import (
@@ -35,21 +52,45 @@ from core.config import settings
 from core.exceptions import (
     InfluxDBConnectionError,
     InfluxDBQueryError,
+    InfluxDBQueryTimeoutError,
     InfluxDBWriteError
 )
+from .coverage import get_coverage_index
 
 logger = logging.getLogger(__name__)
 
 
+class QueryCancelled(Exception):
+    """Raised inside a worker thread when the awaiting coroutine gave up."""
+
+
+class _CancellableResponse:
+    """HTTP response wrapper that aborts line iteration once ``cancel`` is set."""
+
+    def __init__(self, response, cancel: threading.Event):
+        self._response = response
+        self._cancel = cancel
+
+    def __iter__(self):
+        for line in self._response:
+            if self._cancel.is_set():
+                raise QueryCancelled()
+            yield line
+
+    def close(self):
+        self._response.close()
+
+
 class InfluxDBClientWrapper:
     """
     Wrapper for InfluxDB client with enhanced functionality.
 
     Provides:
-    - Connection management
+    - Connection management (shared urllib3 pool)
     - Automatic retries
     - Query and write API access
-    - Health checks
+    - Lazy, cached health checks
+    - Connection reuse and pool saturation metrics
     """
 
     def __init__(
@@ -57,7 +98,9 @@ class InfluxDBClientWrapper:
         url: Optional[str] = None,
         token: Optional[str] = None,
         org: Optional[str] = None,
-        bucket: Optional[str] = None
+        bucket: Optional[str] = None,
+        timeout: Optional[int] = None,
+        pool_maxsize: Optional[int] = None
     ):
         """
         Initialize InfluxDB client wrapper.
@@ -67,47 +110,210 @@ class InfluxDBClientWrapper:
             token: Authentication token (defaults to settings.INFLUXDB_TOKEN)
             org: Organization name (defaults to settings.INFLUXDB_ORG)
             bucket: Default bucket name (defaults to settings.INFLUXDB_BUCKET)
+            timeout: Request timeout in ms (defaults to settings.INFLUXDB_TIMEOUT)
+            pool_maxsize: Reusable connections (defaults to settings.INFLUXDB_POOL_MAXSIZE)
         """
         self.url = url or settings.INFLUXDB_URL
         self.token = token or settings.INFLUXDB_TOKEN
         self.org = org or settings.INFLUXDB_ORG
         self.bucket = bucket or settings.INFLUXDB_BUCKET
+        self.timeout = timeout or settings.INFLUXDB_TIMEOUT
+        self.pool_maxsize = pool_maxsize or settings.INFLUXDB_POOL_MAXSIZE
 
         self._client: Optional[InfluxDBClient] = None
-        self._write_api = None
+        self._write_apis: Dict[Tuple, Any] = {}
         self._query_api = None
+        self._lock = threading.RLock()
+
+        self._health: Optional[Dict[str, Any]] = None
+        self._health_checked_at: Optional[float] = None
+
+        self._stats = {
+            "clients_created": 0,
+            "leases": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "saturation_events": 0,
+            "health_probes": 0
+        }
 
     @property
     def client(self) -> InfluxDBClient:
         """Get or create InfluxDB client instance (lazy loading)."""
         if self._client is None:
-            try:
-                self._client = InfluxDBClient(
-                    url=self.url,
-                    token=self.token,
-                    org=self.org,
-                    timeout=settings.INFLUXDB_TIMEOUT,
-                    verify_ssl=settings.INFLUXDB_VERIFY_SSL,
-                    enable_gzip=settings.INFLUXDB_ENABLE_GZIP
-                )
-                logger.info(f"✅ InfluxDB client connected: {self.url}")
-            except Exception as e:
-                logger.error(f"❌ Failed to create InfluxDB client: {e}")
-                raise InfluxDBConnectionError(self.url, str(e))
+            with self._lock:
+                if self._client is None:
+                    try:
+                        self._client = InfluxDBClient(
+                            url=self.url,
+                            token=self.token,
+                            org=self.org,
+                            timeout=self.timeout,
+                            verify_ssl=settings.INFLUXDB_VERIFY_SSL,
+                            enable_gzip=settings.INFLUXDB_ENABLE_GZIP,
+                            connection_pool_maxsize=self.pool_maxsize
+                        )
+                        self._stats["clients_created"] += 1
+                        logger.info(f"✅ InfluxDB client connected: {self.url} (pool size {self.pool_maxsize})")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to create InfluxDB client: {e}")
+                        raise InfluxDBConnectionError(self.url, str(e))
 
         return self._client
 
     def query_api(self):
         """Get query API instance."""
         if self._query_api is None:
-            self._query_api = self.client.query_api()
+            with self._lock:
+                if self._query_api is None:
+                    self._query_api = self.client.query_api()
         return self._query_api
 
+    @staticmethod
+    def _write_options_key(write_options) -> Tuple:
+        """Value key for WriteOptions (which has no __eq__/__hash__)."""
+        return tuple(sorted(
+            (name, value if isinstance(value, (int, float, str, bool, type(None), Enum)) else id(value))
+            for name, value in vars(write_options).items()
+        ))
+
     def write_api(self, write_options=SYNCHRONOUS):
-        """Get write API instance with specified write options."""
-        if self._write_api is None:
-            self._write_api = self.client.write_api(write_options=write_options)
-        return self._write_api
+        """Get write API instance with specified write options (one per options value)."""
+        key = self._write_options_key(write_options)
+        write_api = self._write_apis.get(key)
+        if write_api is None:
+            with self._lock:
+                write_api = self._write_apis.get(key)
+                if write_api is None:
+                    write_api = self.client.write_api(write_options=write_options)
+                    self._write_apis[key] = write_api
+        return write_api
+
+    # -----------------------------------------------------------------
+    # Leases (shared client borrowed by services)
+    # -----------------------------------------------------------------
+
+    def acquire(self) -> InfluxDBClient:
+        """
+        Borrow the shared client.
+
+        Every ``acquire()`` must be paired with ``release()``. Leases are
+        counted to report reuse and how often concurrent users exceed the
+        connection pool size.
+        """
+        client = self.client
+        with self._lock:
+            self._stats["leases"] += 1
+            self._stats["in_flight"] += 1
+            in_flight = self._stats["in_flight"]
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], in_flight)
+            if in_flight > self.pool_maxsize:
+                self._stats["saturation_events"] += 1
+                logger.warning(
+                    f"⚠️ InfluxDB pool saturated: {in_flight} concurrent users, "
+                    f"{self.pool_maxsize} pooled connections"
+                )
+        return client
+
+    def release(self):
+        """Return a lease taken with ``acquire()`` (the client stays open)."""
+        with self._lock:
+            self._stats["in_flight"] = max(0, self._stats["in_flight"] - 1)
+
+    @contextmanager
+    def lease(self):
+        """Context manager around ``acquire()``/``release()``."""
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release()
+
+    def mark_unhealthy(self):
+        """Force a fresh health probe on the next ``ensure_healthy()``."""
+        self._health_checked_at = None
+
+    def ensure_healthy(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Lazy health probe: reuse the last successful result while it is fresh.
+
+        Args:
+            max_age: Seconds a previous probe is trusted (defaults to settings.INFLUXDB_HEALTH_TTL)
+
+        Returns:
+            Dict with health information
+
+        Raises:
+            InfluxDBConnectionError: If the probe fails
+        """
+        max_age = settings.INFLUXDB_HEALTH_TTL if max_age is None else max_age
+        checked_at = self._health_checked_at
+        if checked_at is not None and self._health is not None and time.monotonic() - checked_at <= max_age:
+            return self._health
+
+        try:
+            health = self.health_check()
+        except Exception:
+            self.mark_unhealthy()
+            raise
+
+        self._health = health
+        self._health_checked_at = time.monotonic()
+        return health
+
+    def _pool_managers(self):
+        """urllib3 pool managers behind the client (sync API client)."""
+        if self._client is None:
+            return []
+        rest_client = getattr(getattr(self._client, "api_client", None), "rest_client", None)
+        pool_manager = getattr(rest_client, "pool_manager", None)
+        return [pool_manager] if pool_manager is not None else []
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Connection reuse and saturation metrics.
+
+        Returns:
+            Dict with lease counters plus urllib3 figures: HTTP requests sent,
+            TCP connections opened, reuse ratio and idle connections.
+        """
+        requests_sent = 0
+        connections_opened = 0
+        idle_connections = 0
+
+        for pool_manager in self._pool_managers():
+            pools = getattr(pool_manager, "pools", None)
+            keys = list(pools.keys()) if pools is not None else []
+            for key in keys:
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                requests_sent += getattr(pool, "num_requests", 0)
+                connections_opened += getattr(pool, "num_connections", 0)
+                queue = getattr(getattr(pool, "pool", None), "queue", None) or []
+                idle_connections += sum(1 for conn in list(queue) if conn is not None)
+
+        reuse_ratio = (
+            round(1 - connections_opened / requests_sent, 3)
+            if requests_sent else None
+        )
+
+        with self._lock:
+            stats = dict(self._stats)
+
+        return {
+            **stats,
+            "pool_maxsize": self.pool_maxsize,
+            "http_requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connection_reuse_ratio": reuse_ratio,
+            "idle_connections": idle_connections,
+            "last_health": self._health,
+            "health_age_seconds": (
+                round(time.monotonic() - self._health_checked_at, 1)
+                if self._health_checked_at is not None else None
+            )
+        }
 
     @retry(
         stop=stop_after_attempt(3),
@@ -124,6 +330,7 @@ class InfluxDBClientWrapper:
         Raises:
             InfluxDBConnectionError: If health check fails
         """
+        self._stats["health_probes"] += 1
         try:
             health = self.client.health()
             return {
@@ -163,16 +370,7 @@ class InfluxDBClientWrapper:
             query_api = self.query_api()
             tables = query_api.query(flux_query, org=self.org)
 
-            results = []
-            for table in tables:
-                for record in table.records:
-                    results.append({
-                        "time": record.get_time(),
-                        "value": record.get_value(),
-                        "field": record.get_field(),
-                        "measurement": record.get_measurement(),
-                        **record.values
-                    })
+            results = self._tables_to_records(tables)
 
             logger.info(f"📊 Query returned {len(results)} records")
             return results
@@ -215,6 +413,7 @@ class InfluxDBClientWrapper:
             )
 
             logger.info(f"✅ Wrote {len(points)} points to {target_bucket}")
+            _record_coverage(points, target_bucket)
             return len(points)
 
         except InfluxDBError as e:
@@ -267,14 +466,127 @@ class InfluxDBClientWrapper:
 
         return self.write_points([point], bucket=bucket)
 
+    # -----------------------------------------------------------------
+    # Async facade (non-blocking for the event loop)
+    # -----------------------------------------------------------------
+
+    @staticmethod
+    def _tables_to_records(tables) -> List[Dict[str, Any]]:
+        """Flatten FluxTables into the dict records returned by ``query()``."""
+        results = []
+        for table in tables:
+            for record in table.records:
+                results.append({
+                    "time": record.get_time(),
+                    "value": record.get_value(),
+                    "field": record.get_field(),
+                    "measurement": record.get_measurement(),
+                    **record.values
+                })
+        return results
+
+    async def run_blocking(
+        self,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+        label: Optional[str] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run a blocking call against this client on the shared executor.
+
+        Same contract as the module-level ``run_blocking``; the call holds a
+        lease on this client while it runs.
+        """
+        def call(cancel: threading.Event):
+            with self.lease():
+                return func(*args, **kwargs)
+
+        return await _run_cancellable(call, timeout, label or getattr(func, "__name__", "<influxdb call>"))
+
+    def _query_tables(
+        self,
+        flux_query: str,
+        org: Optional[str],
+        params: Optional[Dict[str, Any]],
+        cancel: threading.Event
+    ) -> TableList:
+        """Blocking table query that stops parsing (and closes the response) when cancelled."""
+        with self.lease():
+            response = self.query_api().query_raw(flux_query, org=org or self.org, params=params)
+            parser = FluxCsvParser(
+                response=_CancellableResponse(response, cancel),
+                serialization_mode=FluxSerializationMode.tables
+            )
+            list(parser.generator())
+            return parser.table_list()
+
+    async def query_async(
+        self,
+        flux_query: str,
+        org: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> TableList:
+        """
+        Non-blocking equivalent of ``query_api().query()``.
+
+        Parsing stops and the HTTP response is closed as soon as the caller
+        times out or is cancelled.
+
+        Returns:
+            FluxTable list (same type as ``QueryApi.query``)
+        """
+        return await _run_cancellable(
+            lambda cancel: self._query_tables(flux_query, org, params, cancel),
+            timeout,
+            flux_query
+        )
+
+    async def query_frame_async(
+        self,
+        flux_query: str,
+        value_columns: Sequence[str],
+        tag_columns: Sequence[str] = (),
+        rename: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ):
+        """Non-blocking ``frames.query_frame`` (typed DataFrame)."""
+        from .frames import query_frame
+
+        return await self.run_blocking(
+            query_frame, self.query_api(), flux_query, value_columns, tag_columns, rename,
+            org=self.org, timeout=timeout, label=flux_query
+        )
+
+    async def write_async(
+        self,
+        record: Any,
+        bucket: Optional[str] = None,
+        org: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> None:
+        """Non-blocking ``write_api().write()`` (SYNCHRONOUS write API)."""
+        target_bucket = bucket or self.bucket
+        await self.run_blocking(
+            self.write_api().write,
+            bucket=target_bucket, org=org or self.org, record=record,
+            timeout=timeout, label=f"write to {target_bucket}"
+        )
+
     def close(self):
         """Close InfluxDB client connection."""
-        if self._client:
-            self._client.close()
-            logger.info("🔒 InfluxDB client closed")
-            self._client = None
-            self._write_api = None
-            self._query_api = None
+        with self._lock:
+            if self._client:
+                for write_api in self._write_apis.values():
+                    write_api.close()
+                self._client.close()
+                logger.info("🔒 InfluxDB client closed")
+                self._client = None
+                self._write_apis = {}
+                self._query_api = None
+                self.mark_unhealthy()
 
     def __enter__(self):
         """Context manager entry."""
@@ -285,26 +597,245 @@ class InfluxDBClientWrapper:
         self.close()
 
 
-# Global client instance (singleton)
+# =================================================================
+# BOUNDED EXECUTOR FOR BLOCKING CLIENT CALLS
+# =================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_executor_stats = {
+    "calls": 0,
+    "active": 0,
+    "peak_active": 0,
+    "timeouts": 0,
+    "cancelled": 0
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide executor, bounded by settings.INFLUXDB_QUERY_CONCURRENCY (lazy)."""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.INFLUXDB_QUERY_CONCURRENCY,
+                    thread_name_prefix="influxdb"
+                )
+    return _executor
+
+
+async def _run_cancellable(
+    func: Callable[[threading.Event], Any],
+    timeout: Optional[float],
+    label: str
+) -> Any:
+    """Submit ``func(cancel_event)`` to the executor with a timeout."""
+    timeout = settings.INFLUXDB_QUERY_TIMEOUT if timeout is None else timeout
+    cancel = threading.Event()
+    loop = asyncio.get_running_loop()
+
+    def call():
+        if cancel.is_set():
+            raise QueryCancelled()
+        return func(cancel)
+
+    with _executor_lock:
+        _executor_stats["calls"] += 1
+        _executor_stats["active"] += 1
+        _executor_stats["peak_active"] = max(_executor_stats["peak_active"], _executor_stats["active"])
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(_get_executor(), call), timeout=timeout)
+    except asyncio.TimeoutError:
+        cancel.set()
+        with _executor_lock:
+            _executor_stats["timeouts"] += 1
+        logger.warning(f"⏱️ InfluxDB call exceeded {timeout}s, cancelled: {label[:80]}")
+        raise InfluxDBQueryTimeoutError(label, timeout)
+    except asyncio.CancelledError:
+        cancel.set()
+        with _executor_lock:
+            _executor_stats["cancelled"] += 1
+        raise
+    finally:
+        with _executor_lock:
+            _executor_stats["active"] -= 1
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args,
+    timeout: Optional[float] = None,
+    label: Optional[str] = None,
+    **kwargs
+) -> Any:
+    """
+    Run a blocking InfluxDB call without blocking the event loop.
+
+    At most ``INFLUXDB_QUERY_CONCURRENCY`` calls run at once; the rest
+    queue. On timeout or cancellation the awaiting coroutine is released
+    immediately; a call already running keeps its worker until it returns
+    (bounded by the client HTTP timeout). ``query_async`` additionally
+    stops parsing and closes the response.
+
+    Args:
+        func: Blocking callable (e.g. ``query_api.query``, ``wrapper.query``)
+        *args, **kwargs: Arguments for ``func``
+        timeout: Seconds before giving up (defaults to settings.INFLUXDB_QUERY_TIMEOUT)
+        label: Query text or description for errors and logs
+
+    Returns:
+        Result of ``func``
+
+    Raises:
+        InfluxDBQueryTimeoutError: If the call exceeds ``timeout``
+
+    Example:
+        >>> tables = await run_blocking(query_api.query, flux_query)
+    """
+    if label is None:
+        label = args[0] if args and isinstance(args[0], str) else getattr(func, "__name__", "<influxdb call>")
+    return await _run_cancellable(lambda cancel: func(*args, **kwargs), timeout, label)
+
+
+async def query_tables_async(
+    query_api,
+    flux_query: str,
+    org: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None
+) -> TableList:
+    """
+    Non-blocking ``query_api.query()`` for code that holds a raw QueryApi
+    (e.g. ``DataIngestionService.client.query_api()``).
+
+    Returns:
+        FluxTable list
+    """
+    return await run_blocking(query_api.query, flux_query, org=org, params=params, timeout=timeout)
+
+
+async def write_records_async(
+    write_api,
+    bucket: str,
+    record: Any,
+    org: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> None:
+    """Non-blocking ``write_api.write()`` for code that holds a raw WriteApi."""
+    await run_blocking(
+        write_api.write, bucket=bucket, org=org, record=record,
+        timeout=timeout, label=f"write to {bucket}"
+    )
+    _record_coverage(record, bucket)
+
+
+def _record_coverage(record: Any, bucket: str):
+    """Mark written hours in the coverage index (never fails the write)."""
+    try:
+        get_coverage_index().record_points(record, bucket=bucket)
+    except Exception as e:
+        logger.debug(f"Coverage index update skipped: {e}")
+
+
+def get_executor_stats() -> Dict[str, Any]:
+    """Executor load: running calls, peak concurrency, timeouts, cancellations."""
+    with _executor_lock:
+        return {**_executor_stats, "max_workers": settings.INFLUXDB_QUERY_CONCURRENCY}
+
+
+# Global client instances (one per connection target)
 _influxdb_client_instance: Optional[InfluxDBClientWrapper] = None
+_pooled_clients: Dict[Tuple[str, str, str, int], InfluxDBClientWrapper] = {}
+_pooled_clients_lock = threading.Lock()
 
 
-def get_influxdb_client() -> InfluxDBClientWrapper:
+def get_influxdb_client(
+    url: Optional[str] = None,
+    token: Optional[str] = None,
+    org: Optional[str] = None,
+    timeout: Optional[int] = None
+) -> InfluxDBClientWrapper:
     """
-    Get global InfluxDB client instance (singleton).
+    Get the shared InfluxDB client for a connection target.
+
+    Without arguments returns the global client built from settings.
+    Services with their own configuration (e.g. DataIngestionService) get
+    one shared wrapper per (url, token, org, timeout).
 
     Returns:
-        InfluxDBClientWrapper: Global client instance
+        InfluxDBClientWrapper: Shared client instance
 
     Example:
         >>> client = get_influxdb_client()
-        >>> health = client.health_check()
+        >>> health = client.ensure_healthy()
         >>> print(health)
     """
     global _influxdb_client_instance
 
     if _influxdb_client_instance is None:
-        _influxdb_client_instance = InfluxDBClientWrapper()
-        logger.info("🔧 InfluxDB client wrapper initialized")
+        with _pooled_clients_lock:
+            if _influxdb_client_instance is None:
+                _influxdb_client_instance = InfluxDBClientWrapper()
+                logger.info("🔧 InfluxDB client wrapper initialized")
+
+    if url is None and token is None and org is None and timeout is None:
+        return _influxdb_client_instance
+
+    default = _influxdb_client_instance
+    key = (
+        url or default.url,
+        token or default.token,
+        org or default.org,
+        timeout or default.timeout
+    )
+    if key == (default.url, default.token, default.org, default.timeout):
+        return default
 
-    return _influxdb_client_instance
+    with _pooled_clients_lock:
+        wrapper = _pooled_clients.get(key)
+        if wrapper is None:
+            wrapper = InfluxDBClientWrapper(url=key[0], token=key[1], org=key[2], timeout=key[3])
+            _pooled_clients[key] = wrapper
+            logger.info(f"🔧 InfluxDB client wrapper initialized for {key[0]} (org {key[2]})")
+        return wrapper
+
+
+def get_influxdb_pool_stats() -> Dict[str, Any]:
+    """
+    Pool metrics for every shared InfluxDB client.
+
+    Returns:
+        Dict keyed by "url org" with ``get_pool_stats()`` of each client
+    """
+    with _pooled_clients_lock:
+        wrappers = list(_pooled_clients.values())
+    if _influxdb_client_instance is not None:
+        wrappers.insert(0, _influxdb_client_instance)
+
+    return {
+        **{f"{w.url} {w.org}": w.get_pool_stats() for w in wrappers},
+        "executor": get_executor_stats()
+    }
+
+
+def close_influxdb_clients():
+    """Close every shared InfluxDB client and the executor (application shutdown)."""
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+    with _pooled_clients_lock:
+        wrappers = list(_pooled_clients.values())
+    if _influxdb_client_instance is not None:
+        wrappers.append(_influxdb_client_instance)
+
+    for wrapper in wrappers:
+        try:
+            wrapper.close()
+        except Exception as e:
+            logger.error(f"❌ Error closing InfluxDB client {wrapper.url}: {e}")
@@ -0,0 +1,344 @@
+"""
+InfluxDB Coverage Index
+=======================
+
+Persistent per-measurement hourly coverage bitmap: which hours of
+``energy_prices`` / ``weather_data`` have data, and which hours have been
+verified against InfluxDB at all.
+
+- Writes through ``InfluxDBClientWrapper.write_points`` (and so the
+  ingestion sink) and ``write_records_async`` mark their hours as present
+  when the tracked field is in the record (incremental update after each
+  ingest / backfill); the bitmaps are saved from a timer thread at most
+  once per ``COVERAGE_SAVE_DELAY_SECONDS``, and on ``flush()`` at shutdown
+- Gap detection asks ``unverified_ranges()`` and only scans those hours in
+  Flux (``get_coverage_query``), then records the result with
+  ``apply_scan()``; verified history is never rescanned
+- Hours in the last ``COVERAGE_RECHECK_HOURS`` are always re-verified
+  (late data, writers outside this process)
+
+Two bit arrays per measurement, indexed by hours since ``ORIGIN``
+(2000-01-01 UTC, start of the SIAR history), packed to ~30KB each on disk.
+
+Usage:
+    from infrastructure.influxdb.coverage import get_coverage_index
+
+    index = get_coverage_index()
+    for start, stop in index.unverified_ranges("weather_data", start, stop):
+        ...  # aggregateWindow scan, then index.apply_scan(...)
+    missing = index.missing_hours("weather_data", start, stop)
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import settings
+from .line_protocol import field_keys, measurement_of, split_line
+
+logger = logging.getLogger(__name__)
+
+ORIGIN = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# Measurement → field whose presence defines coverage
+TRACKED_MEASUREMENTS = {
+    "energy_prices": "price_eur_kwh",
+    "weather_data": "temperature",
+}
+
+_GROW_HOURS = 24 * 365
+
+
+def _to_utc(timestamp: Any) -> Optional[datetime]:
+    """datetime / ISO string / epoch nanoseconds → aware UTC datetime."""
+    if timestamp is None:
+        return datetime.now(timezone.utc)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    elif isinstance(timestamp, (int, np.integer)):
+        timestamp = datetime.fromtimestamp(int(timestamp) / 1e9, tz=timezone.utc)
+    if not isinstance(timestamp, datetime):
+        return None
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def _hour_index(timestamp: datetime) -> int:
+    return int((timestamp - ORIGIN).total_seconds() // 3600)
+
+
+def _hour_at(index: int) -> datetime:
+    return ORIGIN + timedelta(hours=int(index))
+
+
+class CoverageIndex:
+    """
+    Hourly present/verified bitmaps per measurement, persisted as .npz.
+
+    Thread-safe: writes are recorded from executor threads.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        recheck_hours: Optional[int] = None,
+        save_delay: Optional[float] = None
+    ):
+        self.path = Path(path) if path is not None else settings.COVERAGE_INDEX_PATH
+        self.recheck_hours = settings.COVERAGE_RECHECK_HOURS if recheck_hours is None else recheck_hours
+        self.save_delay = settings.COVERAGE_SAVE_DELAY_SECONDS if save_delay is None else save_delay
+        self._lock = threading.Lock()
+        self._present: Dict[str, np.ndarray] = {}
+        self._verified: Dict[str, np.ndarray] = {}
+        self._unsaved = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._load()
+
+    # -----------------------------------------------------------------
+    # Persistence
+    # -----------------------------------------------------------------
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with np.load(self.path) as data:
+                for key in data.files:
+                    if not key.startswith("length:"):
+                        continue
+                    measurement = key.split(":", 1)[1]
+                    length = int(data[key])
+                    self._present[measurement] = np.unpackbits(data[f"present:{measurement}"])[:length].astype(bool)
+                    self._verified[measurement] = np.unpackbits(data[f"verified:{measurement}"])[:length].astype(bool)
+            logger.info(f"📇 Coverage index loaded: {sorted(self._present)}")
+        except Exception as e:
+            logger.warning(f"⚠️ Coverage index unreadable, starting empty: {e}")
+            self._present.clear()
+            self._verified.clear()
+
+    def save(self):
+        """Persist the bitmaps (atomic replace)."""
+        with self._lock:
+            arrays = {}
+            for measurement, present in self._present.items():
+                arrays[f"present:{measurement}"] = np.packbits(present)
+                arrays[f"verified:{measurement}"] = np.packbits(self._verified[measurement])
+                arrays[f"length:{measurement}"] = np.array(len(present))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp.npz")
+            np.savez_compressed(tmp_path, **arrays)
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not persist coverage index to {self.path}: {e}")
+
+    def _schedule_save(self):
+        """Save within save_delay from a timer thread (one save per burst of writes)."""
+        with self._lock:
+            self._unsaved = True
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self._save_pending)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _save_pending(self):
+        with self._lock:
+            self._save_timer = None
+            unsaved, self._unsaved = self._unsaved, False
+        if unsaved:
+            self.save()
+
+    def flush(self):
+        """Save pending write updates now (shutdown)."""
+        with self._lock:
+            timer = self._save_timer
+        if timer is not None:
+            timer.cancel()
+        self._save_pending()
+
+    # -----------------------------------------------------------------
+    # Updates
+    # -----------------------------------------------------------------
+
+    def _ensure(self, measurement: str, length: int):
+        """Grow both bitmaps to at least `length` hours (caller holds the lock)."""
+        present = self._present.get(measurement)
+        current = 0 if present is None else len(present)
+        if length <= current:
+            return
+        size = max(length, current + _GROW_HOURS)
+        for bitmaps in (self._present, self._verified):
+            grown = np.zeros(size, dtype=bool)
+            if present is not None:
+                grown[:current] = bitmaps[measurement]
+            bitmaps[measurement] = grown
+
+    def mark_present(self, measurement: str, timestamps: Iterable[Any]) -> int:
+        """
+        Record that `measurement` has data at these timestamps.
+
+        Returns:
+            Number of hours that were not marked present before
+        """
+        indices = [_hour_index(ts) for ts in map(_to_utc, timestamps) if ts is not None]
+        indices = np.unique(np.array([i for i in indices if i >= 0], dtype=np.int64))
+        if not len(indices):
+            return 0
+        with self._lock:
+            self._ensure(measurement, int(indices.max()) + 1)
+            present = self._present[measurement]
+            new = int((~present[indices]).sum())
+            present[indices] = True
+        return new
+
+    def record_points(self, records: Any, bucket: Optional[str] = None) -> int:
+        """
+        Mark hours from written records (Point, dict, line protocol
+        string, or lists of them).
+
+        Only the main bucket and TRACKED_MEASUREMENTS count, and only
+        records carrying the tracked field; other records (analytics
+        bucket, other fields, unparseable lines) are ignored. The bitmaps
+        are saved later from a timer thread (``_schedule_save``).
+        """
+        if bucket is not None and bucket != settings.INFLUXDB_BUCKET:
+            return 0
+        if not isinstance(records, (list, tuple)):
+            records = [records]
+
+        by_measurement: Dict[str, List[Any]] = {}
+        for record in records:
+            if isinstance(record, dict):
+                measurement, timestamp = record.get("measurement"), record.get("time")
+                fields = [k for k, v in (record.get("fields") or {}).items() if v is not None]
+            elif isinstance(record, str):
+                try:
+                    series, field_set, timestamp = split_line(record.strip())
+                except ValueError:
+                    continue
+                measurement = measurement_of(series)
+                if measurement not in TRACKED_MEASUREMENTS:
+                    continue
+                fields = field_keys(field_set)
+            else:
+                measurement, timestamp = getattr(record, "_name", None), getattr(record, "_time", None)
+                fields = [k for k, v in (getattr(record, "_fields", None) or {}).items() if v is not None]
+            if measurement in TRACKED_MEASUREMENTS and TRACKED_MEASUREMENTS[measurement] in fields:
+                by_measurement.setdefault(measurement, []).append(timestamp)
+
+        new = sum(self.mark_present(m, times) for m, times in by_measurement.items())
+        if new:
+            self._schedule_save()
+        return new
+
+    def apply_scan(
+        self,
+        measurement: str,
+        start: datetime,
+        stop: datetime,
+        hour_counts: Iterable[Tuple[Any, int]]
+    ):
+        """
+        Store a server-side scan of [start, stop): hours with count > 0 are
+        marked present and the range becomes verified, so hours still unset
+        are known holes. Hours within the recheck window stay unverified.
+
+        Bits are only ever set (never cleared) so a write landing while the
+        scan runs is not lost; invalidate() resets a measurement.
+        """
+        first = max(_hour_index(_to_utc(start)), 0)
+        last = _hour_index(_to_utc(stop))
+        if last <= first:
+            return
+        settled = min(last, _hour_index(datetime.now(timezone.utc)) - self.recheck_hours)
+
+        with self._lock:
+            self._ensure(measurement, last)
+            present = self._present[measurement]
+            for timestamp, count in hour_counts:
+                index = _hour_index(_to_utc(timestamp))
+                if first <= index < last and count:
+                    present[index] = True
+            if settled > first:
+                self._verified[measurement][first:settled] = True
+
+    def invalidate(self, measurement: Optional[str] = None):
+        """Forget coverage (all measurements or one); next detection rescans."""
+        with self._lock:
+            for name in list(self._present):
+                if measurement is None or name == measurement:
+                    del self._present[name]
+                    del self._verified[name]
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+
+    def _slice(self, bitmaps: Dict[str, np.ndarray], measurement: str, first: int, last: int) -> np.ndarray:
+        """Bits for hours [first, last) (False outside the stored range)."""
+        out = np.zeros(max(last - first, 0), dtype=bool)
+        bitmap = bitmaps.get(measurement)
+        if bitmap is None:
+            return out
+        lo, hi = max(first, 0), min(last, len(bitmap))
+        if hi > lo:
+            out[lo - first:hi - first] = bitmap[lo:hi]
+        return out
+
+    def unverified_ranges(self, measurement: str, start: datetime, stop: datetime) -> List[Tuple[datetime, datetime]]:
+        """Contiguous [start, stop) ranges that still need a Flux scan."""
+        first = _hour_index(_to_utc(start))
+        last = _hour_index(_to_utc(stop))
+        with self._lock:
+            verified = self._slice(self._verified, measurement, first, last)
+
+        ranges = []
+        edges = np.flatnonzero(np.diff(np.concatenate([[True], verified, [True]]).astype(np.int8)))
+        for lo, hi in zip(edges[::2], edges[1::2]):
+            ranges.append((_hour_at(first + lo), _hour_at(first + hi)))
+        return ranges
+
+    def present_hours(self, measurement: str, start: datetime, stop: datetime) -> List[datetime]:
+        """Hours in [start, stop) with data."""
+        first = _hour_index(_to_utc(start))
+        with self._lock:
+            present = self._slice(self._present, measurement, first, _hour_index(_to_utc(stop)))
+        return [_hour_at(first + i) for i in np.flatnonzero(present)]
+
+    def missing_hours(self, measurement: str, start: datetime, stop: datetime) -> List[datetime]:
+        """Hours in [start, stop) without data (as of the last scan/write)."""
+        first = _hour_index(_to_utc(start))
+        with self._lock:
+            present = self._slice(self._present, measurement, first, _hour_index(_to_utc(stop)))
+        return [_hour_at(first + i) for i in np.flatnonzero(~present)]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hours present/verified per measurement."""
+        with self._lock:
+            return {
+                measurement: {
+                    "present_hours": int(present.sum()),
+                    "verified_hours": int(self._verified[measurement].sum())
+                }
+                for measurement, present in self._present.items()
+            }
+
+
+_coverage_index: Optional[CoverageIndex] = None
+_coverage_lock = threading.Lock()
+
+
+def get_coverage_index() -> CoverageIndex:
+    """Process-wide coverage index (loaded from settings.COVERAGE_INDEX_PATH)."""
+    global _coverage_index
+    if _coverage_index is None:
+        with _coverage_lock:
+            if _coverage_index is None:
+                _coverage_index = CoverageIndex()
+    return _coverage_index
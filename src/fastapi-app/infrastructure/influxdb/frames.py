@@ -0,0 +1,291 @@
+"""
+InfluxDB Columnar Extraction Module
+===================================
+
+Loads Flux query results straight into typed pandas columns.
+
+The record-based API (``query_api.query()``) materialises one ``FluxRecord``
+per value and callers then rebuild dicts row by row before creating a
+DataFrame. For training-sized extractions (88k SIAR rows, 42k REE rows)
+that loop dominates time and memory. This module instead:
+
+- Pivots fields into columns server-side (``pivot()`` + ``keep()``)
+- Requests plain CSV (no annotations) through ``query_raw``
+- Streams the HTTP body in fixed-size reads and parses it in row chunks
+  with the vectorised pandas CSV reader, keeping only the requested
+  columns of each chunk (peak memory: one raw chunk plus the result)
+
+Usage:
+    from infrastructure.influxdb.frames import build_frame_query, query_frame
+
+    flux = build_frame_query(
+        bucket="energy_data",
+        measurement="energy_prices",
+        fields=["price_eur_kwh"],
+        start="-36mo",
+    )
+    df = query_frame(query_api, flux, value_columns=["price_eur_kwh"])
+
+    # From async code (runs on the bounded InfluxDB executor)
+    df = await query_frame_async(query_api, flux, value_columns=["price_eur_kwh"])
+"""
+
+from typing import Dict, Optional, Sequence
+import io
+import logging
+
+import numpy as np
+import pandas as pd
+from influxdb_client.domain.dialect import Dialect
+
+from core.exceptions import InfluxDBQueryError
+from .client import run_blocking
+from .queries import QueryBuilder
+
+logger = logging.getLogger(__name__)
+
+# Plain CSV: header row only, no datatype/group/default annotation rows
+FRAME_DIALECT = Dialect(
+    header=True,
+    delimiter=",",
+    annotations=[],
+    date_time_format="RFC3339"
+)
+
+# Streaming: bytes per read() on the response, rows per pandas parse
+READ_CHUNK_BYTES = 1 << 20
+PARSE_CHUNK_ROWS = 50_000
+
+TIME_COLUMN = "_time"
+TIMESTAMP_COLUMN = "timestamp"
+
+
+def build_frame_query(
+    bucket: str,
+    measurement: str,
+    fields: Sequence[str],
+    start: str,
+    stop: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+    keep_tags: Sequence[str] = (),
+    sort: bool = True,
+    descending: bool = False,
+    limit: Optional[int] = None
+) -> str:
+    """
+    Build a Flux query returning one row per timestamp with one column per field.
+
+    Args:
+        bucket: Bucket name
+        measurement: Measurement name
+        fields: Field names to pivot into columns
+        start: Range start (e.g. "-36mo", "2000-01-01T00:00:00Z", "0")
+        stop: Optional range stop
+        tags: Optional tag equality filters
+        keep_tags: Tag columns to keep alongside the pivoted fields
+        sort: Sort rows by time (across all series)
+        descending: Sort direction when ``sort`` is True
+        limit: Optional row limit (total rows, across all series)
+
+    Returns:
+        Flux query string
+    """
+    builder = QueryBuilder(bucket) \
+        .range(start, stop) \
+        .filter_measurement(measurement) \
+        .filter_fields(list(fields))
+
+    if tags:
+        for key, value in tags.items():
+            builder.filter_tag(key, value)
+
+    builder.pivot_fields().keep([TIME_COLUMN, *keep_tags, *fields])
+
+    # One table: sort/limit would otherwise apply to each series separately
+    if sort or limit:
+        builder.group()
+
+    if sort:
+        if descending:
+            builder.sort_desc()
+        else:
+            builder.sort_asc()
+
+    if limit:
+        builder.limit(limit)
+
+    return builder.build()
+
+
+def _empty_frame(value_columns: Sequence[str], tag_columns: Sequence[str]) -> pd.DataFrame:
+    """Typed empty frame with the expected output columns."""
+    frame = pd.DataFrame({
+        TIMESTAMP_COLUMN: pd.Series([], dtype="datetime64[ns, UTC]"),
+        **{tag: pd.Series([], dtype=object) for tag in tag_columns},
+        **{col: pd.Series([], dtype=np.float64) for col in value_columns},
+    })
+    return frame
+
+
+def _iter_lines(stream):
+    """Lines (with their terminator) of a file-like object, read ``READ_CHUNK_BYTES`` at a time."""
+    pending = b""
+    while True:
+        data = stream.read(READ_CHUNK_BYTES)
+        if not data:
+            break
+        pending += data
+        start = 0
+        end = pending.find(b"\n")
+        while end != -1:
+            yield pending[start:end + 1]
+            start = end + 1
+            end = pending.find(b"\n", start)
+        pending = pending[start:]
+    if pending:
+        yield pending
+
+
+def _iter_csv_chunks(stream):
+    """
+    ``(header, rows)`` chunks of a plain Flux CSV stream.
+
+    Tables with a different schema start a new header after a blank line;
+    long tables are split every ``PARSE_CHUNK_ROWS`` rows, repeating the header.
+    """
+    header, rows = None, []
+    for line in _iter_lines(stream):
+        if not line.strip():
+            if header is not None and rows:
+                yield header, rows
+            header, rows = None, []
+        elif header is None:
+            header = line if line.endswith(b"\n") else line + b"\n"
+        else:
+            rows.append(line)
+            if len(rows) >= PARSE_CHUNK_ROWS:
+                yield header, rows
+                rows = []
+    if header is not None and rows:
+        yield header, rows
+
+
+def read_flux_csv(
+    source,
+    value_columns: Sequence[str],
+    tag_columns: Sequence[str] = (),
+    rename: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Parse a plain (non-annotated) Flux CSV stream into a typed DataFrame.
+
+    Args:
+        source: File-like object (e.g. HTTP response), bytes or str with the CSV body
+        value_columns: Numeric columns to load as float64
+        tag_columns: String columns to load (missing tags become NaN)
+        rename: Optional mapping applied to value/tag column names
+
+    Returns:
+        DataFrame with ``timestamp`` (UTC) plus the requested columns.
+        Columns absent from the response are added filled with NaN.
+
+    Raises:
+        InfluxDBQueryError: If the stream carries a Flux error table
+    """
+    if isinstance(source, str):
+        source = source.encode()
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    wanted = {TIME_COLUMN, "error", *value_columns, *tag_columns}
+    blocks = []
+
+    for header, rows in _iter_csv_chunks(source):
+        raw = pd.read_csv(
+            io.BytesIO(header + b"".join(rows)),
+            usecols=lambda column: column in wanted,
+            dtype={tag: object for tag in tag_columns}
+        )
+        if "error" in raw.columns:
+            message = str(raw["error"].dropna().iloc[0]) if raw["error"].notna().any() else "unknown error"
+            raise InfluxDBQueryError("<frame query>", message)
+        if not raw.empty and TIME_COLUMN in raw.columns:
+            blocks.append(raw)
+
+    if not blocks:
+        frame = _empty_frame(value_columns, tag_columns)
+    else:
+        raw = blocks[0] if len(blocks) == 1 else pd.concat(blocks, ignore_index=True)
+
+        frame = pd.DataFrame({
+            TIMESTAMP_COLUMN: pd.to_datetime(raw[TIME_COLUMN], utc=True, format="ISO8601")
+        })
+        for tag in tag_columns:
+            frame[tag] = raw[tag] if tag in raw.columns else np.nan
+        for column in value_columns:
+            if column in raw.columns:
+                frame[column] = pd.to_numeric(raw[column], errors="coerce").astype(np.float64)
+            else:
+                frame[column] = np.nan
+
+    if rename:
+        frame = frame.rename(columns=rename)
+
+    return frame
+
+
+def query_frame(
+    query_api,
+    flux_query: str,
+    value_columns: Sequence[str],
+    tag_columns: Sequence[str] = (),
+    rename: Optional[Dict[str, str]] = None,
+    org: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Execute a pivoted Flux query and return a typed DataFrame.
+
+    Args:
+        query_api: influxdb_client QueryApi
+        flux_query: Flux query (typically from ``build_frame_query``)
+        value_columns: Numeric columns to extract
+        tag_columns: Tag columns to extract
+        rename: Optional column rename mapping
+        org: Optional organization override
+
+    Returns:
+        DataFrame with ``timestamp`` plus the requested columns
+    """
+    response = query_api.query_raw(flux_query, org=org, dialect=FRAME_DIALECT)
+    try:
+        frame = read_flux_csv(response, value_columns, tag_columns, rename)
+    except InfluxDBQueryError as e:
+        raise InfluxDBQueryError(flux_query, e.details.get("reason", e.message))
+    finally:
+        close = getattr(response, "release_conn", None) or getattr(response, "close", None)
+        if close:
+            close()
+
+    logger.debug(f"📊 Frame query returned {len(frame)} rows x {len(frame.columns)} columns")
+    return frame
+
+
+async def query_frame_async(
+    query_api,
+    flux_query: str,
+    value_columns: Sequence[str],
+    tag_columns: Sequence[str] = (),
+    rename: Optional[Dict[str, str]] = None,
+    org: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Non-blocking ``query_frame`` for async callers.
+
+    Same arguments as ``query_frame`` plus ``timeout`` (seconds, defaults
+    to settings.INFLUXDB_QUERY_TIMEOUT).
+    """
+    return await run_blocking(
+        query_frame, query_api, flux_query, value_columns, tag_columns, rename,
+        org=org, timeout=timeout, label=flux_query
+    )
@@ -0,0 +1,91 @@
+"""
+Line Protocol Helpers
+=====================
+
+Minimal splitting of InfluxDB line protocol, used by the ingestion sink
+(dedup keys) and the coverage index (hours written as strings).
+
+    measurement,tag=a field=1.0,other="x y" 1700000000000000000
+    └──────── series ──────┘ └───── fields ─────┘ └─ timestamp ─┘
+"""
+
+from typing import Any, List, Optional, Tuple
+
+from influxdb_client import Point, WritePrecision
+
+
+def to_line(record: Any) -> str:
+    """Point / dict / line protocol string → line protocol (ns precision)."""
+    if isinstance(record, str):
+        return record.strip()
+    if isinstance(record, dict):
+        record = Point.from_dict(record, write_precision=WritePrecision.NS)
+    if isinstance(record, Point):
+        return record.to_line_protocol(precision=WritePrecision.NS)
+    raise TypeError(f"Unsupported record type for line protocol: {type(record).__name__}")
+
+
+def split_line(line: str) -> Tuple[str, str, Optional[int]]:
+    """
+    Split a line into (series, fields, timestamp_ns).
+
+    Spaces are separators unless escaped (measurement, tags) or inside a
+    quoted string field. The timestamp is None when the line has none
+    (server time).
+    """
+    parts = []
+    start = 0
+    escaped = False
+    quoted = False
+    for index, char in enumerate(line):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"' and parts:
+            quoted = not quoted
+        elif char == " " and not quoted and len(parts) < 2:
+            parts.append(line[start:index])
+            start = index + 1
+    parts.append(line[start:])
+
+    if len(parts) == 2:
+        return parts[0], parts[1], None
+    if len(parts) != 3:
+        raise ValueError(f"Invalid line protocol: {line[:80]}")
+    series, fields, timestamp = parts
+    return series, fields, int(timestamp) if timestamp.strip() else None
+
+
+def field_keys(fields: str) -> List[str]:
+    """Field names of a fields section (commas inside quoted strings skipped)."""
+    keys = []
+    start = 0
+    escaped = False
+    quoted = False
+    for index, char in enumerate(fields + ","):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            key, _, _ = fields[start:index].partition("=")
+            if key:
+                keys.append(key.replace("\\ ", " ").replace("\\,", ",").replace("\\=", "="))
+            start = index + 1
+    return keys
+
+
+def measurement_of(series: str) -> str:
+    """Measurement name of a series key (first unescaped comma)."""
+    escaped = False
+    for index, char in enumerate(series):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ",":
+            return series[:index].replace("\\ ", " ").replace("\\,", ",")
+    return series.replace("\\ ", " ").replace("\\,", ",")
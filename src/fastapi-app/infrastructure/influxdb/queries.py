@@ -39,6 +39,7 @@ class QueryBuilder:
         self._range = None
         self._filters = []
         self._aggregations = []
+        self._shaping = []
         self._limit = None
         self._sort = None
 
@@ -69,6 +70,12 @@ class QueryBuilder:
         self._filters.append(f'filter(fn: (r) => r["_field"] == "{field}")')
         return self
 
+    def filter_fields(self, fields: List[str]) -> "QueryBuilder":
+        """Add filter matching any of several fields."""
+        condition = " or ".join(f'r["_field"] == "{field}"' for field in fields)
+        self._filters.append(f'filter(fn: (r) => {condition})')
+        return self
+
     def filter_tag(self, tag_key: str, tag_value: str) -> "QueryBuilder":
         """Add tag filter."""
         self._filters.append(f'filter(fn: (r) => r["{tag_key}"] == "{tag_value}")')
@@ -94,6 +101,28 @@ class QueryBuilder:
         self._aggregations.append('count()')
         return self
 
+    def aggregate_coverage(self, window: str = "1h") -> "QueryBuilder":
+        """Count points per window across all series (empty windows = 0, _time = window start)."""
+        self._aggregations.append('group()')
+        self._aggregations.append(f'aggregateWindow(every: {window}, fn: count, createEmpty: true, timeSrc: "_start")')
+        return self
+
+    def pivot_fields(self) -> "QueryBuilder":
+        """Pivot fields into columns (one row per timestamp)."""
+        self._shaping.append('pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")')
+        return self
+
+    def keep(self, columns: List[str]) -> "QueryBuilder":
+        """Keep only the given columns."""
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        self._shaping.append(f'keep(columns: [{column_list}])')
+        return self
+
+    def group(self) -> "QueryBuilder":
+        """Merge all tables into one (sort/limit then apply across series)."""
+        self._shaping.append('group()')
+        return self
+
     def limit(self, n: int) -> "QueryBuilder":
         """Limit number of results."""
         self._limit = f'limit(n: {n})'
@@ -118,6 +147,7 @@ class QueryBuilder:
 
         parts.extend(self._filters)
         parts.extend(self._aggregations)
+        parts.extend(self._shaping)
 
         if self._sort:
             parts.append(self._sort)
@@ -208,6 +238,48 @@ from(bucket: "{bucket}")
 '''
 
 
+def get_coverage_query(
+    bucket: str,
+    measurement: str,
+    start_time: str,
+    end_time: str,
+    field: Optional[str] = None,
+    every: str = "1h",
+    tags: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Query counting points per window, computed server-side.
+
+    Returns one row per window (empty windows included, count 0) with
+    ``_time`` at the window start, so gap detection transfers one row per
+    hour/day instead of every raw point. Series are merged (``group()``)
+    so stations/sources count together.
+
+    Args:
+        bucket: Bucket name
+        measurement: Measurement name
+        start_time: Start time (ISO format)
+        end_time: End time (ISO format, exclusive)
+        field: Optional field filter (one field = one count per point)
+        every: Window size ("1h", "1d")
+        tags: Optional tag filters
+
+    Returns:
+        Flux query string
+    """
+    builder = QueryBuilder(bucket) \
+        .range(start_time, end_time) \
+        .filter_measurement(measurement)
+
+    if field:
+        builder.filter_field(field)
+    if tags:
+        for key, value in tags.items():
+            builder.filter_tag(key, value)
+
+    return builder.aggregate_coverage(every).build()
+
+
 def get_historical_data_query(
     bucket: str,
     measurement: str,
@@ -0,0 +1,375 @@
+"""
+InfluxDB Ingestion Sink
+=======================
+
+Shared write path for every ingest producer (REE, AEMET, OpenWeatherMap,
+gas generation, SIAR, backfills):
+
+- Producers ``await sink.write(points)``; points from concurrent producers
+  are batched by size (``INGESTION_BATCH_SIZE``) and time
+  (``INGESTION_FLUSH_INTERVAL`` linger) into line protocol writes
+- Writes run on the async facade executor with a timeout scaled by the
+  chunk size (``INFLUXDB_WRITE_TIMEOUT`` plus
+  ``INFLUXDB_WRITE_TIMEOUT_PER_1K_POINTS``), retried with exponential
+  backoff; a bounded queue (``INGESTION_MAX_QUEUE_POINTS``) applies
+  backpressure to producers
+- Idempotent upserts: points are keyed by (bucket, measurement, tags,
+  timestamp). A point whose key was already written with the same field
+  values is skipped; changed values are written (InfluxDB overwrites the
+  same series + timestamp, so re-ingesting a day is always safe)
+- Metrics: points/sec, queue depth, duplicates skipped, retries
+- Write listeners (``add_write_listener``) see every written chunk, e.g.
+  the feature store marks backfilled / late ranges for re-materialization
+
+One sink per client wrapper (``get_ingestion_sink``). The worker lives on
+the running event loop and exits when the queue drains.
+
+Usage:
+    from infrastructure.influxdb import get_ingestion_sink
+
+    written = await get_ingestion_sink().write(points, bucket="energy_data")
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from influxdb_client import Point
+
+from core.config import settings
+from core.exceptions import InfluxDBWriteError
+from .client import InfluxDBClientWrapper, get_influxdb_client, run_blocking
+from .line_protocol import split_line, to_line
+
+logger = logging.getLogger(__name__)
+
+_RATE_WINDOW_SECONDS = 60.0
+
+# Called as listener(bucket, lines) in a worker thread after each written chunk
+WriteListener = Callable[[str, List[str]], None]
+_write_listeners: List[WriteListener] = []
+
+
+def add_write_listener(listener: WriteListener):
+    """Register a callback for written line protocol (idempotent)."""
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+@dataclass
+class _Submission:
+    """Points of one ``write()`` call, resolved when flushed."""
+    bucket: str
+    entries: List[Tuple[Optional[Tuple], str, str]]  # (key, digest, line)
+    overwrite: bool
+    future: asyncio.Future
+    written: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class IngestionSink:
+    """
+    Batched, deduplicating writer on top of ``InfluxDBClientWrapper.write_points``.
+
+    Not thread-safe: use from one event loop at a time (the FastAPI /
+    scheduler loop). A new loop (e.g. per test) restarts the queue.
+    """
+
+    def __init__(
+        self,
+        client: Optional[InfluxDBClientWrapper] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue_points: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        dedup_capacity: Optional[int] = None
+    ):
+        self.client = client or get_influxdb_client()
+        self.batch_size = batch_size or settings.INGESTION_BATCH_SIZE
+        self.flush_interval = settings.INGESTION_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.max_queue_points = max_queue_points or settings.INGESTION_MAX_QUEUE_POINTS
+        self.max_retries = settings.INGESTION_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = settings.INGESTION_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.dedup_capacity = dedup_capacity or settings.INGESTION_DEDUP_CAPACITY
+
+        # (bucket, series, timestamp) -> field digest of the last write
+        self._written: "OrderedDict[Tuple, str]" = OrderedDict()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._space: Optional[asyncio.Condition] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._queued_points = 0
+
+        self._rate: deque = deque()
+        self._stats = {
+            "points_submitted": 0,
+            "points_written": 0,
+            "duplicates_skipped": 0,
+            "empty_points_skipped": 0,
+            "batches_written": 0,
+            "retries": 0,
+            "failed_batches": 0,
+            "peak_queue_depth": 0,
+            "backpressure_waits": 0
+        }
+
+    # -----------------------------------------------------------------
+    # Producers
+    # -----------------------------------------------------------------
+
+    async def write(
+        self,
+        records: Any,
+        bucket: Optional[str] = None,
+        overwrite: bool = False
+    ) -> int:
+        """
+        Queue points and wait until they are written.
+
+        Args:
+            records: Point, dict, line protocol string, or a list of them
+            bucket: Target bucket (defaults to the client's bucket)
+            overwrite: Write even points already written with the same values
+
+        Returns:
+            Number of points written (duplicates and points without
+            fields excluded)
+
+        Raises:
+            InfluxDBWriteError / last write error once retries are exhausted
+        """
+        if not isinstance(records, (list, tuple)):
+            records = [records]
+        lines = [to_line(record) for record in records]
+        entries = [self._entry(line) for line in lines if line]
+        if len(entries) < len(lines):
+            # A Point with no fields (every optional value None) serialises to ""
+            self._stats["empty_points_skipped"] += len(lines) - len(entries)
+        if not entries:
+            return 0
+
+        self._bind_loop()
+        loop = asyncio.get_running_loop()
+        submission = _Submission(
+            bucket=bucket or self.client.bucket,
+            entries=entries,
+            overwrite=overwrite,
+            future=loop.create_future()
+        )
+
+        # Backpressure: wait for room (an oversized submission waits for an empty queue)
+        async with self._space:
+            if self._queued_points and self._queued_points + len(entries) > self.max_queue_points:
+                self._stats["backpressure_waits"] += 1
+                await self._space.wait_for(
+                    lambda: not self._queued_points or self._queued_points + len(entries) <= self.max_queue_points
+                )
+            self._queued_points += len(entries)
+            self._stats["points_submitted"] += len(entries)
+            self._stats["peak_queue_depth"] = max(self._stats["peak_queue_depth"], self._queued_points)
+            self._queue.put_nowait(submission)
+
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+        return await submission.future
+
+    def has_written(self, measurement: str, tags: Dict[str, str], timestamp: Any, bucket: Optional[str] = None) -> bool:
+        """Whether a point with this key was written through the sink (this process)."""
+        probe = Point(measurement).field("_probe", 0).time(timestamp)
+        for key, value in tags.items():
+            probe.tag(key, value)
+        series, _, timestamp_ns = split_line(to_line(probe))
+        return (bucket or self.client.bucket, series, timestamp_ns) in self._written
+
+    @staticmethod
+    def _entry(line: str) -> Tuple[Optional[Tuple], str, str]:
+        series, fields, timestamp = split_line(line)
+        digest = hashlib.blake2b(fields.encode(), digest_size=8).hexdigest()
+        # Without timestamp InfluxDB uses server time: never a duplicate
+        key = (series, timestamp) if timestamp is not None else None
+        return key, digest, line
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._space = asyncio.Condition()
+            self._worker = None
+            self._queued_points = 0
+
+    # -----------------------------------------------------------------
+    # Worker
+    # -----------------------------------------------------------------
+
+    async def _run(self):
+        """Collect submissions for up to flush_interval / batch_size, flush, repeat until drained."""
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            points = len(batch[0].entries)
+            deadline = loop.time() + self.flush_interval
+
+            while points < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    submission = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(submission)
+                points += len(submission.entries)
+
+            try:
+                await self._flush(batch)
+            except BaseException as e:
+                # Never leave producers waiting on a dead worker
+                for submission in batch:
+                    if not submission.future.done():
+                        error = e if isinstance(e, Exception) else InfluxDBWriteError(submission.bucket, repr(e))
+                        submission.future.set_exception(error)
+                if not isinstance(e, Exception):
+                    raise
+            finally:
+                async with self._space:
+                    self._queued_points -= points
+                    self._space.notify_all()
+
+    async def _flush(self, batch: List[_Submission]):
+        by_bucket: Dict[str, List[_Submission]] = {}
+        for submission in batch:
+            by_bucket.setdefault(submission.bucket, []).append(submission)
+
+        for bucket, submissions in by_bucket.items():
+            # Last value per key wins (same semantics as InfluxDB upserts)
+            pending: Dict[Any, Tuple[_Submission, Optional[Tuple], str, str]] = {}
+            for submission in submissions:
+                for index, (key, digest, line) in enumerate(submission.entries):
+                    full_key = (bucket,) + key if key is not None else (id(submission), index)
+                    if full_key in pending:
+                        pending[full_key][0].skipped += 1
+                    pending[full_key] = (submission, key, digest, line)
+
+            to_write = []
+            for full_key, (submission, key, digest, line) in pending.items():
+                if key is not None and not submission.overwrite and self._written.get(full_key) == digest:
+                    submission.skipped += 1
+                    self._stats["duplicates_skipped"] += 1
+                    continue
+                to_write.append((full_key, submission, key, digest, line))
+
+            for start in range(0, len(to_write), self.batch_size):
+                chunk = to_write[start:start + self.batch_size]
+                try:
+                    await self._write_chunk(bucket, [line for *_, line in chunk])
+                except Exception as e:
+                    self._stats["failed_batches"] += 1
+                    for _, submission, *_ in chunk:
+                        submission.errors.append(str(e))
+                        if not submission.future.done():
+                            submission.future.set_exception(e)
+                    continue
+                for full_key, submission, key, digest, _ in chunk:
+                    submission.written += 1
+                    if key is not None:
+                        self._remember(full_key, digest)
+
+            for submission in submissions:
+                if not submission.future.done():
+                    submission.future.set_result(submission.written)
+
+    async def _write_chunk(self, bucket: str, lines: List[str]):
+        attempt = 0
+        while True:
+            try:
+                await run_blocking(
+                    self.client.write_points, lines, bucket=bucket,
+                    timeout=self._write_timeout(len(lines)), label=f"sink write to {bucket}"
+                )
+                break
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"❌ Ingestion sink: {len(lines)} points to {bucket} failed after {attempt + 1} attempts: {e}")
+                    raise
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                self._stats["retries"] += 1
+                logger.warning(f"⚠️ Ingestion sink write failed ({e}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        self._stats["points_written"] += len(lines)
+        self._stats["batches_written"] += 1
+        self._rate.append((now, len(lines)))
+
+        for listener in list(_write_listeners):
+            try:
+                await asyncio.to_thread(listener, bucket, lines)
+            except Exception as e:
+                # Never fails the write
+                logger.warning(f"⚠️ Ingestion sink write listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+
+    @staticmethod
+    def _write_timeout(points: int) -> float:
+        """Seconds a chunk write may take: a base plus a share per 1000 points."""
+        return settings.INFLUXDB_WRITE_TIMEOUT + settings.INFLUXDB_WRITE_TIMEOUT_PER_1K_POINTS * points / 1000
+
+    def _remember(self, key: Tuple, digest: str):
+        self._written[key] = digest
+        self._written.move_to_end(key)
+        while len(self._written) > self.dedup_capacity:
+            self._written.popitem(last=False)
+
+    # -----------------------------------------------------------------
+    # Metrics
+    # -----------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput (points/sec over the last minute), queue depth and dedup counters."""
+        now = time.monotonic()
+        while self._rate and now - self._rate[0][0] > _RATE_WINDOW_SECONDS:
+            self._rate.popleft()
+        recent = sum(n for _, n in self._rate)
+        return {
+            **self._stats,
+            "queue_depth": self._queued_points,
+            "points_per_second": round(recent / _RATE_WINDOW_SECONDS, 2),
+            "dedup_keys": len(self._written),
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval
+        }
+
+
+_sinks: Dict[int, Tuple[Any, IngestionSink]] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_ingestion_sink(client: Optional[InfluxDBClientWrapper] = None) -> IngestionSink:
+    """Shared sink for a client wrapper (default: the global client)."""
+    client = client or get_influxdb_client()
+    with _sinks_lock:
+        entry = _sinks.get(id(client))
+        if entry is None or entry[0] is not client:
+            entry = (client, IngestionSink(client))
+            _sinks[id(client)] = entry
+        return entry[1]
+
+
+def get_ingestion_sink_stats() -> Dict[str, Any]:
+    """Metrics of every sink, keyed by "url org"."""
+    with _sinks_lock:
+        entries = list(_sinks.values())
+    return {
+        f"{getattr(client, 'url', '?')} {getattr(client, 'org', '?')}": sink.stats()
+        for client, sink in entries
+    }
@@ -7,7 +7,7 @@ Orchestrates AEMET API client and InfluxDB for weather data.
 Responsibilities:
 - Fetch weather observations from AEMET stations
 - Validate and transform meteorological data
-- Persist to InfluxDB
+- Persist to InfluxDB (shared ingestion sink: batched, idempotent upserts)
 - Query historical weather
 - Detect data gaps
 
@@ -27,8 +27,9 @@ from typing import List, Dict, Any, Optional
 
 from influxdb_client import Point, WritePrecision
 
-from infrastructure.influxdb import InfluxDBClientWrapper
+from infrastructure.influxdb import InfluxDBClientWrapper, run_blocking, get_ingestion_sink
 from infrastructure.external_apis import AEMETAPIClient
+from core.cache import get_cache_manager
 from core.config import settings
 from core.exceptions import (
     AEMETDataError,
@@ -107,13 +108,18 @@ class AEMETService:
 
         # Write to InfluxDB
         try:
-            records_written = self.influxdb.write_points(points, bucket=self.BUCKET)
+            records_written = await get_ingestion_sink(self.influxdb).write(
+                points, bucket=self.BUCKET, overwrite=force_refresh
+            )
             logger.info(f"✅ Wrote {records_written} AEMET weather records to InfluxDB")
 
         except Exception as e:
             logger.error(f"❌ Failed to write AEMET weather to InfluxDB: {e}")
             raise InfluxDBWriteError(self.MEASUREMENT, str(e))
 
+        if records_written:
+            await get_cache_manager().ainvalidate_tags("weather")
+
         # Extract latest values
         latest = weather_records[-1] if weather_records else {}
 
@@ -212,7 +218,7 @@ from(bucket: "{self.BUCKET}")
         flux_query += '\n  |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")'
 
         try:
-            results = self.influxdb.query(flux_query)
+            results = await run_blocking(self.influxdb.query, flux_query)
 
             weather_records = []
             for record in results:
@@ -269,7 +275,7 @@ from(bucket: "{self.BUCKET}")
 '''
 
         try:
-            results = self.influxdb.query(flux_query)
+            results = await run_blocking(self.influxdb.query, flux_query)
 
             if results:
                 record = results[0]
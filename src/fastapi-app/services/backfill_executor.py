@@ -0,0 +1,312 @@
+"""
+Backfill Executor - Chocolate Factory
+======================================
+
+Ejecución concurrente de tareas de backfill con presupuesto por API:
+
+- TokenBucket: presupuesto compartido de peticiones/minuto por API upstream
+  (REE precios y REE generación comparten el de REE)
+- BackfillExecutor: concurrencia acotada entre días y fuentes, checkpoint
+  de tareas completadas (un backfill interrumpido se reanuda sin repetir
+  peticiones) y estadísticas de throughput frente al presupuesto
+- coalesce_day_ranges: une gaps adyacentes en rangos de días para
+  peticiones por rango
+
+Uso:
+    executor = BackfillExecutor()
+    outcomes = await executor.run([
+        BackfillTask(key="ree:2025-11-01:2025-11-07", api="ree", run=fetch_week),
+    ])
+    executor.throughput()  # records/min conseguidos vs presupuesto
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from core.config import settings
+from .feature_store import watch_ingestion
+
+
+class TokenBucket:
+    """
+    Token bucket asíncrono: `rate_per_minute` tokens/min, ráfaga de `burst`.
+
+    Las esperas se sirven en orden (FIFO) para que ninguna fuente se quede
+    sin turno con varias tareas compitiendo por la misma API. Una petición
+    de más tokens que la ráfaga no se recorta: se consume por tramos de
+    `burst`, esperando las recargas necesarias.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be > 0, got {rate_per_minute}")
+        self.rate_per_minute = float(rate_per_minute)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        rate = self.rate_per_minute / 60.0
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int = 1):
+        """Esperar hasta disponer de `tokens` peticiones del presupuesto."""
+        remaining = max(int(tokens), 1)
+        async with self._lock:
+            start = time.monotonic()
+            self._refill(start)
+            while remaining > 0:
+                chunk = min(remaining, self.burst)
+                while self._tokens < chunk:
+                    missing = chunk - self._tokens
+                    await asyncio.sleep(missing * 60.0 / self.rate_per_minute)
+                    self._refill(time.monotonic())
+                self._tokens -= chunk
+                remaining -= chunk
+            self.acquired += max(int(tokens), 1)
+            self.waited_seconds += time.monotonic() - start
+
+
+class BackfillCheckpoint:
+    """
+    Tareas completadas de un backfill, persistidas en JSON.
+
+    Un run que termina sin fallos borra el checkpoint; si se interrumpe o
+    alguna tarea falla, el siguiente run (dentro del TTL) salta las tareas
+    ya hechas y reutiliza sus resultados.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl_hours: Optional[float] = None):
+        self.path = Path(path) if path is not None else settings.BACKFILL_CHECKPOINT_PATH
+        self.ttl = timedelta(hours=settings.BACKFILL_CHECKPOINT_TTL_HOURS if ttl_hours is None else ttl_hours)
+        self._done: Dict[str, Any] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            updated_at = datetime.fromisoformat(data["updated_at"])
+            if datetime.now(timezone.utc) - updated_at > self.ttl:
+                logger.info(f"🗑️ Checkpoint de backfill caducado ({updated_at.isoformat()}), se ignora")
+                return
+            self._done = data.get("done", {})
+            logger.info(f"📌 Checkpoint de backfill: {len(self._done)} tareas ya completadas")
+        except Exception as e:
+            logger.warning(f"⚠️ Checkpoint de backfill ilegible, se ignora: {e}")
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "done": self._done
+            }))
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudo guardar el checkpoint de backfill en {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._done.get(key)
+
+    def is_done(self, key: str) -> bool:
+        return key in self._done
+
+    def mark_done(self, key: str, result: Any):
+        """Registrar una tarea completada (el resultado debe ser serializable a JSON)."""
+        self._done[key] = result
+        self._save()
+
+    def clear(self):
+        self._done = {}
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudo borrar el checkpoint de backfill: {e}")
+
+
+@dataclass
+class BackfillTask:
+    """
+    Unidad de trabajo del executor.
+
+    Attributes:
+        key: Identificador estable (checkpoint), p.ej. "ree:2025-11-01:2025-11-07"
+        api: Presupuesto upstream que consume ("ree", "aemet")
+        run: Corrutina a ejecutar; devuelve un resultado serializable a JSON
+        requests: Peticiones upstream que hace la tarea (tokens a consumir)
+        records: Función resultado -> nº de registros obtenidos (throughput)
+        completed: Función resultado -> si la tarea queda hecha (checkpoint);
+            las no completadas se reintentan en el siguiente run
+    """
+    key: str
+    api: str
+    run: Callable[[], Awaitable[Any]]
+    requests: int = 1
+    records: Callable[[Any], int] = lambda result: 0
+    completed: Callable[[Any], bool] = lambda result: True
+
+
+@dataclass
+class TaskOutcome:
+    """Resultado de una tarea: `result` si terminó, `error` si falló."""
+    key: str
+    api: str
+    result: Any = None
+    error: Optional[str] = None
+    resumed: bool = False
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _ApiStats:
+    requests: int = 0
+    records: int = 0
+    busy_since: Optional[float] = None
+    busy_until: Optional[float] = None
+    failures: int = 0
+
+
+class BackfillExecutor:
+    """
+    Ejecuta BackfillTasks con concurrencia acotada y un TokenBucket por API.
+
+    Thread-unsafe por diseño: un executor por run del BackfillService.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        budgets: Optional[Dict[str, float]] = None,
+        burst: Optional[int] = None,
+        checkpoint: Optional[BackfillCheckpoint] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.BACKFILL_MAX_CONCURRENCY
+        self.budgets = budgets or {
+            "ree": settings.BACKFILL_REE_REQUESTS_PER_MINUTE,
+            "aemet": settings.BACKFILL_AEMET_REQUESTS_PER_MINUTE,
+        }
+        burst = burst or settings.BACKFILL_API_BURST
+        self.buckets = {api: TokenBucket(rate, burst) for api, rate in self.budgets.items()}
+        self.checkpoint = checkpoint or BackfillCheckpoint()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._stats: Dict[str, _ApiStats] = {}
+        self._failed = False
+        # Los gaps rellenados caen bajo la marca de agua del feature store
+        watch_ingestion()
+
+    async def _execute(self, task: BackfillTask) -> TaskOutcome:
+        if self.checkpoint.is_done(task.key):
+            logger.debug(f"⏭️ Backfill {task.key}: completada en un run anterior")
+            return TaskOutcome(task.key, task.api, result=self.checkpoint.get(task.key), resumed=True)
+
+        stats = self._stats.setdefault(task.api, _ApiStats())
+        # Esperar presupuesto fuera del semáforo: una API limitada no ocupa
+        # huecos de concurrencia que podría usar otra fuente
+        bucket = self.buckets.get(task.api)
+        if bucket is not None:
+            await bucket.acquire(task.requests)
+
+        async with self._semaphore:
+            start = time.monotonic()
+            if stats.busy_since is None:
+                stats.busy_since = start
+            try:
+                result = await task.run()
+            except Exception as e:
+                self._failed = True
+                stats.failures += 1
+                logger.warning(f"⚠️ Backfill {task.key} falló: {e}")
+                return TaskOutcome(task.key, task.api, error=str(e), duration_seconds=time.monotonic() - start)
+            finally:
+                stats.requests += task.requests
+                stats.busy_until = time.monotonic()
+
+        stats.records += task.records(result)
+        if task.completed(result):
+            self.checkpoint.mark_done(task.key, result)
+        else:
+            self._failed = True
+        return TaskOutcome(task.key, task.api, result=result, duration_seconds=time.monotonic() - start)
+
+    async def run(self, tasks: Iterable[BackfillTask]) -> List[TaskOutcome]:
+        """
+        Ejecutar tareas (en paralelo, respetando concurrencia y presupuestos).
+
+        Returns:
+            Un TaskOutcome por tarea, en el orden recibido
+        """
+        return list(await asyncio.gather(*(self._execute(task) for task in tasks)))
+
+    def finish(self):
+        """Cerrar el run: sin fallos, el checkpoint ya no hace falta."""
+        if not self._failed:
+            self.checkpoint.clear()
+
+    def throughput(self) -> Dict[str, Dict[str, Any]]:
+        """Peticiones y records/min conseguidos por API frente a su presupuesto."""
+        report = {}
+        for api, stats in self._stats.items():
+            elapsed = (stats.busy_until or 0) - (stats.busy_since or 0)
+            minutes = max(elapsed / 60.0, 1e-9)
+            budget = self.budgets.get(api)
+            requests_per_minute = stats.requests / minutes if elapsed > 0 else 0.0
+            bucket = self.buckets.get(api)
+            report[api] = {
+                "requests": stats.requests,
+                "failures": stats.failures,
+                "records": stats.records,
+                "elapsed_seconds": round(elapsed, 2),
+                "records_per_minute": round(stats.records / minutes, 1) if elapsed > 0 else 0.0,
+                "requests_per_minute": round(requests_per_minute, 1),
+                "budget_requests_per_minute": budget,
+                "budget_utilization": round(requests_per_minute / budget, 2) if budget else None,
+                "rate_limited_seconds": round(bucket.waited_seconds, 2) if bucket else 0.0
+            }
+        return report
+
+
+def coalesce_day_ranges(
+    spans: Iterable[Tuple[date, date]],
+    max_days: int
+) -> List[Tuple[date, date]]:
+    """
+    Unir rangos de días (inclusivos) solapados o adyacentes y partirlos en
+    trozos de como mucho `max_days` días.
+
+    Example:
+        [(1-nov, 1-nov), (2-nov, 3-nov), (9-nov, 9-nov)], max_days=7
+        -> [(1-nov, 3-nov), (9-nov, 9-nov)]
+    """
+    merged: List[List[date]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    chunks = []
+    step = timedelta(days=max(int(max_days), 1))
+    for start, end in merged:
+        while start <= end:
+            chunk_end = min(start + step - timedelta(days=1), end)
+            chunks.append((start, chunk_end))
+            start = chunk_end + timedelta(days=1)
+    return chunks
@@ -7,14 +7,16 @@ usando APIs históricas de REE y estrategias híbridas para datos climáticos.
 """
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 import pandas as pd
 from loguru import logger
 
+from core.config import settings
 from .gap_detector import GapDetectionService, DataGap
 from .data_ingestion import DataIngestionService
+from .backfill_executor import BackfillExecutor, BackfillTask, TaskOutcome, coalesce_day_ranges
 from infrastructure.external_apis import REEAPIClient  # Sprint 15: consolidate API clients
 from .siar_etl import SiarETL
 
@@ -36,6 +38,21 @@ class BackfillResult:
     method_used: str
     errors: List[str]
 
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Representación JSON (checkpoint del backfill)"""
+        data = asdict(self)
+        data["gap_start"] = self.gap_start.isoformat()
+        data["gap_end"] = self.gap_end.isoformat()
+        return data
+
+    @classmethod
+    def from_checkpoint(cls, data: Dict[str, Any]) -> "BackfillResult":
+        return cls(**{
+            **data,
+            "gap_start": datetime.fromisoformat(data["gap_start"]),
+            "gap_end": datetime.fromisoformat(data["gap_end"])
+        })
+
 
 class BackfillService:
     """Servicio para backfill inteligente de datos faltantes"""
@@ -61,34 +78,34 @@ class BackfillService:
                     "duration_seconds": (datetime.now() - start_time).total_seconds()
                 }
             
-            # 2. Ejecutar backfill REE
-            ree_results = []
+            # 2. Ejecutar backfill REE, Weather y Gas en paralelo: un executor
+            #    compartido reparte concurrencia y presupuesto por API
+            executor = BackfillExecutor()
+            backfills = {}
             if analysis.ree_gaps:
                 logger.info(f"📊 Ejecutando backfill REE para {len(analysis.ree_gaps)} gaps")
-                ree_results = await self._backfill_ree_gaps(analysis.ree_gaps)
-            
-            # 3. Ejecutar backfill Weather
-            weather_results = []
+                backfills["ree"] = self._backfill_ree_gaps(analysis.ree_gaps, executor)
             if analysis.weather_gaps:
                 logger.info(f"🌤️ Ejecutando backfill Weather para {len(analysis.weather_gaps)} gaps")
-                weather_results = await self._backfill_weather_gaps(analysis.weather_gaps)
-            
-            # 4. Ejecutar backfill Gas (Ciclos Combinados)
-            gas_results = []
+                backfills["weather"] = self._backfill_weather_gaps(analysis.weather_gaps, executor)
             if hasattr(analysis, "gas_gaps") and analysis.gas_gaps:
                 logger.info(f"⛽ Ejecutando backfill Gas para {len(analysis.gas_gaps)} gaps")
-                gas_results = await self._backfill_gas_gaps(analysis.gas_gaps)
-            
-            # 5. Consolidar resultados
+                backfills["gas"] = self._backfill_gas_gaps(analysis.gas_gaps, executor)
+
+            results = dict(zip(backfills, await asyncio.gather(*backfills.values())))
+            executor.finish()
+
+            # 3. Consolidar resultados
             total_duration = (datetime.now() - start_time).total_seconds()
             
             summary = self._generate_backfill_summary(
-                ree_results, weather_results, gas_results, total_duration
+                results.get("ree", []), results.get("weather", []), results.get("gas", []), total_duration,
+                throughput=executor.throughput()
             )
 
             logger.info(f"✅ Backfill completado en {total_duration:.1f}s")
             
-            # 6. Acciones post-backfill (e.g. reentrenamiento Prophet)
+            # 4. Acciones post-backfill (e.g. reentrenamiento Prophet)
             await self._post_backfill_actions(summary)
 
             # Send success alert
@@ -130,103 +147,124 @@ class BackfillService:
 
             raise
     
-    async def _backfill_ree_gaps(self, gaps: List[DataGap]) -> List[BackfillResult]:
-        """Backfill específico para gaps de REE"""
+    async def _backfill_ree_gaps(
+        self,
+        gaps: List[DataGap],
+        executor: Optional[BackfillExecutor] = None
+    ) -> List[BackfillResult]:
+        """
+        Backfill específico para gaps de REE.
+
+        Los días de todos los gaps se agrupan en rangos contiguos (como mucho
+        BACKFILL_REE_MAX_RANGE_DAYS días por petición) que se piden en
+        paralelo con el presupuesto REE del executor. El resultado se sigue
+        dando por gap, con los registros de sus días.
+        """
         results = []
+        standalone = executor is None
+        executor = executor or BackfillExecutor()
         
         try:
             async with REEClient() as ree_client:
                 async with DataIngestionService() as ingestion_service:
-                    
+
+                    async def fetch_range(range_start: date, range_end: date) -> Dict[str, Any]:
+                        # Una petición por rango (get_pvpc_prices acepta end_date)
+                        data = await ree_client.get_pvpc_prices(target_date=range_start, end_date=range_end)
+                        written = 0
+                        if data:
+                            write_result = await ingestion_service.ingest_ree_prices_historical(data)
+                            written = write_result.successful_writes
+                            logger.info(f"📊 Días {range_start} - {range_end}: {len(data)} registros REE escritos")
+
+                        days: Dict[str, int] = {}
+                        for record in data or []:
+                            day = self._record_day(record, range_start, range_end)
+                            days[day.isoformat()] = days.get(day.isoformat(), 0) + 1
+                        return {"obtained": len(data or []), "written": written, "days": days}
+
+                    ranges = coalesce_day_ranges(
+                        [(gap.start_time.date(), gap.end_time.date()) for gap in gaps],
+                        settings.BACKFILL_REE_MAX_RANGE_DAYS
+                    )
+                    tasks = [
+                        BackfillTask(
+                            key=f"ree:{range_start}:{range_end}",
+                            api="ree",
+                            run=lambda s=range_start, e=range_end: fetch_range(s, e),
+                            records=lambda result: result["obtained"],
+                            # Un rango vacío o con escrituras fallidas se reintenta en el siguiente run
+                            completed=lambda result: result["obtained"] > 0 and result["written"] == result["obtained"]
+                        )
+                        for range_start, range_end in ranges
+                    ]
+                    logger.info(f"📊 REE: {len(gaps)} gaps → {len(tasks)} peticiones por rango")
+                    outcomes = dict(zip(ranges, await executor.run(tasks)))
+
                     for gap in gaps:
-                        gap_start = datetime.now()
-                        logger.info(f"📊 Rellenando gap REE: {gap.start_time} - {gap.end_time}")
-                        
-                        try:
-                            # Obtener datos históricos REE por días
-                            current_date = gap.start_time.date()
-                            end_date = gap.end_time.date()
-                            
-                            total_records = 0
-                            total_written = 0
-                            errors = []
-                            
-                            while current_date <= end_date:
-                                try:
-                                    # Obtener datos para el día actual
-                                    day_start = datetime.combine(
-                                        current_date, datetime.min.time()
-                                    ).replace(tzinfo=timezone.utc)
-                                    
-                                    day_end = day_start + timedelta(days=1) - timedelta(minutes=1)
-
-                                    # Usar get_pvpc_prices con target_date (API solo acepta fecha única)
-                                    daily_data = await ree_client.get_pvpc_prices(
-                                        target_date=current_date
-                                    )
-                                    
-                                    if daily_data:
-                                        # Escribir a InfluxDB usando el método correcto
-                                        write_result = await ingestion_service.ingest_ree_prices_historical(daily_data)
-                                        total_records += len(daily_data)
-                                        total_written += write_result.successful_writes
-                                        
-                                        logger.info(f"📊 Día {current_date}: {len(daily_data)} registros REE escritos")
-                                    
-                                    # Rate limiting
-                                    await asyncio.sleep(2)  # 30 req/min max
-                                    
-                                except Exception as day_error:
-                                    error_msg = f"Error día {current_date}: {day_error}"
-                                    errors.append(error_msg)
-                                    logger.warning(error_msg)
-                                
-                                current_date += timedelta(days=1)
-                            
-                            # Crear resultado
-                            duration = (datetime.now() - gap_start).total_seconds()
-                            success_rate = (total_written / total_records * 100) if total_records > 0 else 0
-                            
-                            result = BackfillResult(
-                                measurement="energy_prices",
-                                gap_start=gap.start_time,
-                                gap_end=gap.end_time,
-                                records_requested=gap.expected_records,
-                                records_obtained=total_records,
-                                records_written=total_written,
-                                success_rate=success_rate,
-                                duration_seconds=duration,
-                                method_used="REE_historical_daily",
-                                errors=errors
-                            )
-                            
-                            results.append(result)
-                            logger.info(f"✅ Gap REE completado: {total_written}/{total_records} records")
-                            
-                        except Exception as gap_error:
-                            logger.error(f"❌ Error en gap REE {gap.start_time}: {gap_error}")
-                            
-                            result = BackfillResult(
-                                measurement="energy_prices",
-                                gap_start=gap.start_time,
-                                gap_end=gap.end_time,
-                                records_requested=gap.expected_records,
-                                records_obtained=0,
-                                records_written=0,
-                                success_rate=0,
-                                duration_seconds=(datetime.now() - gap_start).total_seconds(),
-                                method_used="REE_historical_daily",
-                                errors=[str(gap_error)]
-                            )
-                            results.append(result)
-            
+                        results.append(self._ree_gap_result(gap, outcomes))
+                        logger.info(f"✅ Gap REE completado: {results[-1].records_written}/{results[-1].records_obtained} records")
+
+            if standalone:
+                executor.finish()
             return results
             
         except Exception as e:
             logger.error(f"Error general en backfill REE: {e}")
             return results
+
+    @staticmethod
+    def _record_day(record: Dict[str, Any], range_start: date, range_end: date) -> date:
+        """Día de un registro REE, acotado al rango pedido."""
+        timestamp = record.get("timestamp")
+        day = timestamp.date() if isinstance(timestamp, datetime) else range_start
+        return min(max(day, range_start), range_end)
+
+    @staticmethod
+    def _ree_gap_result(
+        gap: DataGap,
+        outcomes: Dict[Tuple[date, date], TaskOutcome]
+    ) -> BackfillResult:
+        """Resultado de un gap a partir de las peticiones por rango que lo cubren."""
+        gap_days = {
+            (gap.start_time.date() + timedelta(days=i)).isoformat()
+            for i in range((gap.end_time.date() - gap.start_time.date()).days + 1)
+        }
+
+        obtained, written, duration, errors = 0, 0.0, 0.0, []
+        for (range_start, range_end), outcome in outcomes.items():
+            if range_end < gap.start_time.date() or range_start > gap.end_time.date():
+                continue
+            duration += outcome.duration_seconds
+            if not outcome.ok:
+                errors.append(f"Error días {range_start} - {range_end}: {outcome.error}")
+                continue
+            result = outcome.result
+            gap_obtained = sum(n for day, n in result["days"].items() if day in gap_days)
+            # Escrituras del rango repartidas por registros obtenidos
+            ratio = min(result["written"] / result["obtained"], 1.0) if result["obtained"] else 0.0
+            obtained += gap_obtained
+            written += gap_obtained * ratio
+
+        written = int(round(written))
+        return BackfillResult(
+            measurement="energy_prices",
+            gap_start=gap.start_time,
+            gap_end=gap.end_time,
+            records_requested=gap.expected_records,
+            records_obtained=obtained,
+            records_written=written,
+            success_rate=(written / obtained * 100) if obtained > 0 else 0,
+            duration_seconds=duration,
+            method_used="REE_historical_daily",
+            errors=errors
+        )
     
-    async def _backfill_weather_gaps(self, gaps: List[DataGap]) -> List[BackfillResult]:
+    async def _backfill_weather_gaps(
+        self,
+        gaps: List[DataGap],
+        executor: Optional[BackfillExecutor] = None
+    ) -> List[BackfillResult]:
         """
         Backfill específico para gaps de Weather usando AEMET API
 
@@ -241,13 +279,18 @@ class BackfillService:
 
         La predicción por municipio permite pre-cargar 48h de datos meteorológicos,
         reduciendo la necesidad de tener el equipo encendido para backfill.
+
+        Los gaps se procesan en paralelo con el presupuesto AEMET del executor.
         """
-        results = []
+        from infrastructure.external_apis import AEMETAPIClient
+
+        standalone = executor is None
+        executor = executor or BackfillExecutor()
 
         try:
             now = datetime.now(timezone.utc)
 
-            for gap in gaps:
+            async def backfill_gap(gap: DataGap) -> Dict[str, Any]:
                 gap_start = datetime.now()
 
                 # Calcular antigüedad del gap (desde INICIO, no desde fin)
@@ -282,8 +325,6 @@ class BackfillService:
                     if result.success_rate < 50 and gap.gap_duration_hours > 720:  # 30 días
                         logger.warning(f"⚠️ AEMET falló con gap grande ({gap.gap_duration_hours:.1f}h). "
                                      f"Considerar descarga manual SIAR si necesario")
-
-                    results.append(result)
                     
                 except Exception as gap_error:
                     logger.error(f"❌ Error en gap Weather {gap.start_time}: {gap_error}")
@@ -300,13 +341,48 @@ class BackfillService:
                         method_used="failed",
                         errors=[str(gap_error)]
                     )
-                    results.append(result)
-            
+
+                return result.to_checkpoint()
+
+            tasks = [
+                BackfillTask(
+                    key=f"weather:{gap.start_time.isoformat()}:{gap.end_time.isoformat()}",
+                    api="aemet",
+                    run=lambda gap=gap: backfill_gap(gap),
+                    # Cada estrategia hace una petición AEMET (metadata + datos)
+                    requests=AEMETAPIClient.HTTP_CALLS_PER_REQUEST,
+                    records=lambda result: result["records_obtained"],
+                    # Un gap sin datos y con errores se reintenta en el siguiente run
+                    completed=lambda result: not (result["errors"] and result["records_written"] == 0)
+                )
+                for gap in gaps
+            ]
+            outcomes = await executor.run(tasks)
+            if standalone:
+                executor.finish()
+
+            results = []
+            for gap, outcome in zip(gaps, outcomes):
+                if outcome.ok:
+                    results.append(BackfillResult.from_checkpoint(outcome.result))
+                    continue
+                results.append(BackfillResult(
+                    measurement="weather_data",
+                    gap_start=gap.start_time,
+                    gap_end=gap.end_time,
+                    records_requested=gap.expected_records,
+                    records_obtained=0,
+                    records_written=0,
+                    success_rate=0,
+                    duration_seconds=outcome.duration_seconds,
+                    method_used="failed",
+                    errors=[outcome.error]
+                ))
             return results
             
         except Exception as e:
             logger.error(f"Error general en backfill Weather: {e}")
-            return results
+            return []
     
     
     async def _backfill_weather_aemet(self, gap: DataGap) -> BackfillResult:
@@ -585,56 +661,74 @@ class BackfillService:
             errors=errors
         )
 
-    async def _backfill_gas_gaps(self, gaps: List[DataGap]) -> List[BackfillResult]:
-        """Backfill específico para gaps de generación de gas (Ciclos Combinados)"""
-        results = []
+    async def _backfill_gas_gaps(
+        self,
+        gaps: List[DataGap],
+        executor: Optional[BackfillExecutor] = None
+    ) -> List[BackfillResult]:
+        """
+        Backfill específico para gaps de generación de gas (Ciclos Combinados).
+
+        Un día por petición (la API de estructura de generación devuelve un
+        único valor diario); comparte el presupuesto REE con los precios.
+        """
+        standalone = executor is None
+        executor = executor or BackfillExecutor()
         try:
             from .gas_generation_service import GasGenerationService
             service = GasGenerationService()
-            
-            for gap in gaps:
-                gap_start_time = datetime.now()
+
+            async def backfill_gap(gap: DataGap) -> Dict[str, Any]:
                 target_date = gap.start_time.date()
                 logger.info(f"⛽ Rellenando gap Gas: {target_date}")
-                
-                try:
-                    result_ingesta = await service.ingest_gas_data(target_date)
-                    
-                    obtained = 1 if result_ingesta["success"] and result_ingesta.get("action") == "ingested" else 0
-                    written = obtained
-                    
-                    res = BackfillResult(
-                        measurement="generation_mix",
-                        gap_start=gap.start_time,
-                        gap_end=gap.end_time,
-                        records_requested=1,
-                        records_obtained=obtained,
-                        records_written=written,
-                        success_rate=100.0 if written > 0 else 0.0,
-                        duration_seconds=(datetime.now() - gap_start_time).total_seconds(),
-                        method_used="REE_generation_daily",
-                        errors=[result_ingesta.get("error")] if not result_ingesta["success"] else []
-                    )
-                    results.append(res)
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error en backfill gas para {target_date}: {e}")
-                    results.append(BackfillResult(
-                        measurement="generation_mix",
-                        gap_start=gap.start_time,
-                        gap_end=gap.end_time,
-                        records_requested=1,
-                        records_obtained=0,
-                        records_written=0,
-                        success_rate=0.0,
-                        duration_seconds=(datetime.now() - gap_start_time).total_seconds(),
-                        method_used="REE_generation_daily",
-                        errors=[str(e)]
-                    ))
+                result_ingesta = await service.ingest_gas_data(target_date)
+                written = 1 if result_ingesta["success"] and result_ingesta.get("action") == "ingested" else 0
+                return {
+                    "success": bool(result_ingesta["success"]),
+                    "written": written,
+                    "error": result_ingesta.get("error") if not result_ingesta["success"] else None
+                }
+
+            tasks = [
+                BackfillTask(
+                    key=f"gas:{gap.start_time.date()}",
+                    api="ree",
+                    run=lambda gap=gap: backfill_gap(gap),
+                    records=lambda result: result["written"],
+                    completed=lambda result: result["success"]
+                )
+                for gap in gaps
+            ]
+            outcomes = await executor.run(tasks)
+            if standalone:
+                executor.finish()
+
+            results = []
+            for gap, outcome in zip(gaps, outcomes):
+                if not outcome.ok:
+                    logger.error(f"❌ Error en backfill gas para {gap.start_time.date()}: {outcome.error}")
+                result = outcome.result or {}
+                written = result.get("written", 0)
+                if outcome.ok:
+                    errors = [result["error"]] if not result["success"] else []
+                else:
+                    errors = [outcome.error]
+                results.append(BackfillResult(
+                    measurement="generation_mix",
+                    gap_start=gap.start_time,
+                    gap_end=gap.end_time,
+                    records_requested=1,
+                    records_obtained=written,
+                    records_written=written,
+                    success_rate=100.0 if written > 0 else 0.0,
+                    duration_seconds=outcome.duration_seconds,
+                    method_used="REE_generation_daily",
+                    errors=errors
+                ))
             return results
         except Exception as e:
             logger.error(f"Error general en backfill Gas: {e}")
-            return results
+            return []
 
     async def _post_backfill_actions(self, summary: Dict[str, Any]):
         """Acciones a realizar tras un backfill exitoso (e.g. reentrenar Prophet)"""
@@ -670,8 +764,9 @@ class BackfillService:
     def _generate_backfill_summary(self, ree_results: List[BackfillResult], 
                                  weather_results: List[BackfillResult],
                                  gas_results: List[BackfillResult],
-                                 total_duration: float) -> Dict[str, Any]:
-        """Generar resumen completo del backfill"""
+                                 total_duration: float,
+                                 throughput: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generar resumen completo del backfill (throughput: por API, ver BackfillExecutor)"""
         
         all_results = ree_results + weather_results + gas_results
         
@@ -717,6 +812,7 @@ class BackfillService:
                 }
                 for r in all_results
             ],
+            "throughput": throughput or {},
             "recommendations": {
                 "data_status": "updated" if overall_success_rate > 90 else "partially_updated",
                 "next_check": "Run /gaps/summary to verify results"
@@ -0,0 +1,114 @@
+"""
+Chatbot Answer Cache
+====================
+
+Las preguntas repetidas ("cuándo producir mañana", "precio ahora")
+reconstruían el mismo contexto y pagaban una llamada nueva a Claude.
+
+La clave es la pregunta normalizada (minúsculas, sin tildes ni signos) +
+el fingerprint de los datos del contexto (ChatContext.fingerprint): la
+misma pregunta con los mismos datos devuelve la respuesta guardada sin
+llamar al LLM. Cuando cambian los datos (nuevo snapshot del dashboard,
+nuevos precios REE...) cambia el fingerprint y la respuesta se regenera.
+
+- LRU acotada (CHATBOT_ANSWER_CACHE_MAX_ENTRIES) con TTL
+  (CHATBOT_ANSWER_CACHE_TTL_SECONDS) como límite de seguridad
+- Solo se guardan respuestas correctas (success=True)
+- Estadísticas: hit rate, tokens/USD ahorrados, latencia hit vs miss
+"""
+
+import copy
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_question(question: str) -> str:
+    """'¿Cuándo producir  MAÑANA?' → 'cuando producir manana'."""
+    decomposed = unicodedata.normalize("NFKD", question.lower())
+    ascii_only = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", ascii_only).strip()
+
+
+class ChatbotAnswerCache:
+    """
+    Respuestas del chatbot por (pregunta normalizada, fingerprint del contexto).
+
+    Args:
+        max_entries: Máximo de respuestas guardadas (LRU)
+        ttl_seconds: Edad máxima de una respuesta
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries if max_entries is not None else settings.CHATBOT_ANSWER_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CHATBOT_ANSWER_CACHE_TTL_SECONDS
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {
+            "hits": 0, "misses": 0, "stores": 0, "evictions": 0,
+            "saved_tokens": 0, "saved_cost_usd": 0.0,
+            "hit_latency_ms": 0, "miss_latency_ms": 0
+        }
+
+    @staticmethod
+    def make_key(question: str, fingerprint: str) -> str:
+        normalized = normalize_question(question)
+        return hashlib.sha256(f"{normalized}\x00{fingerprint}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Respuesta guardada (copia) o None; cuenta hit/miss."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        result = entry[1]
+        self.stats["hits"] += 1
+        self.stats["saved_tokens"] += result["tokens"]["total"]
+        self.stats["saved_cost_usd"] += result["cost_usd"]
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Guardar una respuesta correcta."""
+        if not result.get("success"):
+            return
+        self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        self.stats["stores"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def record_latency(self, hit: bool, latency_ms: int):
+        self.stats["hit_latency_ms" if hit else "miss_latency_ms"] += latency_ms
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "evictions": stats["evictions"],
+            "saved_tokens": stats["saved_tokens"],
+            "saved_cost_usd": round(stats["saved_cost_usd"], 6),
+            "avg_hit_latency_ms": round(stats["hit_latency_ms"] / stats["hits"]) if stats["hits"] else None,
+            "avg_miss_latency_ms": round(stats["miss_latency_ms"] / stats["misses"]) if stats["misses"] else None
+        }
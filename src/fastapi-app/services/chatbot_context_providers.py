@@ -0,0 +1,240 @@
+"""
+Chatbot Context Providers
+=========================
+
+El contexto del chatbot se construía con peticiones HTTP a la propia API
+(``http://localhost:8000/dashboard/complete``, ``/insights/*``,
+``/ree/prices/*``, ``/optimize/production/daily``): cada pregunta pagaba
+el stack HTTP + serialización JSON de ida y vuelta, y una pregunta con
+varias categorías descargaba ``/dashboard/complete`` hasta cinco veces.
+
+Ahora cada fuente es un provider que llama directamente al servicio de
+dominio, y ChatContextSnapshot memoiza las fuentes de UNA pregunta: todas
+las categorías detectadas comparten una única obtención de cada fuente.
+
+Los providers devuelven los mismos dicts que servían los endpoints
+(``jsonable_encoder``: fechas como ISO strings), así que los formateadores
+de ChatbotContextService no cambian.
+
+``fingerprint()`` resume los datos obtenidos (época de datos): la caché de
+respuestas del chatbot lo usa como parte de la clave. Ignora los campos que
+cambian en cada llamada sin que cambien los datos (``VOLATILE_FIELDS``).
+
+Usage:
+    snapshot = ChatContextSnapshot()
+    dashboard = await snapshot.get("dashboard")   # fetch
+    dashboard = await snapshot.get("dashboard")   # misma task, sin fetch
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ContextProvider = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Días de histórico para las estadísticas REE del contexto de precios
+PRICE_STATS_DAYS = 30
+# Objetivo del plan de producción que se resume en el contexto
+PRODUCTION_PLAN_TARGET_KG = 200
+
+
+# =================================================================
+# PROVIDERS (servicios de dominio, en proceso)
+# =================================================================
+
+# (etag, documento decodificado) del último snapshot de dashboard usado
+_dashboard_document: Optional[Tuple[str, Dict[str, Any]]] = None
+
+
+async def fetch_dashboard() -> Dict[str, Any]:
+    """
+    Dashboard completo desde el snapshot materializado.
+
+    Se decodifica el cuerpo ya serializado de /dashboard/complete una vez
+    por versión del snapshot (mismo ETag → mismo dict, solo lectura).
+    """
+    global _dashboard_document
+    from services.dashboard import get_dashboard_service
+    from services.dashboard_snapshot import get_dashboard_snapshot_service
+
+    snapshot = await get_dashboard_snapshot_service().get_snapshot(get_dashboard_service())
+    cached = _dashboard_document
+    if cached is not None and cached[0] == snapshot.etag:
+        return cached[1]
+
+    document = json.loads(snapshot.bodies["complete"])
+    _dashboard_document = (snapshot.etag, document)
+    return document
+
+
+async def fetch_optimal_windows() -> Dict[str, Any]:
+    """Ventanas óptimas 7 días (GET /insights/optimal-windows)."""
+    from services.predictive_insights_service import PredictiveInsightsService
+    return jsonable_encoder(await PredictiveInsightsService().get_optimal_windows())
+
+
+async def fetch_alerts() -> Dict[str, Any]:
+    """Alertas predictivas (GET /insights/alerts)."""
+    from services.predictive_insights_service import PredictiveInsightsService
+    return jsonable_encoder(await PredictiveInsightsService().get_predictive_alerts())
+
+
+async def fetch_savings() -> Dict[str, Any]:
+    """Tracking de ahorros (GET /insights/savings-tracking)."""
+    from services.predictive_insights_service import PredictiveInsightsService
+    return jsonable_encoder(await PredictiveInsightsService().get_savings_tracking())
+
+
+def _ree_service():
+    from dependencies import get_telegram_alert_service
+    from infrastructure.influxdb import get_influxdb_client
+    from services.ree_service import REEService
+    return REEService(get_influxdb_client(), telegram_service=get_telegram_alert_service())
+
+
+async def fetch_latest_price() -> Dict[str, Any]:
+    """Último precio REE (GET /ree/prices/latest); {} si no hay datos recientes."""
+    return jsonable_encoder(await _ree_service().get_latest_price() or {})
+
+
+async def fetch_price_stats() -> Dict[str, Any]:
+    """Estadísticas REE de los últimos PRICE_STATS_DAYS días (GET /ree/prices/stats)."""
+    end_date = date.today()
+    start_date = end_date - timedelta(days=PRICE_STATS_DAYS)
+    return jsonable_encoder(await _ree_service().get_price_stats(start_date, end_date))
+
+
+async def fetch_production_plan() -> Dict[str, Any]:
+    """Plan horario de mañana (POST /optimize/production/daily → "optimization")."""
+    from services.data_ingestion import DataIngestionService
+    from services.hourly_optimizer_service import get_optimizer_service
+
+    async with DataIngestionService() as service:
+        optimizer = get_optimizer_service(influxdb_client=service.client)
+        result = await optimizer.optimize_daily_production(target_kg=PRODUCTION_PLAN_TARGET_KG)
+    return jsonable_encoder(result)
+
+
+CONTEXT_PROVIDERS: Dict[str, ContextProvider] = {
+    "dashboard": fetch_dashboard,
+    "optimal_windows": fetch_optimal_windows,
+    "alerts": fetch_alerts,
+    "savings": fetch_savings,
+    "latest_price": fetch_latest_price,
+    "price_stats": fetch_price_stats,
+    "production_plan": fetch_production_plan,
+}
+
+
+# Campos por fuente (a cualquier profundidad) que cambian en cada llamada:
+# hora de generación de la alerta de ola de calor, tiempos del solver.
+# El dashboard no necesita lista: su ETag ya excluye los campos de build.
+VOLATILE_FIELDS: Dict[str, frozenset] = {
+    "alerts": frozenset({"datetime"}),
+    "production_plan": frozenset({"solve_ms", "greedy_solve_ms"}),
+}
+
+
+def _without_fields(value: Any, fields: frozenset) -> Any:
+    if isinstance(value, dict):
+        return {k: _without_fields(v, fields) for k, v in value.items() if k not in fields}
+    if isinstance(value, list):
+        return [_without_fields(v, fields) for v in value]
+    return value
+
+
+def _data_digest(source: str, data: Any) -> str:
+    """Digest de los datos estables de una fuente."""
+    cached = _dashboard_document
+    if cached is not None and data is cached[1]:
+        return cached[0]
+    volatile = VOLATILE_FIELDS.get(source)
+    if volatile:
+        data = _without_fields(data, volatile)
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# =================================================================
+# SNAPSHOT POR PREGUNTA
+# =================================================================
+
+class ChatContextSnapshot:
+    """
+    Fuentes de contexto de una pregunta, obtenidas como mucho una vez.
+
+    ``get(source)`` arranca el provider la primera vez y devuelve la misma
+    task a las siguientes llamadas, aunque lleguen mientras está en curso.
+    Los errores (y los timeouts) llegan a todas las categorías que usan esa
+    fuente.
+
+    Args:
+        providers: Fuente → provider (default: CONTEXT_PROVIDERS)
+        timeout_seconds: Límite por fuente
+            (default: settings.CHATBOT_CONTEXT_SOURCE_TIMEOUT_SECONDS)
+    """
+
+    def __init__(
+        self,
+        providers: Optional[Dict[str, ContextProvider]] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        self.providers = CONTEXT_PROVIDERS if providers is None else providers
+        self.timeout_seconds = (
+            settings.CHATBOT_CONTEXT_SOURCE_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds
+        )
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, source: str) -> "asyncio.Task[Dict[str, Any]]":
+        """Task (awaitable) con los datos de ``source``."""
+        task = self._tasks.get(source)
+        if task is None:
+            provider = self.providers[source]
+            task = asyncio.ensure_future(asyncio.wait_for(provider(), self.timeout_seconds))
+            task.add_done_callback(self._consume_task_result)
+            self._tasks[source] = task
+        return task
+
+    @staticmethod
+    def _consume_task_result(task: asyncio.Task):
+        """Evitar 'exception was never retrieved' si nadie llegó a esperarla."""
+        if not task.cancelled():
+            task.exception()
+
+    def fingerprint(self) -> str:
+        """
+        Hash de los datos obtenidos (fuentes terminadas; errores incluidos).
+
+        Mismas fuentes con los mismos datos → mismo fingerprint (sin contar
+        VOLATILE_FIELDS). El dashboard usa el ETag de su snapshot en lugar de
+        re-serializar el documento.
+        """
+        digest = hashlib.sha256()
+        for source in sorted(self._tasks):
+            task = self._tasks[source]
+            if not task.done() or task.cancelled() or task.exception() is not None:
+                value = "error"
+            else:
+                value = _data_digest(source, task.result())
+            digest.update(f"{source}={value};".encode())
+        return digest.hexdigest()[:16]
+
+    @property
+    def fetched(self) -> List[str]:
+        """Fuentes obtenidas (o en curso) para esta pregunta."""
+        return list(self._tasks)
+
+    def close(self):
+        """Cancelar las fuentes que sigan en curso."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
@@ -6,28 +6,144 @@ Sprint 11 - Chatbot BI Conversacional
 
 RAG local sin vector DB, usando keyword matching inteligente.
 Optimizado para tokens (500-1500 tokens/pregunta).
+
+Los datos salen de los servicios de dominio en proceso
+(services/chatbot_context_providers.py), con un snapshot por pregunta
+compartido por todas las categorías.
+
+Antes de enviarlo a Claude, compress_context() quita los bloques repetidos
+entre secciones y ajusta el contexto a CHATBOT_CONTEXT_MAX_TOKENS.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
-import httpx
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
 from core.config import settings
+from services.chatbot_context_providers import ChatContextSnapshot, ContextProvider
 
 logger = logging.getLogger(__name__)
 
+# Bloques de una sección que repiten lo que ya cuenta otra sección presente
+# (sección → {sección que lo cubre: prefijos de bloque})
+SECTION_OVERLAPS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "full_dashboard": {
+        "current_status": ("📊 ESTADO ACTUAL",),
+        "analysis": ("📅 ANÁLISIS HISTÓRICO",),
+    },
+}
+
+# Descarte por presupuesto de tokens: primero el contexto menos específico;
+# después, secciones de la pregunta de la última a la primera
+BUDGET_DROP_ORDER = ("full_dashboard", "production_context")
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokens aproximados (1 token ≈ 4 caracteres)."""
+    return len(text) // 4
+
+
+def compress_context(
+    sections: List[Tuple[str, str]],
+    max_tokens: int
+) -> Tuple[List[Tuple[str, str]], Dict[str, Any]]:
+    """
+    Quitar duplicados y ajustar el contexto a un presupuesto de tokens.
+
+    1. Bloques (párrafos) idénticos a uno ya incluido o cubiertos por otra
+       sección presente (SECTION_OVERLAPS) se eliminan
+    2. Si sigue por encima de ``max_tokens``, se descartan secciones
+       completas (BUDGET_DROP_ORDER, luego de la última a la segunda)
+
+    Args:
+        sections: (nombre, texto) en orden de prioridad
+        max_tokens: Presupuesto del contexto
+
+    Returns:
+        (secciones resultantes, estadísticas)
+    """
+    present = {name for name, _ in sections}
+    tokens_before = estimate_tokens("\n\n".join(text for _, text in sections))
+    seen_blocks = set()
+    deduplicated = 0
+
+    kept = []
+    for name, text in sections:
+        covered = tuple(
+            prefix
+            for other, prefixes in SECTION_OVERLAPS.get(name, {}).items() if other in present
+            for prefix in prefixes
+        )
+        blocks = []
+        for block in text.split("\n\n"):
+            key = block.strip()
+            if not key:
+                continue
+            if key in seen_blocks or (covered and key.startswith(covered)):
+                deduplicated += 1
+                continue
+            seen_blocks.add(key)
+            blocks.append(block)
+        if blocks:
+            kept.append((name, "\n\n".join(blocks)))
+
+    dropped = []
+    drop_order = [n for n in BUDGET_DROP_ORDER] + [name for name, _ in reversed(kept[1:])]
+    for candidate in drop_order:
+        if estimate_tokens("\n\n".join(text for _, text in kept)) <= max_tokens or len(kept) <= 1:
+            break
+        remaining = [(name, text) for name, text in kept if name != candidate]
+        if len(remaining) < len(kept):
+            dropped.append(candidate)
+            kept = remaining
+
+    tokens_after = estimate_tokens("\n\n".join(text for _, text in kept))
+    return kept, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "deduplicated_blocks": deduplicated,
+        "dropped_sections": dropped
+    }
+
+
+class ChatContext(str):
+    """
+    Contexto para Claude (el texto) + metadatos de cómo se construyó.
+
+    Attributes:
+        fingerprint: Hash de los datos usados (ChatContextSnapshot.fingerprint)
+        sections: Secciones incluidas
+        compression: Estadísticas de compress_context()
+    """
+
+    def __new__(cls, text: str, fingerprint: str, sections: List[str], compression: Dict[str, Any]):
+        context = super().__new__(cls, text)
+        context.fingerprint = fingerprint
+        context.sections = sections
+        context.compression = compression
+        return context
+
 
 class ChatbotContextService:
     """
     Construye contexto relevante para Claude Haiku basado en keywords.
 
     NO usa embeddings ni vector DB.
-    Usa keyword matching simple + endpoints disponibles.
+    Usa keyword matching simple + servicios de dominio (sin HTTP loopback).
+
+    Args:
+        providers: Fuente → provider para los snapshots (default:
+            CONTEXT_PROVIDERS, los servicios de dominio)
     """
 
-    def __init__(self):
-        self.base_url = "http://localhost:8000"
+    def __init__(self, providers: Optional[Dict[str, ContextProvider]] = None):
+        self.providers = providers
+        self.max_tokens = settings.CHATBOT_CONTEXT_MAX_TOKENS
+        self.compression_stats = {
+            "contexts": 0, "tokens_before": 0, "tokens_after": 0,
+            "deduplicated_blocks": 0, "dropped_sections": 0
+        }
         self.keywords_map = {
             "optimal_windows": [
                 "cuándo", "cuando", "producir", "ventana", "ventanas",
@@ -53,21 +169,21 @@ class ChatbotContextService:
             ],
         }
 
-    async def build_context(self, question: str) -> str:
+    async def build_context(self, question: str) -> ChatContext:
         """
         Construye contexto relevante basado en keywords detectados.
 
-        OPTIMIZACIÓN: Ejecuta todas las llamadas HTTP en paralelo con asyncio.gather()
-        para reducir latencia de ~15s → ~3s
+        OPTIMIZACIÓN: Ejecuta todas las categorías en paralelo con asyncio.gather()
+        sobre un único ChatContextSnapshot: cada fuente (dashboard, insights,
+        REE, optimizador) se obtiene una sola vez por pregunta
 
         Args:
             question: Pregunta del usuario
 
         Returns:
-            Contexto formateado para Claude (< 2000 tokens)
+            Contexto formateado para Claude (<= CHATBOT_CONTEXT_MAX_TOKENS),
+            con fingerprint de los datos usados
         """
-        import asyncio
-
         question_lower = question.lower()
 
         # Detectar categorías relevantes
@@ -75,12 +191,15 @@ class ChatbotContextService:
 
         logger.info(f"Pregunta: '{question}' → Categorías: {relevant_categories}")
 
+        # Snapshot de esta pregunta: cada fuente se obtiene una sola vez
+        context = ChatContextSnapshot(self.providers)
+
         # Preparar tareas paralelas
         tasks = []
         task_names = []
 
         # Estado actual siempre incluido (baseline)
-        tasks.append(self._get_current_status())
+        tasks.append(self._get_current_status(context))
         task_names.append("current_status")
 
         # Contexto de producción SIEMPRE (para que entienda el negocio)
@@ -89,64 +208,92 @@ class ChatbotContextService:
 
         # Añadir contextos específicos según categorías detectadas
         if "optimal_windows" in relevant_categories:
-            tasks.append(self._get_optimal_windows())
+            tasks.append(self._get_optimal_windows(context))
             task_names.append("optimal_windows")
             # Añadir también el forecast semanal Prophet
-            tasks.append(self._get_weekly_forecast())
+            tasks.append(self._get_weekly_forecast(context))
             task_names.append("weekly_forecast")
 
         if "price_forecast" in relevant_categories:
-            tasks.append(self._get_price_forecast())
+            tasks.append(self._get_price_forecast(context))
             task_names.append("price_forecast")
 
         if "alerts" in relevant_categories:
-            tasks.append(self._get_alerts())
+            tasks.append(self._get_alerts(context))
             task_names.append("alerts")
 
         if "savings" in relevant_categories:
-            tasks.append(self._get_savings())
+            tasks.append(self._get_savings(context))
             task_names.append("savings")
 
         if "production_plan" in relevant_categories:
-            tasks.append(self._get_production_plan())
+            tasks.append(self._get_production_plan(context))
             task_names.append("production_plan")
 
         if "analysis" in relevant_categories:
-            tasks.append(self._get_analysis())
+            tasks.append(self._get_analysis(context))
             task_names.append("analysis")
             # Añadir también analytics históricos
-            tasks.append(self._get_historical_analytics())
+            tasks.append(self._get_historical_analytics(context))
             task_names.append("historical_analytics")
 
         if "recommendations" in relevant_categories:
-            tasks.append(self._get_human_recommendation())
+            tasks.append(self._get_human_recommendation(context))
             task_names.append("human_recommendation")
 
         # Si no hay match específico, usar dashboard completo
         if len(relevant_categories) == 0:
-            tasks.append(self._get_full_dashboard())
+            tasks.append(self._get_full_dashboard(context))
             task_names.append("full_dashboard")
 
-        # 🚀 EJECUTAR TODAS LAS LLAMADAS EN PARALELO
-        logger.info(f"Ejecutando {len(tasks)} llamadas HTTP en paralelo: {task_names}")
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 🚀 EJECUTAR TODAS LAS CATEGORÍAS EN PARALELO
+        logger.info(f"Ejecutando {len(tasks)} secciones en paralelo: {task_names}")
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            context.close()
 
         # Construir contexto con resultados exitosos
-        context_parts = []
+        sections = []
         for i, result in enumerate(results):
             if isinstance(result, Exception):
                 logger.warning(f"Error en {task_names[i]}: {result}")
             else:
-                context_parts.append(result)
-
-        # Unir contextos
-        full_context = "\n\n".join(context_parts)
-
-        # Log tamaño aproximado (1 token ≈ 4 caracteres)
-        estimated_tokens = len(full_context) // 4
-        logger.info(f"Contexto construido: ~{estimated_tokens} tokens")
-
-        return full_context
+                sections.append((task_names[i], result))
+
+        # Sin duplicados y dentro del presupuesto de tokens
+        sections, compression = compress_context(sections, self.max_tokens)
+        self._record_compression(compression)
+        full_context = "\n\n".join(text for _, text in sections)
+
+        logger.info(
+            f"Contexto construido: ~{compression['tokens_after']} tokens "
+            f"(antes de comprimir ~{compression['tokens_before']}, fuentes: {context.fetched})"
+        )
+
+        return ChatContext(
+            full_context,
+            fingerprint=context.fingerprint(),
+            sections=[name for name, _ in sections],
+            compression=compression
+        )
+
+    def _record_compression(self, compression: Dict[str, Any]):
+        stats = self.compression_stats
+        stats["contexts"] += 1
+        stats["tokens_before"] += compression["tokens_before"]
+        stats["tokens_after"] += compression["tokens_after"]
+        stats["deduplicated_blocks"] += compression["deduplicated_blocks"]
+        stats["dropped_sections"] += len(compression["dropped_sections"])
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """Tokens de contexto ahorrados por compress_context()."""
+        stats = self.compression_stats
+        return {
+            **stats,
+            "saved_tokens": stats["tokens_before"] - stats["tokens_after"],
+            "max_tokens": self.max_tokens
+        }
 
     def _detect_categories(self, question_lower: str) -> List[str]:
         """Detecta categorías relevantes basándose en keywords."""
@@ -158,43 +305,41 @@ class ChatbotContextService:
 
         return detected
 
-    async def _get_current_status(self) -> str:
+    async def _get_current_status(self, context: ChatContextSnapshot) -> str:
         """Estado actual básico (siempre incluido)."""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(f"{self.base_url}/dashboard/complete")
-            data = response.json()
-
-            # Extraer datos del dashboard completo
-            current = data.get('current_info', {})
-            energy = current.get('energy', {})
-            weather = current.get('weather', {})
-
-            # Log datos para debugging
-            logger.info(f"Dashboard data keys: {list(data.keys())}")
-            logger.info(f"Current info keys: {list(current.keys())}")
-            logger.info(f"Energy data: {energy}")
-            logger.info(f"Weather data: {weather}")
-
-            # Construir contexto con valores reales
-            price = energy.get('price_eur_kwh', 'N/A')
-            temp = weather.get('temperature', 'N/A')
-            humidity = weather.get('humidity', 'N/A')
-            pressure = weather.get('pressure', 'N/A')
-            comfort = weather.get('comfort_index', 'N/A')
-            prod_status = current.get('production_status', 'N/A')
-            efficiency = current.get('factory_efficiency', 'N/A')
-
-            # Extraer predicciones sklearn (restauradas Oct 22, 2025)
-            predictions = data.get('predictions', {})
-            energy_opt = predictions.get('energy_optimization', {})
-            prod_rec = predictions.get('production_recommendation', {})
-
-            energy_score = energy_opt.get('score', 'N/A')
-            energy_rec = energy_opt.get('recommendation', 'N/A')
-            prod_class = prod_rec.get('class', 'N/A')
-            prod_confidence = prod_rec.get('confidence', 'N/A')
-
-            context = f"""ESTADO ACTUAL CHOCOLATE FACTORY
+        data = await context.get("dashboard")
+
+        # Extraer datos del dashboard completo
+        current = data.get('current_info', {})
+        energy = current.get('energy', {})
+        weather = current.get('weather', {})
+
+        # Log datos para debugging
+        logger.info(f"Dashboard data keys: {list(data.keys())}")
+        logger.info(f"Current info keys: {list(current.keys())}")
+        logger.info(f"Energy data: {energy}")
+        logger.info(f"Weather data: {weather}")
+
+        # Construir contexto con valores reales
+        price = energy.get('price_eur_kwh', 'N/A')
+        temp = weather.get('temperature', 'N/A')
+        humidity = weather.get('humidity', 'N/A')
+        pressure = weather.get('pressure', 'N/A')
+        comfort = weather.get('comfort_index', 'N/A')
+        prod_status = current.get('production_status', 'N/A')
+        efficiency = current.get('factory_efficiency', 'N/A')
+
+        # Extraer predicciones sklearn (restauradas Oct 22, 2025)
+        predictions = data.get('predictions', {})
+        energy_opt = predictions.get('energy_optimization', {})
+        prod_rec = predictions.get('production_recommendation', {})
+
+        energy_score = energy_opt.get('score', 'N/A')
+        energy_rec = energy_opt.get('recommendation', 'N/A')
+        prod_class = prod_rec.get('class', 'N/A')
+        prod_confidence = prod_rec.get('confidence', 'N/A')
+
+        status_text = f"""ESTADO ACTUAL CHOCOLATE FACTORY
 Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M')}
 Precio energía actual: {price} €/kWh
 Tendencia precio: {energy.get('trend', 'N/A')}
@@ -209,44 +354,40 @@ Eficiencia fábrica: {efficiency}%
 Optimización energética: {energy_score}/100 ({energy_rec})
 Recomendación producción: {prod_class} (confianza {prod_confidence}%)"""
 
-            logger.info(f"Context built successfully with {len(context)} chars")
-            return context
+        logger.info(f"Context built successfully with {len(status_text)} chars")
+        return status_text
 
-    async def _get_optimal_windows(self) -> str:
+    async def _get_optimal_windows(self, context: ChatContextSnapshot) -> str:
         """Próximas ventanas óptimas (Sprint 09)."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/insights/optimal-windows")
-            data = response.json()
+        data = await context.get("optimal_windows")
 
-            windows = data.get('optimal_windows', [])[:5]  # Limitar a 5 ventanas
+        windows = data.get('optimal_windows', [])[:5]  # Limitar a 5 ventanas
 
-            windows_text = "PRÓXIMAS VENTANAS ÓPTIMAS DE PRODUCCIÓN (Sprint 09):\n\n"
-            for w in windows:
-                date_str = w.get('datetime', '')[:10]  # YYYY-MM-DD
-                hours = w.get('hours', 'N/A')
-                price = w.get('avg_price_eur_kwh', 0)
-                process = w.get('recommended_process', 'N/A')
-                savings = w.get('estimated_savings_eur', 0)
-                quality = w.get('quality', 'N/A')
+        windows_text = "PRÓXIMAS VENTANAS ÓPTIMAS DE PRODUCCIÓN (Sprint 09):\n\n"
+        for w in windows:
+            date_str = w.get('datetime', '')[:10]  # YYYY-MM-DD
+            hours = w.get('hours', 'N/A')
+            price = w.get('avg_price_eur_kwh', 0)
+            process = w.get('recommended_process', 'N/A')
+            savings = w.get('estimated_savings_eur', 0)
+            quality = w.get('quality', 'N/A')
 
-                windows_text += f"📅 {date_str} · {hours}\n"
-                windows_text += f"   💰 Precio: {price:.4f} €/kWh ({quality})\n"
-                windows_text += f"   🏭 Proceso: {process}\n"
-                windows_text += f"   💵 Ahorro estimado: {savings:.2f} €\n\n"
+            windows_text += f"📅 {date_str} · {hours}\n"
+            windows_text += f"   💰 Precio: {price:.4f} €/kWh ({quality})\n"
+            windows_text += f"   🏭 Proceso: {process}\n"
+            windows_text += f"   💵 Ahorro estimado: {savings:.2f} €\n\n"
 
-            return windows_text
+        return windows_text
 
-    async def _get_weekly_forecast(self) -> str:
+    async def _get_weekly_forecast(self, context: ChatContextSnapshot) -> str:
         """Forecast Prophet 7 días (calendar_days del dashboard)."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/dashboard/complete")
-            data = response.json()
+        data = await context.get("dashboard")
 
-            weekly = data.get('weekly_forecast', {})
-            days = weekly.get('calendar_days', [])
-            summary = weekly.get('summary', {})
+        weekly = data.get('weekly_forecast', {})
+        days = weekly.get('calendar_days', [])
+        summary = weekly.get('summary', {})
 
-            forecast_text = f"""FORECAST PROPHET ML - PRÓXIMOS 7 DÍAS ({summary.get('period', {}).get('start_date', 'N/A')} a {summary.get('period', {}).get('end_date', 'N/A')}):
+        forecast_text = f"""FORECAST PROPHET ML - PRÓXIMOS 7 DÍAS ({summary.get('period', {}).get('start_date', 'N/A')} a {summary.get('period', {}).get('end_date', 'N/A')}):
 
 📊 RESUMEN SEMANAL:
    • Precio mínimo: {summary.get('price_summary', {}).get('min_price', 0):.4f} €/kWh
@@ -256,52 +397,39 @@ Recomendación producción: {prod_class} (confianza {prod_confidence}%)"""
 
 📅 PRECIOS DIARIOS PREVISTOS:
 """
-            # Mostrar solo los próximos 5 días (no todos los 7)
-            for day in days[1:6]:  # Saltar hoy, mostrar 5 días siguientes
-                date = day.get('date', '')
-                day_name = day.get('day_name', '')
-                price = day.get('avg_price_eur_kwh', 0)
-                temp = day.get('avg_temperature', 0)
-                icon = day.get('recommendation_icon', '⚪')
+        # Mostrar solo los próximos 5 días (no todos los 7)
+        for day in days[1:6]:  # Saltar hoy, mostrar 5 días siguientes
+            date = day.get('date', '')
+            day_name = day.get('day_name', '')
+            price = day.get('avg_price_eur_kwh', 0)
+            temp = day.get('avg_temperature', 0)
+            icon = day.get('recommendation_icon', '⚪')
 
-                forecast_text += f"   {icon} {date} ({day_name}): {price:.4f} €/kWh, {temp:.1f}°C\n"
+            forecast_text += f"   {icon} {date} ({day_name}): {price:.4f} €/kWh, {temp:.1f}°C\n"
 
-            return forecast_text
+        return forecast_text
 
-    async def _get_price_forecast(self) -> str:
+    async def _get_price_forecast(self, context: ChatContextSnapshot) -> str:
         """Precios REE y análisis de desviación."""
-        from datetime import date, timedelta
-
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Obtener último precio REE
-            latest_response = await client.get(f"{self.base_url}/ree/prices/latest")
-            latest = latest_response.json()
-
-            # Obtener estadísticas REE (últimos 30 días)
-            end_date = date.today()
-            start_date = end_date - timedelta(days=30)
-            stats_response = await client.get(
-                f"{self.base_url}/ree/prices/stats",
-                params={"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
-            )
-            stats = stats_response.json()
-
-            price_now = latest.get('price_eur_kwh', 0)
-            timestamp = latest.get('timestamp', 'N/A')
-            hour = timestamp[11:16] if len(timestamp) > 11 else 'N/A'
-
-            # Clasificar precio actual
-            if price_now < 0.10:
-                icon = "🟢"
-                label = "EXCELENTE"
-            elif price_now < 0.15:
-                icon = "🟡"
-                label = "BUENO"
-            else:
-                icon = "🔴"
-                label = "ALTO"
-
-            forecast_text = f"""ANÁLISIS PRECIOS ENERGÍA REE (últimos 30 días):
+        # Último precio REE + estadísticas REE (últimos 30 días)
+        latest, stats = await asyncio.gather(context.get("latest_price"), context.get("price_stats"))
+
+        price_now = latest.get('price_eur_kwh', 0)
+        timestamp = latest.get('timestamp', 'N/A')
+        hour = timestamp[11:16] if len(timestamp) > 11 else 'N/A'
+
+        # Clasificar precio actual
+        if price_now < 0.10:
+            icon = "🟢"
+            label = "EXCELENTE"
+        elif price_now < 0.15:
+            icon = "🟡"
+            label = "BUENO"
+        else:
+            icon = "🔴"
+            label = "ALTO"
+
+        forecast_text = f"""ANÁLISIS PRECIOS ENERGÍA REE (últimos 30 días):
 
 💰 Precio actual ({hour}h): {icon} {price_now:.4f} €/kWh ({label})
 
@@ -314,33 +442,29 @@ Recomendación producción: {prod_class} (confianza {prod_confidence}%)"""
 
 RECOMENDACIÓN: {'PRODUCIR AHORA' if price_now < 0.10 else 'ESPERAR A VALLE' if price_now > 0.15 else 'PRODUCCIÓN MODERADA'}"""
 
-            return forecast_text
+        return forecast_text
 
-    async def _get_alerts(self) -> str:
+    async def _get_alerts(self, context: ChatContextSnapshot) -> str:
         """Alertas predictivas (Sprint 09)."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/insights/alerts")
-            data = response.json()
+        data = await context.get("alerts")
 
-            alerts_text = f"ALERTAS ACTIVAS ({data.get('total_alerts', 0)}):\n"
-            for alert in data.get('alerts', [])[:5]:  # Limitar a 5 alertas
-                alerts_text += f"- [{alert['severity']}] {alert['message']}\n"
+        alerts_text = f"ALERTAS ACTIVAS ({data.get('total_alerts', 0)}):\n"
+        for alert in data.get('alerts', [])[:5]:  # Limitar a 5 alertas
+            alerts_text += f"- [{alert['severity']}] {alert['message']}\n"
 
-            return alerts_text
+        return alerts_text
 
-    async def _get_savings(self) -> str:
+    async def _get_savings(self, context: ChatContextSnapshot) -> str:
         """Tracking de ahorros (Sprint 09)."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/insights/savings-tracking")
-            data = response.json()
+        data = await context.get("savings")
 
-            # Extraer correctamente los datos del JSON
-            daily = data.get('daily_savings', {})
-            weekly = data.get('weekly_projection', {})
-            monthly = data.get('monthly_tracking', {})
-            annual = data.get('annual_projection', {})
+        # Extraer correctamente los datos del JSON
+        daily = data.get('daily_savings', {})
+        weekly = data.get('weekly_projection', {})
+        monthly = data.get('monthly_tracking', {})
+        annual = data.get('annual_projection', {})
 
-            savings_text = f"""TRACKING AHORROS ENERGÉTICOS (Sprint 09):
+        savings_text = f"""TRACKING AHORROS ENERGÉTICOS (Sprint 09):
 
 💰 AHORROS ACTUALES:
    • Hoy: {daily.get('savings_eur', 0):.2f} € ({daily.get('savings_pct', 0):.1f}% ahorro)
@@ -355,37 +479,30 @@ RECOMENDACIÓN: {'PRODUCIR AHORA' if price_now < 0.10 else 'ESPERAR A VALLE' if
 🎯 ROI: {annual.get('roi_description', 'N/A')}
 📈 Estado mensual: {monthly.get('status', 'N/A')}"""
 
-            return savings_text
+        return savings_text
 
-    async def _get_production_plan(self) -> str:
+    async def _get_production_plan(self, context: ChatContextSnapshot) -> str:
         """Plan de producción optimizado (Sprint 08)."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                f"{self.base_url}/optimize/production/daily",
-                json={"target_kg": 200}
-            )
-            data = response.json()
+        data = await context.get("production_plan")
 
-            plan_text = "PLAN PRODUCCIÓN OPTIMIZADO (Hoy):\n"
-            for batch in data.get('recommended_batches', [])[:3]:  # Limitar a 3 batches
-                plan_text += f"- {batch['start_hour']}:00-{batch['end_hour']}:00h: {batch['process']} (Precio: {batch['avg_price']} €/kWh)\n"
+        plan_text = f"PLAN PRODUCCIÓN OPTIMIZADO ({data.get('target_date', 'N/A')[:10]}):\n"
+        for batch in data.get('plan', {}).get('batches', [])[:3]:  # Limitar a 3 batches
+            plan_text += f"- {batch['start_time']}-{batch['end_time']}h: {batch['quality_type']} (Precio: {batch['avg_price_eur_kwh']} €/kWh)\n"
 
-            return plan_text
+        return plan_text
 
-    async def _get_analysis(self) -> str:
+    async def _get_analysis(self, context: ChatContextSnapshot) -> str:
         """Análisis histórico SIAR (Sprint 07)."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/dashboard/complete")
-            data = response.json()
+        data = await context.get("dashboard")
 
-            siar = data.get('siar_analysis', {}).get('seasonal_patterns', {})
-            thresholds = data.get('siar_analysis', {}).get('thresholds', {})
+        siar = data.get('siar_analysis', {}).get('seasonal_patterns', {})
+        thresholds = data.get('siar_analysis', {}).get('thresholds', {})
 
-            best_month = siar.get('best_month', {})
-            worst_month = siar.get('worst_month', {})
-            temp_thresh = thresholds.get('temperature', {})
+        best_month = siar.get('best_month', {})
+        worst_month = siar.get('worst_month', {})
+        temp_thresh = thresholds.get('temperature', {})
 
-            analysis_text = f"""ANÁLISIS HISTÓRICO (25 años SIAR - 88,935 registros):
+        analysis_text = f"""ANÁLISIS HISTÓRICO (25 años SIAR - 88,935 registros):
 
 📅 MEJOR MES: {best_month.get('name', 'N/A')}
    • Eficiencia: {best_month.get('efficiency_score', 0):.1f}%
@@ -401,20 +518,18 @@ RECOMENDACIÓN: {'PRODUCIR AHORA' if price_now < 0.10 else 'ESPERAR A VALLE' if
    • P95: {temp_thresh.get('p95', 'N/A')}°C
    • P99: {temp_thresh.get('p99', 'N/A')}°C"""
 
-            return analysis_text
+        return analysis_text
 
-    async def _get_historical_analytics(self) -> str:
+    async def _get_historical_analytics(self, context: ChatContextSnapshot) -> str:
         """Analytics históricos con ahorro anual proyectado."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/dashboard/complete")
-            data = response.json()
+        data = await context.get("dashboard")
 
-            analytics = data.get('historical_analytics', {})
-            factory = analytics.get('factory_metrics', {})
-            price = analytics.get('price_analysis', {})
-            optimization = analytics.get('optimization_potential', {})
+        analytics = data.get('historical_analytics', {})
+        factory = analytics.get('factory_metrics', {})
+        price = analytics.get('price_analysis', {})
+        optimization = analytics.get('optimization_potential', {})
 
-            analytics_text = f"""ANALYTICS HISTÓRICOS (Últimos {analytics.get('analysis_period', 'N/A')}):
+        analytics_text = f"""ANALYTICS HISTÓRICOS (Últimos {analytics.get('analysis_period', 'N/A')}):
 
 💰 POTENCIAL DE AHORRO:
    • Ahorro anual proyectado: {optimization.get('annual_savings_projection', 0):.2f} €
@@ -431,20 +546,18 @@ RECOMENDACIÓN: {'PRODUCIR AHORA' if price_now < 0.10 else 'ESPERAR A VALLE' if
    • Volatilidad: {price.get('volatility_coefficient', 0):.1%}
    • Rango precios: {price.get('price_range_eur_kwh', 0):.4f} €/kWh"""
 
-            return analytics_text
+        return analytics_text
 
-    async def _get_human_recommendation(self) -> str:
+    async def _get_human_recommendation(self, context: ChatContextSnapshot) -> str:
         """Recomendación del sistema con lógica de negocio."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/dashboard/complete")
-            data = response.json()
+        data = await context.get("dashboard")
 
-            human_rec = data.get('recommendations', {}).get('human_recommendation', {})
-            main_msg = human_rec.get('main_message', {})
-            next_window = human_rec.get('next_window', {})
-            economic = human_rec.get('economic_impact', {})
+        human_rec = data.get('recommendations', {}).get('human_recommendation', {})
+        main_msg = human_rec.get('main_message', {})
+        next_window = human_rec.get('next_window', {})
+        economic = human_rec.get('economic_impact', {})
 
-            rec_text = f"""RECOMENDACIÓN DEL SISTEMA:
+        rec_text = f"""RECOMENDACIÓN DEL SISTEMA:
 
 🎯 {main_msg.get('title', 'N/A')}
    Situación: {main_msg.get('situation', 'N/A')}
@@ -459,14 +572,14 @@ RECOMENDACIÓN: {'PRODUCIR AHORA' if price_now < 0.10 else 'ESPERAR A VALLE' if
    • Beneficio estimado: {next_window.get('estimated_benefit', 'N/A')}
    • Horas hasta óptima: {next_window.get('hours_until_optimal', 0):.1f}h"""
 
-            # Añadir acciones prioritarias si existen
-            actions = main_msg.get('priority_actions', [])
-            if actions:
-                rec_text += f"\n\n🔧 ACCIONES PRIORITARIAS:\n"
-                for action in actions[:3]:  # Máximo 3 acciones
-                    rec_text += f"   • {action}\n"
+        # Añadir acciones prioritarias si existen
+        actions = main_msg.get('priority_actions', [])
+        if actions:
+            rec_text += f"\n\n🔧 ACCIONES PRIORITARIAS:\n"
+            for action in actions[:3]:  # Máximo 3 acciones
+                rec_text += f"   • {action}\n"
 
-            return rec_text
+        return rec_text
 
     async def _get_production_context(self) -> str:
         """Contexto de procesos de producción de chocolate."""
@@ -489,21 +602,19 @@ RECOMENDACIÓN: {'PRODUCIR AHORA' if price_now < 0.10 else 'ESPERAR A VALLE' if
    • P2 (Llano): Operación moderada
    • P3 (Valle 00-07h): PRIORIZAR conchado intensivo"""
 
-    async def _get_full_dashboard(self) -> str:
+    async def _get_full_dashboard(self, context: ChatContextSnapshot) -> str:
         """Dashboard completo (fallback) - TODOS los datos disponibles."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{self.base_url}/dashboard/complete")
-            data = response.json()
+        data = await context.get("dashboard")
 
-            # Extraer SIAR analysis
-            siar = data.get('siar_analysis', {}).get('seasonal_patterns', {})
-            best_month = siar.get('best_month', {}).get('name', 'N/A')
-            worst_month = siar.get('worst_month', {}).get('name', 'N/A')
+        # Extraer SIAR analysis
+        siar = data.get('siar_analysis', {}).get('seasonal_patterns', {})
+        best_month = siar.get('best_month', {}).get('name', 'N/A')
+        worst_month = siar.get('worst_month', {}).get('name', 'N/A')
 
-            # Current info
-            current = data.get('current_info', {})
+        # Current info
+        current = data.get('current_info', {})
 
-            dashboard_text = f"""RESUMEN COMPLETO SISTEMA:
+        dashboard_text = f"""RESUMEN COMPLETO SISTEMA:
 
 📊 ESTADO ACTUAL:
 • Precio: {current.get('energy', {}).get('price_eur_kwh', 'N/A')} €/kWh
@@ -521,4 +632,4 @@ Consulta endpoints específicos para:
 - Forecast Prophet: /predict/prices/*
 - Plan producción: /optimize/production/daily"""
 
-            return dashboard_text
+        return dashboard_text
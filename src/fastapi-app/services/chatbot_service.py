@@ -8,12 +8,14 @@ Integración con Claude Haiku API para consultas conversacionales.
 Optimizado para respuestas concisas y costo bajo.
 """
 
+import hashlib
 import logging
 import time
-from typing import Dict, Optional
-from anthropic import Anthropic, APIError, APITimeoutError
+from typing import AsyncIterator, Dict, Optional
+from anthropic import AsyncAnthropic, APIError, APITimeoutError
 
 from core.config import settings
+from services.chatbot_answer_cache import ChatbotAnswerCache
 from services.chatbot_context_service import ChatbotContextService
 
 logger = logging.getLogger(__name__)
@@ -28,11 +30,16 @@ class ChatbotService:
     - Context optimizado (< 2000 tokens)
     - Cost tracking automático
     - Error handling robusto
+    - Caché de respuestas por pregunta normalizada + datos del contexto
     """
 
     def __init__(self):
-        self.client = Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.CHATBOT_API_BASE_URL
+        )
         self.context_service = ChatbotContextService()
+        self.answer_cache = ChatbotAnswerCache()
         self.model = settings.CHATBOT_MODEL
         self.max_tokens = settings.CHATBOT_MAX_TOKENS
 
@@ -79,7 +86,7 @@ REGLAS CRÍTICAS:
             user_id: ID del usuario (para logging)
 
         Returns:
-            Dict con: answer, tokens, latency_ms, cost_usd
+            Dict con: answer, tokens, latency_ms, cost_usd, cached
         """
         start_time = time.time()
 
@@ -88,8 +95,79 @@ REGLAS CRÍTICAS:
             logger.info(f"User {user_id}: '{question}'")
             context = await self.context_service.build_context(question)
 
-            # 2. Preparar mensaje para Claude
-            user_message = f"""CONTEXTO:
+            # 2. Misma pregunta con los mismos datos: respuesta guardada
+            cache_key = self._cache_key(question, context)
+            cached = self.answer_cache.get(cache_key)
+            if cached is not None:
+                return self._cached_result(cached, start_time)
+
+            # 3. Llamar a Claude Haiku API (async: no bloquea el event loop)
+            logger.info(f"Calling Claude Haiku API...")
+            message = await self.client.messages.create(**self._build_request(context, question))
+
+            # 4. Extraer respuesta + métricas
+            result = self._build_result(message.content[0].text, message.usage, start_time)
+            self.answer_cache.put(cache_key, result)
+
+        except Exception as e:
+            result = self._handle_error(e, start_time)
+
+        self.answer_cache.record_latency(False, result["latency_ms"])
+        return result
+
+    async def ask_stream(self, question: str, user_id: Optional[str] = None) -> AsyncIterator[Dict]:
+        """
+        Como ask(), pero emitiendo la respuesta de Claude token a token.
+
+        Eventos (``{"event": ..., "data": ...}``):
+        - ``token``: ``{"text": "..."}`` por cada fragmento de texto (un solo
+          token con la respuesta completa si viene de la caché)
+        - ``done``: el mismo dict que ask() + ``first_token_ms``
+        - ``error``: el dict de error de ask() (también tras tokens parciales)
+
+        Args:
+            question: Pregunta del usuario
+            user_id: ID del usuario (para logging)
+        """
+        start_time = time.time()
+
+        try:
+            logger.info(f"User {user_id} (stream): '{question}'")
+            context = await self.context_service.build_context(question)
+
+            cache_key = self._cache_key(question, context)
+            cached = self.answer_cache.get(cache_key)
+            if cached is not None:
+                result = self._cached_result(cached, start_time)
+                result["first_token_ms"] = result["latency_ms"]
+                yield {"event": "token", "data": {"text": result["answer"]}}
+                yield {"event": "done", "data": result}
+                return
+
+            first_token_ms = None
+            logger.info("Streaming Claude Haiku API...")
+            async with self.client.messages.stream(**self._build_request(context, question)) as stream:
+                async for text in stream.text_stream:
+                    if first_token_ms is None:
+                        first_token_ms = int((time.time() - start_time) * 1000)
+                    yield {"event": "token", "data": {"text": text}}
+                message = await stream.get_final_message()
+
+            answer = "".join(block.text for block in message.content if block.type == "text")
+            result = self._build_result(answer, message.usage, start_time)
+            self.answer_cache.put(cache_key, result)
+            self.answer_cache.record_latency(False, result["latency_ms"])
+            result["first_token_ms"] = first_token_ms
+            yield {"event": "done", "data": result}
+
+        except Exception as e:
+            result = self._handle_error(e, start_time)
+            self.answer_cache.record_latency(False, result["latency_ms"])
+            yield {"event": "error", "data": result}
+
+    def _build_request(self, context: str, question: str) -> Dict:
+        """Parámetros de messages.create / messages.stream."""
+        user_message = f"""CONTEXTO:
 {context}
 
 PREGUNTA DEL USUARIO:
@@ -97,70 +175,87 @@ PREGUNTA DEL USUARIO:
 
 Responde de forma concisa y accionable basándote SOLO en el contexto anterior."""
 
-            # 3. Llamar a Claude Haiku API
-            logger.info(f"Calling Claude Haiku API...")
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                system=self.system_prompt,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ]
-            )
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "system": self.system_prompt,
+            "messages": [
+                {"role": "user", "content": user_message}
+            ]
+        }
 
-            # 4. Extraer respuesta
-            answer = message.content[0].text
-
-            # 5. Calcular métricas
-            latency_ms = int((time.time() - start_time) * 1000)
-            tokens = {
-                "input": message.usage.input_tokens,
-                "output": message.usage.output_tokens,
-                "total": message.usage.input_tokens + message.usage.output_tokens
-            }
-
-            # 6. Calcular costo (Haiku pricing)
-            cost_usd = self._calculate_cost(
-                message.usage.input_tokens,
-                message.usage.output_tokens
-            )
+    def _cache_key(self, question: str, context: str) -> str:
+        """Pregunta normalizada + fingerprint de los datos del contexto."""
+        fingerprint = getattr(context, "fingerprint", None)
+        if fingerprint is None:  # Contexto sin metadatos: hash del propio texto
+            fingerprint = hashlib.sha256(context.encode("utf-8")).hexdigest()[:16]
+        return self.answer_cache.make_key(question, fingerprint)
+
+    def _cached_result(self, cached: Dict, start_time: float) -> Dict:
+        """Respuesta de la caché: sin tokens ni costo nuevos."""
+        latency_ms = int((time.time() - start_time) * 1000)
+        self.answer_cache.record_latency(True, latency_ms)
+        logger.info(f"Answer cache hit ({latency_ms}ms, {cached['tokens']['total']} tokens ahorrados)")
+        return {
+            **cached,
+            "tokens": {"input": 0, "output": 0, "total": 0},
+            "latency_ms": latency_ms,
+            "cost_usd": 0.0,
+            "cached": True
+        }
 
-            logger.info(
-                f"Response: {len(answer)} chars, "
-                f"{tokens['total']} tokens, "
-                f"{latency_ms}ms, "
-                f"${cost_usd:.6f}"
-            )
+    def _build_result(self, answer: str, usage, start_time: float) -> Dict:
+        """Respuesta + tokens, latencia y costo."""
+        latency_ms = int((time.time() - start_time) * 1000)
+        tokens = {
+            "input": usage.input_tokens,
+            "output": usage.output_tokens,
+            "total": usage.input_tokens + usage.output_tokens
+        }
 
-            return {
-                "answer": answer,
-                "tokens": tokens,
-                "latency_ms": latency_ms,
-                "cost_usd": cost_usd,
-                "model": self.model,
-                "success": True
-            }
-
-        except APITimeoutError as e:
-            logger.error(f"Claude API timeout: {e}")
+        # Calcular costo (Haiku pricing)
+        cost_usd = self._calculate_cost(usage.input_tokens, usage.output_tokens)
+
+        logger.info(
+            f"Response: {len(answer)} chars, "
+            f"{tokens['total']} tokens, "
+            f"{latency_ms}ms, "
+            f"${cost_usd:.6f}"
+        )
+
+        return {
+            "answer": answer,
+            "tokens": tokens,
+            "latency_ms": latency_ms,
+            "cost_usd": cost_usd,
+            "model": self.model,
+            "success": True,
+            "cached": False
+        }
+
+    def _handle_error(self, error: Exception, start_time: float) -> Dict:
+        """Error de Claude API (o inesperado) → respuesta de error estandarizada."""
+        latency_ms = int((time.time() - start_time) * 1000)
+
+        if isinstance(error, APITimeoutError):
+            logger.error(f"Claude API timeout: {error}")
             return self._error_response(
                 "⏱️ Timeout: El servicio está tardando demasiado. Inténtalo de nuevo.",
-                latency_ms=int((time.time() - start_time) * 1000)
+                latency_ms=latency_ms
             )
 
-        except APIError as e:
-            logger.error(f"Claude API error: {e}")
+        if isinstance(error, APIError):
+            logger.error(f"Claude API error: {error}")
             return self._error_response(
                 "❌ Error del servicio Claude. Por favor, inténtalo más tarde.",
-                latency_ms=int((time.time() - start_time) * 1000)
+                latency_ms=latency_ms
             )
 
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}", exc_info=True)
-            return self._error_response(
-                "⚠️ Error inesperado. Contacta al administrador si persiste.",
-                latency_ms=int((time.time() - start_time) * 1000)
-            )
+        logger.error(f"Unexpected error: {error}", exc_info=error)
+        return self._error_response(
+            "⚠️ Error inesperado. Contacta al administrador si persiste.",
+            latency_ms=latency_ms
+        )
 
     def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """
@@ -182,7 +277,8 @@ Responde de forma concisa y accionable basándote SOLO en el contexto anterior."
             "latency_ms": latency_ms,
             "cost_usd": 0.0,
             "model": self.model,
-            "success": False
+            "success": False,
+            "cached": False
         }
 
 
@@ -9,13 +9,18 @@ Servicio para consolidar información del dashboard Node-RED:
 - Alertas y notificaciones
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable
 from dataclasses import dataclass
 
+from core.cache import single_flight
+from core.config import settings
+
 from infrastructure.external_apis import REEAPIClient, OpenWeatherMapAPIClient  # Sprint 15
-from .legacy.ml_models import ChocolateMLModels  # Legacy - not actively used
+from .legacy.ml_models import chocolate_ml_models  # Legacy - not actively used
 from domain.ml.feature_engineering import ChocolateFeatureEngine  # Sprint 15
 from domain.recommendations.business_logic_service import get_business_logic_service  # Sprint 15
 from .price_forecasting_service import PriceForecastingService
@@ -49,7 +54,7 @@ class DashboardService:
         if ml_models is not None:
             self.ml_models = ml_models
         else:
-            self.ml_models = ChocolateMLModels()
+            self.ml_models = chocolate_ml_models  # Shared module instance
 
         if feature_engine is not None:
             self.feature_engine = feature_engine
@@ -57,27 +62,59 @@ class DashboardService:
             self.feature_engine = ChocolateFeatureEngine()
         
     async def get_complete_dashboard_data(self) -> Dict[str, Any]:
-        """Obtiene todos los datos consolidados para el dashboard"""
+        """
+        Obtiene todos los datos consolidados para el dashboard.
+
+        Las secciones se resuelven como un pequeño grafo de dependencias:
+        current_info, weekly_forecast y siar_analysis arrancan en paralelo;
+        predictions espera a current_info; recommendations y alerts
+        dependen de ambos. Cada sección tiene su propio timeout y un
+        resultado parcial de fallback, y su wall time se reporta en
+        ``metadata.sections``.
+        """
         try:
-            # 1. Información actual
-            logger.info("📊 Getting complete dashboard data - starting with current_info")
-            current_info = await self._get_current_info()
-            logger.info(f"📊 current_info result: {bool(current_info)} - keys: {list(current_info.keys()) if current_info else []}")
-            
-            # 2. Predicciones ML
-            predictions = await self._get_ml_predictions(current_info)
-            
-            # 3. Recomendaciones
-            recommendations = self._generate_recommendations(current_info, predictions)
-            
-            # 4. Alertas
-            alerts = self._generate_alerts(current_info, predictions)
-            
-            # 5. Pronóstico semanal con heatmap
-            weekly_forecast = await self._get_weekly_forecast_heatmap()
-            
-            # 6. SIAR Historical Analysis
-            siar_analysis = await self._get_siar_analysis()
+            logger.info("📊 Getting complete dashboard data - fanning out independent sections")
+            pipeline_start = time.perf_counter()
+            timings: Dict[str, Dict[str, Any]] = {}
+
+            # 1. Secciones independientes (en paralelo)
+            current_task = asyncio.create_task(self._run_section(
+                "current_info", self._get_current_info, self._fallback_current_info, timings
+            ))
+            weekly_task = asyncio.create_task(self._run_section(
+                "weekly_forecast", self._get_weekly_forecast_heatmap, self._fallback_weekly_forecast, timings
+            ))
+            siar_task = asyncio.create_task(self._run_section(
+                "siar_analysis", self._get_siar_analysis, self._fallback_siar_analysis, timings
+            ))
+
+            try:
+                current_info = await current_task
+                logger.info(f"📊 current_info result: {bool(current_info)} - keys: {list(current_info.keys()) if current_info else []}")
+
+                # 2. Predicciones ML (dependen de current_info)
+                predictions = await self._run_section(
+                    "predictions",
+                    lambda: self._get_ml_predictions(current_info),
+                    self._fallback_predictions,
+                    timings
+                )
+
+                # 3-4. Recomendaciones y alertas (síncronas, dependen de 1 y 2)
+                section_start = time.perf_counter()
+                recommendations = self._generate_recommendations(current_info, predictions)
+                timings["recommendations"] = self._section_timing(section_start, "ok")
+
+                section_start = time.perf_counter()
+                alerts = self._generate_alerts(current_info, predictions)
+                timings["alerts"] = self._section_timing(section_start, "ok")
+
+                # 5-6. Pronóstico semanal + SIAR (ya en curso)
+                weekly_forecast, siar_analysis = await asyncio.gather(weekly_task, siar_task)
+            finally:
+                for task in (current_task, weekly_task, siar_task):
+                    if not task.done():
+                        task.cancel()
 
             dashboard_data = {
                 "🏢": "Chocolate Factory - Enhanced Dashboard",
@@ -104,16 +141,103 @@ class DashboardService:
                         "historical_integration": "✅ 131k+ records training data"
                     }
                 },
+                "metadata": {
+                    "sections": timings,
+                    "total_seconds": round(time.perf_counter() - pipeline_start, 3),
+                    "degraded_sections": sorted(
+                        name for name, timing in timings.items() if timing["status"] != "ok"
+                    )
+                },
                 "timestamp": datetime.now().isoformat()
             }
             
-            logger.info("✅ Dashboard data consolidated successfully")
+            logger.info(
+                f"✅ Dashboard data consolidated successfully in "
+                f"{dashboard_data['metadata']['total_seconds']:.2f}s"
+            )
             return dashboard_data
             
         except Exception as e:
             logger.error(f"❌ Failed to get dashboard data: {e}")
             raise
     
+    @staticmethod
+    def _section_timing(start: float, status: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wall time y estado de una sección del dashboard"""
+        timing = {"seconds": round(time.perf_counter() - start, 3), "status": status}
+        if timeout is not None:
+            timing["timeout_seconds"] = timeout
+        return timing
+
+    async def _run_section(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        fallback: Callable[[str], Any],
+        timings: Dict[str, Dict[str, Any]]
+    ) -> Any:
+        """
+        Ejecuta una sección con su presupuesto de tiempo.
+
+        Args:
+            name: Nombre de la sección (clave en DASHBOARD_SECTION_TIMEOUTS)
+            factory: Crea la corrutina de la sección
+            fallback: Construye el resultado parcial a partir del motivo del fallo
+            timings: Dict donde se registra el wall time de la sección
+
+        Returns:
+            Resultado de la sección, o el fallback si excede el timeout o falla
+        """
+        timeout = settings.DASHBOARD_SECTION_TIMEOUTS.get(name)
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(factory(), timeout=timeout)
+            timings[name] = self._section_timing(start, "ok", timeout)
+            return result
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ Dashboard section '{name}' exceeded {timeout}s, using fallback")
+            timings[name] = self._section_timing(start, "timeout", timeout)
+            return fallback(f"timeout after {timeout}s")
+        except Exception as e:
+            logger.error(f"❌ Dashboard section '{name}' failed: {e}")
+            timings[name] = self._section_timing(start, "error", timeout)
+            return fallback(str(e))
+
+    @staticmethod
+    def _fallback_current_info(reason: str) -> Dict[str, Any]:
+        """Sin información actual: las secciones dependientes usan sus defaults"""
+        return {}
+
+    @staticmethod
+    def _fallback_predictions(reason: str) -> Dict[str, Any]:
+        """Estructura básica de predicciones cuando Enhanced ML no responde"""
+        return {
+            "energy_optimization": {"score": 50, "recommendation": "moderate"},
+            "production_recommendation": {"class": "Moderate", "confidence": 50, "action": "Standard production"},
+            "enhanced_cost_analysis": {"total_cost_per_kg": 13.90, "cost_category": "unknown"},
+            "enhanced_recommendations": {"main_action": "standard_production", "overall_score": 50},
+            "error": reason
+        }
+
+    @staticmethod
+    def _fallback_weekly_forecast(reason: str) -> Dict[str, Any]:
+        """Heatmap vacío cuando el pronóstico semanal no está disponible"""
+        return {
+            "status": "error",
+            "message": f"Failed to generate weekly forecast: {reason}",
+            "calendar_days": [],
+            "summary": {}
+        }
+
+    @staticmethod
+    def _fallback_siar_analysis(reason: str) -> Dict[str, Any]:
+        """Análisis SIAR no disponible"""
+        return {
+            "status": "error",
+            "message": reason
+        }
+
+    @single_flight("dashboard.current_info")
     async def _get_current_info(self) -> Dict[str, Any]:
         """Obtiene información actual de precios y clima"""
         try:
@@ -271,6 +395,7 @@ class DashboardService:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return {}
     
+    @single_flight("dashboard.predictions")
     async def _get_ml_predictions(self, current_info: Dict[str, Any]) -> Dict[str, Any]:
         """Obtiene predicciones ML basadas en datos actuales - INTEGRADO CON ENHANCED ML"""
         try:
@@ -386,13 +511,7 @@ class DashboardService:
         except Exception as e:
             logger.error(f"❌ Error getting enhanced ML predictions: {e}")
             # Fallback to basic structure
-            return {
-                "energy_optimization": {"score": 50, "recommendation": "moderate"},
-                "production_recommendation": {"class": "Moderate", "confidence": 50, "action": "Standard production"},
-                "enhanced_cost_analysis": {"total_cost_per_kg": 13.90, "cost_category": "unknown"},
-                "enhanced_recommendations": {"main_action": "standard_production", "overall_score": 50},
-                "error": str(e)
-            }
+            return self._fallback_predictions(str(e))
     
     def _generate_recommendations(self, current_info: Dict[str, Any], predictions: Dict[str, Any]) -> Dict[str, Any]:
         """Genera recomendaciones operativas INTEGRADAS con Enhanced ML"""
@@ -863,6 +982,7 @@ class DashboardService:
 
         return round(efficiency, 1)
 
+    @single_flight("dashboard.weekly_forecast")
     async def _get_weekly_forecast_heatmap(self) -> Dict[str, Any]:
         """Genera datos de pronóstico semanal con heatmap para calendario"""
         try:
@@ -1079,12 +1199,7 @@ class DashboardService:
             
         except Exception as e:
             logger.error(f"❌ Error generating weekly forecast heatmap: {e}")
-            return {
-                "status": "error",
-                "message": f"Failed to generate weekly forecast: {str(e)}",
-                "calendar_days": [],
-                "summary": {}
-            }
+            return self._fallback_weekly_forecast(str(e))
     
     async def _get_next_hour_forecast(self) -> Dict[str, Any]:
         """Obtiene pronóstico para la próxima hora"""
@@ -1173,6 +1288,7 @@ class DashboardService:
                 "production_forecast": {"outlook": "moderate", "combined_score": 50}
             }
 
+    @single_flight("dashboard.siar_analysis")
     async def _get_siar_analysis(self) -> Dict[str, Any]:
         """Obtiene análisis histórico SIAR para el dashboard"""
         try:
@@ -1257,10 +1373,7 @@ class DashboardService:
 
         except Exception as e:
             logger.error(f"❌ Error getting SIAR analysis: {e}")
-            return {
-                "status": "error",
-                "message": str(e)
-            }
+            return self._fallback_siar_analysis(str(e))
 
 
 # Singleton service
@@ -0,0 +1,336 @@
+"""
+Dashboard Snapshot Service
+==========================
+
+Materializes the complete dashboard document in the background so that
+/dashboard/complete, /summary and /alerts are served from memory.
+
+- Rebuilt by the scheduler (periodic job) and after each REE/weather ingestion
+- Pre-serialized JSON bodies with a content hash used as ETag; the hash
+  skips build-time fields (timestamps, section timings) so an unchanged
+  dashboard keeps its ETag and clients get 304s
+- Stale-while-revalidate: a stale snapshot is served while a single
+  background rebuild runs; only a missing or expired snapshot blocks
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Build-time fields (any depth / top level only): new on every rebuild, not content
+VOLATILE_KEYS = frozenset({"timestamp", "last_update", "rules_loaded_at"})
+VOLATILE_TOP_LEVEL_KEYS = frozenset({"metadata"})
+
+
+def _without_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _without_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_without_volatile(v) for v in value]
+    return value
+
+
+def content_hash(document: Dict[str, Any]) -> str:
+    """Hash of the dashboard content, ignoring build-time fields."""
+    stable = {k: v for k, v in document.items() if k not in VOLATILE_TOP_LEVEL_KEYS}
+    body = json.dumps(
+        _without_volatile(jsonable_encoder(stable)),
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True
+    )
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class DashboardSnapshot:
+    """Pre-serialized dashboard views from one build."""
+    version: int
+    etag: str
+    built_at: float  # time.monotonic() at build end
+    built_at_iso: str
+    build_seconds: float
+    document: Dict[str, Any]
+    bodies: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the snapshot was built."""
+        return time.monotonic() - self.built_at
+
+    def view_etag(self, view: str) -> str:
+        """Strong ETag for one view (complete/summary/alerts)."""
+        return f'"{self.etag}-{view}"'
+
+
+class DashboardSnapshotService:
+    """
+    Holds the latest dashboard snapshot and coordinates rebuilds.
+
+    Attributes:
+        max_age_seconds: Age after which the snapshot is stale
+        max_stale_seconds: Extra time a stale snapshot may still be served
+    """
+
+    VIEWS = ("complete", "summary", "alerts")
+
+    def __init__(
+        self,
+        max_age_seconds: Optional[int] = None,
+        max_stale_seconds: Optional[int] = None
+    ):
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else settings.DASHBOARD_SNAPSHOT_MAX_AGE
+        self.max_stale_seconds = max_stale_seconds if max_stale_seconds is not None else settings.DASHBOARD_SNAPSHOT_MAX_STALE
+
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_pending = False
+        self._version = 0
+
+        self.stats = {
+            "builds": 0,
+            "build_errors": 0,
+            "fresh_hits": 0,
+            "stale_hits": 0,
+            "blocking_builds": 0,
+            "follow_up_builds": 0,
+            "last_error": None
+        }
+
+    # -----------------------------------------------------------------
+    # Build
+    # -----------------------------------------------------------------
+
+    async def _build_document(self, service) -> Dict[str, Any]:
+        """Assemble the full /dashboard/complete document."""
+        dashboard_data = await service.get_complete_dashboard_data()
+
+        # Historical analytics (Sprint 15: moved to legacy)
+        try:
+            from services.legacy.historical_analytics import HistoricalAnalyticsService
+            analytics_service = HistoricalAnalyticsService()
+            historical_analytics = await analytics_service.get_historical_analytics()
+            dashboard_data["historical_analytics"] = historical_analytics.model_dump()
+        except Exception as e:
+            logger.warning(f"Failed to add historical analytics: {e}")
+            dashboard_data["historical_analytics"] = {
+                "status": "error",
+                "message": f"Historical analytics failed: {str(e)}"
+            }
+
+        return dashboard_data
+
+    @staticmethod
+    def build_summary(full_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive the /dashboard/summary view from the complete document."""
+        current_info = full_data.get("current_info", {})
+        predictions = full_data.get("predictions", {})
+
+        return {
+            "🏢": "Chocolate Factory - Dashboard Summary",
+            "current": {
+                "energy_price": current_info.get("energy", {}).get("price_eur_kwh", 0) if current_info.get("energy") else 0,
+                "temperature": current_info.get("weather", {}).get("temperature", 0) if current_info.get("weather") else 0,
+                "humidity": current_info.get("weather", {}).get("humidity", 0) if current_info.get("weather") else 0,
+                "production_status": current_info.get("production_status", "🔄 Cargando...")
+            },
+            "predictions": {
+                "energy_score": predictions.get("energy_optimization", {}).get("score", 0),
+                "production_class": predictions.get("production_recommendation", {}).get("class", "Unknown")
+            },
+            "alerts_count": len(full_data.get("alerts", [])),
+            "status": full_data.get("system_status", {}).get("status", "🔄 Cargando..."),
+            "timestamp": full_data.get("timestamp", datetime.now().isoformat())
+        }
+
+    @staticmethod
+    def build_alerts(full_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive the /dashboard/alerts view from the complete document."""
+        alerts = full_data.get("alerts", [])
+
+        return {
+            "🏢": "Chocolate Factory - Alertas Activas",
+            "alerts": alerts,
+            "alert_counts": {
+                "critical": len([a for a in alerts if a.get("level") == "critical"]),
+                "warning": len([a for a in alerts if a.get("level") == "warning"]),
+                "high": len([a for a in alerts if a.get("level") == "high"]),
+                "info": len([a for a in alerts if a.get("level") == "info"])
+            },
+            "timestamp": full_data.get("timestamp")
+        }
+
+    @staticmethod
+    def _serialize(payload: Dict[str, Any]) -> bytes:
+        """Serialize once, the same way FastAPI would for a dict response."""
+        return json.dumps(
+            jsonable_encoder(payload),
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+    async def _rebuild(self, service=None) -> DashboardSnapshot:
+        """Build and publish a new snapshot."""
+        if service is None:
+            from services.dashboard import get_dashboard_service
+            service = get_dashboard_service()
+
+        start = time.perf_counter()
+        try:
+            document = await self._build_document(service)
+        except Exception as e:
+            self.stats["build_errors"] += 1
+            self.stats["last_error"] = str(e)
+            logger.error(f"❌ Dashboard snapshot build failed: {e}")
+            raise
+
+        build_seconds = time.perf_counter() - start
+        complete_body = self._serialize(document)
+        etag = content_hash(document)
+
+        # Content unchanged: keep version/ETag so clients keep getting 304s
+        previous = self._snapshot
+        if previous is not None and previous.etag == etag:
+            version = previous.version
+        else:
+            self._version += 1
+            version = self._version
+
+        snapshot = DashboardSnapshot(
+            version=version,
+            etag=etag,
+            built_at=time.monotonic(),
+            built_at_iso=datetime.now().isoformat(),
+            build_seconds=round(build_seconds, 3),
+            document=document,
+            bodies={
+                "complete": complete_body,
+                "summary": self._serialize(self.build_summary(document)),
+                "alerts": self._serialize(self.build_alerts(document))
+            }
+        )
+
+        self._snapshot = snapshot
+        self.stats["builds"] += 1
+        self.stats["last_error"] = None
+        logger.info(f"📸 Dashboard snapshot v{version} built in {build_seconds:.2f}s")
+        return snapshot
+
+    def refresh(self, service=None, new_data: bool = True) -> asyncio.Task:
+        """
+        Start a rebuild unless one is already running (single flight).
+
+        A rebuild already in flight may have read InfluxDB before the data
+        that triggered this call landed. With ``new_data`` (after ingestion)
+        it is marked to rebuild once more when it finishes; stale-serving
+        callers pass ``new_data=False`` and just join it.
+
+        Returns:
+            The in-flight rebuild task
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_pending = False
+            self._refresh_task = asyncio.create_task(self._run_refresh(service))
+            self._refresh_task.add_done_callback(self._consume_task_result)
+        elif new_data:
+            self._refresh_pending = True
+        return self._refresh_task
+
+    async def _run_refresh(self, service=None) -> DashboardSnapshot:
+        """Rebuild until no new-data trigger arrived during the last build."""
+        while True:
+            self._refresh_pending = False
+            try:
+                snapshot = await self._rebuild(service)
+            except Exception:
+                if not self._refresh_pending:
+                    raise
+                logger.warning("⚠️ Dashboard snapshot build failed, retrying with the new data")
+                continue
+            if not self._refresh_pending:
+                return snapshot
+            self.stats["follow_up_builds"] += 1
+            logger.info("🔁 New data during dashboard snapshot build, rebuilding")
+
+    @staticmethod
+    def _consume_task_result(task: asyncio.Task):
+        """Avoid 'exception was never retrieved' for background rebuilds."""
+        if not task.cancelled():
+            task.exception()
+
+    # -----------------------------------------------------------------
+    # Serve
+    # -----------------------------------------------------------------
+
+    async def get_snapshot(self, service=None) -> DashboardSnapshot:
+        """
+        Get the snapshot to serve, applying stale-while-revalidate.
+
+        - Fresh: returned as-is
+        - Stale (within max_stale): returned, background rebuild started
+        - Missing/expired: rebuild awaited (falls back to stale on error)
+        """
+        snapshot = self._snapshot
+
+        if snapshot is not None:
+            age = snapshot.age_seconds
+            if age <= self.max_age_seconds:
+                self.stats["fresh_hits"] += 1
+                return snapshot
+            if age <= self.max_age_seconds + self.max_stale_seconds:
+                self.stats["stale_hits"] += 1
+                self.refresh(service, new_data=False)
+                return snapshot
+
+        self.stats["blocking_builds"] += 1
+        try:
+            return await asyncio.shield(self.refresh(service, new_data=False))
+        except Exception:
+            if snapshot is not None:
+                logger.warning("⚠️ Serving expired dashboard snapshot after rebuild failure")
+                return snapshot
+            raise
+
+    def cache_control(self, snapshot: DashboardSnapshot) -> str:
+        """Cache-Control header matching the server-side freshness window."""
+        remaining = max(0, int(self.max_age_seconds - snapshot.age_seconds))
+        return f"max-age={remaining}, stale-while-revalidate={self.max_stale_seconds}"
+
+    def get_status(self) -> Dict[str, Any]:
+        """Snapshot and rebuild statistics."""
+        snapshot = self._snapshot
+        return {
+            "has_snapshot": snapshot is not None,
+            "version": snapshot.version if snapshot else None,
+            "etag": snapshot.etag if snapshot else None,
+            "built_at": snapshot.built_at_iso if snapshot else None,
+            "age_seconds": round(snapshot.age_seconds, 1) if snapshot else None,
+            "build_seconds": snapshot.build_seconds if snapshot else None,
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+            "max_age_seconds": self.max_age_seconds,
+            "max_stale_seconds": self.max_stale_seconds,
+            **self.stats
+        }
+
+
+# Singleton service
+_dashboard_snapshot_service: Optional[DashboardSnapshotService] = None
+
+
+def get_dashboard_snapshot_service() -> DashboardSnapshotService:
+    """Obtiene instancia singleton del servicio de snapshots del dashboard"""
+    global _dashboard_snapshot_service
+    if _dashboard_snapshot_service is None:
+        _dashboard_snapshot_service = DashboardSnapshotService()
+    return _dashboard_snapshot_service
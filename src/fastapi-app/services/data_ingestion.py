@@ -23,6 +23,13 @@ from loguru import logger
 import os
 
 from infrastructure.external_apis import REEAPIClient, AEMETAPIClient, OpenWeatherMapAPIClient  # Sprint 15
+from infrastructure.influxdb.client import (
+    InfluxDBClientWrapper,
+    get_influxdb_client,
+    query_tables_async
+)
+from infrastructure.influxdb.sink import get_ingestion_sink
+from core.cache import get_cache_manager
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -95,37 +102,48 @@ class DataIngestionService:
         self.config = influx_config or InfluxDBConfig()
         self.client: Optional[InfluxDBClient] = None
         self.write_api = None
+        self._influx: Optional[InfluxDBClientWrapper] = None
         
         if not all([self.config.url, self.config.token, self.config.org, self.config.bucket]):
             logger.warning("InfluxDB configuration incomplete. Check environment variables.")
     
-    async def __aenter__(self):
-        """Async context manager entry"""
-        self.client = InfluxDBClient(
+    @property
+    def influx(self) -> InfluxDBClientWrapper:
+        """Shared client wrapper for this config (async query/write facade)"""
+        if self._influx is not None:
+            return self._influx
+        return get_influxdb_client(
             url=self.config.url,
             token=self.config.token,
             org=self.config.org,
             timeout=self.config.timeout
         )
-        self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
-        
-        # Test connection
-        try:
-            health = self.client.health()
-            logger.info(f"InfluxDB connection established: {health.status}")
-        except Exception as e:
-            logger.error(f"InfluxDB connection failed: {e}")
-            raise
-        
+
+    async def __aenter__(self):
+        """Async context manager entry (borrows the process-wide pooled client)"""
+        self._influx = self.influx
+        self.client = self._influx.acquire()
+        self.write_api = self._influx.write_api(write_options=SYNCHRONOUS)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.write_api:
-            self.write_api.close()
-        if self.client:
-            self.client.close()
+        """Async context manager exit (the shared client stays open)"""
+        if self._influx is not None:
+            if exc_type is not None:
+                self._influx.mark_unhealthy()
+            self._influx.release()
+            self._influx = None
     
+    async def _write_points(self, points: List[Point], *cache_tags: str) -> int:
+        """
+        Write through the shared ingestion sink (batched, idempotent upserts)
+        and invalidate the cached reads tagged ``cache_tags`` ("ree", "weather")
+        """
+        written = await get_ingestion_sink(self.influx).write(points, bucket=self.config.bucket)
+        if written and cache_tags:
+            await get_cache_manager().ainvalidate_tags(*cache_tags)
+        return written
+
     def _determine_season(self, timestamp: datetime) -> str:
         """Determine season based on timestamp"""
         month = timestamp.month
@@ -278,13 +296,7 @@ class DataIngestionService:
                     logger.info(f"📥 REE InfluxDB Write: Starting batch write of {len(valid_points)} points")
                     logger.debug(f"🔧 InfluxDB Config: bucket={self.config.bucket}, org={self.config.org}")
 
-                    self.write_api.write(
-                        bucket=self.config.bucket,
-                        org=self.config.org,
-                        record=valid_points
-                    )
-
-                    stats.successful_writes = len(valid_points)
+                    stats.successful_writes = await self._write_points(valid_points, "ree")
 
                     # Log success with data range info
                     if valid_points:
@@ -448,12 +460,7 @@ class DataIngestionService:
             if valid_points:
                 try:
                     logger.info(f"📥 Writing {len(valid_points)} historical points to InfluxDB")
-                    self.write_api.write(
-                        bucket=self.config.bucket,
-                        org=self.config.org,
-                        record=valid_points
-                    )
-                    stats.successful_writes = len(valid_points)
+                    stats.successful_writes = await self._write_points(valid_points, "ree")
                     logger.info(f"✅ Successfully wrote {stats.successful_writes} historical price records")
                     
                 except Exception as e:
@@ -689,12 +696,7 @@ class DataIngestionService:
             if valid_points:
                 try:
                     logger.info(f"Writing {len(valid_points)} weather points to InfluxDB")
-                    self.write_api.write(
-                        bucket=self.config.bucket,
-                        org=self.config.org,
-                        record=valid_points
-                    )
-                    stats.successful_writes = len(valid_points)
+                    stats.successful_writes = await self._write_points(valid_points, "weather")
                     logger.info(f"Successfully wrote {stats.successful_writes} weather records to InfluxDB")
                     
                 except Exception as e:
@@ -755,12 +757,7 @@ class DataIngestionService:
                     
                     # Write to InfluxDB
                     logger.info("Writing OpenWeatherMap data to InfluxDB")
-                    self.write_api.write(
-                        bucket=self.config.bucket,
-                        org=self.config.org,
-                        record=[point]
-                    )
-                    stats.successful_writes = 1
+                    stats.successful_writes = await self._write_points([point], "weather")
                     logger.info("Successfully wrote OpenWeatherMap weather record to InfluxDB")
                     
                 except Exception as e:
@@ -896,12 +893,7 @@ class DataIngestionService:
             if valid_points:
                 try:
                     logger.info(f"📥 Writing {len(valid_points)} forecast points to InfluxDB")
-                    self.write_api.write(
-                        bucket=self.config.bucket,
-                        org=self.config.org,
-                        record=valid_points
-                    )
-                    stats.successful_writes = len(valid_points)
+                    stats.successful_writes = await self._write_points(valid_points, "weather")
                     logger.info(f"✅ Successfully wrote {stats.successful_writes} forecast records to InfluxDB")
 
                 except Exception as e:
@@ -943,11 +935,9 @@ class DataIngestionService:
             return {"status": "disconnected", "error": "Client not initialized"}
         
         try:
-            # Check InfluxDB health
-            health = self.client.health()
-            
-            # Query recent data to check ingestion status
-            query_api = self.client.query_api()
+            # Check InfluxDB health (cached probe, off the event loop)
+            influx = self.influx
+            health = await influx.run_blocking(influx.ensure_healthy, label="health")
             
             # Check latest energy prices record
             flux_query = f'''
@@ -957,7 +947,7 @@ class DataIngestionService:
                 |> last()
             '''
             
-            result = query_api.query(flux_query)
+            result = await query_tables_async(self.client.query_api(), flux_query)
             
             latest_record = None
             for table in result:
@@ -973,7 +963,7 @@ class DataIngestionService:
             
             return {
                 "status": "connected",
-                "influxdb_health": health.status,
+                "influxdb_health": health["status"],
                 "latest_price_record": latest_record,
                 "bucket": self.config.bucket,
                 "org": self.config.org
@@ -0,0 +1,517 @@
+"""
+Feature Store - Chocolate Factory
+==================================
+
+Almacén local columnar (Parquet) del histórico usado para entrenar:
+precios REE, clima actual (AEMET/OpenWeatherMap), SIAR y generación de gas.
+
+- Una tabla por fuente, alineada a la hora (media por hora: varias
+  estaciones SIAR o lecturas sub-horarias quedan en una fila)
+- Particionada por año (``<FEATURE_STORE_PATH>/<fuente>/year=YYYY/data.parquet``)
+  con row groups de ~1 mes: las lecturas solo abren los años del rango y
+  pyarrow descarta row groups y columnas que no se piden
+- Actualización incremental: ``_manifest.json`` guarda la marca de agua
+  (último timestamp) por fuente; cada refresco solo pide a InfluxDB desde
+  la marca de agua menos ``FEATURE_STORE_OVERLAP_HOURS`` (datos tardíos o
+  revisados) y reescribe únicamente los años afectados
+- Rangos sucios: lo que se escribe por debajo de ese solape (backfills de
+  gaps, cargas de histórico SIAR) llega por el listener del ingestion sink
+  (``watch_ingestion``) o por ``mark_dirty``, queda apuntado en el manifest
+  y el siguiente refresco vuelve a pedir esos rangos
+- Varios procesos (API, workers de entrenamiento) comparten el almacén: el
+  manifest se relee si cambia en disco y cada escritura lo recarga y
+  fusiona bajo un lock de fichero (``_manifest.lock``)
+- Sin pyarrow (o si el almacén falla) ``load()`` consulta InfluxDB
+  directamente, como antes
+
+Uso:
+    store = get_feature_store()
+    ree = await store.load("ree", ["price_eur_kwh"], start=now - pd.DateOffset(months=36))
+    hourly = store.read_aligned({"ree": ["price_eur_kwh"], "siar": ["temperature"]})
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from loguru import logger
+
+from core.config import settings
+from infrastructure.influxdb import add_write_listener, build_frame_query, get_influxdb_client, query_frame_async
+from infrastructure.influxdb.line_protocol import measurement_of, split_line
+
+TIMESTAMP = "timestamp"
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_LOCK_FILE = "_manifest.lock"
+PARTITION_FILE = "data.parquet"
+ROW_GROUP_HOURS = 24 * 31  # ~1 mes por row group (poda por rango temporal)
+
+TimeBound = Optional[Union[str, datetime, pd.Timestamp]]
+
+
+@dataclass(frozen=True)
+class FeatureSource:
+    """Origen en InfluxDB de una tabla del feature store."""
+    measurement: str
+    fields: Sequence[str]
+    bucket: Optional[str] = None  # None = bucket por defecto
+    tags: Dict[str, str] = field(default_factory=dict)
+
+
+FEATURE_SOURCES: Dict[str, FeatureSource] = {
+    "ree": FeatureSource(
+        measurement="energy_prices",
+        fields=("price_eur_kwh",)
+    ),
+    "weather": FeatureSource(
+        measurement="weather_data",
+        fields=("temperature", "humidity", "pressure")
+    ),
+    "siar": FeatureSource(
+        measurement="siar_weather",
+        fields=(
+            "temperature", "temperature_max", "temperature_min",
+            "humidity", "humidity_max", "humidity_min",
+            "wind_speed", "wind_direction", "wind_gust", "precipitation"
+        ),
+        bucket=settings.INFLUXDB_BUCKET_SIAR
+    ),
+    "gas": FeatureSource(
+        measurement="generation_mix",
+        fields=("value_mwh",),
+        tags={"source": "ree_generation"}
+    ),
+}
+
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _to_utc(value: TimeBound) -> Optional[pd.Timestamp]:
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+def _flux_time(timestamp: pd.Timestamp) -> str:
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _merge_ranges(ranges: Sequence[Tuple[pd.Timestamp, pd.Timestamp]]) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Unir rangos [start, stop) solapados o contiguos."""
+    merged: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def to_hourly(frame: pd.DataFrame, fields: Sequence[str]) -> pd.DataFrame:
+    """Una fila por hora (media), sin filas vacías, ordenada por timestamp."""
+    if frame.empty:
+        return pd.DataFrame({
+            TIMESTAMP: pd.Series([], dtype="datetime64[ns, UTC]"),
+            **{name: pd.Series([], dtype="float64") for name in fields}
+        })
+    frame = frame.reindex(columns=[TIMESTAMP, *fields]).dropna(subset=list(fields), how="all")
+    frame[TIMESTAMP] = pd.to_datetime(frame[TIMESTAMP], utc=True).dt.floor("h").astype("datetime64[ns, UTC]")
+    hourly = frame.groupby(TIMESTAMP, as_index=False)[list(fields)].mean()
+    return hourly.astype({name: "float64" for name in fields})
+
+
+class FeatureStore:
+    """
+    Parquet particionado por fuente/año con marca de agua incremental.
+
+    Las lecturas son síncronas (disco local); ``refresh``/``load`` son
+    async porque consultan InfluxDB (y leen el disco en un hilo).
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        client=None,
+        overlap_hours: Optional[int] = None
+    ):
+        self.root = Path(root or settings.FEATURE_STORE_PATH)
+        self.overlap = pd.Timedelta(hours=settings.FEATURE_STORE_OVERLAP_HOURS if overlap_hours is None else overlap_hours)
+        self._client = client
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_mtime: Optional[int] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_influxdb_client()
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        """Parquet disponible (pyarrow instalado)."""
+        return _parquet_available()
+
+    # -----------------------------------------------------------------
+    # Manifest / marca de agua
+    # -----------------------------------------------------------------
+
+    def _manifest_stat(self) -> Optional[int]:
+        try:
+            return (self.root / MANIFEST_FILE).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self.root / MANIFEST_FILE
+        try:
+            return json.loads(path.read_text()) if path.exists() else {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Feature store manifest unreadable ({e}), rebuilding from InfluxDB")
+            return {}
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Manifest en memoria; se relee si otro proceso lo ha reescrito."""
+        mtime = self._manifest_stat()
+        if self._manifest is None or mtime != self._manifest_mtime:
+            self._manifest = self._read_manifest()
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    @contextmanager
+    def _locked_manifest(self) -> Iterator[Dict[str, Any]]:
+        """
+        Manifest releído de disco bajo lock (hilos + procesos); se guarda al
+        salir del bloque. Las entradas de otros procesos se conservan.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / MANIFEST_LOCK_FILE, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                manifest = self._read_manifest()
+                yield manifest
+                self._save_manifest(manifest)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.root / f"{MANIFEST_FILE}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.root / MANIFEST_FILE)
+        self._manifest = manifest
+        self._manifest_mtime = self._manifest_stat()
+
+    def watermark(self, source: str) -> Optional[pd.Timestamp]:
+        """Último timestamp almacenado de la fuente (None si está vacía)."""
+        entry = self._load_manifest().get(source) or {}
+        return _to_utc(entry.get("watermark"))
+
+    def dirty_ranges(self, source: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Rangos [start, stop) pendientes de re-materializar."""
+        entry = self._load_manifest().get(source) or {}
+        return [(_to_utc(start), _to_utc(stop)) for start, stop in entry.get("dirty", [])]
+
+    def mark_dirty(self, source: str, start: TimeBound, stop: TimeBound) -> bool:
+        """
+        Apuntar [start, stop) para volver a pedirlo en el próximo refresco.
+
+        Lo que cae dentro del solape de la marca de agua ya se pide en cada
+        refresco y no se apunta; una fuente aún sin materializar tampoco
+        (su primer refresco trae todo el histórico).
+
+        Returns:
+            True si quedó algún rango apuntado
+        """
+        watermark = self.watermark(source)
+        if watermark is None:
+            return False
+        start = _to_utc(start).floor("h")
+        stop = min(_to_utc(stop).ceil("h"), watermark - self.overlap)
+        if stop <= start:
+            return False
+
+        with self._locked_manifest() as manifest:
+            entry = manifest.setdefault(source, {})
+            ranges = [(_to_utc(a), _to_utc(b)) for a, b in entry.get("dirty", [])]
+            entry["dirty"] = [
+                [a.isoformat(), b.isoformat()] for a, b in _merge_ranges([*ranges, (start, stop)])
+            ]
+        logger.info(f"📦 Feature store '{source}': {start} → {stop} marked for re-materialization")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Marca de agua, filas y particiones por fuente."""
+        return {
+            "path": str(self.root),
+            "available": self.available,
+            "sources": dict(self._load_manifest())
+        }
+
+    # -----------------------------------------------------------------
+    # Actualización incremental
+    # -----------------------------------------------------------------
+
+    async def _fetch(self, source: str, start: TimeBound = None, stop: TimeBound = None) -> pd.DataFrame:
+        """Rango [start, stop) de InfluxDB, alineado a la hora."""
+        spec = FEATURE_SOURCES[source]
+        start, stop = _to_utc(start), _to_utc(stop)
+        flux = build_frame_query(
+            bucket=spec.bucket or self.client.bucket,
+            measurement=spec.measurement,
+            fields=list(spec.fields),
+            start=_flux_time(start) if start is not None else "0",
+            stop=_flux_time(stop) if stop is not None else None,
+            tags=spec.tags or None,
+            sort=False
+        )
+        frame = await query_frame_async(self.client.query_api(), flux, value_columns=list(spec.fields))
+        return to_hourly(frame, spec.fields)
+
+    async def refresh(self, source: str) -> int:
+        """
+        Traer de InfluxDB lo posterior a la marca de agua (con solape) y los
+        rangos sucios apuntados.
+
+        Returns:
+            Horas recibidas (delta + rangos sucios)
+        """
+        watermark = self.watermark(source)
+        since = watermark - self.overlap if watermark is not None else None
+        delta = await self._fetch(source, start=since)
+
+        dirty = self.dirty_ranges(source)
+        frames = [await self._fetch(source, start=start, stop=stop) for start, stop in dirty]
+        rematerialized = sum(len(frame) for frame in frames)
+        if frames:
+            delta = pd.concat([*frames, delta], ignore_index=True).drop_duplicates(subset=[TIMESTAMP], keep="last")
+        await asyncio.to_thread(self._merge, source, delta, dirty)
+
+        logger.info(
+            f"📦 Feature store '{source}': {len(delta) - rematerialized} hours since "
+            f"{since if since is not None else 'beginning'}, {rematerialized} from {len(dirty)} dirty ranges "
+            f"(watermark {self.watermark(source)})"
+        )
+        return len(delta)
+
+    async def refresh_all(self, sources: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Refrescar varias fuentes en paralelo."""
+        sources = list(sources or FEATURE_SOURCES)
+        counts = await asyncio.gather(*(self.refresh(source) for source in sources))
+        return dict(zip(sources, counts))
+
+    def _partition_path(self, source: str, year: int) -> Path:
+        return self.root / source / f"year={year}" / PARTITION_FILE
+
+    def _merge(
+        self,
+        source: str,
+        delta: pd.DataFrame,
+        resolved: Sequence[Tuple[pd.Timestamp, pd.Timestamp]] = ()
+    ):
+        """
+        Fusionar el delta en las particiones anuales afectadas (el delta gana)
+        y quitar del manifest los rangos sucios ya re-materializados.
+        """
+        with self._locked_manifest() as manifest:
+            entry = dict(manifest.get(source) or {})
+            partitions = set(entry.get("partitions", []))
+            rows = dict(entry.get("rows_by_year", {}))
+
+            if not delta.empty:
+                for year, part in delta.groupby(delta[TIMESTAMP].dt.year):
+                    path = self._partition_path(source, int(year))
+                    if path.exists():
+                        part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+                        part = part.drop_duplicates(subset=[TIMESTAMP], keep="last")
+                    part = part.sort_values(TIMESTAMP).reset_index(drop=True)
+
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_suffix(".tmp")
+                    part.to_parquet(tmp_path, engine="pyarrow", index=False, row_group_size=ROW_GROUP_HOURS)
+                    os.replace(tmp_path, path)
+                    partitions.add(int(year))
+                    rows[str(int(year))] = len(part)
+
+                latest = delta[TIMESTAMP].max()
+                watermark = _to_utc(entry.get("watermark"))
+                entry["watermark"] = max(latest, watermark).isoformat() if watermark is not None else latest.isoformat()
+
+            # Rangos apuntados mientras se refrescaba siguen pendientes
+            done = {(start.isoformat(), stop.isoformat()) for start, stop in resolved}
+            dirty = [pair for pair in entry.get("dirty", []) if tuple(pair) not in done]
+            if dirty:
+                entry["dirty"] = dirty
+            else:
+                entry.pop("dirty", None)
+
+            entry["partitions"] = sorted(partitions)
+            entry["rows_by_year"] = rows
+            entry["rows"] = sum(rows.values())
+            entry["refreshed_at"] = datetime.now(timezone.utc).isoformat()
+            manifest[source] = entry
+
+    # -----------------------------------------------------------------
+    # Lectura con poda
+    # -----------------------------------------------------------------
+
+    def read(
+        self,
+        source: str,
+        columns: Optional[Sequence[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None
+    ) -> pd.DataFrame:
+        """
+        Leer [start, end) de una fuente.
+
+        Solo se abren las particiones de los años del rango y solo las
+        columnas pedidas; el filtro temporal descarta row groups por sus
+        estadísticas min/max.
+
+        Returns:
+            DataFrame con ``timestamp`` (UTC, horario) y las columnas pedidas
+        """
+        columns = list(columns or FEATURE_SOURCES[source].fields)
+        start, end = _to_utc(start), _to_utc(end)
+        years = [
+            year for year in self._load_manifest().get(source, {}).get("partitions", [])
+            if (start is None or year >= start.year) and (end is None or year <= end.year)
+        ]
+
+        filters = []
+        if start is not None:
+            filters.append((TIMESTAMP, ">=", start))
+        if end is not None:
+            filters.append((TIMESTAMP, "<", end))
+
+        frames = []
+        for year in years:
+            path = self._partition_path(source, year)
+            if path.exists():
+                frames.append(pd.read_parquet(path, engine="pyarrow", columns=[TIMESTAMP, *columns], filters=filters or None))
+
+        if not frames:
+            return to_hourly(pd.DataFrame(), columns)
+        return pd.concat(frames, ignore_index=True).sort_values(TIMESTAMP).reset_index(drop=True)
+
+    def read_aligned(
+        self,
+        columns: Dict[str, Sequence[str]],
+        start: TimeBound = None,
+        end: TimeBound = None
+    ) -> pd.DataFrame:
+        """
+        Tabla horaria con columnas de varias fuentes (outer join por hora).
+
+        Columnas con el mismo nombre en varias fuentes llevan el prefijo
+        de la fuente (``siar_temperature``, ``weather_temperature``).
+        """
+        counts: Dict[str, int] = {}
+        for names in columns.values():
+            for name in names:
+                counts[name] = counts.get(name, 0) + 1
+
+        aligned: Optional[pd.DataFrame] = None
+        for source, names in columns.items():
+            frame = self.read(source, names, start, end)
+            frame = frame.rename(columns={name: f"{source}_{name}" for name in names if counts[name] > 1})
+            aligned = frame if aligned is None else aligned.merge(frame, on=TIMESTAMP, how="outer")
+        return aligned.sort_values(TIMESTAMP).reset_index(drop=True) if aligned is not None else pd.DataFrame()
+
+    # -----------------------------------------------------------------
+    # Entrada para los entrenamientos
+    # -----------------------------------------------------------------
+
+    async def load(
+        self,
+        source: str,
+        columns: Optional[Sequence[str]] = None,
+        start: TimeBound = None,
+        end: TimeBound = None
+    ) -> pd.DataFrame:
+        """
+        Refrescar el delta y leer [start, end) del almacén.
+
+        Sin pyarrow, o si el almacén falla, se consulta el rango en
+        InfluxDB directamente (misma forma de salida).
+        """
+        columns = list(columns or FEATURE_SOURCES[source].fields)
+        if self.available:
+            try:
+                await self.refresh(source)
+                return await asyncio.to_thread(self.read, source, columns, start, end)
+            except Exception as e:
+                logger.warning(f"⚠️ Feature store '{source}' unavailable ({e}), querying InfluxDB directly")
+
+        frame = await self._fetch(source, start=start, stop=end)
+        return frame[[TIMESTAMP, *columns]]
+
+
+_feature_store: Optional[FeatureStore] = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Feature store compartido (singleton)."""
+    global _feature_store
+    with _feature_store_lock:
+        if _feature_store is None:
+            _feature_store = FeatureStore()
+        return _feature_store
+
+
+def _source_of(bucket: str, series: str) -> Optional[str]:
+    measurement = measurement_of(series)
+    for name, spec in FEATURE_SOURCES.items():
+        if spec.measurement != measurement or bucket != (spec.bucket or settings.INFLUXDB_BUCKET):
+            continue
+        if all(f",{key}={value}" in series for key, value in spec.tags.items()):
+            return name
+    return None
+
+
+def record_written_lines(bucket: str, lines: Sequence[str]):
+    """
+    Listener del ingestion sink: rango escrito por fuente → ``mark_dirty``.
+
+    Las escrituras recientes (dentro del solape) no tocan el disco.
+    """
+    bounds: Dict[str, List[int]] = {}
+    for line in lines:
+        try:
+            series, _, timestamp = split_line(line)
+        except ValueError:
+            continue
+        source = _source_of(bucket, series) if timestamp is not None else None
+        if source is None:
+            continue
+        low_high = bounds.setdefault(source, [timestamp, timestamp])
+        low_high[0], low_high[1] = min(low_high[0], timestamp), max(low_high[1], timestamp)
+
+    store = get_feature_store()
+    for source, (low, high) in bounds.items():
+        store.mark_dirty(
+            source,
+            pd.Timestamp(low, unit="ns", tz="UTC"),
+            pd.Timestamp(high, unit="ns", tz="UTC") + pd.Timedelta(1, unit="ns")
+        )
+
+
+def watch_ingestion():
+    """Apuntar en el feature store lo que escribe el ingestion sink (idempotente)."""
+    add_write_listener(record_written_lines)
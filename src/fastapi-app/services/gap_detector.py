@@ -15,6 +15,9 @@ import pandas as pd
 from loguru import logger
 
 from .data_ingestion import DataIngestionService
+from infrastructure.influxdb.client import query_tables_async
+from infrastructure.influxdb.coverage import CoverageIndex, get_coverage_index
+from infrastructure.influxdb.queries import get_coverage_query
 
 
 @dataclass 
@@ -43,10 +46,11 @@ class GapAnalysis(BaseModel):
 class GapDetectionService:
     """Servicio para detectar gaps en datos temporales"""
 
-    def __init__(self, telegram_service=None):
+    def __init__(self, telegram_service=None, coverage_index: Optional[CoverageIndex] = None):
         self.expected_interval_minutes = 60  # Datos cada hora (normal operation)
         self.accelerated_interval_minutes = 5  # Modo acelerado temporal
         self.telegram_service = telegram_service
+        self.coverage = coverage_index or get_coverage_index()
         
     async def detect_all_gaps(self, days_back: int = 30) -> GapAnalysis:
         """Detectar todos los gaps en datos de REE y clima"""
@@ -89,99 +93,99 @@ class GapDetectionService:
             logger.error(f"❌ Error detectando gaps: {e}")
             raise
     
+    async def _scan_hourly_coverage(
+        self,
+        measurement: str,
+        field: str,
+        days_back: int
+    ) -> Tuple[List[datetime], List[datetime]]:
+        """
+        Horas esperadas y horas con datos en los últimos `days_back` días.
+
+        El índice de cobertura responde para la historia ya verificada; solo
+        los tramos sin verificar (incluidas las últimas horas) se consultan
+        en Flux, con conteo horario server-side (aggregateWindow) en lugar
+        de traer cada timestamp.
+
+        Returns:
+            (horas esperadas, horas con al menos un dato)
+        """
+        end_time = datetime.now(timezone.utc)
+        start_hour = (end_time - timedelta(days=days_back)).replace(minute=0, second=0, microsecond=0)
+        stop_hour = end_time.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+        ranges = self.coverage.unverified_ranges(measurement, start_hour, stop_hour)
+        if ranges:
+            async with DataIngestionService() as service:
+                query_api = service.client.query_api()
+
+                for range_start, range_stop in ranges:
+                    query = get_coverage_query(
+                        service.config.bucket,
+                        measurement,
+                        range_start.isoformat(),
+                        range_stop.isoformat(),
+                        field=field
+                    )
+                    tables = await query_tables_async(query_api, query)
+
+                    # Una fila por hora: (_time = inicio de la hora, _value = nº de puntos)
+                    self.coverage.apply_scan(measurement, range_start, range_stop, (
+                        (record.get_time(), int(record.get_value() or 0))
+                        for table in tables
+                        for record in table.records
+                    ))
+            await asyncio.to_thread(self.coverage.save)
+
+        hours = int((stop_hour - start_hour).total_seconds() // 3600)
+        expected_hours = [start_hour + timedelta(hours=h) for h in range(hours)]
+        present_hours = self.coverage.present_hours(measurement, start_hour, stop_hour)
+
+        logger.debug(
+            f"📇 {measurement}: {len(ranges)} tramo(s) escaneados, "
+            f"{len(present_hours)}/{hours} horas con datos"
+        )
+        return expected_hours, present_hours
+
     async def _detect_ree_gaps(self, days_back: int) -> List[DataGap]:
         """Detectar gaps en datos de precios REE"""
         try:
-            async with DataIngestionService() as service:
-                query_api = service.client.query_api()
-                
-                # Obtener datos REE existentes
-                end_time = datetime.now(timezone.utc)
-                start_time = end_time - timedelta(days=days_back)
-                
-                query = f'''
-                from(bucket: "{service.config.bucket}")
-                |> range(start: -{days_back}d)
-                |> filter(fn: (r) => r._measurement == "energy_prices")
-                |> filter(fn: (r) => r._field == "price_eur_kwh")
-                |> sort(columns: ["_time"])
-                '''
-                
-                tables = query_api.query(query)
-                
-                # Extraer timestamps existentes
-                existing_times = []
-                for table in tables:
-                    for record in table.records:
-                        existing_times.append(record.get_time())
-                
-                # Generar timeline esperado (cada hora)
-                expected_times = []
-                current = start_time.replace(minute=0, second=0, microsecond=0)
-                while current <= end_time:
-                    expected_times.append(current)
-                    current += timedelta(hours=1)
-                
-                # Detectar gaps
-                gaps = self._find_time_gaps(
-                    expected_times, 
-                    existing_times, 
-                    "energy_prices",
-                    timedelta(hours=1)
-                )
-                
-                logger.info(f"📊 REE: {len(gaps)} gaps detectados en {days_back} días")
-                return gaps
-                
+            expected_times, existing_times = await self._scan_hourly_coverage(
+                "energy_prices", "price_eur_kwh", days_back
+            )
+
+            # Detectar gaps
+            gaps = self._find_time_gaps(
+                expected_times,
+                existing_times,
+                "energy_prices",
+                timedelta(hours=1)
+            )
+
+            logger.info(f"📊 REE: {len(gaps)} gaps detectados en {days_back} días")
+            return gaps
+
         except Exception as e:
             logger.error(f"Error detectando gaps REE: {e}")
             return []
-    
+
     async def _detect_weather_gaps(self, days_back: int) -> List[DataGap]:
         """Detectar gaps en datos climáticos"""
         try:
-            async with DataIngestionService() as service:
-                query_api = service.client.query_api()
-
-                # Obtener datos climáticos existentes
-                end_time = datetime.now(timezone.utc)
-                start_time = end_time - timedelta(days=days_back)
-
-                query = f'''
-                from(bucket: "{service.config.bucket}")
-                |> range(start: -{days_back}d)
-                |> filter(fn: (r) => r._measurement == "weather_data")
-                |> filter(fn: (r) => r._field == "temperature")
-                |> sort(columns: ["_time"])
-                '''
-
-                tables = query_api.query(query)
-
-                # Extraer timestamps existentes y agrupar por hora
-                # FIXED: No buscar timestamps exactos, agrupar por hora
-                hours_with_data = set()
-                for table in tables:
-                    for record in table.records:
-                        timestamp = record.get_time()
-                        # Normalizar a la hora (truncar minutos/segundos)
-                        hour_key = timestamp.replace(minute=0, second=0, microsecond=0)
-                        hours_with_data.add(hour_key)
-
-                # Generar timeline esperado (cada hora)
-                expected_hours = []
-                current = start_time.replace(minute=0, second=0, microsecond=0)
-                while current <= end_time:
-                    expected_hours.append(current)
-                    current += timedelta(hours=1)
+            # Presencia por hora (varias lecturas por hora cuentan como una)
+            expected_hours, hours_with_data = await self._scan_hourly_coverage(
+                "weather_data", "temperature", days_back
+            )
+            hours_with_data = set(hours_with_data)
 
-                # Detectar gaps: horas sin ningún dato
-                missing_hours = [h for h in expected_hours if h not in hours_with_data]
+            # Detectar gaps: horas sin ningún dato
+            missing_hours = [h for h in expected_hours if h not in hours_with_data]
 
-                # Agrupar horas faltantes en rangos continuos
-                gaps = self._group_missing_hours_into_gaps(missing_hours, "weather_data")
+            # Agrupar horas faltantes en rangos continuos
+            gaps = self._group_missing_hours_into_gaps(missing_hours, "weather_data")
 
-                logger.info(f"🌤️ Weather: {len(gaps)} gaps detectados en {days_back} días")
-                return gaps
+            logger.info(f"🌤️ Weather: {len(gaps)} gaps detectados en {days_back} días")
+            return gaps
 
         except Exception as e:
             logger.error(f"Error detectando gaps climáticos: {e}")
@@ -472,7 +476,7 @@ class GapDetectionService:
                 results = {}
                 
                 # Obtener último REE
-                ree_tables = query_api.query(ree_query)
+                ree_tables = await query_tables_async(query_api, ree_query)
                 results['latest_ree'] = None
                 for table in ree_tables:
                     for record in table.records:
@@ -480,7 +484,7 @@ class GapDetectionService:
                         break
                 
                 # Obtener último Weather
-                weather_tables = query_api.query(weather_query)
+                weather_tables = await query_tables_async(query_api, weather_query)
                 results['latest_weather'] = None
                 for table in weather_tables:
                     for record in table.records:
@@ -488,7 +492,7 @@ class GapDetectionService:
                         break
 
                 # Obtener último Gas
-                gas_tables = query_api.query(gas_query)
+                gas_tables = await query_tables_async(query_api, gas_query)
                 results['latest_gas'] = None
                 for table in gas_tables:
                     for record in table.records:
@@ -7,7 +7,8 @@ desde la API de REE y InfluxDB.
 
 Funcionalidades:
 - Fetch diario desde REE API
-- Write a InfluxDB (bucket energy_data, measurement generation_mix)
+- Write a InfluxDB (bucket energy_data, measurement generation_mix) vía
+  el ingestion sink compartido (upserts idempotentes)
 - Query histórico para training Prophet
 - Query último valor para predicción
 - Detección de gaps
@@ -25,8 +26,14 @@ from typing import Dict, List, Any, Optional
 import pandas as pd
 
 from influxdb_client import Point, WritePrecision
-from infrastructure.influxdb import get_influxdb_client
+from infrastructure.influxdb import (
+    get_coverage_query,
+    get_influxdb_client,
+    get_ingestion_sink,
+    run_blocking
+)
 from infrastructure.external_apis.ree_client import REEAPIClient
+from .feature_store import get_feature_store
 
 logger = logging.getLogger(__name__)
 
@@ -70,7 +77,7 @@ class GasGenerationService:
         
         # Check if data already exists
         if not force:
-            existing = await self._check_existing(target_date)
+            existing = self._check_existing(target_date)
             if existing:
                 logger.info(f"⏭️ Data already exists for {target_date}, skipping")
                 return {
@@ -107,9 +114,9 @@ class GasGenerationService:
                 .tag("technology", TAG_TECHNOLOGY) \
                 .field("value_mwh", gas_data["value_mwh"]) \
                 .field("percentage", gas_data["percentage"]) \
-                .time(datetime.combine(target_date, datetime.min.time()))
+                .time(self._day_timestamp(target_date))
             
-            self.influx.write_points([point], bucket="energy_data")
+            await get_ingestion_sink(self.influx).write([point], bucket="energy_data", overwrite=force)
             
             logger.info(f"✅ Ingested gas data: {gas_data['value_mwh']:,.0f} MWh ({gas_data['percentage']*100:.1f}%)")
             
@@ -129,21 +136,24 @@ class GasGenerationService:
                 "error": str(e)
             }
     
-    async def _check_existing(self, target_date: date) -> bool:
-        """Check if data exists for a specific date."""
-        query = f'''
-        from(bucket: "energy_data")
-          |> range(start: {target_date}T00:00:00Z, stop: {target_date + timedelta(days=1)}T00:00:00Z)
-          |> filter(fn: (r) => r._measurement == "{MEASUREMENT}")
-          |> filter(fn: (r) => r.source == "{TAG_SOURCE}")
-          |> limit(n: 1)
-        '''
-        
-        try:
-            results = self.influx.query(query)
-            return len(results) > 0
-        except Exception:
-            return False
+    @staticmethod
+    def _day_timestamp(target_date: date) -> datetime:
+        return datetime.combine(target_date, datetime.min.time())
+
+    def _check_existing(self, target_date: date) -> bool:
+        """
+        Check if data for a date was already written through the ingestion sink.
+
+        Sin consulta Flux previa: si el proceso se reinicia, el día se vuelve
+        a pedir a REE y el write es un upsert idempotente (misma serie y
+        timestamp sobrescriben el punto).
+        """
+        return get_ingestion_sink(self.influx).has_written(
+            MEASUREMENT,
+            {"source": TAG_SOURCE, "technology": TAG_TECHNOLOGY},
+            self._day_timestamp(target_date),
+            bucket="energy_data"
+        )
     
     async def get_historical(self, months: int = 36) -> pd.DataFrame:
         """
@@ -157,30 +167,19 @@ class GasGenerationService:
         """
         logger.info(f"📊 Querying {months} months of gas history")
         
-        query = f'''
-        from(bucket: "energy_data")
-          |> range(start: -{months}mo)
-          |> filter(fn: (r) => r._measurement == "{MEASUREMENT}")
-          |> filter(fn: (r) => r.source == "{TAG_SOURCE}")
-          |> filter(fn: (r) => r._field == "value_mwh")
-          |> sort(columns: ["_time"])
-        '''
-        
         try:
-            results = self.influx.query(query)
+            # Feature store: history comes from local Parquet, only the delta from InfluxDB
+            start = pd.Timestamp.now(tz="UTC") - pd.DateOffset(months=months)
+            history = await get_feature_store().load("gas", ["value_mwh"], start=start)
             
-            if not results:
+            if history.empty:
                 logger.warning("⚠️ No gas data found in InfluxDB")
                 return pd.DataFrame()
             
-            records = []
-            for r in results:
-                records.append({
-                    "ds": r["time"].replace(tzinfo=None),
-                    "gas_gen": r["value"]
-                })
-            
-            df = pd.DataFrame(records)
+            df = pd.DataFrame({
+                "ds": history["timestamp"].dt.tz_localize(None),
+                "gas_gen": history["value_mwh"]
+            })
             df = df.sort_values("ds").reset_index(drop=True)
             
             # Normalize for Prophet regressor
@@ -213,7 +212,7 @@ class GasGenerationService:
         '''
         
         try:
-            results = self.influx.query(query)
+            results = await run_blocking(self.influx.query, query)
             
             if not results:
                 logger.warning("⚠️ No recent gas data found")
@@ -249,7 +248,7 @@ class GasGenerationService:
         '''
         
         try:
-            results = self.influx.query(query)
+            results = await run_blocking(self.influx.query, query)
             values = [r["value"] for r in results]
             
             if values:
@@ -275,17 +274,20 @@ class GasGenerationService:
         end_date = date.today()
         start_date = end_date - timedelta(days=days_back)
         
-        query = f'''
-        from(bucket: "energy_data")
-          |> range(start: {start_date}T00:00:00Z, stop: {end_date}T00:00:00Z)
-          |> filter(fn: (r) => r._measurement == "{MEASUREMENT}")
-          |> filter(fn: (r) => r.source == "{TAG_SOURCE}")
-          |> filter(fn: (r) => r._field == "value_mwh")
-        '''
+        # Conteo diario server-side: una fila por día en lugar de cada punto
+        query = get_coverage_query(
+            "energy_data",
+            MEASUREMENT,
+            f"{start_date}T00:00:00Z",
+            f"{end_date}T00:00:00Z",
+            field="value_mwh",
+            every="1d",
+            tags={"source": TAG_SOURCE}
+        )
         
         try:
-            results = self.influx.query(query)
-            existing_dates = set(r["time"].date() for r in results)
+            results = await run_blocking(self.influx.query, query)
+            existing_dates = set(r["time"].date() for r in results if r["value"])
             
             all_dates = set(start_date + timedelta(days=i) for i in range(days_back))
             missing = sorted(all_dates - existing_dates)
@@ -11,6 +11,7 @@ Constraints: Secuencia obligatoria, tiempos proceso, capacidades maquinaria.
 
 import logging
 from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
 from scipy.optimize import linprog, OptimizeResult
@@ -18,8 +19,20 @@ from dataclasses import dataclass
 import asyncio
 import math
 
+from core.cache import get_cache_manager
+from core.config import settings
+from domain.optimization.batch_scheduler import (
+    SchedulePlan,
+    build_batch_profile,
+    greedy_schedule,
+    exact_schedule
+)
+from domain.optimization.rolling_horizon import RollingHorizonPlanner
+
 logger = logging.getLogger(__name__)
 
+OPTIMIZER_MODES = ("greedy", "exact")
+
 
 def sanitize_for_json(obj):
     """Recursively sanitize data structure to remove NaN/inf values"""
@@ -148,6 +161,23 @@ PRODUCTION_PROCESSES = {
 }
 
 
+# Secuencia de procesos por calidad
+BATCH_SEQUENCES = {
+    "premium": ["mixing", "rolling", "conching_premium", "tempering", "molding"],
+    "standard": ["mixing", "rolling", "conching_standard", "tempering", "molding"]
+}
+
+# Huella horaria por calidad (tablas de coste del scheduler)
+BATCH_PROFILES = {
+    quality: build_batch_profile(quality, [
+        (PRODUCTION_PROCESSES[p].duration_minutes,
+         PRODUCTION_PROCESSES[p].energy_kwh_per_minute * PRODUCTION_PROCESSES[p].duration_minutes)
+        for p in sequence
+    ])
+    for quality, sequence in BATCH_SEQUENCES.items()
+}
+
+
 class HourlyOptimizerService:
     """
     Servicio de optimización horaria de producción.
@@ -164,6 +194,9 @@ class HourlyOptimizerService:
     5. Calcular ahorro vs baseline
     """
 
+    # Variantes (modo, kg/día) del plan semanal que se mantienen y refrescan
+    MAX_WEEKLY_VARIANTS = 8
+
     def __init__(self, influxdb_client=None):
         self.influxdb = influxdb_client
         self.bucket = "energy_data"
@@ -171,8 +204,7 @@ class HourlyOptimizerService:
 
         # ML service para predicciones de producción (Sprint 15: moved to domain layer)
         from domain.ml.direct_ml import DirectMLService
-        self.ml_service = DirectMLService()
-        self.ml_service.load_models()
+        self.ml_service = DirectMLService()  # Modelos: carga perezosa en la primera predicción
 
         # Capacidad de producción
         self.batch_size_kg = 10  # kg por lote
@@ -183,12 +215,19 @@ class HourlyOptimizerService:
         self.standard_ratio = 0.70
         self.premium_ratio = 0.30
 
+        # Plan semanal (rolling horizon): un planner por (modo, kg/día), cada
+        # uno cachea sus planes por día entre llamadas
+        self._rolling_planners: "OrderedDict[Tuple[str, float], RollingHorizonPlanner]" = OrderedDict()
+        self._weekly_refresh_task: Optional[asyncio.Task] = None
+        self._weekly_refresh_pending = False
+
         logger.info("✅ HourlyOptimizerService initialized")
 
     async def optimize_daily_production(
         self,
         target_date: Optional[datetime] = None,
-        target_kg: Optional[float] = None
+        target_kg: Optional[float] = None,
+        mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Genera plan optimizado de producción para 24 horas.
@@ -196,10 +235,15 @@ class HourlyOptimizerService:
         Args:
             target_date: Fecha objetivo (default: mañana)
             target_kg: Kg objetivo (default: 200kg)
+            mode: "greedy" o "exact" (default: settings.OPTIMIZER_MODE)
 
         Returns:
             Dict con plan optimizado, ahorro estimado, y recomendaciones
         """
+        mode = mode or settings.OPTIMIZER_MODE
+        if mode not in OPTIMIZER_MODES:
+            raise ValueError(f"Unknown optimizer mode '{mode}' (expected one of {OPTIMIZER_MODES})")
+
         try:
             # Fecha objetivo (por defecto mañana)
             if target_date is None:
@@ -224,12 +268,13 @@ class HourlyOptimizerService:
             logger.info(f"📦 Batches: {num_batches} total ({num_standard} std, {num_premium} premium)")
 
             # 4. Optimizar ventanas de producción
-            optimal_batches = await self._optimize_batch_scheduling(
+            optimal_batches, solver = await self._optimize_batch_scheduling(
                 ree_forecast=ree_forecast,
                 weather_forecast=weather_forecast,
                 num_standard=num_standard,
                 num_premium=num_premium,
-                target_date=target_date
+                target_date=target_date,
+                mode=mode
             )
 
             # 5. Calcular baseline (sin optimización)
@@ -281,7 +326,8 @@ class HourlyOptimizerService:
                 },
                 "recommendations": recommendations,
                 "metadata": {
-                    "optimization_algorithm": "greedy_heuristic",
+                    "optimization_algorithm": "exact_dp" if mode == "exact" else "greedy_heuristic",
+                    "solver": solver,
                     "constraints": {
                         "batch_size_kg": self.batch_size_kg,
                         "sequence_enforced": True,
@@ -307,6 +353,298 @@ class HourlyOptimizerService:
             logger.error(f"❌ Error optimizando producción: {e}", exc_info=True)
             raise
 
+    async def optimize_weekly_production(
+        self,
+        start_date: Optional[datetime] = None,
+        days: int = 7,
+        target_kg: Optional[float] = None,
+        mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Plan multi-día (rolling horizon) sobre el forecast Prophet 168h.
+
+        Cada día planifica su objetivo; un batch puede empezar tarde y
+        terminar la mañana siguiente (WIP), y el día siguiente no arranca
+        batches hasta que termina. Precios REE ya publicados sustituyen a
+        la predicción Prophet en sus horas.
+
+        Re-plan incremental: el planner recuerda el plan de cada día y solo
+        recalcula los días cuyas horas (precio/clima), WIP de entrada u
+        objetivo han cambiado desde la llamada anterior.
+
+        Args:
+            start_date: Primer día (default: mañana); se alinea a medianoche
+            days: Días a planificar (1-7, límite del forecast 168h)
+            target_kg: Kg objetivo por día (default: 200kg)
+            mode: "greedy" o "exact" (default: settings.OPTIMIZER_MODE)
+
+        Returns:
+            Dict con plan por día, totales y días recalculados/reutilizados
+        """
+        mode = mode or settings.OPTIMIZER_MODE
+        if mode not in OPTIMIZER_MODES:
+            raise ValueError(f"Unknown optimizer mode '{mode}' (expected one of {OPTIMIZER_MODES})")
+        if not 1 <= days <= 7:
+            raise ValueError(f"days must be between 1 and 7 (168h forecast), got {days}")
+
+        if start_date is None:
+            start_date = datetime.now(timezone.utc) + timedelta(days=1)
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if target_kg is None:
+            target_kg = self.daily_target_kg
+
+        hours = days * 24
+        logger.info(f"🗓️ Plan semanal {start_date.date()} (+{days}d): {target_kg}kg/día, modo {mode}")
+
+        # 1. Precio y clima por hora absoluta del horizonte
+        prices, price_sources = await self._get_price_horizon(start_date, hours)
+        weather = await self._get_weather_horizon(start_date, hours)
+
+        scores_by_hour = {}
+        for hour in range(hours):
+            if prices[hour] is None:
+                continue
+            temp = weather[hour]["temperature"]
+            humidity = weather[hour]["humidity"]
+            scores_by_hour[hour] = {
+                "hour": hour,
+                "score": self._score_hour(prices[hour], temp, humidity),
+                "price_eur_kwh": prices[hour],
+                "temperature": temp,
+                "humidity": humidity
+            }
+
+        # 2. Planificar (solo se recalculan los días con entradas nuevas)
+        num_batches = int(np.ceil(target_kg / self.batch_size_kg))
+        num_standard = int(num_batches * self.standard_ratio)
+        num_premium = num_batches - num_standard
+        demands = [(BATCH_PROFILES["premium"], num_premium), (BATCH_PROFILES["standard"], num_standard)]
+
+        result = self._rolling_planner(mode, target_kg).plan(
+            horizon_start=start_date,
+            prices=[scores_by_hour[h]["price_eur_kwh"] if h in scores_by_hour else 0.15 for h in range(hours)],
+            scores=[scores_by_hour[h]["score"] if h in scores_by_hour else 0.0 for h in range(hours)],
+            valid_starts=[h in scores_by_hour for h in range(hours)],
+            demands=demands,
+            mode=mode,
+            days=days
+        )
+
+        # 3. Batches con horas absolutas (lineal: sin envolver en medianoche)
+        day_entries = []
+        for index, day_plan in enumerate(result.days):
+            day_offset = index * 24
+            plan = SchedulePlan(
+                solver=mode,
+                placements=[(quality, day_offset + hour) for quality, hour in day_plan.placements]
+            )
+            batches = self._plan_to_batches(
+                plan, scores_by_hour, horizon=hours, cyclic=False, id_suffix=f"-{day_plan.day:%Y%m%d}"
+            )
+            for quality_type, missing in day_plan.unscheduled.items():
+                logger.warning(f"⚠️  {day_plan.day}: sin ventana para {missing} batch(es) {quality_type}")
+
+            day_entries.append({
+                "date": day_plan.day.isoformat(),
+                "batches": [self._horizon_batch_to_dict(b, start_date) for b in batches],
+                "carry_in_hours": day_plan.carry_in_hours,
+                "spill_hours": day_plan.spill_hours,
+                "total_energy_kwh": round(sum(b.total_energy_kwh for b in batches), 2),
+                "total_cost_eur": round(sum(b.total_cost_eur for b in batches), 2),
+                "unscheduled": day_plan.unscheduled,
+                "replanned": day_plan.day in result.replanned,
+                "solve_ms": round(day_plan.solve_seconds * 1000, 2)
+            })
+
+        return sanitize_for_json({
+            "start_date": start_date.isoformat(),
+            "days": days,
+            "target_kg_per_day": target_kg,
+            "num_batches_per_day": num_batches,
+            "plan": day_entries,
+            "totals": {
+                "batches": sum(len(d["batches"]) for d in day_entries),
+                "total_energy_kwh": round(sum(d["total_energy_kwh"] for d in day_entries), 2),
+                "total_cost_eur": round(sum(d["total_cost_eur"] for d in day_entries), 2)
+            },
+            "replan": {
+                "replanned_days": [d.isoformat() for d in result.replanned],
+                "reused_days": [d.isoformat() for d in result.reused]
+            },
+            "data_sources": price_sources,
+            "metadata": {
+                "optimization_algorithm": f"rolling_horizon_{'exact_dp' if mode == 'exact' else 'greedy_heuristic'}",
+                "horizon_hours": hours,
+                "mode": mode
+            }
+        })
+
+    def _rolling_planner(self, mode: str, target_kg: float) -> RollingHorizonPlanner:
+        """Planner de la variante (modo, kg/día); se conservan las más recientes."""
+        key = (mode, float(target_kg))
+        planner = self._rolling_planners.get(key)
+        if planner is None:
+            planner = self._rolling_planners[key] = RollingHorizonPlanner()
+            while len(self._rolling_planners) > self.MAX_WEEKLY_VARIANTS:
+                self._rolling_planners.popitem(last=False)
+        self._rolling_planners.move_to_end(key)
+        return planner
+
+    def refresh_weekly_plan(self) -> asyncio.Task:
+        """
+        Re-plan semanal en background tras nuevo forecast o precios REE.
+
+        Re-planifica todas las variantes (modo, kg/día) con planes cacheados,
+        no solo la por defecto.
+
+        Single flight: si ya hay un re-plan en curso se devuelve ese, marcado
+        para hacer una pasada más al terminar (los datos que llegaron durante
+        el re-plan también se planifican).
+        """
+        if self._weekly_refresh_task is None or self._weekly_refresh_task.done():
+            self._weekly_refresh_pending = False
+            self._weekly_refresh_task = asyncio.create_task(self._run_weekly_refresh())
+            self._weekly_refresh_task.add_done_callback(self._consume_task_result)
+        else:
+            self._weekly_refresh_pending = True
+        return self._weekly_refresh_task
+
+    async def _run_weekly_refresh(self) -> List[Dict[str, Any]]:
+        """Re-plan de cada variante hasta que no lleguen más triggers durante la pasada."""
+        while True:
+            self._weekly_refresh_pending = False
+            variants = list(self._rolling_planners) or [(settings.OPTIMIZER_MODE, float(self.daily_target_kg))]
+            try:
+                results = [
+                    await self.optimize_weekly_production(mode=mode, target_kg=target_kg)
+                    for mode, target_kg in variants
+                ]
+            except Exception as e:
+                if not self._weekly_refresh_pending:
+                    raise
+                logger.warning(f"⚠️ Re-plan semanal fallido ({e}), reintentando con los datos nuevos")
+                continue
+            if not self._weekly_refresh_pending:
+                return results
+            logger.info("🔁 Nuevos datos durante el re-plan semanal, otra pasada")
+
+    @staticmethod
+    def _consume_task_result(task: asyncio.Task):
+        """Evita 'exception was never retrieved' en re-plans en background."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Re-plan semanal fallido: {task.exception()}")
+
+    @staticmethod
+    def _horizon_offset(timestamp: Any, horizon_start: datetime) -> float:
+        """Horas desde horizon_start (timestamps ISO o datetime, naive = UTC)"""
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return (timestamp - horizon_start).total_seconds() / 3600
+
+    async def _get_price_horizon(
+        self,
+        start: datetime,
+        hours: int
+    ) -> Tuple[List[Optional[float]], Dict[str, int]]:
+        """
+        Precio por hora del horizonte: REE publicado (InfluxDB) o Prophet.
+
+        Returns:
+            (precio €/kWh o None si no hay dato, conteo de horas por fuente)
+        """
+        prices: List[Optional[float]] = [None] * hours
+
+        try:
+            from services.price_forecasting_service import get_price_forecasting_service
+
+            predictions = await get_price_forecasting_service().predict_weekly(
+                start_date=start.replace(tzinfo=None)
+            )
+            for pred in predictions:
+                offset = int(self._horizon_offset(pred["timestamp"], start))
+                price = pred["predicted_price"]
+                if 0 <= offset < hours and isinstance(price, (int, float)) and -1000 < price < 1000:
+                    prices[offset] = max(0.0, float(price))
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo forecast REE {hours}h: {e}")
+
+        published_hours = set()
+
+        try:
+            from infrastructure.influxdb import get_influxdb_client
+            from services.ree_service import REEService
+
+            published = await REEService(get_influxdb_client()).get_prices(
+                start_date=start.date(),
+                end_date=(start + timedelta(hours=hours)).date()
+            )
+            for record in published:
+                offset = int(self._horizon_offset(record["timestamp"], start))
+                if 0 <= offset < hours and record.get("price_eur_kwh") is not None:
+                    prices[offset] = max(0.0, float(record["price_eur_kwh"]))
+                    published_hours.add(offset)
+        except Exception as e:
+            logger.warning(f"⚠️ Precios REE publicados no disponibles, usando solo Prophet: {e}")
+
+        return prices, {
+            "ree_published_hours": len(published_hours),
+            "prophet_hours": sum(p is not None for p in prices) - len(published_hours),
+            "missing_hours": sum(p is None for p in prices)
+        }
+
+    async def _get_owm_forecast_records(self) -> List[Dict[str, Any]]:
+        """
+        Registros OpenWeatherMap (cada 3h, 5 días).
+
+        Cacheados OPTIMIZER_WEATHER_TTL_SECONDS (tag "weather": la ingesta de
+        clima los invalida); una respuesta vacía no se cachea.
+        """
+        from infrastructure.external_apis import OpenWeatherMapAPIClient
+
+        async def fetch():
+            async with OpenWeatherMapAPIClient() as owm:
+                records = await owm.get_forecast(hours=120)
+            if not records:
+                raise ValueError("empty OpenWeatherMap forecast")
+            return records
+
+        return await get_cache_manager().aget_or_set(
+            "optimizer:owm_forecast_120h", fetch,
+            ttl=settings.OPTIMIZER_WEATHER_TTL_SECONDS, tags=("weather",)
+        )
+
+    async def _get_weather_horizon(self, start: datetime, hours: int) -> List[Dict[str, float]]:
+        """
+        Clima por hora del horizonte: registro OWM más cercano.
+
+        Más allá de los 5 días de OWM se mantiene el último registro
+        (persistencia); sin forecast, condiciones ideales.
+        """
+        try:
+            records = [r for r in await self._get_owm_forecast_records() if r.get("timestamp")]
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo forecast clima {hours}h: {e}")
+            records = []
+
+        if not records:
+            logger.warning("⚠️ No hay forecast OWM, usando condiciones ideales")
+            return [{"temperature": 22.0, "humidity": 55.0} for _ in range(hours)]
+
+        offsets = np.array([self._horizon_offset(r["timestamp"], start) for r in records])
+        nearest = np.abs(offsets[None, :] - np.arange(hours)[:, None]).argmin(axis=1)
+        return [
+            {
+                "temperature": records[i].get("temperature", 22.0),
+                "humidity": records[i].get("humidity", 55.0)
+            }
+            for i in nearest
+        ]
+
     async def _get_ree_forecast_24h(self, target_date: datetime) -> List[Dict[str, Any]]:
         """Obtiene predicciones REE para 24 horas desde target_date"""
         try:
@@ -473,203 +811,235 @@ class HourlyOptimizerService:
         weather_forecast: List[Dict[str, Any]],
         num_standard: int,
         num_premium: int,
-        target_date: datetime
-    ) -> List[ProductionBatch]:
+        target_date: datetime,
+        mode: str = "greedy"
+    ) -> Tuple[List[ProductionBatch], Dict[str, Any]]:
         """
-        Optimiza scheduling de batches usando estrategia greedy.
-
-        Estrategia:
-        1. Calcular score para cada hora (precio + clima)
-        2. Ordenar horas por mejor score
-        3. Asignar batches premium a mejores ventanas (conchado largo)
-        4. Asignar batches standard a ventanas restantes
-        5. Verificar constraints (secuencia, buffers, capacidad)
+        Optimiza scheduling de batches.
+
+        Modos:
+        - greedy: ordenar horas por score (60% precio, 40% clima) y asignar
+          premium y luego standard a la primera ventana libre
+        - exact: programación dinámica sobre slots horarios (máximo de
+          batches, luego premium, luego coste mínimo)
+
+        Returns:
+            (batches ordenados por hora de inicio, resumen del solver)
         """
 
         # 1. Calcular scores para cada hora
+        ree_by_hour = {r["hour"]: r for r in ree_forecast}
+        weather_by_hour = {w["hour"]: w for w in weather_forecast}
+
         hourly_scores = []
         for hour in range(24):
-            ree_data = next((r for r in ree_forecast if r["hour"] == hour), None)
-            weather_data = next((w for w in weather_forecast if w["hour"] == hour), None)
+            ree_data = ree_by_hour.get(hour)
+            weather_data = weather_by_hour.get(hour)
 
             if ree_data and weather_data:
-                # Score = peso_precio * (1 - precio_normalizado) + peso_clima * clima_score
-                # Menor precio = mejor score
-                # Condiciones óptimas = mejor score
-
-                price_score = 1.0 - min(ree_data["price_eur_kwh"] / 0.30, 1.0)  # Normalizar a 0.30€/kWh max
-
-                # Clima score: óptimo para conchado (18-28°C, <50% humedad)
                 temp = weather_data["temperature"]
                 humidity = weather_data["humidity"]
 
-                temp_optimal = 1.0 if 18 <= temp <= 28 else max(0.0, 1.0 - abs(temp - 23) / 15)
-                humidity_optimal = 1.0 if humidity <= 50 else max(0.0, 1.0 - (humidity - 50) / 50)
-
-                climate_score = (temp_optimal + humidity_optimal) / 2
-
-                # Pesos: 60% precio, 40% clima (conchado crítico)
-                total_score = 0.6 * price_score + 0.4 * climate_score
-
                 hourly_scores.append({
                     "hour": hour,
-                    "score": total_score,
+                    "score": self._score_hour(ree_data["price_eur_kwh"], temp, humidity),
                     "price_eur_kwh": ree_data["price_eur_kwh"],
                     "temperature": temp,
                     "humidity": humidity
                 })
 
-        # 2. Ordenar por mejor score
-        hourly_scores.sort(key=lambda x: x["score"], reverse=True)
+        # 2. Tablas por hora (precio por defecto 0.15 si falta dato)
+        scores_by_hour = {s["hour"]: s for s in hourly_scores}
+        prices = [scores_by_hour[h]["price_eur_kwh"] if h in scores_by_hour else 0.15 for h in range(24)]
+        scores = [scores_by_hour[h]["score"] if h in scores_by_hour else 0.0 for h in range(24)]
+        valid_starts = [h in scores_by_hour for h in range(24)]
+        demands = [(BATCH_PROFILES["premium"], num_premium), (BATCH_PROFILES["standard"], num_standard)]
 
         # 3. Asignar batches
-        batches = []
-        used_hours = set()
-
-        # Premium primero (requieren más horas óptimas para conchado largo)
-        for i in range(num_premium):
-            batch = self._schedule_batch(
-                batch_id=f"P{i+1:02d}",
-                quality_type="premium",
-                hourly_scores=hourly_scores,
-                used_hours=used_hours,
-                target_date=target_date
-            )
-            if batch:
-                batches.append(batch)
-                # Marcar horas usadas por este batch
-                duration_hours = int(np.ceil(batch.total_duration_hours))
-                for h in range(batch.start_hour, batch.start_hour + duration_hours):
-                    used_hours.add(h % 24)
-
-        # Standard después
-        for i in range(num_standard):
-            batch = self._schedule_batch(
-                batch_id=f"S{i+1:02d}",
-                quality_type="standard",
-                hourly_scores=hourly_scores,
-                used_hours=used_hours,
-                target_date=target_date
-            )
-            if batch:
-                batches.append(batch)
-                duration_hours = int(np.ceil(batch.total_duration_hours))
-                for h in range(batch.start_hour, batch.start_hour + duration_hours):
-                    used_hours.add(h % 24)
+        greedy_plan = greedy_schedule(scores, valid_starts, demands, prices, cyclic=True)
+        plan = exact_schedule(prices, valid_starts, demands, cyclic=True) if mode == "exact" else greedy_plan
+
+        for quality_type, missing in plan.unscheduled.items():
+            logger.warning(f"⚠️  No hay ventana disponible para {missing} batch(es) {quality_type}")
+
+        batches = self._plan_to_batches(plan, scores_by_hour)
+        solver = {
+            "mode": mode,
+            "solve_ms": round(plan.solve_seconds * 1000, 2),
+            "unscheduled": plan.unscheduled
+        }
+
+        if mode == "exact":
+            greedy_batches = self._plan_to_batches(greedy_plan, scores_by_hour)
+            greedy_cost = sum(b.total_cost_eur for b in greedy_batches)
+            exact_cost = sum(b.total_cost_eur for b in batches)
+            solver["vs_greedy"] = {
+                "greedy_cost_eur": round(greedy_cost, 2),
+                "exact_cost_eur": round(exact_cost, 2),
+                "gap_eur": round(greedy_cost - exact_cost, 2),
+                "gap_percent": round((greedy_cost - exact_cost) / greedy_cost * 100, 2) if greedy_cost > 0 else 0.0,
+                "greedy_batches": {q: greedy_plan.count(q) for q in BATCH_SEQUENCES},
+                "exact_batches": {q: plan.count(q) for q in BATCH_SEQUENCES},
+                # Gap is like-for-like only when both plans have the same batch mix
+                "comparable": all(greedy_plan.count(q) == plan.count(q) for q in BATCH_SEQUENCES),
+                "greedy_solve_ms": round(greedy_plan.solve_seconds * 1000, 2)
+            }
 
         # Ordenar por hora de inicio
         batches.sort(key=lambda b: b.start_hour)
 
+        return batches, solver
+
+    @staticmethod
+    def _score_hour(price_eur_kwh: float, temperature: float, humidity: float) -> float:
+        """
+        Score = peso_precio * (1 - precio_normalizado) + peso_clima * clima_score
+
+        Menor precio = mejor score; condiciones óptimas = mejor score.
+        """
+        price_score = 1.0 - min(price_eur_kwh / 0.30, 1.0)  # Normalizar a 0.30€/kWh max
+
+        # Clima score: óptimo para conchado (18-28°C, <50% humedad)
+        temp_optimal = 1.0 if 18 <= temperature <= 28 else max(0.0, 1.0 - abs(temperature - 23) / 15)
+        humidity_optimal = 1.0 if humidity <= 50 else max(0.0, 1.0 - (humidity - 50) / 50)
+
+        climate_score = (temp_optimal + humidity_optimal) / 2
+
+        # Pesos: 60% precio, 40% clima (conchado crítico)
+        return 0.6 * price_score + 0.4 * climate_score
+
+    def _plan_to_batches(
+        self,
+        plan: SchedulePlan,
+        scores_by_hour: Dict[int, Dict[str, Any]],
+        horizon: int = 24,
+        cyclic: bool = True,
+        id_suffix: str = ""
+    ) -> List[ProductionBatch]:
+        """Convierte placements del solver en ProductionBatch (IDs P01.., S01.. por tipo)"""
+        batches = []
+        seen = {"premium": 0, "standard": 0}
+        for quality_type, start_hour in plan.placements:
+            seen[quality_type] += 1
+            prefix = "P" if quality_type == "premium" else "S"
+            batches.append(self._build_batch(
+                batch_id=f"{prefix}{seen[quality_type]:02d}{id_suffix}",
+                quality_type=quality_type,
+                start_hour=start_hour,
+                scores_by_hour=scores_by_hour,
+                horizon=horizon,
+                cyclic=cyclic
+            ))
         return batches
 
-    def _schedule_batch(
+    def _build_batch(
         self,
         batch_id: str,
         quality_type: str,
-        hourly_scores: List[Dict[str, Any]],
-        used_hours: set,
-        target_date: datetime
-    ) -> Optional[ProductionBatch]:
-        """Programa un batch individual en la mejor ventana disponible"""
+        start_hour: int,
+        scores_by_hour: Dict[int, Dict[str, Any]],
+        horizon: int = 24,
+        cyclic: bool = True
+    ) -> ProductionBatch:
+        """
+        Construye un batch en la ventana que empieza en start_hour.
+
+        horizon/cyclic: 24h circular (plan diario, cruce de medianoche
+        envuelve) o lineal (plan semanal, horas absolutas desde el inicio
+        del horizonte, como batch_cost_table(cyclic=False))
+        """
 
         # Seleccionar procesos según calidad
-        if quality_type == "premium":
-            process_sequence = ["mixing", "rolling", "conching_premium", "tempering", "molding"]
-        else:
-            process_sequence = ["mixing", "rolling", "conching_standard", "tempering", "molding"]
+        process_sequence = BATCH_SEQUENCES[quality_type]
 
         # Calcular duración total
         total_duration_min = sum(PRODUCTION_PROCESSES[p].duration_minutes for p in process_sequence)
         total_duration_hours = total_duration_min / 60.0
         required_hours = int(np.ceil(total_duration_hours))
+        hours_range = [(start_hour + h) % horizon for h in range(required_hours)]
 
-        # Buscar ventana libre con mejor score
-        for score_data in hourly_scores:
-            start_hour = score_data["hour"]
-
-            # Verificar si todas las horas necesarias están libres
-            hours_range = [(start_hour + h) % 24 for h in range(required_hours)]
-            if any(h in used_hours for h in hours_range):
-                continue
-
-            # Ventana válida encontrada
-            # Calcular costo energético
-            processes = []
-            current_minute = 0
-            total_energy = 0.0
-            total_cost = 0.0
-
-            for proc_name in process_sequence:
-                proc = PRODUCTION_PROCESSES[proc_name]
-                start_min = current_minute
-                end_min = start_min + proc.duration_minutes
-
-                # Hora inicio/fin del proceso
-                proc_start_hour = (start_hour + int(start_min / 60)) % 24
-                proc_end_hour = (start_hour + int(end_min / 60)) % 24
-
-                # Precio promedio durante el proceso (manejar cruce de medianoche)
-                if proc_end_hour < proc_start_hour:
-                    # Cruza medianoche: 23h → 0h
-                    proc_hours = list(range(proc_start_hour, 24)) + list(range(0, proc_end_hour + 1))
-                else:
-                    proc_hours = list(range(proc_start_hour, proc_end_hour + 1))
-
-                proc_prices = [next((s["price_eur_kwh"] for s in hourly_scores if s["hour"] == h % 24), 0.15) for h in proc_hours]
-                avg_price = np.mean(proc_prices) if proc_prices else 0.15
-
-                proc_energy = proc.energy_kwh_per_minute * proc.duration_minutes
-                proc_cost = proc_energy * avg_price
-
-                total_energy += proc_energy
-                total_cost += proc_cost
-
-                processes.append({
-                    "name": proc.name,
-                    "start_minute": start_min,
-                    "end_minute": end_min,
-                    "duration_minutes": proc.duration_minutes,
-                    "energy_kwh": round(proc_energy, 2),
-                    "avg_price_eur_kwh": round(avg_price, 4),
-                    "cost_eur": round(proc_cost, 2)
-                })
-
-                current_minute = end_min
-
-            # Obtener condiciones climáticas promedio
-            weather_data = [s for s in hourly_scores if s["hour"] in hours_range]
-            avg_temp = np.mean([w["temperature"] for w in weather_data]) if weather_data else 22.0
-            avg_humidity = np.mean([w["humidity"] for w in weather_data]) if weather_data else 55.0
-
-            # Generar recomendación
-            if avg_temp <= 28 and avg_humidity <= 60:
-                recommendation = "✅ Condiciones óptimas"
-            elif avg_temp <= 32 and avg_humidity <= 70:
-                recommendation = "⚠️ Condiciones aceptables"
+        # Calcular costo energético
+        processes = []
+        current_minute = 0
+        total_energy = 0.0
+        total_cost = 0.0
+
+        for proc_name in process_sequence:
+            proc = PRODUCTION_PROCESSES[proc_name]
+            start_min = current_minute
+            end_min = start_min + proc.duration_minutes
+
+            # Hora inicio/fin del proceso
+            proc_start_hour = (start_hour + int(start_min / 60)) % horizon
+            proc_end_hour = (start_hour + int(end_min / 60)) % horizon
+
+            # Precio promedio durante el proceso (manejar cruce de medianoche)
+            if not cyclic:
+                # Horizonte lineal: el batch nunca envuelve; recortar al final del horizonte
+                proc_start_hour = start_hour + int(start_min / 60)
+                proc_end_hour = min(start_hour + int(end_min / 60), horizon - 1)
+                proc_hours = list(range(min(proc_start_hour, proc_end_hour), proc_end_hour + 1))
+            elif proc_end_hour < proc_start_hour:
+                # Cruza medianoche: 23h → 0h
+                proc_hours = list(range(proc_start_hour, horizon)) + list(range(0, proc_end_hour + 1))
             else:
-                recommendation = "🔴 Condiciones subóptimas - monitorear"
-
-            batch = ProductionBatch(
-                batch_id=batch_id,
-                quality_type=quality_type,
-                start_hour=start_hour,
-                processes=processes,
-                total_duration_hours=round(total_duration_hours, 2),
-                total_energy_kwh=round(total_energy, 2),
-                total_cost_eur=round(total_cost, 2),
-                avg_price_eur_kwh=round(total_cost / total_energy if total_energy > 0 else 0.15, 4),
-                weather_conditions={
-                    "avg_temperature": round(avg_temp, 1),
-                    "avg_humidity": round(avg_humidity, 1)
-                },
-                recommendation=recommendation
-            )
-
-            return batch
-
-        # No se encontró ventana disponible
-        logger.warning(f"⚠️  No hay ventana disponible para batch {batch_id}")
-        return None
+                proc_hours = list(range(proc_start_hour, proc_end_hour + 1))
+
+            proc_prices = [
+                scores_by_hour[h % horizon]["price_eur_kwh"] if h % horizon in scores_by_hour else 0.15
+                for h in proc_hours
+            ]
+            avg_price = np.mean(proc_prices) if proc_prices else 0.15
+
+            proc_energy = proc.energy_kwh_per_minute * proc.duration_minutes
+            proc_cost = proc_energy * avg_price
+
+            total_energy += proc_energy
+            total_cost += proc_cost
+
+            processes.append({
+                "name": proc.name,
+                "start_minute": start_min,
+                "end_minute": end_min,
+                "duration_minutes": proc.duration_minutes,
+                "energy_kwh": round(proc_energy, 2),
+                "avg_price_eur_kwh": round(avg_price, 4),
+                "cost_eur": round(proc_cost, 2)
+            })
+
+            current_minute = end_min
+
+        # Obtener condiciones climáticas promedio
+        weather_data = sorted(
+            (scores_by_hour[h] for h in sorted(hours_range) if h in scores_by_hour),
+            key=lambda x: x["score"], reverse=True
+        )
+        avg_temp = np.mean([w["temperature"] for w in weather_data]) if weather_data else 22.0
+        avg_humidity = np.mean([w["humidity"] for w in weather_data]) if weather_data else 55.0
+
+        # Generar recomendación
+        if avg_temp <= 28 and avg_humidity <= 60:
+            recommendation = "✅ Condiciones óptimas"
+        elif avg_temp <= 32 and avg_humidity <= 70:
+            recommendation = "⚠️ Condiciones aceptables"
+        else:
+            recommendation = "🔴 Condiciones subóptimas - monitorear"
+
+        return ProductionBatch(
+            batch_id=batch_id,
+            quality_type=quality_type,
+            start_hour=start_hour,
+            processes=processes,
+            total_duration_hours=round(total_duration_hours, 2),
+            total_energy_kwh=round(total_energy, 2),
+            total_cost_eur=round(total_cost, 2),
+            avg_price_eur_kwh=round(total_cost / total_energy if total_energy > 0 else 0.15, 4),
+            weather_conditions={
+                "avg_temperature": round(avg_temp, 1),
+                "avg_humidity": round(avg_humidity, 1)
+            },
+            recommendation=recommendation
+        )
 
     def _calculate_baseline(
         self,
@@ -691,13 +1061,13 @@ class HourlyOptimizerService:
 
         # Standard batches
         for _ in range(num_standard):
-            for proc_name in ["mixing", "rolling", "conching_standard", "tempering", "molding"]:
+            for proc_name in BATCH_SEQUENCES["standard"]:
                 proc = PRODUCTION_PROCESSES[proc_name]
                 total_energy += proc.energy_kwh_per_minute * proc.duration_minutes
 
         # Premium batches
         for _ in range(num_premium):
-            for proc_name in ["mixing", "rolling", "conching_premium", "tempering", "molding"]:
+            for proc_name in BATCH_SEQUENCES["premium"]:
                 proc = PRODUCTION_PROCESSES[proc_name]
                 total_energy += proc.energy_kwh_per_minute * proc.duration_minutes
 
@@ -772,6 +1142,20 @@ class HourlyOptimizerService:
             "recommendation": batch.recommendation
         }
 
+    def _horizon_batch_to_dict(self, batch: ProductionBatch, horizon_start: datetime) -> Dict[str, Any]:
+        """Batch de plan multi-día (start_hour absoluta desde horizon_start) a diccionario"""
+        required_hours = int(np.ceil(batch.total_duration_hours))
+        start = horizon_start + timedelta(hours=batch.start_hour)
+        end = start + timedelta(hours=required_hours)
+        return {
+            **self._batch_to_dict(batch),
+            "start_hour": start.hour,
+            "start_time": start.isoformat(),
+            "end_hour": end.hour,
+            "end_time": end.isoformat(),
+            "spills_into_next_day": end.date() > start.date() and end.hour > 0
+        }
+
     def _generate_hourly_timeline(
         self,
         ree_forecast: List[Dict[str, Any]],
@@ -786,6 +1170,7 @@ class HourlyOptimizerService:
             Lista de 24 elementos (uno por hora) con información completa
         """
         timeline = []
+        ml_inputs = []  # (price, temperature, humidity) sin redondear, por hora
 
         for hour in range(24):
             # Obtener precio REE
@@ -836,29 +1221,7 @@ class HourlyOptimizerService:
             if not math.isfinite(humidity):
                 humidity = 55.0
 
-            # Obtener predicción ML de estado de producción
-            ml_production_state = "Moderate"  # default
-            ml_confidence = 0.0
-            try:
-                ml_result = self.ml_service.predict_production_recommendation(
-                    price_eur_kwh=float(price_eur_kwh),
-                    temperature=float(temperature),
-                    humidity=float(humidity)
-                )
-                if "production_recommendation" in ml_result:
-                    ml_production_state = ml_result.get("production_recommendation", "Moderate")
-                    ml_confidence = ml_result.get("confidence", 0.0)
-            except Exception as e:
-                logger.warning(f"⚠️ ML prediction error at hour {hour}: {e}")
-
-            # Map production state to climate score (0-1 scale)
-            state_to_score = {
-                'Optimal': 1.0,
-                'Moderate': 0.7,
-                'Reduced': 0.4,
-                'Halt': 0.1
-            }
-            ml_climate_score = state_to_score.get(ml_production_state, 0.7)
+            ml_inputs.append((float(price_eur_kwh), float(temperature), float(humidity)))
 
             hour_data = {
                 "hour": hour,
@@ -871,15 +1234,42 @@ class HourlyOptimizerService:
                 "climate_status": self._get_climate_status(temperature, humidity),
                 "active_batch": active_batch,
                 "active_process": active_process,
-                "is_production_hour": active_batch is not None,
-                # Nuevos campos ML
-                "production_state": ml_production_state,
-                "ml_confidence": round(float(ml_confidence), 3),
-                "climate_score": round(float(ml_climate_score), 2)
+                "is_production_hour": active_batch is not None
             }
 
             timeline.append(hour_data)
 
+        # Predicción ML de estado de producción: 24 horas en una sola llamada
+        ml_states = ["Moderate"] * len(timeline)  # default
+        ml_confidences = [0.0] * len(timeline)
+        try:
+            ml_result = self.ml_service.predict_production_recommendation_batch(
+                timestamps=[target_date.replace(hour=h["hour"]) for h in timeline],
+                prices=[row[0] for row in ml_inputs],
+                temperatures=[row[1] for row in ml_inputs],
+                humidities=[row[2] for row in ml_inputs]
+            )
+            if "production_recommendation" in ml_result:
+                ml_states = ml_result["production_recommendation"]
+                ml_confidences = ml_result["confidence"]
+            elif "error" in ml_result:
+                logger.warning(f"⚠️ ML batch prediction unavailable: {ml_result['error']}")
+        except Exception as e:
+            logger.warning(f"⚠️ ML batch prediction error: {e}")
+
+        # Map production state to climate score (0-1 scale)
+        state_to_score = {
+            'Optimal': 1.0,
+            'Moderate': 0.7,
+            'Reduced': 0.4,
+            'Halt': 0.1
+        }
+        for hour_data, ml_production_state, ml_confidence in zip(timeline, ml_states, ml_confidences):
+            # Nuevos campos ML
+            hour_data["production_state"] = ml_production_state
+            hour_data["ml_confidence"] = round(float(ml_confidence), 3)
+            hour_data["climate_score"] = round(float(state_to_score.get(ml_production_state, 0.7)), 2)
+
         return timeline
 
     def _classify_tariff_period(self, hour: int) -> str:
@@ -968,5 +1358,8 @@ def get_optimizer_service(influxdb_client=None) -> HourlyOptimizerService:
     """Get singleton optimizer service instance"""
     global _optimizer_instance
     if _optimizer_instance is None:
+        from services.training_pool import get_training_pool
         _optimizer_instance = HourlyOptimizerService(influxdb_client=influxdb_client)
+        # Hot reload de los modelos sklearn que publica el training worker
+        get_training_pool().register_reload_hook("sklearn", _optimizer_instance.ml_service.load_models)
     return _optimizer_instance
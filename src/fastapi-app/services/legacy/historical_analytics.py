@@ -7,8 +7,8 @@ from datetime import datetime, timedelta
 from typing import List, Optional
 from pydantic import BaseModel
 import logging
-from influxdb_client import InfluxDBClient
 from influxdb_client.client.query_api import QueryApi
+from infrastructure.influxdb.client import get_influxdb_client, query_tables_async
 import statistics
 
 logger = logging.getLogger(__name__)
@@ -51,11 +51,11 @@ class HistoricalAnalyticsService:
     def __init__(self):
         # Configuración InfluxDB usando las mismas variables de entorno que data_ingestion
         import os
-        self.influx_client = InfluxDBClient(
+        self.influx_client = get_influxdb_client(
             url=os.getenv("INFLUXDB_URL", "http://influxdb:8086"),
             token=os.getenv("INFLUXDB_TOKEN", ""),
             org=os.getenv("INFLUXDB_ORG", "chocolate-factory")
-        )
+        ).client
         self.query_api = self.influx_client.query_api()
         self.bucket = os.getenv("INFLUXDB_BUCKET", "energy_data")
         
@@ -110,7 +110,7 @@ class HistoricalAnalyticsService:
                 |> sort(columns: ["_time"])
             '''
             
-            result = self.query_api.query(query)
+            result = await query_tables_async(self.query_api, query)
             
             data = []
             for table in result:
@@ -20,6 +20,7 @@ import pandas as pd
 from loguru import logger
 
 from infrastructure.external_apis import REEAPIClient  # Sprint 15
+from infrastructure.influxdb.client import query_tables_async
 from .siar_etl import SiarETL
 from .data_ingestion import DataIngestionService
 from .gap_detector import GapDetectionService
@@ -181,7 +182,7 @@ class HistoricalDataService:
 
                 # Procesar REE
                 try:
-                    ree_tables = query_api.query(ree_query)
+                    ree_tables = await query_tables_async(query_api, ree_query)
                     for table in ree_tables:
                         for record in table.records:
                             year = record.get_time().year
@@ -192,7 +193,7 @@ class HistoricalDataService:
 
                 # Procesar Weather
                 try:
-                    weather_tables = query_api.query(weather_query)
+                    weather_tables = await query_tables_async(query_api, weather_query)
                     for table in weather_tables:
                         for record in table.records:
                             year = record.get_time().year
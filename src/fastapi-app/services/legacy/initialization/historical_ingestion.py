@@ -14,6 +14,7 @@ from dataclasses import dataclass
 
 from infrastructure.external_apis import REEAPIClient, AEMETAPIClient  # Sprint 15
 from infrastructure.external_apis.aemet_client import AEMETWeatherData
+from infrastructure.influxdb.client import query_tables_async, write_records_async
 from ..data_ingestion import DataIngestionService, DataIngestionStats
 
 # For backward compatibility
@@ -188,7 +189,7 @@ class HistoricalDataIngestion:
         '''
         
         try:
-            results = query_api.query(query)
+            results = await query_tables_async(query_api, query)
             
             total_records = 0
             earliest_date = None
@@ -297,27 +298,21 @@ class HistoricalDataIngestion:
             raise RuntimeError("DataIngestionService not initialized")
         
         write_api = self.data_service.client.write_api()
-        successful_writes = 0
-        
+
         try:
-            for weather in weather_data:
-                # Convert AEMET data to InfluxDB point using correct method
-                point = self.data_service._transform_aemet_weather_to_influx_point(weather)
-                
-                # Write individual point
-                write_api.write(
-                    bucket=self.data_service.config.bucket,
-                    org=self.data_service.config.org,
-                    record=point
+            # Convert AEMET data to InfluxDB points using correct method
+            points = [
+                self.data_service._transform_aemet_weather_to_influx_point(weather)
+                for weather in weather_data
+            ]
+
+            # One write, off the event loop
+            if points:
+                await write_records_async(
+                    write_api, self.data_service.config.bucket, points,
+                    org=self.data_service.config.org
                 )
-                successful_writes += 1
-                
-                # Batch write every 100 records for efficiency
-                if successful_writes % 100 == 0:
-                    logger.debug(f"Wrote {successful_writes} AEMET historical records...")
-            
-            # Ensure all data is written
-            write_api.flush()
+            successful_writes = len(points)
             logger.info(f"Successfully stored {successful_writes} AEMET historical weather records")
             
             return successful_writes
@@ -348,7 +343,7 @@ class HistoricalDataIngestion:
         '''
         
         try:
-            results = query_api.query(query)
+            results = await query_tables_async(query_api, query)
             
             total_records = 0
             earliest_date = None
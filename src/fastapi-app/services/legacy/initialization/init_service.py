@@ -10,6 +10,7 @@ Coordinador principal para inicialización del sistema.
 """
 
 import logging
+import asyncio
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
@@ -224,7 +225,7 @@ class InitializationService:
                 |> limit(n: 1)
             '''
             try:
-                list(query_api.query(test_query))
+                await query_tables_async(query_api, test_query)
                 logger.info("✅ InfluxDB schemas verified")
             except Exception as e:
                 logger.warning(f"⚠️ InfluxDB schema check failed: {e}")
@@ -243,7 +244,7 @@ class InitializationService:
             '''
             
             try:
-                results = query_api.query(count_query)
+                results = await query_tables_async(query_api, count_query)
                 total_records = 0
                 for table in results:
                     for record in table.records:
@@ -289,10 +290,12 @@ class InitializationService:
                     |> count()
                 '''
                 
-                # Execute queries
-                ree_results = query_api.query(ree_count_query)
-                weather_results = query_api.query(weather_count_query)
-                recent_results = query_api.query(recent_count_query)
+                # Execute queries (concurrently, off the event loop)
+                ree_results, weather_results, recent_results = await asyncio.gather(
+                    query_tables_async(query_api, ree_count_query),
+                    query_tables_async(query_api, weather_count_query),
+                    query_tables_async(query_api, recent_count_query)
+                )
                 
                 # Process results
                 ree_count = 0
@@ -20,6 +20,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import statistics
 
+from core.cache import cache_key_wrapper, single_flight
 from core.config import settings
 from infrastructure.influxdb.client import get_influxdb_client
 
@@ -41,6 +42,7 @@ class PredictiveInsightsService:
         self.influxdb_client = get_influxdb_client()
 
 
+    @single_flight("insights.optimal_windows", ignore_self=True)
     async def get_optimal_windows(self, days: int = 7) -> Dict[str, Any]:
         """
         Get optimal production windows for next N days.
@@ -314,19 +316,8 @@ class PredictiveInsightsService:
                     })
 
             # 2. Check for weather extremes (next 72h from AEMET forecast)
-            query_weather_forecast = f'''
-            from(bucket: "{settings.INFLUXDB_BUCKET}")
-                |> range(start: now(), stop: 72h)
-                |> filter(fn: (r) => r["_measurement"] == "weather_forecast")
-                |> filter(fn: (r) => r["_field"] == "temperature")
-                |> filter(fn: (r) => r["data_source"] == "aemet")
-                |> aggregateWindow(every: 24h, fn: max, createEmpty: false)
-                |> yield(name: "max_temps")
-            '''
-
             try:
-                weather_result = self.influxdb_client.query_api().query(query_weather_forecast)
-                max_temps = [record.get_value() for table in weather_result for record in table.records]
+                max_temps = await self._get_forecast_max_temps()
 
                 # SIAR P90 threshold: 28.8°C (from Sprint 07)
                 if max_temps and any(t > 28.8 for t in max_temps):
@@ -375,6 +366,23 @@ class PredictiveInsightsService:
             }
 
 
+    @cache_key_wrapper("insights.forecast_max_temps", ignore_self=True, tags=["weather"])
+    async def _get_forecast_max_temps(self) -> List[float]:
+        """Máximas diarias de la predicción AEMET (72h); cacheado hasta la próxima ingesta de clima"""
+        query_weather_forecast = f'''
+        from(bucket: "{settings.INFLUXDB_BUCKET}")
+            |> range(start: now(), stop: 72h)
+            |> filter(fn: (r) => r["_measurement"] == "weather_forecast")
+            |> filter(fn: (r) => r["_field"] == "temperature")
+            |> filter(fn: (r) => r["data_source"] == "aemet")
+            |> aggregateWindow(every: 24h, fn: max, createEmpty: false)
+            |> yield(name: "max_temps")
+        '''
+
+        weather_result = await self.influxdb_client.query_async(query_weather_forecast)
+        return [record.get_value() for table in weather_result for record in table.records]
+
+
     async def get_savings_tracking(self) -> Dict[str, Any]:
         """
         Track theoretical energy savings vs baseline.
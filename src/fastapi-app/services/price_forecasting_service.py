@@ -18,12 +18,14 @@ Funcionalidades:
 - Corrección por inercia usando últimas 3h de precios reales
 - Predicción 7 días con intervalos de confianza 95%
 - Almacenamiento predicciones en InfluxDB
+- Caché horaria de predicciones compartida por todos los consumidores
 """
 
-import pickle
+import asyncio
 import logging
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Hashable
 from datetime import datetime, timedelta
 
 import pandas as pd
@@ -33,11 +35,185 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from influxdb_client import Point
 
 from .data_ingestion import DataIngestionService
+from infrastructure.influxdb.client import query_tables_async, write_records_async
 from .gas_generation_service import GasGenerationService
+from .feature_store import get_feature_store
+from core.cache import SingleFlight
+from domain.ml.model_artifacts import get_model_registry, publish_latest, write_pickle_atomic
 from domain.ml.model_metrics_tracker import ModelMetricsTracker
+from domain.ml.incremental_training import (
+    MODE_FULL,
+    MODE_INCREMENTAL,
+    MODE_SKIP,
+    get_incremental_state,
+    prophet_warm_start_params
+)
 
 logger = logging.getLogger(__name__)
 
+# Nombre en el metrics tracker y en el estado de reentrenamiento incremental
+PROPHET_MODEL_NAME = "prophet_price_forecast"
+
+
+class ForecastInputUnavailable(Exception):
+    """Input del forecast (inercia, gas) sin datos: se usa el fallback sin memoizarlo."""
+
+
+class ForecastCache:
+    """
+    Caché de predicciones compartida por todas las instancias del servicio.
+
+    Dashboard, PredictiveInsights, chatbot y HourlyOptimizer crean su propio
+    PriceForecastingService, así que la caché vive a nivel de módulo. Memoiza
+    el forecast Prophet, la corrección por inercia y el input de gas:
+
+    - Se vacía al cambiar la hora (inercia/gas dependen de la hora actual)
+    - Se invalida explícitamente al guardar un modelo nuevo (_save_model)
+    - Single-flight: llamadas concurrentes con la misma clave comparten cálculo
+    - Los fallbacks (sin datos de inercia/gas) no se memoizan: las factories
+      lanzan ForecastInputUnavailable y se reintenta en la siguiente llamada
+    """
+
+    def __init__(self):
+        self._hour: Optional[datetime] = None
+        self._generation = 0
+        self._entries: Dict[Hashable, Any] = {}
+        self._flights = SingleFlight("forecast_cache", copy_result=False)
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @staticmethod
+    def current_hour() -> datetime:
+        """Hora actual truncada (clave de expiración)"""
+        return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+    def _roll_hour(self):
+        """
+        Vacía la caché cuando cambia la hora.
+
+        La generación avanza aunque la caché esté vacía: un cálculo iniciado
+        en la hora anterior no debe almacenarse en la nueva.
+        """
+        hour = self.current_hour()
+        if hour != self._hour:
+            if self._hour is not None:
+                self.invalidate(f"hour rollover → {hour.strftime('%H:00')}")
+            self._hour = hour
+
+    def invalidate(self, reason: str = "manual"):
+        """Descarta todas las entradas (los cálculos en curso no se almacenan)"""
+        self._entries.clear()
+        self._generation += 1
+        self.stats["invalidations"] += 1
+        logger.info(f"🗑️ Forecast cache invalidated ({reason})")
+
+    async def get_or_compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Devuelve el valor cacheado para ``key`` o lo calcula una sola vez.
+
+        Las llamadas concurrentes con la misma clave comparten el cálculo
+        (SingleFlight por hora: corre en su propia task, cancelar a un
+        llamante no cancela a los demás). Las excepciones de ``factory`` se propagan y
+        no se cachean.
+        """
+        self._roll_hour()
+
+        if key in self._entries:
+            self.stats["hits"] += 1
+            return self._entries[key]
+
+        self.stats["misses"] += 1
+        generation = self._generation
+
+        async def compute():
+            value = await factory()
+            if generation == self._generation:
+                self._entries[key] = value
+            return value
+
+        # La hora en la clave: una llamada de las 11:00 no se une al cálculo de las 10:59
+        return await self._flights.do((self._hour, key), compute)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de la caché"""
+        return {
+            **self.stats,
+            "coalesced": self._flights.stats["coalesced"],
+            "entries": len(self._entries),
+            "hour": self._hour.isoformat() if self._hour else None
+        }
+
+
+# Modelo Prophet de producción (compartido con el backtesting, domain/ml/backtesting.py)
+PROPHET_CONFIG: Dict[str, Any] = {
+    # Seasonality configuration (disabled default, use custom Fourier)
+    'yearly_seasonality': False,    # Custom Fourier order instead
+    'weekly_seasonality': False,    # Custom Fourier order instead
+    'daily_seasonality': False,     # Custom Fourier order instead
+
+    # Confidence interval
+    'interval_width': 0.95,         # 95% confidence intervals
+
+    # Changepoints: balance entre flexibilidad y generalización
+    'changepoint_prior_scale': 0.08,  # Sweet spot
+    'n_changepoints': 25,             # Sweet spot
+
+    # Seasonality: balance fino
+    'seasonality_prior_scale': 10.0,  # Sweet spot
+
+    # Smoothing
+    'seasonality_mode': 'multiplicative',  # Better for price variations
+}
+
+# Custom Fourier seasonality (optimizado para R² = 0.48): daily/weekly/yearly sweet spots
+PROPHET_SEASONALITIES: List[Dict[str, Any]] = [
+    {'name': 'daily', 'period': 1, 'fourier_order': 8, 'prior_scale': 12.0},
+    {'name': 'weekly', 'period': 7, 'fourier_order': 5, 'prior_scale': 10.0},
+    {'name': 'yearly', 'period': 365.25, 'fourier_order': 8, 'prior_scale': 8.0},
+]
+
+# Regresores exógenos → prior_scale (NO lags autoregresivos: causan overfitting temporal)
+PROPHET_REGRESSORS: Dict[str, float] = {
+    'is_peak_hour': 0.10,    # Demand proxies
+    'is_valley_hour': 0.08,
+    'is_weekend': 0.06,      # Holidays & weekends
+    'is_holiday': 0.08,
+    'is_winter': 0.04,       # Seasonality proxies
+    'is_summer': 0.04,
+    'gas_gen_scaled': 0.10,  # Gas generation (Ciclo Combinado)
+}
+
+# Media histórica de Prophet (36 meses): referencia de la corrección por inercia
+INERTIA_BASELINE_EUR_KWH = 0.138
+
+
+def build_prophet_model(
+    config: Optional[Dict[str, Any]] = None,
+    seasonalities: Optional[List[Dict[str, Any]]] = None,
+    regressors: Optional[Dict[str, float]] = None
+) -> Prophet:
+    """Prophet sin entrenar con holidays ES, estacionalidades Fourier y regresores."""
+    model = Prophet(**(PROPHET_CONFIG if config is None else config))
+
+    # Agregar country holidays españoles (mejora estacionalidad)
+    model.add_country_holidays('ES')
+
+    for seasonality in (PROPHET_SEASONALITIES if seasonalities is None else seasonalities):
+        model.add_seasonality(**seasonality)
+
+    for name, prior_scale in (PROPHET_REGRESSORS if regressors is None else regressors).items():
+        model.add_regressor(name, prior_scale=prior_scale)
+
+    return model
+
+
+# Process-wide forecast cache (shared across PriceForecastingService instances)
+_forecast_cache = ForecastCache()
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Obtiene la caché de predicciones compartida"""
+    return _forecast_cache
+
 
 class PriceForecastingService:
     """
@@ -68,25 +244,7 @@ class PriceForecastingService:
         self.metrics_tracker = ModelMetricsTracker()
 
         # Configuración Prophet (optimizada para R² = 0.48, balance generalización/complejidad)
-        self.prophet_config = {
-            # Seasonality configuration (disabled default, use custom Fourier)
-            'yearly_seasonality': False,    # Custom Fourier order instead
-            'weekly_seasonality': False,    # Custom Fourier order instead
-            'daily_seasonality': False,     # Custom Fourier order instead
-
-            # Confidence interval
-            'interval_width': 0.95,         # 95% confidence intervals
-
-            # Changepoints: balance entre flexibilidad y generalización
-            'changepoint_prior_scale': 0.08,  # Sweet spot
-            'n_changepoints': 25,             # Sweet spot
-
-            # Seasonality: balance fino
-            'seasonality_prior_scale': 10.0,  # Sweet spot
-
-            # Smoothing
-            'seasonality_mode': 'multiplicative',  # Better for price variations
-        }
+        self.prophet_config = dict(PROPHET_CONFIG)
 
         # Intentar cargar modelo existente
         self._load_latest_model()
@@ -103,46 +261,23 @@ class PriceForecastingService:
         """
         logger.info(f"📊 Extrayendo datos REE: {months_back} meses")
 
-        async with DataIngestionService() as service:
-            # Query para extraer precios REE
-            query = f'''
-                from(bucket: "{service.config.bucket}")
-                |> range(start: -{months_back}mo)
-                |> filter(fn: (r) => r._measurement == "energy_prices")
-                |> filter(fn: (r) => r._field == "price_eur_kwh")
-                |> sort(columns: ["_time"])
-            '''
-
-            try:
-                query_api = service.client.query_api()
-                tables = query_api.query(query)
-
-                # Procesar datos
-                data = []
-                for table in tables:
-                    for record in table.records:
-                        data.append({
-                            'timestamp': record.get_time(),
-                            'price_eur_kwh': record.get_value()
-                        })
-
-                df = pd.DataFrame(data)
-
-                if df.empty:
-                    logger.error("❌ No se encontraron datos REE en InfluxDB")
-                    return pd.DataFrame()
+        try:
+            # Feature store: la historia ya guardada se lee de Parquet, solo el delta viene de InfluxDB
+            start = pd.Timestamp.now(tz='UTC') - pd.DateOffset(months=months_back)
+            df = await get_feature_store().load("ree", ["price_eur_kwh"], start=start)
 
-                # Eliminar duplicados y ordenar
-                df = df.drop_duplicates(subset=['timestamp']).sort_values('timestamp')
+            if df.empty:
+                logger.error("❌ No se encontraron datos REE en InfluxDB")
+                return pd.DataFrame()
 
-                logger.info(f"✅ Extraídos {len(df)} registros REE ({df['timestamp'].min()} → {df['timestamp'].max()})")
-                logger.info(f"📈 Rango precios: {df['price_eur_kwh'].min():.4f} - {df['price_eur_kwh'].max():.4f} €/kWh")
+            logger.info(f"✅ Extraídos {len(df)} registros REE ({df['timestamp'].min()} → {df['timestamp'].max()})")
+            logger.info(f"📈 Rango precios: {df['price_eur_kwh'].min():.4f} - {df['price_eur_kwh'].max():.4f} €/kWh")
 
-                return df
+            return df
 
-            except Exception as e:
-                logger.error(f"❌ Error extrayendo datos REE: {e}")
-                return pd.DataFrame()
+        except Exception as e:
+            logger.error(f"❌ Error extrayendo datos REE: {e}")
+            return pd.DataFrame()
 
     def prepare_prophet_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -171,7 +306,8 @@ class PriceForecastingService:
 
         return prophet_df
 
-    def _add_prophet_features(self, df: pd.DataFrame, include_lags: bool = False) -> pd.DataFrame:
+    @staticmethod
+    def _add_prophet_features(df: pd.DataFrame, include_lags: bool = False) -> pd.DataFrame:
         """
         Agrega features exógenas avanzadas: lags, Fourier, holidays, demanda proxy.
 
@@ -249,18 +385,57 @@ class PriceForecastingService:
 
         return df
 
-    async def train_model(self, months_back: int = 36, test_days: int = 7) -> Dict[str, Any]:
+    @staticmethod
+    def _merge_gas_regressor(df_prophet: pd.DataFrame, gas_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Añade ``gas_gen_scaled`` (diario) a cada hora; sin datos de gas usa 0.5.
+        """
+        if gas_df is None or gas_df.empty:
+            # No gas data available, use placeholder
+            df_prophet = df_prophet.copy()
+            df_prophet['gas_gen_scaled'] = 0.5
+            logger.warning("⚠️ No gas data available, using placeholder value")
+            return df_prophet
+
+        # Gas data is daily, need to expand to hourly (same value for all hours in a day)
+        gas_df = gas_df.copy()
+        gas_df['date'] = gas_df['ds'].dt.date
+        df_prophet = df_prophet.copy()
+        df_prophet['date'] = df_prophet['ds'].dt.date
+
+        # Merge gas data (left join to keep all price records)
+        df_prophet = df_prophet.merge(
+            gas_df[['date', 'gas_gen_scaled']],
+            on='date',
+            how='left'
+        )
+
+        # Fill any missing gas values with median
+        df_prophet['gas_gen_scaled'] = df_prophet['gas_gen_scaled'].fillna(
+            df_prophet['gas_gen_scaled'].median()
+        )
+
+        df_prophet = df_prophet.drop(columns=['date'])
+        logger.info(f"✅ Gas generation data merged: {gas_df['gas_gen_scaled'].notna().sum()} days")
+        return df_prophet
+
+    async def train_model(self, months_back: int = 36, test_days: int = 7, incremental: bool = False) -> Dict[str, Any]:
         """
         Entrena modelo Prophet con datos históricos REE.
 
         Args:
             months_back: Meses de historia para entrenar (default: 36 = 3 años)
             test_days: Días para validación (default: 7 = horizonte real de predicción)
+            incremental: Modo de los jobs programados: sin reentrenar si apenas
+                hay horas nuevas desde el último modelo; si las hay, el ajuste
+                parte de los parámetros del modelo anterior (stan_init).
+                Refit en frío periódico.
 
         Returns:
             Diccionario con métricas de entrenamiento y validación
         """
-        logger.info("🤖 Iniciando entrenamiento modelo Prophet...")
+        logger.info(f"🤖 Iniciando entrenamiento modelo Prophet{' (incremental)' if incremental else ''}...")
+        training_start = time.perf_counter()
 
         # 1. Extraer datos históricos
         df_raw = await self.extract_ree_historical_data(months_back=months_back)
@@ -281,35 +456,33 @@ class PriceForecastingService:
 
         # 2c. Agregar gas generation data (Ciclo Combinado) como regressor
         try:
-            gas_service = GasGenerationService()
-            gas_df = await gas_service.get_historical(months=months_back)
-            
-            if not gas_df.empty:
-                # Gas data is daily, need to expand to hourly (same value for all hours in a day)
-                gas_df['date'] = gas_df['ds'].dt.date
-                df_prophet['date'] = df_prophet['ds'].dt.date
-                
-                # Merge gas data (left join to keep all price records)
-                df_prophet = df_prophet.merge(
-                    gas_df[['date', 'gas_gen_scaled']], 
-                    on='date', 
-                    how='left'
-                )
-                
-                # Fill any missing gas values with median
-                df_prophet['gas_gen_scaled'] = df_prophet['gas_gen_scaled'].fillna(
-                    df_prophet['gas_gen_scaled'].median()
-                )
-                
-                df_prophet = df_prophet.drop(columns=['date'])
-                logger.info(f"✅ Gas generation data merged: {gas_df['gas_gen_scaled'].notna().sum()} days")
-            else:
-                # No gas data available, use placeholder
-                df_prophet['gas_gen_scaled'] = 0.5
-                logger.warning("⚠️ No gas data available, using placeholder value")
+            gas_df = await GasGenerationService().get_historical(months=months_back)
         except Exception as e:
             logger.warning(f"⚠️ Could not load gas data: {e}, using placeholder")
-            df_prophet['gas_gen_scaled'] = 0.5
+            gas_df = pd.DataFrame()
+        df_prophet = self._merge_gas_regressor(df_prophet, gas_df)
+
+        # 2d. Modo incremental: ¿hay horas nuevas suficientes desde el último modelo?
+        state = get_incremental_state()
+        mode = MODE_FULL
+        warm_start = None
+        if incremental:
+            plan = state.plan(PROPHET_MODEL_NAME, df_prophet['ds'], model_available=self.model is not None)
+            logger.info(f"🧭 Training plan: {plan.mode} ({plan.reason})")
+
+            if plan.mode == MODE_SKIP:
+                return {
+                    "success": True,
+                    "skipped": True,
+                    "training_mode": MODE_SKIP,
+                    "reason": plan.reason,
+                    "new_samples": plan.new_samples,
+                    "metrics": {k: float(v) for k, v in self.metrics.items()},
+                    "last_training": self.last_training.isoformat() if self.last_training else None
+                }
+            if plan.mode == MODE_INCREMENTAL:
+                warm_start = prophet_warm_start_params(self.model)
+                mode = MODE_INCREMENTAL if warm_start else MODE_FULL
 
         # 3. Split train/test: test = últimos N días (horizonte real de predicción)
         # Antes: 80/20 (test = ~7 meses) - no representativo del uso real
@@ -322,71 +495,24 @@ class PriceForecastingService:
         logger.info(f"📊 Split: {len(df_train)} train / {len(df_test)} test ({test_days} días)")
 
         try:
-            # 4. Configurar y entrenar Prophet con custom seasonality
-            self.model = Prophet(**self.prophet_config)
-
-            # Agregar country holidays españoles (mejora estacionalidad)
-            self.model.add_country_holidays('ES')
-
-            # === CUSTOM FOURIER SEASONALITY (optimizado para R² = 0.48) ===
-            # Daily: orden 8 (sweet spot - generaliza bien)
-            self.model.add_seasonality(
-                name='daily',
-                period=1,
-                fourier_order=8,
-                prior_scale=12.0
-            )
-
-            # Weekly: orden 5 (sweet spot - generaliza bien)
-            self.model.add_seasonality(
-                name='weekly',
-                period=7,
-                fourier_order=5,
-                prior_scale=10.0
-            )
-
-            # Yearly: orden 8 (sweet spot)
-            self.model.add_seasonality(
-                name='yearly',
-                period=365.25,
-                fourier_order=8,
-                prior_scale=8.0
-            )
-
-            # === REGRESSORES EXÓGENOS (optimizados para R² = 0.48) ===
-            # Demand proxies (sweet spot)
-            self.model.add_regressor('is_peak_hour', prior_scale=0.10)
-            self.model.add_regressor('is_valley_hour', prior_scale=0.08)
-
-            # Holidays & weekends
-            self.model.add_regressor('is_weekend', prior_scale=0.06)
-            self.model.add_regressor('is_holiday', prior_scale=0.08)
-
-            # Seasonality proxies
-            self.model.add_regressor('is_winter', prior_scale=0.04)
-            self.model.add_regressor('is_summer', prior_scale=0.04)
-
-            # Gas generation regressor (Ciclo Combinado)
-            self.model.add_regressor('gas_gen_scaled', prior_scale=0.10)
-
-            # NO lags autoregressivos (causan overfitting temporal)
+            # 4. Configurar y entrenar Prophet con custom seasonality + regresores exógenos
+            self.model = build_prophet_model(self.prophet_config)
 
             # Suprimir output verbose de Prophet
             import logging as prophet_logging
             prophet_logging.getLogger('prophet').setLevel(prophet_logging.WARNING)
 
-            self.model.fit(df_train)
+            # Warm start: el optimizador parte de los parámetros del modelo anterior
+            if warm_start:
+                self.model.fit(df_train, init=warm_start)
+            else:
+                self.model.fit(df_train)
 
             logger.info("✅ Modelo Prophet entrenado exitosamente")
 
             # 5. Validar con datos de test (backtesting)
             # Seleccionar columnas de regressores (sin lags)
-            regressor_cols = [
-                'ds', 'is_peak_hour', 'is_valley_hour',
-                'is_weekend', 'is_holiday', 'is_winter', 'is_summer',
-                'gas_gen_scaled'
-            ]
-            future_test = df_test[regressor_cols].copy()
+            future_test = df_test[['ds'] + list(PROPHET_REGRESSORS)].copy()
             forecast_test = self.model.predict(future_test)
 
             # Calcular métricas
@@ -417,23 +543,25 @@ class PriceForecastingService:
             logger.info(f"   R²: {r2:.4f} (objetivo: >0.85)")
             logger.info(f"   Coverage 95%: {coverage:.2%} (objetivo: >90%)")
 
-            # 6. Log metrics to CSV tracker (Sprint 20)
-            training_duration = (datetime.now() - datetime.now()).total_seconds()  # Placeholder
-            self.metrics_tracker.log_metrics(
-                model_name="prophet_price_forecast",
+            # 6. Log metrics to CSV tracker (Sprint 20), con deriva vs último refit completo
+            training_duration = time.perf_counter() - training_start
+            drift = self.metrics_tracker.log_training_run(
+                model_name=PROPHET_MODEL_NAME,
                 metrics={
                     "mae": float(mae),
                     "rmse": float(rmse),
                     "r2": float(r2),
                     "samples": len(df_train),
-                    "duration_seconds": training_duration
+                    "duration_seconds": round(training_duration, 3)
                 },
-                notes="scheduled_retrain" if hasattr(self, '_scheduled_run') else "manual_train"
+                mode=mode,
+                notes="scheduled_retrain" if incremental else "manual_train"
             )
 
             # 7. Guardar modelo
             self.last_training = datetime.now()
             self._save_model()
+            state.record(PROPHET_MODEL_NAME, mode, df_prophet['ds'].max())
 
             # 7. Resultado (convertir numpy types a Python nativos)
             result = {
@@ -447,6 +575,9 @@ class PriceForecastingService:
                     "test_samples": int(len(df_test)),
                 },
                 "last_training": self.last_training.isoformat(),
+                "training_mode": mode,
+                "duration_seconds": round(training_duration, 3),
+                "drift_vs_full_refit": drift,
                 "model_file": str(self.models_dir / "latest" / "price_forecast_prophet.pkl"),
                 "meets_objectives": {
                     "mae_ok": bool(mae < 0.02),
@@ -484,7 +615,7 @@ class PriceForecastingService:
 
             try:
                 query_api = service.client.query_api()
-                tables = query_api.query(query)
+                tables = await query_tables_async(query_api, query)
 
                 data = []
                 for table in tables:
@@ -517,6 +648,9 @@ class PriceForecastingService:
 
         Returns:
             Factor de corrección a aplicar a predicciones Prophet
+
+        Raises:
+            ForecastInputUnavailable: Error de consulta o menos de 2 precios
         """
         try:
             async with DataIngestionService() as service:
@@ -529,7 +663,7 @@ class PriceForecastingService:
                     |> limit(n: {window_hours + 2})
                 '''
                 query_api = service.client.query_api()
-                tables = query_api.query(query)
+                tables = await query_tables_async(query_api, query)
 
                 prices = []
                 for table in tables:
@@ -537,22 +671,19 @@ class PriceForecastingService:
                         prices.append(record.get_value())
 
                 if len(prices) < 2:
-                    logger.warning("⚠️ Insuficientes datos para inercia, sin corrección")
-                    return 0.0
+                    raise ForecastInputUnavailable(f"{len(prices)} precios en las últimas {window_hours + 1}h")
 
                 recent_mean = np.mean(prices[:window_hours])
 
-                # Media histórica de Prophet (baseline)
-                prophet_baseline = 0.138  # Media histórica 36 meses
-
-                correction = recent_mean - prophet_baseline
+                correction = recent_mean - INERTIA_BASELINE_EUR_KWH
                 logger.info(f"📊 Inercia {window_hours}h: media_reciente={recent_mean:.4f}, corrección={correction:+.4f}")
 
                 return correction
 
+        except ForecastInputUnavailable:
+            raise
         except Exception as e:
-            logger.warning(f"⚠️ Error calculando inercia: {e}, sin corrección")
-            return 0.0
+            raise ForecastInputUnavailable(f"error calculando inercia: {e}") from e
 
     async def predict_weekly(self, start_date: Optional[datetime] = None, apply_inertia: bool = True) -> List[Dict[str, Any]]:
         """
@@ -562,6 +693,11 @@ class PriceForecastingService:
         - Prophet captura estacionalidad (hora, día, semana)
         - Inercia corrige nivel con media últimas 3h reales
 
+        El resultado se cachea por (modelo, hora de inicio, gas, corrección
+        por inercia) hasta el cambio de hora o el próximo _save_model(); un
+        input con fallback da otra clave, así que un forecast calculado sin
+        datos no se sirve cuando ya los hay.
+
         Args:
             start_date: Fecha de inicio para predicciones (default: ahora)
             apply_inertia: Aplicar corrección por inercia (default: True)
@@ -578,65 +714,107 @@ class PriceForecastingService:
         if start_date is None:
             start_date = datetime.now().replace(minute=0, second=0, microsecond=0)
 
-        logger.info(f"🔮 Generando predicción 168 horas desde {start_date.isoformat()}...")
+        try:
+            gas_gen_scaled = await self._get_gas_input()
+            inertia_correction = await self._get_inertia_input(window_hours=3) if apply_inertia else 0.0
+
+            key = ("forecast", self.model_version_key, start_date.isoformat(), gas_gen_scaled, inertia_correction)
+            predictions = await _forecast_cache.get_or_compute(
+                key,
+                lambda: self._compute_weekly(start_date, gas_gen_scaled, inertia_correction)
+            )
+
+            # Copias: los consumidores no deben mutar la entrada cacheada
+            return [dict(p) for p in predictions]
+
+        except Exception as e:
+            logger.error(f"❌ Error generando predicciones: {e}")
+            raise
+
+    async def _get_gas_input(self) -> float:
+        """
+        Input de gas (último valor conocido) memoizado por hora.
+
+        Returns:
+            gas_gen_scaled, o 0.5 si no hay datos (sin memoizar)
+        """
+        async def fetch_latest_gas() -> Dict[str, float]:
+            latest_gas = await GasGenerationService().get_latest()
+            if not latest_gas:
+                raise ForecastInputUnavailable("no recent gas data")
+            return latest_gas
 
         try:
-            # 1. Crear dataframe de fechas futuras
-            future_dates = pd.date_range(
-                start=start_date,
-                periods=168,
-                freq='h'
+            latest_gas = await _forecast_cache.get_or_compute(("gas",), fetch_latest_gas)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load gas data: {e}, using placeholder 0.5")
+            return 0.5
+
+        return latest_gas['gas_gen_scaled']
+
+    async def _get_inertia_input(self, window_hours: int) -> float:
+        """
+        Corrección por inercia memoizada por hora.
+
+        Returns:
+            Corrección, o 0.0 si no hay datos (sin memoizar)
+        """
+        try:
+            return await _forecast_cache.get_or_compute(
+                ("inertia", window_hours),
+                lambda: self._get_inertia_correction(window_hours=window_hours)
             )
+        except ForecastInputUnavailable as e:
+            logger.warning(f"⚠️ Inercia no disponible ({e}), sin corrección")
+            return 0.0
 
-            future = pd.DataFrame({'ds': future_dates})
+    async def _compute_weekly(
+        self,
+        start_date: datetime,
+        gas_gen_scaled: float,
+        inertia_correction: float
+    ) -> List[Dict[str, Any]]:
+        """Ejecuta Prophet + inercia (solo en cache miss)"""
+        logger.info(f"🔮 Generando predicción 168 horas desde {start_date.isoformat()}...")
 
-            # 2. Agregar features exógenas (sin lags)
-            future = self._add_prophet_features(future, include_lags=False)
+        # 1. Crear dataframe de fechas futuras
+        future_dates = pd.date_range(
+            start=start_date,
+            periods=168,
+            freq='h'
+        )
 
-            # 2b. Agregar gas generation (último valor conocido para todas las horas futuras)
-            try:
-                gas_service = GasGenerationService()
-                latest_gas = await gas_service.get_latest()
-                
-                if latest_gas:
-                    future['gas_gen_scaled'] = latest_gas['gas_gen_scaled']
-                    logger.info(f"✅ Gas value for prediction: {latest_gas['gas_gen']:.0f} MWh (from {latest_gas['date']})")
-                else:
-                    future['gas_gen_scaled'] = 0.5
-                    logger.warning("⚠️ No gas data, using placeholder 0.5")
-            except Exception as e:
-                future['gas_gen_scaled'] = 0.5
-                logger.warning(f"⚠️ Could not load gas data: {e}, using placeholder")
+        future = pd.DataFrame({'ds': future_dates})
 
-            logger.info("✅ Features exógenas agregadas (sin lags)")
+        # 2. Agregar features exógenas (sin lags) + gas (último valor conocido)
+        future = self._add_prophet_features(future, include_lags=False)
+        future['gas_gen_scaled'] = gas_gen_scaled
 
-            # 3. Predecir con modelo Prophet
-            forecast = self.model.predict(future)
+        logger.info("✅ Features exógenas agregadas (sin lags)")
 
-            # 4. Calcular corrección por inercia (últimas 3h)
-            inertia_correction = 0.0
-            if apply_inertia:
-                inertia_correction = await self._get_inertia_correction(window_hours=3)
+        # 3. Predecir con modelo Prophet (fuera del event loop: uncertainty sampling es CPU)
+        forecast = await asyncio.to_thread(self.model.predict, future)
 
-            # 5. Formatear resultados con corrección
-            predictions = []
-            for _, row in forecast.iterrows():
-                corrected_price = row['yhat'] + inertia_correction
-                predictions.append({
-                    'timestamp': row['ds'].isoformat(),
-                    'predicted_price': round(corrected_price, 4),
-                    'confidence_lower': round(row['yhat_lower'] + inertia_correction, 4),
-                    'confidence_upper': round(row['yhat_upper'] + inertia_correction, 4),
-                })
+        # 4. Formatear resultados con corrección por inercia
+        ds = forecast['ds']
+        yhat = (forecast['yhat'] + inertia_correction).round(4)
+        lower = (forecast['yhat_lower'] + inertia_correction).round(4)
+        upper = (forecast['yhat_upper'] + inertia_correction).round(4)
 
-            logger.info(f"✅ {len(predictions)} predicciones generadas (inercia: {inertia_correction:+.4f})")
-            logger.info(f"📈 Rango predicho: {min(p['predicted_price'] for p in predictions):.4f} - {max(p['predicted_price'] for p in predictions):.4f} €/kWh")
+        predictions = [
+            {
+                'timestamp': ts.isoformat(),
+                'predicted_price': float(price),
+                'confidence_lower': float(lo),
+                'confidence_upper': float(hi),
+            }
+            for ts, price, lo, hi in zip(ds, yhat, lower, upper)
+        ]
 
-            return predictions
+        logger.info(f"✅ {len(predictions)} predicciones generadas (inercia: {inertia_correction:+.4f})")
+        logger.info(f"📈 Rango predicho: {min(p['predicted_price'] for p in predictions):.4f} - {max(p['predicted_price'] for p in predictions):.4f} €/kWh")
 
-        except Exception as e:
-            logger.error(f"❌ Error generando predicciones: {e}")
-            raise
+        return predictions
 
     async def predict_hours(self, hours: int = 24) -> List[Dict[str, Any]]:
         """
@@ -670,7 +848,7 @@ class PriceForecastingService:
         async with DataIngestionService() as service:
             try:
                 points = []
-                model_version = self.last_training.strftime("%Y%m%d_%H%M%S") if self.last_training else "unknown"
+                model_version = self.model_version
 
                 for pred in predictions:
                     point = (
@@ -687,7 +865,7 @@ class PriceForecastingService:
 
                 # Escribir en batch
                 write_api = service.client.write_api()
-                write_api.write(bucket=service.config.bucket, record=points)
+                await write_records_async(write_api, service.config.bucket, points)
 
                 logger.info(f"✅ Predicciones almacenadas exitosamente")
                 return True
@@ -696,6 +874,18 @@ class PriceForecastingService:
                 logger.error(f"❌ Error almacenando predicciones: {e}")
                 return False
 
+    @property
+    def model_version(self) -> str:
+        """Versión del modelo (timestamp de entrenamiento), como en InfluxDB"""
+        return self.last_training.strftime("%Y%m%d_%H%M%S") if self.last_training else "unknown"
+
+    @property
+    def model_version_key(self) -> str:
+        """Identificador del artefacto de modelo para la caché de predicciones"""
+        if self.last_training:
+            return self.last_training.isoformat()
+        return f"unversioned-{id(self.model)}"
+
     def get_model_status(self) -> Dict[str, Any]:
         """
         Obtiene estado actual del modelo.
@@ -709,6 +899,7 @@ class PriceForecastingService:
             "metrics": self.metrics,
             "model_file": str(self.models_dir / "latest" / "price_forecast_prophet.pkl"),
             "prophet_config": self.prophet_config,
+            "forecast_cache": _forecast_cache.get_stats(),
         }
 
     def _save_model(self):
@@ -727,8 +918,7 @@ class PriceForecastingService:
             }
 
             # Save versioned model
-            with open(versioned_path, 'wb') as f:
-                pickle.dump(model_data, f)
+            write_pickle_atomic(model_data, versioned_path)
 
             logger.info(f"💾 Modelo Prophet guardado: {versioned_path}")
 
@@ -736,16 +926,19 @@ class PriceForecastingService:
             latest_dir = self.models_dir / "latest"
             latest_dir.mkdir(exist_ok=True)
             latest_path = latest_dir / "price_forecast_prophet.pkl"
-
-            if latest_path.exists() or latest_path.is_symlink():
-                latest_path.unlink()
-            latest_path.symlink_to(f"../{versioned_filename}")
+            publish_latest(latest_path, f"../{versioned_filename}")
 
             logger.info(f"🔗 Symlink actualizado: {latest_path} → {versioned_filename}")
 
+            _forecast_cache.invalidate(f"new model {versioned_filename}")
+
         except Exception as e:
             logger.error(f"❌ Error guardando modelo: {e}")
 
+    def reload_model(self) -> bool:
+        """Hot reload: recarga el modelo publicado en latest/ por el training worker"""
+        return self._load_latest_model()
+
     def _load_latest_model(self) -> bool:
         """
         Carga último modelo Prophet entrenado desde symlink latest/.
@@ -766,12 +959,12 @@ class PriceForecastingService:
                 logger.info("ℹ️ No hay modelo previo disponible")
                 return False
 
-            with open(model_path, 'rb') as f:
-                model_data = pickle.load(f)
+            # Compartido por todas las instancias del proceso (se deserializa una vez)
+            model_data = get_model_registry().get(model_path)
 
             self.model = model_data['model']
             self.last_training = model_data['last_training']
-            self.metrics = model_data.get('metrics', {})
+            self.metrics = dict(model_data.get('metrics', {}))
 
             logger.info(f"✅ Modelo cargado (entrenado: {self.last_training})")
             return True
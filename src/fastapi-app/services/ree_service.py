@@ -7,8 +7,8 @@ Orchestrates REE API client and InfluxDB for electricity price data.
 Responsibilities:
 - Fetch prices from REE API (via infrastructure layer)
 - Validate and transform data
-- Persist to InfluxDB
-- Query historical prices
+- Persist to InfluxDB (shared ingestion sink: batched, idempotent upserts)
+- Query historical prices (cached; tag "ree" invalidated after ingestion)
 - Detect data gaps
 
 Usage:
@@ -28,8 +28,14 @@ from collections import deque
 
 from influxdb_client import Point, WritePrecision
 
-from infrastructure.influxdb import InfluxDBClientWrapper
+from infrastructure.influxdb import (
+    InfluxDBClientWrapper,
+    run_blocking,
+    get_coverage_index,
+    get_ingestion_sink
+)
 from infrastructure.external_apis import REEAPIClient
+from core.cache import cache_key_wrapper, get_cache_manager
 from core.config import settings
 from core.exceptions import (
     REEDataError,
@@ -98,7 +104,7 @@ class REEService:
 
         # Check if data already exists
         if not force_refresh:
-            existing = await self._check_existing_data(target_date)
+            existing = self._check_existing_data(target_date)
             if existing:
                 logger.info(f"⚠️ Data for {target_date} already exists (use force_refresh=True to overwrite)")
                 return {
@@ -134,13 +140,18 @@ class REEService:
 
         # Write to InfluxDB
         try:
-            records_written = self.influxdb.write_points(points, bucket=self.BUCKET)
+            records_written = await get_ingestion_sink(self.influxdb).write(
+                points, bucket=self.BUCKET, overwrite=force_refresh
+            )
             logger.info(f"✅ Wrote {records_written} REE prices to InfluxDB")
 
         except Exception as e:
             logger.error(f"❌ Failed to write REE prices to InfluxDB: {e}")
             raise InfluxDBWriteError(self.MEASUREMENT, str(e))
 
+        if records_written:
+            await get_cache_manager().ainvalidate_tags("ree")
+
         return {
             "date": target_date.isoformat(),
             "records_written": records_written,
@@ -175,34 +186,30 @@ class REEService:
 
         return points
 
-    async def _check_existing_data(self, target_date: date) -> bool:
+    def _check_existing_data(self, target_date: date) -> bool:
         """
         Check if data already exists for a given date.
 
+        Uses the coverage index (hours written through the sink or verified
+        by gap detection) instead of a Flux count per run: the 5-minute REE
+        job no longer queries InfluxDB just to skip a day it already has.
+
         Args:
             target_date: Date to check
 
         Returns:
-            True if data exists, False otherwise
+            True if any hour of the (UTC) day is present, False otherwise
         """
         start_dt = datetime.combine(target_date, datetime.min.time()).replace(tzinfo=timezone.utc)
         end_dt = start_dt + timedelta(days=1)
 
-        flux_query = f'''
-from(bucket: "{self.BUCKET}")
-  |> range(start: {start_dt.isoformat()}, stop: {end_dt.isoformat()})
-  |> filter(fn: (r) => r["_measurement"] == "{self.MEASUREMENT}")
-  |> filter(fn: (r) => r["_field"] == "price_eur_kwh")
-  |> count()
-'''
-
         try:
-            results = self.influxdb.query(flux_query)
-            return len(results) > 0
+            return bool(get_coverage_index().present_hours(self.MEASUREMENT, start_dt, end_dt))
         except Exception as e:
             logger.warning(f"⚠️ Failed to check existing data: {e}")
             return False
 
+    @cache_key_wrapper("ree.prices", ignore_self=True, tags=["ree"])
     async def get_prices(
         self,
         start_date: date,
@@ -212,6 +219,9 @@ from(bucket: "{self.BUCKET}")
         """
         Get historical REE prices from InfluxDB.
 
+        Cached (tag "ree", invalidated after each ingestion). The returned
+        list is shared: do not mutate it.
+
         Args:
             start_date: Start date
             end_date: End date (defaults to start_date + 1 day)
@@ -244,7 +254,7 @@ from(bucket: "{self.BUCKET}")
             flux_query += f'\n  |> limit(n: {limit})'
 
         try:
-            results = self.influxdb.query(flux_query)
+            results = await run_blocking(self.influxdb.query, flux_query)
 
             prices = [
                 {
@@ -283,7 +293,7 @@ from(bucket: "{self.BUCKET}")
 '''
 
         try:
-            results = self.influxdb.query(flux_query)
+            results = await run_blocking(self.influxdb.query, flux_query)
 
             if results:
                 record = results[0]
@@ -299,6 +309,7 @@ from(bucket: "{self.BUCKET}")
             logger.error(f"❌ Failed to get latest price: {e}")
             return None
 
+    @cache_key_wrapper("ree.price_stats", ignore_self=True, tags=["ree"])
     async def get_price_stats(
         self,
         start_date: date,
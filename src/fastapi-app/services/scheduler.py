@@ -27,6 +27,7 @@ from pydantic import BaseModel, Field
 from loguru import logger
 
 from .data_ingestion import DataIngestionService, DataIngestionStats
+from infrastructure.influxdb.client import query_tables_async
 
 
 class SchedulerConfig(BaseModel):
@@ -519,9 +520,9 @@ class SchedulerService:
                 '''
                 
                 # Execute queries
-                price_results = query_api.query(price_query)
-                temp_results = query_api.query(temp_query)
-                humidity_results = query_api.query(humidity_query)
+                price_results = await query_tables_async(query_api, price_query)
+                temp_results = await query_tables_async(query_api, temp_query)
+                humidity_results = await query_tables_async(query_api, humidity_query)
                 
                 # Extract values
                 price = None
@@ -623,21 +624,20 @@ class SchedulerService:
         try:
             logger.info("🤖 Starting scheduled direct ML training job")
             
-            # Import direct ML service
-            from domain.ml.direct_ml import DirectMLService
-            
-            # Initialize direct ML service
-            direct_ml = DirectMLService()
-            
-            # Train models using direct approach
-            training_results = await direct_ml.train_models()
+            # Train models using direct approach (training worker process)
+            from services.training_pool import get_training_pool
+            training_results = await get_training_pool().run("sklearn", incremental=True)
             
             if not training_results.get("success"):
                 logger.error(f"❌ ML training failed: {training_results.get('error', 'Unknown error')}")
                 return
+
+            if training_results.get("skipped"):
+                logger.info(f"⏭️ Direct ML retraining skipped: {training_results.get('reason')}")
+                return
             
             # Log training results
-            logger.info("🎯 Direct ML Training Results:")
+            logger.info(f"🎯 Direct ML Training Results ({training_results.get('training_mode')}):")
             
             # Energy model results
             if "energy_model" in training_results:
@@ -682,21 +682,20 @@ class SchedulerService:
         try:
             logger.info("✨ Starting scheduled Enhanced ML training job")
 
-            # Import enhanced ML service
-            from domain.ml.enhanced_ml_service import EnhancedMLService
-
-            # Initialize enhanced ML service
-            enhanced_ml = EnhancedMLService()
-
-            # Train enhanced models using historical data
-            training_results = await enhanced_ml.train_enhanced_models()
+            # Train enhanced models using historical data (training worker process)
+            from services.training_pool import get_training_pool
+            training_results = await get_training_pool().run("enhanced", incremental=True)
 
             if not training_results.get("success"):
                 logger.error(f"❌ Enhanced ML training failed: {training_results.get('error', 'Unknown error')}")
                 return
 
+            if training_results.get("skipped"):
+                logger.info(f"⏭️ Enhanced ML retraining skipped: {training_results.get('reason')}")
+                return
+
             # Log enhanced training results
-            logger.info("🚀 Enhanced ML Training Results:")
+            logger.info(f"🚀 Enhanced ML Training Results ({training_results.get('training_mode')}):")
 
             # Cost optimization model results
             if "cost_optimization" in training_results:
@@ -878,10 +877,13 @@ class SchedulerService:
                 "stats": job_stats.dict() if job_stats else None
             })
         
+        from services.training_pool import get_training_pool
+
         return {
             "status": "running" if self.is_running else "stopped",
             "total_jobs": len(jobs_info),
-            "jobs": jobs_info
+            "jobs": jobs_info,
+            "training_pool": get_training_pool().get_status()
         }
     
     async def trigger_job_now(self, job_id: str) -> bool:
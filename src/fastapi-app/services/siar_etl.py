@@ -19,6 +19,7 @@ import pandas as pd
 
 from .data_ingestion import DataIngestionService, DataIngestionStats
 from .data_ingestion import AEMETWeatherData  # AEMETWeatherData is defined in data_ingestion.py
+from .siar_loader import SiarLoader
 
 
 class SiarETL:
@@ -154,40 +155,17 @@ class SiarETL:
         """
         Process real SIAR CSV files from the data directory
 
+        Streaming load (services.siar_loader): encoding detected once per
+        file, vectorized chunks, files parsed in parallel processes.
+
         Args:
             data_path: Path to directory containing SIAR CSV files
         """
         logger.info(f"🚀 Starting SIAR ETL for real CSV files in {data_path}")
 
-        stats = DataIngestionStats()
-
         try:
-            # Find all CSV files in the data directory using find command approach
-            import glob
-            import os
-            # Use os.walk to handle encoding issues
-            csv_files = []
-            for root, dirs, files in os.walk("/app/data"):
-                for file in files:
-                    if file.endswith('.csv'):
-                        csv_files.append(os.path.join(root, file))
-
-            if not csv_files:
-                logger.warning(f"No CSV files found in {data_path}")
-                return stats
-
-            logger.info(f"📁 Found {len(csv_files)} CSV files to process")
-
-            # Process each CSV file
-            for csv_file in csv_files:
-                logger.info(f"📊 Processing {csv_file}")
-                file_stats = await self.process_real_siar_csv_simple(csv_file)
-
-                # Accumulate stats
-                stats.total_records += file_stats.total_records
-                stats.successful_writes += file_stats.successful_writes
-                stats.failed_writes += file_stats.failed_writes
-
+            loader = SiarLoader()
+            stats = await loader.load_directory(data_path)
             logger.info(f"✅ SIAR ETL completed: {stats.successful_writes}/{stats.total_records} records loaded")
             return stats
 
@@ -197,130 +175,13 @@ class SiarETL:
 
     async def process_real_siar_csv_simple(self, csv_file_path: str) -> DataIngestionStats:
         """
-        Simple and direct processing of SIAR CSV files
+        Simple and direct processing of a single SIAR CSV file
         Based on known format: IdProvincia;IdEstacion;Fecha;Año;Dia;TempMedia(°C);TempMax(°C);...
         """
-        stats = DataIngestionStats()
+        logger.info(f"📊 Processing SIAR CSV (simple): {csv_file_path}")
 
         try:
-            logger.info(f"📊 Processing SIAR CSV (simple): {csv_file_path}")
-
-            # Read file with encoding handling
-            content = None
-            for encoding in ['latin-1', 'iso-8859-1', 'cp1252', 'utf-8']:
-                try:
-                    with open(csv_file_path, 'r', encoding=encoding) as f:
-                        lines = f.readlines()
-                    logger.info(f"Successfully read {csv_file_path} with {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-
-            if lines is None:
-                raise ValueError(f"Could not decode {csv_file_path}")
-
-            # Skip header line and process data lines
-            data_lines = lines[1:]  # Skip first line (header)
-            logger.info(f"🎯 Found {len(data_lines)} data lines")
-
-            weather_data = []
-
-            for line_num, line in enumerate(data_lines, 2):  # Start from line 2
-                try:
-                    # Character-by-character cleaning approach - keep only valid CSV characters
-                    clean_chars = []
-                    for char in line:
-                        # Keep only printable ASCII characters, semicolons, commas, forward slashes, colons, digits, letters, dots, minus
-                        if char.isprintable() and (char.isalnum() or char in ';,/:.-'):
-                            clean_chars.append(char)
-
-                    clean_line = ''.join(clean_chars)
-
-                    if not clean_line.strip():
-                        continue
-
-                    # Debug first few lines to verify cleaning
-                    if line_num <= 5:
-                        logger.info(f"🔍 Line {line_num} Original: '{line[:30]}...' (len={len(line)})")
-                        logger.info(f"🔍 Line {line_num} Cleaned:  '{clean_line[:30]}...' (len={len(clean_line)})")
-
-                    parts = clean_line.split(';')
-                    if len(parts) < 22:  # Need at least 22 columns
-                        logger.warning(f"⚠️ Line {line_num}: insufficient columns ({len(parts)})")
-                        if len(parts) > 2:  # Debug: show what we got
-                            logger.info(f"🔍 Debug parts[0:3]: {parts[0:3]}")
-                        continue
-
-                    # Extract key data (using position-based access)
-                    try:
-                        fecha_str = parts[2]  # Should now be clean DD/MM/YYYY
-                        if not fecha_str or '/' not in fecha_str:
-                            continue
-
-                        # Debug: log first successful date parsing
-                        if stats.total_records < 3:
-                            logger.info(f"🔍 Debug: Clean line length={len(clean_line)}, fecha_str='{fecha_str}' (len={len(fecha_str)})")
-
-                        # Parse Spanish date format DD/MM/YYYY
-                        date_obj = pd.to_datetime(fecha_str, format='%d/%m/%Y')
-
-                        # Create weather record with SIAR-specific formatting
-                        weather_record = AEMETWeatherData(
-                            timestamp=date_obj.replace(tzinfo=timezone.utc),
-                            station_id=f"SIAR_J{int(parts[1]):02d}_Linares",  # Unique SIAR identifier
-                            station_name=f"SIAR_Linares_J{int(parts[1]):02d}",
-                            province="Jaén",
-                            altitude=None,  # Not available in SIAR
-                            temperature=self._safe_float_comma(parts[5]) if len(parts) > 5 else None,      # TempMedia
-                            temperature_max=self._safe_float_comma(parts[6]) if len(parts) > 6 else None,  # TempMax
-                            temperature_min=self._safe_float_comma(parts[8]) if len(parts) > 8 else None,  # TempMin
-                            humidity=self._safe_float_comma(parts[10]) if len(parts) > 10 else None,       # HumedadMedia
-                            humidity_max=self._safe_float_comma(parts[11]) if len(parts) > 11 else None,   # HumedadMax
-                            humidity_min=self._safe_float_comma(parts[13]) if len(parts) > 13 else None,   # HumedadMin
-                            pressure=None,  # Not available in SIAR format
-                            wind_speed=self._safe_float_comma(parts[15]) if len(parts) > 15 else None,     # Velviento (m/s)
-                            wind_direction=self._safe_float_comma(parts[16]) if len(parts) > 16 else None, # DirViento
-                            wind_gust=self._safe_float_comma(parts[17]) if len(parts) > 17 else None,      # VelVientoMax -> wind_gust
-                            precipitation=self._safe_float_comma(parts[21]) if len(parts) > 21 else None   # Precipitación
-                            # Note: radiation data (parts[20]) not included in AEMETWeatherData model
-                        )
-
-                        weather_data.append(weather_record)
-                        stats.total_records += 1
-
-                        # Log first successful record for debugging
-                        if stats.total_records == 1:
-                            logger.info(f"🎯 First record created successfully: {fecha_str}, Station: {weather_record.station_id}")
-
-                        # Log progress every 100 records
-                        if stats.total_records % 100 == 0:
-                            logger.info(f"📈 Processed {stats.total_records} records...")
-
-                    except (ValueError, IndexError) as e:
-                        logger.warning(f"⚠️ Line {line_num}: parsing error - {e}")
-                        stats.failed_writes += 1
-                        continue
-
-                except Exception as e:
-                    logger.warning(f"⚠️ Line {line_num}: general error - {e}")
-                    stats.failed_writes += 1
-                    continue
-
-            # Write to InfluxDB using AEMET weather ingestion method
-            if weather_data:
-                logger.info(f"💾 Writing {len(weather_data)} SIAR records to InfluxDB...")
-
-                async with DataIngestionService() as ingestion_service:
-                    ingestion_stats = await ingestion_service.ingest_aemet_weather(weather_data)
-
-                    stats.successful_writes = ingestion_stats.successful_writes
-                    stats.failed_writes = ingestion_stats.failed_writes
-
-                logger.info(f"✅ SIAR CSV completed: {stats.successful_writes} records written from {csv_file_path}")
-            else:
-                logger.warning(f"⚠️ No valid weather data found in {csv_file_path}")
-
-            return stats
+            return await SiarLoader(workers=1).load_files([csv_file_path])
 
         except Exception as e:
             logger.error(f"❌ Error processing SIAR CSV {csv_file_path}: {e}")
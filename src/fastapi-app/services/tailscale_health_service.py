@@ -14,6 +14,7 @@ from dataclasses import dataclass
 import httpx
 from influxdb_client import Point
 from core.logging_config import get_logger
+from infrastructure.influxdb.client import query_tables_async, write_records_async
 
 logger = get_logger(__name__)
 
@@ -274,14 +275,14 @@ class TailscaleHealthService:
                 if node.latency_ms is not None:
                     point = point.field("latency_ms", node.latency_ms)
 
-                write_api.write(bucket="analytics", record=point)
+                await write_records_async(write_api, "analytics", point)
 
             logger.debug(f"Stored health metrics for {len(nodes)} nodes in InfluxDB")
 
         except Exception as e:
             logger.error(f"Failed to store health metrics: {e}")
 
-    def calculate_uptime(self, hostname: str, hours: int = 24) -> Optional[float]:
+    async def calculate_uptime(self, hostname: str, hours: int = 24) -> Optional[float]:
         """
         Calculate uptime percentage for a node from InfluxDB data.
 
@@ -307,7 +308,7 @@ class TailscaleHealthService:
                     |> mean()
             '''
 
-            result = query_api.query(query=query)
+            result = await query_tables_async(query_api, query)
 
             if result and len(result) > 0 and len(result[0].records) > 0:
                 uptime_fraction = result[0].records[0].get_value()
@@ -503,7 +504,7 @@ class TailscaleHealthService:
                 .field("tx_bytes", conn_stats.get("tx_bytes", 0)) \
                 .field("rx_bytes", conn_stats.get("rx_bytes", 0))
 
-            write_api.write(bucket="analytics", record=point)
+            await write_records_async(write_api, "analytics", point)
 
             logger.debug(f"Stored connection metrics for {hostname} in InfluxDB")
 
@@ -0,0 +1,470 @@
+"""
+Training Worker Pool - Chocolate Factory
+=========================================
+
+Reentrenamientos fuera del proceso de la API. RandomForest y la
+optimización Stan de Prophet son CPU-bound: ejecutados en el event loop
+de FastAPI (APScheduler) retrasan las peticiones del dashboard.
+
+- Cola local de trabajos con ``ML_TRAINING_WORKERS`` workers; un trabajo
+  en cola o en curso con el mismo nombre no se duplica (se comparte)
+- Cada trabajo corre en un proceso nuevo (spawn) con límites: núcleos
+  (afinidad + hilos BLAS/OpenMP), nice, memoria (RLIMIT_AS) y timeout
+  (el proceso se termina)
+- Los modelos se publican de forma atómica en ``/app/models/latest``
+  (domain/ml/model_artifacts.py); al terminar, los hooks de recarga
+  actualizan los modelos que la API tiene en memoria (hot reload)
+- Estado (en cola, en curso, historial) para ``get_job_status``
+
+Uso:
+    pool = get_training_pool()
+    result = await pool.run("sklearn")   # encola y espera el resultado
+    job = pool.submit("prophet")         # encola y vuelve
+    pool.get_status()
+"""
+
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Union
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Nombre del trabajo → "módulo:función" que se ejecuta en el worker
+TRAINING_JOBS: Dict[str, str] = {
+    "sklearn": "services.training_pool:train_sklearn_models",
+    "enhanced": "services.training_pool:train_enhanced_models",
+    "prophet": "services.training_pool:train_prophet_model",
+}
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+_POLL_SECONDS = 0.2
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+ReloadHook = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+# =================================================================
+# TRAINING TARGETS (run inside the worker process)
+# =================================================================
+
+async def train_sklearn_models(incremental: bool = True) -> Dict[str, Any]:
+    """DirectMLService: energy optimization + production classifier"""
+    from domain.ml.direct_ml import DirectMLService
+    return await DirectMLService().train_models(incremental=incremental)
+
+
+async def train_enhanced_models(incremental: bool = True) -> Dict[str, Any]:
+    """EnhancedMLService: cost, efficiency and price forecast models"""
+    from domain.ml.enhanced_ml_service import EnhancedMLService
+    return await EnhancedMLService().train_enhanced_models(incremental=incremental)
+
+
+async def train_prophet_model(months_back: int = 36, incremental: bool = True) -> Dict[str, Any]:
+    """PriceForecastingService: Prophet 168h price model"""
+    from services.price_forecasting_service import PriceForecastingService
+    return await PriceForecastingService().train_model(months_back=months_back, incremental=incremental)
+
+
+# =================================================================
+# WORKER PROCESS
+# =================================================================
+
+@dataclass(frozen=True)
+class TrainingLimits:
+    """Límites de recursos de un proceso de entrenamiento."""
+    cpus: int = 0
+    max_memory_mb: int = 0
+    nice: int = 0
+    timeout_seconds: float = 3600
+
+    @classmethod
+    def from_settings(cls) -> "TrainingLimits":
+        return cls(
+            cpus=settings.ML_TRAINING_CPUS,
+            max_memory_mb=settings.ML_TRAINING_MAX_MEMORY_MB,
+            nice=settings.ML_TRAINING_NICE,
+            timeout_seconds=settings.ML_TRAINING_TIMEOUT_SECONDS
+        )
+
+
+_spawn_env_lock = threading.Lock()
+
+
+@contextmanager
+def _thread_env(limits: TrainingLimits):
+    """
+    Límites de hilos BLAS/OpenMP en el entorno con el que arranca el hijo.
+
+    Las librerías leen OMP_NUM_THREADS & co. al cargarse, y el hijo importa
+    numpy al deserializar ``_worker_main`` (services/__init__): fijarlas
+    dentro del hijo llega tarde. Se aplican solo mientras dura ``start()``.
+    """
+    if limits.cpus <= 0:
+        yield
+        return
+    with _spawn_env_lock:
+        previous = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+        os.environ.update({name: str(limits.cpus) for name in _THREAD_ENV_VARS})
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def _apply_limits(limits: TrainingLimits):
+    """Aplicar afinidad, prioridad y memoria al proceso actual (los hilos vienen de _thread_env)."""
+    if limits.cpus > 0:
+        if hasattr(os, "sched_setaffinity"):
+            # Los últimos núcleos: el primero queda libre para la API
+            available = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, available[-limits.cpus:])
+    if limits.nice > 0:
+        os.nice(limits.nice)
+    if limits.max_memory_mb > 0:
+        try:
+            import resource
+            limit = limits.max_memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"⚠️ Memory limit not applied: {e}")
+
+
+def _resolve_target(target: str) -> Callable[..., Any]:
+    module_name, _, function_name = target.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _json_safe(result: Any) -> Any:
+    """Resultado serializable (numpy, Timestamps...) para devolverlo a la API."""
+    return json.loads(json.dumps(result, default=str))
+
+
+def _worker_main(conn, target: str, kwargs: Dict[str, Any], limits: TrainingLimits):
+    """Punto de entrada del proceso de entrenamiento."""
+    try:
+        _apply_limits(limits)
+        from core.logging_config import setup_logging
+        setup_logging(enable_file_logging=False)
+
+        function = _resolve_target(target)
+        result = function(**kwargs)
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+        message = {"ok": True, "result": _json_safe(result)}
+    except MemoryError:
+        message = {"ok": False, "error": f"memory limit exceeded ({limits.max_memory_mb} MB)"}
+    except BaseException as e:
+        message = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    try:
+        conn.send(message)
+    finally:
+        conn.close()
+
+
+# =================================================================
+# JOB QUEUE
+# =================================================================
+
+class TrainingProcessError(RuntimeError):
+    """Fallo del proceso de entrenamiento (excepción, timeout, memoria, señal)."""
+
+
+@dataclass
+class TrainingJob:
+    """Un entrenamiento encolado, en curso o terminado."""
+    name: str
+    target: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: str = STATUS_QUEUED
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    pid: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_seconds": self.duration_seconds,
+            "pid": self.pid,
+            "training_mode": (self.result or {}).get("training_mode"),
+            "error": self.error
+        }
+
+
+class TrainingWorkerPool:
+    """
+    Cola de entrenamientos ejecutados en procesos aparte.
+
+    Args:
+        workers: Entrenamientos simultáneos
+        out_of_process: False ejecuta el entrenamiento en el proceso actual
+        limits: Límites por trabajo (por defecto, de settings)
+        history_size: Trabajos terminados que se conservan para el estado
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        out_of_process: Optional[bool] = None,
+        limits: Optional[TrainingLimits] = None,
+        history_size: int = 50
+    ):
+        self.workers = max(int(workers or settings.ML_TRAINING_WORKERS), 1)
+        self.out_of_process = settings.ML_TRAINING_OUT_OF_PROCESS if out_of_process is None else out_of_process
+        self.limits = limits or TrainingLimits.from_settings()
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._active: Dict[str, TrainingJob] = {}
+        self._history: Deque[TrainingJob] = deque(maxlen=history_size)
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._reload_hooks: Dict[str, List[ReloadHook]] = {}
+
+    # ----------------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------------
+
+    def register_reload_hook(self, name: str, hook: ReloadHook):
+        """Llamar ``hook`` (sync o async) cada vez que el trabajo ``name`` publica modelos."""
+        self._reload_hooks.setdefault(name, []).append(hook)
+
+    def submit(self, name: str, target: Optional[str] = None, **kwargs) -> TrainingJob:
+        """
+        Encolar un entrenamiento (debe llamarse desde el event loop).
+
+        Si ya hay uno con el mismo nombre en cola o en curso se devuelve ese.
+        """
+        active = self._active.get(name)
+        if active is not None:
+            logger.info(f"🔁 Training job '{name}' already {active.status}, sharing it")
+            return active
+
+        target = target or TRAINING_JOBS.get(name)
+        if target is None:
+            raise ValueError(f"Unknown training job '{name}'. Available: {sorted(TRAINING_JOBS)}")
+
+        self._ensure_started()
+        job = TrainingJob(name=name, target=target, kwargs=kwargs)
+        job.future = asyncio.get_running_loop().create_future()
+        self._active[name] = job
+        self._queue.put_nowait(job)
+        logger.info(f"📥 Training job '{name}' queued ({job.id}, {self._queue.qsize()} in queue)")
+        return job
+
+    async def run(self, name: str, target: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Encolar y esperar el resultado.
+
+        Returns:
+            El dict que devuelve el entrenamiento, o ``{"success": False, "error": ...}``
+            si el proceso falla, supera el timeout o el límite de memoria.
+        """
+        job = self.submit(name, target, **kwargs)
+        await asyncio.shield(job.future)
+        if job.status == STATUS_FAILED and job.result is None:
+            return {"success": False, "error": job.error}
+        return job.result
+
+    def get_job(self, job_id: str) -> Optional[TrainingJob]:
+        for job in list(self._active.values()) + list(self._history):
+            if job.id == job_id:
+                return job
+        return None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado del pool para get_job_status / API."""
+        active = sorted(self._active.values(), key=lambda job: job.submitted_at)
+        return {
+            "mode": "process" if self.out_of_process else "inline",
+            "workers": self.workers,
+            "limits": {
+                "cpus": self.limits.cpus,
+                "max_memory_mb": self.limits.max_memory_mb,
+                "nice": self.limits.nice,
+                "timeout_seconds": self.limits.timeout_seconds
+            },
+            "running": [job.to_dict() for job in active if job.status == STATUS_RUNNING],
+            "queued": [job.to_dict() for job in active if job.status == STATUS_QUEUED],
+            "recent": [job.to_dict() for job in reversed(self._history)]
+        }
+
+    async def shutdown(self):
+        """Cancelar workers y terminar los procesos de entrenamiento en curso."""
+        for process in list(self._processes.values()):
+            if process.is_alive():
+                process.terminate()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        for job in self._active.values():
+            job.status = STATUS_FAILED
+            job.error = "training pool shut down"
+            if job.future is not None and not job.future.done():
+                job.future.set_result(job)
+        self._active.clear()
+        self._worker_tasks = []
+        self._queue = None
+
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._queue is not None and self._worker_tasks and not all(t.done() for t in self._worker_tasks):
+            return
+        self._queue = asyncio.Queue()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop(), name=f"training-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def _worker_loop(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: TrainingJob):
+        job.status = STATUS_RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        start = time.monotonic()
+        logger.info(f"🏋️ Training job '{job.name}' started ({'process' if self.out_of_process else 'inline'})")
+
+        try:
+            if self.out_of_process:
+                job.result = await self._run_in_process(job)
+            else:
+                result = _resolve_target(job.target)(**job.kwargs)
+                job.result = await result if inspect.isawaitable(result) else result
+        except TrainingProcessError as e:
+            job.error = str(e)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+
+        job.finished_at = datetime.now(timezone.utc)
+        job.duration_seconds = round(time.monotonic() - start, 3)
+        result = job.result if isinstance(job.result, dict) else {}
+        if job.error or result.get("success") is False:
+            job.status = STATUS_FAILED
+            job.error = job.error or result.get("error")
+            logger.error(f"❌ Training job '{job.name}' failed after {job.duration_seconds}s: {job.error}")
+        elif result.get("skipped"):
+            job.status = STATUS_SKIPPED
+            logger.info(f"⏭️ Training job '{job.name}' skipped: {result.get('reason')}")
+        else:
+            job.status = STATUS_SUCCEEDED
+            logger.info(f"✅ Training job '{job.name}' finished in {job.duration_seconds}s")
+            await self._reload_models(job.name)
+
+        self._active.pop(job.name, None)
+        self._history.append(job)
+        if not job.future.done():
+            job.future.set_result(job)
+
+    async def _run_in_process(self, job: TrainingJob) -> Dict[str, Any]:
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        # No daemon: joblib (n_jobs=-1) necesita crear procesos hijos
+        process = context.Process(
+            target=_worker_main,
+            args=(sender, job.target, job.kwargs, self.limits),
+            name=f"training-{job.name}"
+        )
+        with _thread_env(self.limits):
+            process.start()
+        sender.close()
+        job.pid = process.pid
+        self._processes[job.id] = process
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.limits.timeout_seconds
+        try:
+            while True:
+                if receiver.poll():
+                    try:
+                        message = receiver.recv()
+                        break
+                    except EOFError:
+                        # Pipe cerrado sin resultado: el proceso murió (señal, OOM killer, os._exit)
+                        await asyncio.to_thread(process.join, 10)
+                        raise TrainingProcessError(f"training process exited with code {process.exitcode}")
+                if loop.time() > deadline:
+                    process.terminate()
+                    raise TrainingProcessError(f"timeout after {self.limits.timeout_seconds}s, process terminated")
+                await asyncio.sleep(_POLL_SECONDS)
+        finally:
+            receiver.close()
+            await asyncio.to_thread(process.join, 10)
+            if process.is_alive():
+                process.kill()
+            self._processes.pop(job.id, None)
+
+        if not message["ok"]:
+            raise TrainingProcessError(message["error"])
+        return message["result"]
+
+    async def _reload_models(self, name: str):
+        """Hot reload en la API de lo que el trabajo acaba de publicar."""
+        for hook in self._reload_hooks.get(name, []):
+            try:
+                if inspect.iscoroutinefunction(hook):
+                    await hook()
+                else:
+                    # Cargar un pickle grande no debe bloquear el event loop
+                    await asyncio.to_thread(hook)
+            except Exception as e:
+                logger.warning(f"⚠️ Model reload after '{name}' failed: {e}")
+
+
+def _invalidate_forecast_cache():
+    from services.price_forecasting_service import get_forecast_cache
+    get_forecast_cache().invalidate("new Prophet model from training worker")
+
+
+_training_pool: Optional[TrainingWorkerPool] = None
+_training_pool_lock = threading.Lock()
+
+
+def get_training_pool() -> TrainingWorkerPool:
+    """Pool de entrenamiento compartido (singleton)."""
+    global _training_pool
+    with _training_pool_lock:
+        if _training_pool is None:
+            _training_pool = TrainingWorkerPool()
+            # Las instancias por petición cargan de disco; la caché de forecast es de módulo
+            _training_pool.register_reload_hook("prophet", _invalidate_forecast_cache)
+        return _training_pool
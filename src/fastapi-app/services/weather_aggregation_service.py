@@ -21,9 +21,10 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
-from infrastructure.influxdb import InfluxDBClientWrapper
+from infrastructure.influxdb import InfluxDBClientWrapper, get_ingestion_sink
 from infrastructure.external_apis import OpenWeatherMapAPIClient
 from services.aemet_service import AEMETService
+from core.cache import get_cache_manager, single_flight
 from core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -54,6 +55,7 @@ class WeatherAggregationService:
         self.influxdb = influxdb_client
         self.aemet_service = aemet_service
 
+    @single_flight("weather.current", ignore_self=True)
     async def get_current_weather(
         self,
         prefer_source: Optional[str] = None
@@ -167,7 +169,8 @@ class WeatherAggregationService:
 
             point.time(weather["timestamp"], WritePrecision.NS)
 
-            self.influxdb.write_points([point])
+            if await get_ingestion_sink(self.influxdb).write([point]):
+                await get_cache_manager().ainvalidate_tags("weather")
             logger.info("✅ Persisted OpenWeatherMap data to InfluxDB")
 
         except Exception as e:
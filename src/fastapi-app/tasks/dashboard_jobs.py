@@ -0,0 +1,39 @@
+"""
+Dashboard Snapshot Jobs
+=======================
+
+APScheduler jobs that keep the materialized dashboard snapshot up to date.
+"""
+
+import logging
+
+from services.dashboard_snapshot import get_dashboard_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+
+async def dashboard_snapshot_job():
+    """
+    Scheduled job: Rebuild the dashboard snapshot (periodic safety net).
+    """
+    logger.info("🔄 Running scheduled dashboard snapshot rebuild")
+
+    try:
+        snapshot = await get_dashboard_snapshot_service().refresh(new_data=False)
+        logger.info(f"✅ Dashboard snapshot v{snapshot.version} ready ({snapshot.build_seconds}s)")
+
+    except Exception as e:
+        logger.error(f"❌ Dashboard snapshot rebuild failed: {e}", exc_info=True)
+
+
+def request_dashboard_refresh():
+    """
+    Trigger a background snapshot rebuild after new data is ingested.
+
+    Non-blocking: concurrent requests share the in-flight rebuild, which
+    runs once more if it started before this data landed.
+    """
+    try:
+        get_dashboard_snapshot_service().refresh()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not trigger dashboard snapshot rebuild: {e}")
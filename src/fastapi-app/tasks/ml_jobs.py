@@ -8,9 +8,11 @@ Background jobs for ML model training and maintenance.
 import logging
 from pathlib import Path
 
-from services.price_forecasting_service import PriceForecastingService
+from domain.ml.model_metrics_tracker import ModelMetricsTracker
+from services.training_pool import get_training_pool
 from dependencies import get_telegram_alert_service
 from services.telegram_alert_service import AlertSeverity
+from .optimization_jobs import request_plan_refresh
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +28,26 @@ async def ensure_prophet_model_job():
     logger.info("🔄 Iniciando reentrenamiento programado de Prophet...")
 
     try:
-        forecast_service = PriceForecastingService()
+        # Entrenar modelo con datos de los últimos 36 meses (3 años completos);
+        # incremental: sin horas nuevas suficientes no se reentrena, y si las hay
+        # el ajuste parte de los parámetros del modelo anterior. Se ejecuta en el
+        # training worker (proceso aparte) y la API recarga el modelo publicado
+        result = await get_training_pool().run("prophet", months_back=36, incremental=True)
 
-        # Entrenar modelo con datos de los últimos 36 meses (3 años completos)
-        result = await forecast_service.train_model(months_back=36)
+        if result.get('skipped'):
+            logger.info(f"⏭️ Prophet retraining skipped: {result.get('reason')}")
 
-        if result.get('success'):
-            logger.info("✅ Modelo Prophet entrenado exitosamente")
+        elif result.get('success'):
+            logger.info(f"✅ Modelo Prophet entrenado exitosamente ({result.get('training_mode')}, {result.get('duration_seconds')}s)")
             logger.info(f"   MAE: {result['metrics']['mae']:.4f} €/kWh")
             logger.info(f"   R²: {result['metrics']['r2']:.4f}")
 
+            # Nuevo forecast 168h: re-plan semanal incremental
+            request_plan_refresh()
+
             # Sprint 20: Check for model degradation
             current_metrics = result['metrics']
-            degradation = forecast_service.metrics_tracker.detect_degradation(
+            degradation = ModelMetricsTracker().detect_degradation(
                 model_name="prophet_price_forecast",
                 current_metrics=current_metrics,
                 threshold_multiplier=2.0
@@ -0,0 +1,26 @@
+"""
+Production Optimization Jobs
+============================
+
+Keeps the rolling-horizon (multi-day) production plan in step with new
+REE prices and Prophet forecasts.
+"""
+
+import logging
+
+from services.hourly_optimizer_service import get_optimizer_service
+
+logger = logging.getLogger(__name__)
+
+
+def request_plan_refresh():
+    """
+    Trigger a background weekly re-plan after new prices or a new forecast.
+
+    Non-blocking and incremental: only days whose inputs changed are
+    re-solved; concurrent requests share the in-flight re-plan.
+    """
+    try:
+        get_optimizer_service().refresh_weekly_plan()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not trigger weekly plan refresh: {e}")
@@ -11,6 +11,8 @@ from datetime import date
 from services.ree_service import REEService
 from infrastructure.influxdb import get_influxdb_client
 from dependencies import get_telegram_alert_service
+from .dashboard_jobs import request_dashboard_refresh
+from .optimization_jobs import request_plan_refresh
 
 logger = logging.getLogger(__name__)
 
@@ -30,5 +32,9 @@ async def ree_ingestion_job():
 
         logger.info(f"✅ REE ingestion completed: {result['records_written']} records")
 
+        if result.get('records_written'):
+            request_dashboard_refresh()
+            request_plan_refresh()
+
     except Exception as e:
         logger.error(f"❌ REE ingestion failed: {e}", exc_info=True)
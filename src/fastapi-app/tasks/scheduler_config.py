@@ -15,6 +15,7 @@ from .ml_jobs import ensure_prophet_model_job
 from .sklearn_jobs import sklearn_training_job  # sklearn training
 from .gap_detection_jobs import automatic_gap_detection  # Sprint 18
 from .gas_generation_jobs import gas_ingestion_job  # Gas feature (Ciclo Combinado)
+from .dashboard_jobs import dashboard_snapshot_job  # Dashboard snapshot materializer
 from .health_monitoring_jobs import (  # Sprint 13 (pivoted) + Sprint 20
     collect_health_metrics,
     log_health_status,
@@ -146,4 +147,15 @@ async def register_all_jobs(scheduler: AsyncIOScheduler):
     )
     logger.info("   ✅ Gas generation ingestion: daily at 11:00h")
 
+    # Dashboard snapshot rebuild (periodic; ingestion jobs also trigger rebuilds)
+    scheduler.add_job(
+        func=dashboard_snapshot_job,
+        trigger="interval",
+        minutes=settings.DASHBOARD_SNAPSHOT_INTERVAL,
+        id="dashboard_snapshot",
+        name="Dashboard Snapshot Materializer",
+        replace_existing=True
+    )
+    logger.info(f"   ✅ Dashboard snapshot: every {settings.DASHBOARD_SNAPSHOT_INTERVAL} minutes + after ingestion")
+
     logger.info(f"✅ Registered {len(scheduler.get_jobs())} jobs")
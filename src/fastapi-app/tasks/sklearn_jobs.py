@@ -1,6 +1,6 @@
 """sklearn ML Training Jobs (Sprint 18: Telegram alerts)"""
 import logging
-from domain.ml.direct_ml import DirectMLService
+from services.training_pool import get_training_pool
 from dependencies import get_telegram_alert_service
 from services.telegram_alert_service import AlertSeverity
 
@@ -12,11 +12,13 @@ async def sklearn_training_job():
 
     try:
         logger.info("🤖 Starting sklearn training job...")
-        direct_ml = DirectMLService()
-        results = await direct_ml.train_models()
+        # Entrena en un proceso aparte: el event loop de la API sigue libre
+        results = await get_training_pool().run("sklearn", incremental=True)
 
-        if results.get("success"):
-            logger.info(f"✅ sklearn training completed: {results.get('models_trained', [])} models")
+        if results.get("skipped"):
+            logger.info(f"⏭️ sklearn retraining skipped: {results.get('reason')}")
+        elif results.get("success"):
+            logger.info(f"✅ sklearn training completed ({results.get('training_mode')}): {results.get('total_samples', 0)} samples")
         else:
             logger.error(f"❌ sklearn training failed: {results.get('error')}")
 
@@ -10,6 +10,7 @@ import logging
 from services.aemet_service import AEMETService
 from services.weather_aggregation_service import WeatherAggregationService
 from infrastructure.influxdb import get_influxdb_client
+from .dashboard_jobs import request_dashboard_refresh
 
 logger = logging.getLogger(__name__)
 
@@ -29,5 +30,7 @@ async def weather_ingestion_job():
 
         logger.info(f"✅ Weather ingestion completed: {result}")
 
+        request_dashboard_refresh()
+
     except Exception as e:
         logger.error(f"❌ Weather ingestion failed: {e}", exc_info=True)
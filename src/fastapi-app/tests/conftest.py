@@ -28,6 +28,9 @@ import tempfile
 test_dir = Path(tempfile.mkdtemp())
 os.environ["ML_MODELS_DIR"] = str(test_dir / "models")
 os.environ["STATIC_FILES_DIR"] = str(test_dir / "static")
+os.environ["COVERAGE_INDEX_PATH"] = str(test_dir / "coverage_index.npz")
+os.environ["BACKFILL_CHECKPOINT_PATH"] = str(test_dir / "backfill_checkpoint.json")
+os.environ["FEATURE_STORE_PATH"] = str(test_dir / "feature_store")
 
 # Patch Path.mkdir globally to prevent permission errors during imports
 _original_mkdir = Path.mkdir
@@ -209,6 +212,23 @@ def mock_dashboard_service():
     return mock
 
 
+@pytest.fixture(autouse=True)
+def clean_backfill_checkpoint():
+    """Backfill checkpoints (failed runs) must not leak between tests."""
+    yield
+    Path(os.environ["BACKFILL_CHECKPOINT_PATH"]).unlink(missing_ok=True)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache_manager():
+    """Cached service reads (REE prices, forecasts...) must not leak between tests."""
+    from core.cache import get_cache_manager
+
+    get_cache_manager().clear()
+    yield
+    get_cache_manager().clear()
+
+
 # =============================================================================
 # SAMPLE DATA FIXTURES
 # =============================================================================
@@ -194,6 +194,29 @@ class TestDashboardAlertsEndpoint:
             assert data.get("alerts", []) == []
 
 
+@pytest.mark.integration
+class TestDashboardSnapshotCaching:
+    """Test snapshot ETag / conditional request handling."""
+
+    def test_conditional_request_returns_304(self, client):
+        """Repeating a request with If-None-Match returns 304 without a body."""
+        first = client.get("/dashboard/complete")
+        etag = first.headers["etag"]
+
+        second = client.get("/dashboard/complete", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert "stale-while-revalidate" in first.headers["cache-control"]
+
+    def test_views_have_distinct_etags(self, client):
+        """Summary and alerts are cached as separate representations."""
+        summary = client.get("/dashboard/summary")
+        alerts = client.get("/dashboard/alerts")
+
+        assert summary.headers["etag"] != alerts.headers["etag"]
+
+
 @pytest.mark.integration
 class TestDashboardErrorHandling:
     """Test error handling in dashboard endpoints."""
@@ -230,7 +253,7 @@ class TestDashboardErrorHandling:
 # =============================================================================
 # SUMMARY
 # =============================================================================
-# Total tests: 12
+# Total tests: 14
 # Coverage: /dashboard/complete, /dashboard/summary, /dashboard/alerts
 # Focus: Data completeness, error handling, performance
 # =============================================================================
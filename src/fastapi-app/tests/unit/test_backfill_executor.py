@@ -0,0 +1,257 @@
+"""
+Unit Tests for Backfill Executor
+=================================
+
+Tests services/backfill_executor.py and its use by BackfillService.
+
+Coverage:
+- ✅ Token bucket spaces requests to the configured budget
+- ✅ Requests larger than the burst wait for refills instead of being capped
+- ✅ Adjacent gap days coalesce into range chunks
+- ✅ Bounded concurrency across tasks
+- ✅ Interrupted runs resume from the checkpoint
+- ✅ REE gaps fetched as range requests, results reported per gap
+- ✅ Empty or partially written REE ranges are not checkpointed
+- ✅ A failed weather task reports an error result instead of dropping the batch
+- ✅ Throughput (records/min vs budget) in the backfill summary
+"""
+
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.backfill_executor import (
+    BackfillCheckpoint,
+    BackfillExecutor,
+    BackfillTask,
+    TaskOutcome,
+    TokenBucket,
+    coalesce_day_ranges
+)
+from services.backfill_service import BackfillResult, BackfillService
+from services.gap_detector import DataGap
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return BackfillCheckpoint(path=tmp_path / "checkpoint.json")
+
+
+def _executor(checkpoint, rate=6000.0, concurrency=4):
+    return BackfillExecutor(
+        max_concurrency=concurrency,
+        budgets={"ree": rate, "aemet": rate},
+        burst=1,
+        checkpoint=checkpoint
+    )
+
+
+@pytest.mark.unit
+class TestBackfillExecutor:
+    """Unit tests for TokenBucket, coalescing and BackfillExecutor."""
+
+    def test_token_bucket_rate(self):
+        """Burst 1 at 1200 req/min: 5 acquisitions need >= 4 x 50ms."""
+        async def run():
+            bucket = TokenBucket(rate_per_minute=1200, burst=1)
+            start = time.monotonic()
+            for _ in range(5):
+                await bucket.acquire()
+            return time.monotonic() - start, bucket
+
+        elapsed, bucket = asyncio.run(run())
+
+        assert elapsed >= 0.19
+        assert bucket.acquired == 5
+
+    def test_token_bucket_honors_requests_above_burst(self):
+        """Burst 2 at 1200 req/min: acquiring 2 + 5 tokens waits for 5 refills (>= 250ms)."""
+        async def run():
+            bucket = TokenBucket(rate_per_minute=1200, burst=2)
+            start = time.monotonic()
+            await bucket.acquire(2)
+            await bucket.acquire(5)
+            return time.monotonic() - start, bucket
+
+        elapsed, bucket = asyncio.run(run())
+
+        assert elapsed >= 0.24
+        assert bucket.acquired == 7
+
+    def test_coalesce_day_ranges(self):
+        """Overlapping/adjacent spans merge; long runs split into max_days chunks."""
+        d = lambda day: date(2025, 11, day)
+        spans = [(d(2), d(3)), (d(1), d(1)), (d(3), d(4)), (d(9), d(9)), (d(11), d(27))]
+
+        assert coalesce_day_ranges(spans, max_days=7) == [
+            (d(1), d(4)), (d(9), d(9)), (d(11), d(17)), (d(18), d(24)), (d(25), d(27))
+        ]
+
+    def test_bounded_concurrency(self, checkpoint):
+        """No more than max_concurrency tasks run at once."""
+        running, peak = 0, 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"n": 1}
+
+        executor = _executor(checkpoint, concurrency=3)
+        tasks = [BackfillTask(key=f"t{i}", api="ree" if i % 2 else "aemet", run=work) for i in range(10)]
+        outcomes = asyncio.run(executor.run(tasks))
+
+        assert all(o.ok for o in outcomes)
+        assert peak == 3
+
+    def test_resume_from_checkpoint(self, checkpoint, tmp_path):
+        """Completed tasks are skipped after an interrupted run; a clean run clears the checkpoint."""
+        calls = []
+
+        def task(key, fail=False):
+            async def run():
+                calls.append(key)
+                if fail:
+                    raise RuntimeError("upstream 503")
+                return {"key": key}
+            return BackfillTask(key=key, api="ree", run=run)
+
+        first = _executor(checkpoint)
+        outcomes = asyncio.run(first.run([task("a"), task("b", fail=True), task("c")]))
+        first.finish()
+        assert [o.ok for o in outcomes] == [True, False, True]
+
+        calls.clear()
+        resumed = _executor(BackfillCheckpoint(path=tmp_path / "checkpoint.json"))
+        outcomes = asyncio.run(resumed.run([task("a"), task("b"), task("c")]))
+        resumed.finish()
+
+        assert calls == ["b"]
+        assert [o.resumed for o in outcomes] == [True, False, True]
+        assert outcomes[0].result == {"key": "a"}
+        assert not (tmp_path / "checkpoint.json").exists()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBackfillServiceExecutor:
+    """BackfillService on top of BackfillExecutor."""
+
+    @staticmethod
+    def _gap(start, end):
+        hours = int((end - start).total_seconds() // 3600)
+        return DataGap("energy_prices", start, end, hours + 1, hours + 1, float(hours), "moderate")
+
+    @staticmethod
+    def _prices(start_day: date, end_day: date):
+        days = (end_day - start_day).days + 1
+        first = datetime.combine(start_day, datetime.min.time()).replace(tzinfo=timezone.utc)
+        return [
+            {"timestamp": first + timedelta(hours=h), "price_eur_kwh": 0.1, "source": "ree_pvpc"}
+            for h in range(24 * days)
+        ]
+
+    async def test_ree_gaps_fetched_as_ranges(self, checkpoint):
+        """Adjacent gaps share one range request; each gap reports its own days."""
+        utc = timezone.utc
+        gaps = [
+            self._gap(datetime(2025, 11, 1, 10, tzinfo=utc), datetime(2025, 11, 1, 20, tzinfo=utc)),
+            self._gap(datetime(2025, 11, 2, 0, tzinfo=utc), datetime(2025, 11, 3, 23, tzinfo=utc)),
+            self._gap(datetime(2025, 11, 10, 0, tzinfo=utc), datetime(2025, 11, 10, 23, tzinfo=utc)),
+        ]
+
+        ree_client = AsyncMock()
+        ree_client.__aenter__.return_value = ree_client
+        ree_client.get_pvpc_prices.side_effect = lambda target_date, end_date: self._prices(target_date, end_date)
+        ingestion = AsyncMock()
+        ingestion.__aenter__.return_value = ingestion
+        ingestion.ingest_ree_prices_historical.side_effect = lambda data: MagicMock(successful_writes=len(data))
+
+        executor = _executor(checkpoint)
+        with patch("services.backfill_service.REEClient", return_value=ree_client), \
+             patch("services.backfill_service.DataIngestionService", return_value=ingestion):
+            results = await BackfillService()._backfill_ree_gaps(gaps, executor)
+
+        requested = sorted(call.kwargs["target_date"] for call in ree_client.get_pvpc_prices.call_args_list)
+        assert requested == [date(2025, 11, 1), date(2025, 11, 10)]
+        assert [r.records_obtained for r in results] == [24, 48, 24]
+        assert [r.records_written for r in results] == [24, 48, 24]
+
+        throughput = executor.throughput()["ree"]
+        assert throughput["requests"] == 2
+        assert throughput["records"] == 96
+        assert throughput["budget_requests_per_minute"] == 6000.0
+
+    async def test_incomplete_ree_ranges_not_checkpointed(self, checkpoint):
+        """A range with no data or failed writes is retried on the next run."""
+        utc = timezone.utc
+        gaps = [
+            self._gap(datetime(2025, 11, 1, tzinfo=utc), datetime(2025, 11, 1, 23, tzinfo=utc)),
+            self._gap(datetime(2025, 11, 10, tzinfo=utc), datetime(2025, 11, 10, 23, tzinfo=utc)),
+        ]
+
+        ree_client = AsyncMock()
+        ree_client.__aenter__.return_value = ree_client
+        ree_client.get_pvpc_prices.side_effect = (
+            lambda target_date, end_date: [] if target_date == date(2025, 11, 1) else self._prices(target_date, end_date)
+        )
+        ingestion = AsyncMock()
+        ingestion.__aenter__.return_value = ingestion
+        ingestion.ingest_ree_prices_historical.side_effect = lambda data: MagicMock(successful_writes=len(data) - 1)
+
+        with patch("services.backfill_service.REEClient", return_value=ree_client), \
+             patch("services.backfill_service.DataIngestionService", return_value=ingestion):
+            await BackfillService()._backfill_ree_gaps(gaps, _executor(checkpoint))
+
+        assert not checkpoint.is_done("ree:2025-11-01:2025-11-01")
+        assert not checkpoint.is_done("ree:2025-11-10:2025-11-10")
+
+    async def test_failed_weather_task_reports_error(self):
+        """One failed AEMET task yields an error result; the other gaps are kept."""
+        utc = timezone.utc
+        gaps = [
+            DataGap("weather_data", datetime(2025, 10, 1, tzinfo=utc), datetime(2025, 10, 4, tzinfo=utc), 72, 72, 72.0, "moderate"),
+            DataGap("weather_data", datetime(2025, 10, 8, tzinfo=utc), datetime(2025, 10, 11, tzinfo=utc), 72, 72, 72.0, "moderate"),
+        ]
+        service = BackfillService()
+        executor = MagicMock(run=AsyncMock(return_value=[
+            TaskOutcome("weather:a", "aemet", error="upstream 503"),
+            TaskOutcome("weather:b", "aemet", result=BackfillResult(
+                measurement="weather_data", gap_start=gaps[1].start_time, gap_end=gaps[1].end_time,
+                records_requested=72, records_obtained=72, records_written=72, success_rate=100.0,
+                duration_seconds=1.0, method_used="aemet_daily", errors=[]
+            ).to_checkpoint())
+        ]))
+        results = await service._backfill_weather_gaps(gaps, executor)
+
+        assert [r.method_used for r in results] == ["failed", "aemet_daily"]
+        assert results[0].errors == ["upstream 503"]
+        assert results[0].gap_start == gaps[0].start_time
+        assert results[1].records_written == 72
+
+    async def test_summary_reports_throughput(self):
+        """execute_intelligent_backfill shares one executor and reports its throughput."""
+        service = BackfillService()
+        gap = self._gap(datetime(2025, 11, 1, tzinfo=timezone.utc), datetime(2025, 11, 1, 23, tzinfo=timezone.utc))
+        service.gap_detector = MagicMock()
+        service.gap_detector.detect_all_gaps = AsyncMock(return_value=MagicMock(
+            total_gaps_found=1, ree_gaps=[gap], weather_gaps=[], gas_gaps=[]
+        ))
+
+        async def fake_ree(gaps, executor):
+            await executor.run([BackfillTask(
+                key="ree:test", api="ree", run=AsyncMock(return_value={"obtained": 24}),
+                records=lambda result: result["obtained"]
+            )])
+            return []
+
+        service._backfill_ree_gaps = fake_ree
+        summary = await service.execute_intelligent_backfill(days_back=2)
+
+        assert summary["throughput"]["ree"]["records"] == 24
+        assert "records_per_minute" in summary["throughput"]["ree"]
@@ -0,0 +1,118 @@
+"""
+Unit Tests for Batch Optimization Scoring
+==========================================
+
+Tests DirectMLService batch prediction methods and the
+/predict/*/batch request schema.
+
+Coverage:
+- ✅ Batch energy scores match the single-row path
+- ✅ Batch production classes/probabilities match the single-row path
+- ✅ One model call per batch (168 hours)
+- ✅ Columnar response layout
+- ✅ Length validation (service and request schema)
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from pydantic import ValidationError
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+from api.routers.ml_predictions import BatchPredictionRequest
+from domain.ml.direct_ml import DirectMLService
+
+FEATURES = [
+    'price_eur_kwh', 'hour', 'day_of_week', 'temperature', 'humidity',
+    'machine_power_kw', 'machine_thermal_efficiency', 'machine_humidity_efficiency',
+    'estimated_cost_eur', 'tariff_multiplier'
+]
+
+
+@pytest.fixture(scope="module")
+def trained_service():
+    """DirectMLService with small models trained on engineered features."""
+    rng = np.random.default_rng(3)
+    n = 500
+    df = DirectMLService.engineer_features(None, pd.DataFrame({
+        'timestamp': pd.date_range('2025-01-01', periods=n, freq='h'),
+        'price_eur_kwh': rng.uniform(0.02, 0.35, n),
+        'temperature': rng.uniform(5, 40, n),
+        'humidity': rng.uniform(20, 90, n)
+    }))
+    X = df[FEATURES].to_numpy()
+
+    service = DirectMLService.__new__(DirectMLService)
+    service.energy_model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, df['energy_optimization_score'])
+    service.production_model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, df['production_class'])
+    return service
+
+
+@pytest.fixture
+def week_inputs():
+    """168 forecast hours."""
+    rng = np.random.default_rng(11)
+    start = datetime(2025, 10, 20, 0, 0)
+    return {
+        "timestamps": [start + timedelta(hours=h) for h in range(168)],
+        "prices": rng.uniform(0.02, 0.35, 168).tolist(),
+        "temperatures": rng.uniform(5, 40, 168).tolist(),
+        "humidities": rng.uniform(20, 90, 168).tolist()
+    }
+
+
+def _rows(inputs):
+    return zip(inputs["timestamps"], inputs["prices"], inputs["temperatures"], inputs["humidities"])
+
+
+@pytest.mark.unit
+class TestBatchPredictions:
+    """Unit tests for vectorized optimization scoring."""
+
+    def test_energy_batch_matches_single_row(self, trained_service, week_inputs):
+        """Row i equals predict_energy_optimization() for the same hour."""
+        batch = trained_service.predict_energy_optimization_batch(**week_inputs)
+
+        assert batch["count"] == 168
+        for i, (ts, price, temp, hum) in enumerate(_rows(week_inputs)):
+            single = trained_service.predict_energy_optimization(price, temp, hum, timestamp=ts)
+            assert single == {key: batch[key][i] for key in single}
+
+    def test_production_batch_matches_single_row(self, trained_service, week_inputs):
+        """Classes, confidence and probabilities match the single-row path."""
+        batch = trained_service.predict_production_recommendation_batch(**week_inputs)
+
+        for i, (ts, price, temp, hum) in enumerate(_rows(week_inputs)):
+            single = trained_service.predict_production_recommendation(price, temp, hum, timestamp=ts)
+            assert single["production_recommendation"] == batch["production_recommendation"][i]
+            assert single["confidence"] == batch["confidence"][i]
+            assert single["probabilities"] == {k: v[i] for k, v in batch["probabilities"].items()}
+
+        # Argmax of predict_proba is exactly what model.predict returns
+        features, _ = trained_service.build_feature_matrix(**week_inputs)
+        assert batch["production_recommendation"] == trained_service.production_model.predict(features).tolist()
+
+    def test_one_model_call_per_batch(self, trained_service, week_inputs, monkeypatch):
+        """168 hours are scored with a single predict call."""
+        calls = []
+        original = trained_service.energy_model.predict
+        monkeypatch.setattr(trained_service.energy_model, "predict", lambda X: calls.append(X.shape) or original(X))
+
+        trained_service.predict_energy_optimization_batch(**week_inputs)
+
+        assert calls == [(168, 10)]
+
+    def test_length_mismatch(self, trained_service, week_inputs):
+        """Misaligned columns are rejected by the service and the request schema."""
+        week_inputs["prices"] = week_inputs["prices"][:-1]
+        result = trained_service.predict_energy_optimization_batch(**week_inputs)
+        assert "error" in result
+
+        with pytest.raises(ValidationError):
+            BatchPredictionRequest(
+                timestamps=[datetime(2025, 10, 20, 0), datetime(2025, 10, 20, 1)],
+                price_eur_kwh=[0.1],
+                temperature=[20.0, 21.0],
+                humidity=[50.0, 50.0]
+            )
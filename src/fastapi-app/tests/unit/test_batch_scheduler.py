@@ -0,0 +1,147 @@
+"""
+Unit Tests for Batch Scheduler
+===============================
+
+Tests domain/optimization/batch_scheduler.py and its use by
+HourlyOptimizerService (greedy vs exact modes).
+
+Coverage:
+- ✅ Prefix-sum cost tables match per-hour mean pricing
+- ✅ Exact DP matches brute force on small instances
+- ✅ Exact never costlier than greedy for the same batch mix
+- ✅ Linear (non-cyclic) horizons keep batches inside the horizon
+- ✅ Optimizer exact mode reports the cost gap vs greedy
+"""
+
+import asyncio
+from datetime import datetime
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from domain.optimization.batch_scheduler import (
+    batch_cost_table,
+    build_batch_profile,
+    exact_schedule,
+    greedy_schedule
+)
+from services.hourly_optimizer_service import BATCH_PROFILES, HourlyOptimizerService
+
+PREMIUM = BATCH_PROFILES["premium"]
+STANDARD = BATCH_PROFILES["standard"]
+
+
+def _brute_force_cost(prices, profile, count, cyclic=True):
+    """Cheapest set of `count` non-overlapping windows (one batch type)."""
+    horizon = len(prices)
+    costs = batch_cost_table(prices, profile, cyclic)
+    best = np.inf
+    for starts in combinations(range(horizon), count):
+        hours = [(s + h) % horizon if cyclic else s + h for s in starts for h in range(profile.required_hours)]
+        if len(set(hours)) == len(hours) and max(hours) < horizon:
+            best = min(best, sum(costs[s] for s in starts))
+    return best
+
+
+@pytest.fixture
+def day_prices():
+    """Cheap night, expensive evening peak."""
+    rng = np.random.default_rng(9)
+    base = np.array([0.08] * 7 + [0.14] * 10 + [0.28] * 4 + [0.12] * 3)
+    return base + rng.uniform(0, 0.02, 24)
+
+
+@pytest.mark.unit
+class TestBatchScheduler:
+    """Unit tests for greedy and exact placement."""
+
+    def test_cost_table_matches_mean_pricing(self, day_prices):
+        """Prefix sums equal per-process mean prices, wrapping midnight.
+
+        Process hours follow the optimizer convention int(start/60)..int(end/60).
+        """
+        profile = build_batch_profile("test", [(90, 10.0), (150, 20.0)])
+        costs = batch_cost_table(day_prices, profile, cyclic=True)
+
+        start = 22
+        expected = (
+            10.0 * np.mean([day_prices[22], day_prices[23]]) +
+            20.0 * np.mean([day_prices[23], day_prices[0], day_prices[1], day_prices[2]])
+        )
+        assert profile.required_hours == 4
+        assert costs[start] == pytest.approx(expected)
+
+    def test_exact_matches_brute_force(self, day_prices):
+        """DP optimum equals exhaustive search."""
+        valid = [True] * 24
+        for profile, count in [(STANDARD, 1), (STANDARD, 2), (STANDARD, 3), (PREMIUM, 2)]:
+            plan = exact_schedule(day_prices, valid, [(profile, count)], cyclic=True)
+
+            assert plan.count(profile.quality_type) == count
+            assert plan.total_cost == pytest.approx(_brute_force_cost(day_prices, profile, count))
+
+    def test_exact_not_costlier_than_greedy(self):
+        """Same batch mix: exact cost <= greedy cost."""
+        rng = np.random.default_rng(0)
+        for _ in range(25):
+            prices = rng.uniform(0.03, 0.30, 24)
+            scores = rng.uniform(0, 1, 24)
+            demands = [(PREMIUM, int(rng.integers(0, 2))), (STANDARD, int(rng.integers(0, 3)))]
+
+            greedy = greedy_schedule(scores, [True] * 24, demands, prices)
+            exact = exact_schedule(prices, [True] * 24, demands)
+
+            assert len(exact.placements) >= len(greedy.placements)
+            if all(greedy.count(p.quality_type) == exact.count(p.quality_type) for p, _ in demands):
+                assert exact.total_cost <= greedy.total_cost + 1e-9
+
+    def test_linear_horizon(self):
+        """Week horizons (non-cyclic) keep every batch inside the horizon."""
+        prices = np.random.default_rng(4).uniform(0.03, 0.30, 168)
+        # 6 x 12h + 13 x 7h = 163h of 168h
+        plan = exact_schedule(prices, [True] * 168, [(PREMIUM, 6), (STANDARD, 13)], cyclic=False)
+
+        assert len(plan.placements) == 19
+        assert plan.unscheduled == {}
+        for quality, start in plan.placements:
+            assert start + BATCH_PROFILES[quality].required_hours <= 168
+
+
+@pytest.mark.unit
+class TestOptimizerModes:
+    """HourlyOptimizerService greedy/exact scheduling."""
+
+    @pytest.fixture
+    def optimizer(self):
+        return HourlyOptimizerService.__new__(HourlyOptimizerService)
+
+    def _forecasts(self, prices):
+        ree = [{"hour": h, "price_eur_kwh": float(p)} for h, p in enumerate(prices)]
+        weather = [{"hour": h, "temperature": 22.0, "humidity": 45.0} for h in range(24)]
+        return ree, weather
+
+    def test_exact_mode_reports_gap(self, optimizer, day_prices):
+        """Exact mode returns batches plus the comparison with greedy."""
+        ree, weather = self._forecasts(day_prices)
+        batches, solver = asyncio.run(optimizer._optimize_batch_scheduling(
+            ree, weather, num_standard=1, num_premium=1, target_date=datetime(2025, 10, 20), mode="exact"
+        ))
+
+        gap = solver["vs_greedy"]
+        assert solver["mode"] == "exact"
+        assert [b.batch_id for b in sorted(batches, key=lambda b: b.batch_id)] == ["P01", "S01"]
+        assert gap["exact_cost_eur"] == pytest.approx(sum(b.total_cost_eur for b in batches))
+        assert gap["comparable"] is True
+        assert gap["gap_eur"] >= 0
+
+    def test_greedy_mode_unchanged_shape(self, optimizer, day_prices):
+        """Greedy mode has no comparison block."""
+        ree, weather = self._forecasts(day_prices)
+        batches, solver = asyncio.run(optimizer._optimize_batch_scheduling(
+            ree, weather, num_standard=2, num_premium=1, target_date=datetime(2025, 10, 20)
+        ))
+
+        assert solver["mode"] == "greedy"
+        assert "vs_greedy" not in solver
+        assert len(batches) == 2  # 12h premium + 7h standard; a second 7h window does not fit
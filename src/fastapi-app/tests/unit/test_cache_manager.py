@@ -0,0 +1,352 @@
+"""
+Unit Tests for CacheManager and the Redis Backend
+=================================================
+
+Tests core/cache/cache_manager.py and core/cache/redis_backend.py. The
+shared backend runs against a local in-process stand-in that speaks the
+Redis protocol (RESP2) for the commands the cache uses.
+
+Coverage:
+- ✅ LRU eviction by max entries and max bytes
+- ✅ Heap-based expiry (cleanup only touches expired entries)
+- ✅ Tag invalidation
+- ✅ Reads return copies (mutating a result does not touch the cache)
+- ✅ Stable hashed keys (argument order, self ignored, unstable objects rejected)
+- ✅ cache_key_wrapper (sync/async), concurrent misses computed once
+- ✅ cache_key_wrapper bypasses the cache for arguments without a stable key
+- ✅ Results computed across a tag invalidation are not stored
+- ✅ Two managers (workers) share hits through the backend; invalidations
+  are broadcast and drop the other worker's L1 copy
+- ✅ L1 copy of a backend hit never outlives the entry's TTL left in Redis
+- ✅ Backend down → local-only, errors counted
+"""
+
+import asyncio
+import time
+from datetime import date
+
+import pytest
+import pytest_asyncio
+
+from core.cache import CacheManager, RedisCacheBackend, cache_key_wrapper, make_cache_key
+
+
+class _RedisStandIn:
+    """Servidor RESP2 en proceso: GET/SET PX/DEL/SADD/SMEMBERS/PTTL/PEXPIRE/PING/PUBLISH/SUBSCRIBE."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.commands = []
+        self.subscribers = {}
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def _run(self, name, args):
+        self.commands.append(name)
+        if name == "PING":
+            return "+PONG"
+        if name == "GET":
+            return self.data[args[0]] if self._alive(args[0]) else None
+        if name == "SET":
+            key, value = args[0], args[1]
+            self.data[key] = value
+            self.expires.pop(key, None)
+            if len(args) > 3 and args[2].upper() == b"PX":
+                self.expires[key] = time.monotonic() + int(args[3]) / 1000
+            return "+OK"
+        if name == "DEL":
+            removed = sum(1 for key in args if self._alive(key))
+            for key in args:
+                self.data.pop(key, None)
+                self.expires.pop(key, None)
+            return removed
+        if name == "SADD":
+            self._alive(args[0])
+            members = self.data.setdefault(args[0], set())
+            before = len(members)
+            members.update(args[1:])
+            return len(members) - before
+        if name == "SMEMBERS":
+            return sorted(self.data[args[0]]) if self._alive(args[0]) else []
+        if name == "PTTL":
+            if not self._alive(args[0]):
+                return -2
+            if args[0] not in self.expires:
+                return -1
+            return int((self.expires[args[0]] - time.monotonic()) * 1000)
+        if name == "PEXPIRE":
+            if not self._alive(args[0]):
+                return 0
+            self.expires[args[0]] = time.monotonic() + int(args[1]) / 1000
+            return 1
+        return Exception(f"ERR unknown command '{name}'")
+
+    @staticmethod
+    def _encode(reply):
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, Exception):
+            return b"-" + str(reply).encode() + b"\r\n"
+        if isinstance(reply, str):
+            return reply.encode() + b"\r\n"
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(_RedisStandIn._encode(item) for item in reply)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                name = args[0].decode().upper()
+                if name == "SUBSCRIBE":
+                    self.subscribers.setdefault(args[1], []).append(writer)
+                    reply = [b"subscribe", args[1], 1]
+                elif name == "PUBLISH":
+                    listeners = [w for w in self.subscribers.get(args[1], []) if not w.is_closing()]
+                    for listener in listeners:
+                        listener.write(self._encode([b"message", args[1], args[2]]))
+                    reply = len(listeners)
+                else:
+                    reply = self._run(name, args[1:])
+                writer.write(self._encode(reply))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def redis_url():
+    stand_in = _RedisStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"redis://127.0.0.1:{port}/0", stand_in
+    server.close()
+    await server.wait_closed()
+
+
+def _manager(**kwargs):
+    options = {"max_entries": 100, "max_bytes": 1_000_000, "default_ttl": 60, "local_ttl": 60, "enabled": True}
+    options.update(kwargs)
+    return CacheManager(**options)
+
+
+@pytest.mark.unit
+class TestLocalCache:
+    """Bounds, expiry and tags (local only)."""
+
+    def test_lru_eviction_by_entries(self):
+        cache = _manager(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "a" becomes most recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_lru_eviction_by_bytes(self):
+        cache = _manager(max_bytes=3000)
+        for key in ("a", "b", "c"):
+            cache.set(key, "x" * 1000)
+        cache.set("huge", "x" * 10_000)
+
+        stats = cache.get_stats()
+        assert cache.get("a") is None and cache.get("c") is not None
+        assert cache.get("huge") is None and stats["oversize"] == 1
+        assert stats["bytes"] <= 3000
+
+    def test_heap_expiry(self):
+        cache = _manager()
+        cache.set("short", 1, ttl=0.01)
+        cache.set("long", 2, ttl=60)
+        cache.set("none", None, ttl=60)
+        time.sleep(0.02)
+
+        assert cache.cleanup_expired() == 1
+        assert cache.get("long") == 2
+        assert cache.get("none", "missing") is None  # None is a cached value
+        assert cache.get_stats()["entries"] == 2
+
+    def test_tag_invalidation(self):
+        cache = _manager()
+        cache.set("ree:1", 1, tags=["ree"])
+        cache.set("ree:2", 2, tags=["ree", "dashboard"])
+        cache.set("weather:1", 3, tags=["weather"])
+
+        assert cache.invalidate_tags("ree") == 2
+        assert cache.get("ree:2") is None and cache.get("weather:1") == 3
+        assert cache.get_stats()["tags"] == 1
+
+    def test_reads_return_copies(self):
+        cache = _manager()
+        cache.set("prices", [{"price": 0.1}])
+
+        cache.get("prices")[0]["price"] = 99
+        cache.get("prices").append({"price": 0.2})
+
+        assert cache.get("prices") == [{"price": 0.1}]
+
+
+@pytest.mark.unit
+class TestCacheKeys:
+    """make_cache_key."""
+
+    def test_stable_keys(self):
+        key = make_cache_key("ree", date(2026, 10, 1), filters={"a": 1, "b": [1, 2]})
+
+        assert key == make_cache_key("ree", date(2026, 10, 1), filters={"b": [1, 2], "a": 1})
+        assert key.startswith("ree:") and len(key) == len("ree:") + 32
+        assert make_cache_key("ree", "2026-10-01") != make_cache_key("ree", date(2026, 10, 1))
+        assert make_cache_key("ree", 1) != make_cache_key("ree", "1")
+
+    def test_unstable_objects_rejected(self):
+        with pytest.raises(TypeError, match="ignore_self"):
+            make_cache_key("svc", object())
+
+    def test_wrapper_ignores_self(self):
+        cache = _manager()
+        calls = []
+
+        class Service:
+            @cache_key_wrapper("svc.total", ignore_self=True, manager=cache)
+            def total(self, values):
+                calls.append(values)
+                return sum(values)
+
+        assert Service().total([1, 2]) == 3
+        assert Service().total([1, 2]) == 3  # Another instance, same key
+        assert len(calls) == 1
+        assert cache.invalidate_tags("svc.total") == 1
+
+    def test_wrapper_bypasses_unstable_args(self):
+        cache = _manager()
+        calls = []
+
+        @cache_key_wrapper("svc.describe", manager=cache)
+        def describe(value):
+            calls.append(value)
+            return type(value).__name__
+
+        marker = object()
+        assert describe(marker) == "object"  # Not a TypeError
+        assert describe(marker) == "object"
+        assert len(calls) == 2 and cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestAsyncCache:
+    """Async API, shared backend and degradation."""
+
+    async def test_concurrent_misses_computed_once(self):
+        cache = _manager()
+        calls = []
+
+        @cache_key_wrapper("prices", manager=cache)
+        async def prices(day):
+            calls.append(day)
+            await asyncio.sleep(0.05)
+            return {"day": day}
+
+        results = await asyncio.gather(*[prices("2026-10-16") for _ in range(5)])
+        await prices("2026-10-16")
+
+        assert len(calls) == 1
+        assert all(r == {"day": "2026-10-16"} for r in results)
+        assert cache.get_stats()["coalesced"] == 4
+
+    async def test_invalidation_during_compute_not_stored(self):
+        cache = _manager()
+        started = asyncio.Event()
+
+        async def slow_prices():
+            started.set()
+            await asyncio.sleep(0.05)
+            return {"avg": 0.12}  # Read before the ingestion landed
+
+        compute = asyncio.create_task(cache.aget_or_set("ree:stats", slow_prices, tags=["ree"]))
+        await started.wait()
+        cache.invalidate_tags("ree")  # New prices ingested mid-compute
+
+        assert await compute == {"avg": 0.12}
+        assert cache.get("ree:stats") is None
+        assert cache.get_stats()["stale_results"] == 1
+
+    async def test_workers_share_hits_through_backend(self, redis_url):
+        url, stand_in = redis_url
+        worker_a = _manager(backend=RedisCacheBackend(url), local_ttl=5)
+        worker_b = _manager(backend=RedisCacheBackend(url), local_ttl=5)
+
+        await worker_a.aset("ree:stats", {"avg": 0.12}, ttl=60, tags=["ree"])
+        assert await worker_b.aget("ree:stats") == {"avg": 0.12}
+        assert worker_b.get_stats()["backend_hits"] == 1
+        assert worker_b.get("ree:stats") == {"avg": 0.12}  # Now in worker B's L1
+
+        for _ in range(50):
+            if worker_b.get_stats()["invalidation_listener"]:
+                break
+            await asyncio.sleep(0.01)
+
+        assert await worker_a.ainvalidate_tags("ree") == 1
+        await asyncio.sleep(0.05)  # Broadcast delivery
+        assert worker_b.get("ree:stats") is None  # Dropped from L1 without waiting local_ttl
+        assert worker_b.get_stats()["remote_invalidations"] == 1
+        assert await worker_b.aget("ree:stats") is None
+        assert "chocolate:cache:tag:ree" not in stand_in.data
+
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+    async def test_backend_ttl(self, redis_url):
+        url, _ = redis_url
+        worker_a = _manager(backend=RedisCacheBackend(url), local_ttl=0.01)
+        worker_b = _manager(backend=RedisCacheBackend(url))
+
+        await worker_a.aset("short", 1, ttl=0.05)
+        assert await worker_b.aget("short") == 1
+        worker_b.clear()
+        await asyncio.sleep(0.08)
+        assert await worker_b.aget("short") is None
+
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+    async def test_local_copy_capped_at_backend_ttl(self, redis_url):
+        url, stand_in = redis_url
+        worker_a = _manager(backend=RedisCacheBackend(url))
+        worker_b = _manager(backend=RedisCacheBackend(url), local_ttl=60)
+
+        await worker_a.aset("short", 1, ttl=0.05)
+        assert await worker_b.aget("short") == 1
+        assert "PTTL" in stand_in.commands
+        await asyncio.sleep(0.08)
+        assert worker_b.get("short") is None  # L1 expired with the Redis entry, not after 60s
+
+        await worker_a.aclose()
+        await worker_b.aclose()
+
+    async def test_backend_down_falls_back_to_local(self):
+        cache = _manager(backend=RedisCacheBackend("redis://127.0.0.1:1/0", timeout_seconds=0.2))
+
+        await cache.aset("k", 1)
+        assert await cache.aget("k") == 1
+        assert await cache.aget("other") is None
+
+        stats = cache.get_stats()
+        assert stats["backend_errors"] == 1  # Then skipped until BACKEND_RETRY_SECONDS
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        await cache.aclose()
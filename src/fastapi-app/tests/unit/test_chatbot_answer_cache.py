@@ -0,0 +1,156 @@
+"""
+Unit Tests for Chatbot Answer Cache and Context Compression
+===========================================================
+
+Tests services/chatbot_answer_cache.py, compress_context() and how
+ChatbotService / GET /chat/stats use them.
+
+Coverage:
+- ✅ Question normalization (case, accents, punctuation)
+- ✅ Same question + same data → cached answer, no LLM call
+- ✅ Data change (new fingerprint) → new LLM call
+- ✅ Errors not cached; LRU eviction and TTL
+- ✅ Duplicate / overlapping sections removed, token budget enforced
+- ✅ /chat/stats reports hit rate, saved tokens and latency
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from services.chatbot_answer_cache import ChatbotAnswerCache, normalize_question
+from services.chatbot_context_service import ChatbotContextService, compress_context
+from services.chatbot_service import ChatbotService
+
+
+def _llm_message(text="✅ Producir 02:00-08:00h"):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text, type="text")],
+        usage=SimpleNamespace(input_tokens=800, output_tokens=60)
+    )
+
+
+@pytest.fixture
+def dashboard():
+    return {"current_info": {"energy": {"price_eur_kwh": 0.0812}, "factory_efficiency": 87.5}}
+
+
+@pytest.fixture
+def chatbot(dashboard):
+    async def fetch_dashboard():
+        return dashboard
+
+    async def fetch_windows():
+        return {"optimal_windows": []}
+
+    service = ChatbotService()
+    service.context_service = ChatbotContextService(providers={
+        "dashboard": fetch_dashboard, "optimal_windows": fetch_windows
+    })
+    service.client = SimpleNamespace(messages=SimpleNamespace(create=AsyncMock(return_value=_llm_message())))
+    return service
+
+
+@pytest.mark.unit
+class TestAnswerCacheUnit:
+    """ChatbotAnswerCache on its own."""
+
+    def test_normalize_question(self):
+        assert normalize_question("¿Cuándo producir  MAÑANA?") == "cuando producir manana"
+        assert normalize_question("precio ahora") == normalize_question("¡Precio, ahora!")
+
+    def test_errors_not_cached_lru_and_ttl(self):
+        cache = ChatbotAnswerCache(max_entries=2, ttl_seconds=60)
+        ok = {"success": True, "tokens": {"total": 10}, "cost_usd": 0.001, "answer": "a"}
+
+        cache.put("error", {**ok, "success": False})
+        for key in ("a", "b", "c"):
+            cache.put(key, ok)
+
+        assert cache.get("error") is None
+        assert cache.get("a") is None  # Evicted (LRU)
+        assert cache.get("c")["answer"] == "a"
+        cache.ttl_seconds = -1
+        assert cache.get("c") is None  # Expired
+        assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestAnswerCacheService:
+    """ChatbotService with the answer cache."""
+
+    async def test_repeated_question_served_from_cache(self, chatbot):
+        first = await chatbot.ask("¿Cuándo producir mañana?")
+        second = await chatbot.ask("cuando producir manana")
+
+        assert chatbot.client.messages.create.await_count == 1
+        assert first["cached"] is False and second["cached"] is True
+        assert second["answer"] == first["answer"]
+        assert second["tokens"]["total"] == 0 and second["cost_usd"] == 0.0
+        stats = chatbot.answer_cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["saved_tokens"] == 860
+        assert stats["saved_cost_usd"] == pytest.approx(first["cost_usd"])
+
+    async def test_new_data_misses(self, chatbot, dashboard):
+        await chatbot.ask("¿Cuándo producir mañana?")
+        dashboard["current_info"]["energy"]["price_eur_kwh"] = 0.2345
+        await chatbot.ask("¿Cuándo producir mañana?")
+
+        assert chatbot.client.messages.create.await_count == 2
+
+    async def test_stream_hit(self, chatbot):
+        await chatbot.ask("precio ahora")
+        events = [e async for e in chatbot.ask_stream("Precio ahora")]
+
+        assert [e["event"] for e in events] == ["token", "done"]
+        assert events[1]["data"]["cached"] is True
+        assert chatbot.client.messages.create.await_count == 1
+
+    async def test_stats_endpoint(self, chatbot, monkeypatch):
+        from api.routers import chatbot as chatbot_router
+
+        monkeypatch.setattr(chatbot_router, "get_chatbot_service", lambda: chatbot)
+        await chatbot.ask("Dame un resumen")
+        await chatbot.ask("dame un resumen")
+
+        stats = await chatbot_router.get_chatbot_stats()
+
+        assert stats.answer_cache["hit_rate"] == 0.5
+        assert stats.answer_cache["avg_hit_latency_ms"] is not None
+        assert stats.context_compression["contexts"] == 2
+        assert stats.context_compression["saved_tokens"] > 0  # full_dashboard repeats current status
+
+
+@pytest.mark.unit
+class TestCompressContext:
+    """Duplicate removal and token budget."""
+
+    def test_overlapping_and_duplicate_blocks_removed(self):
+        sections = [
+            ("current_status", "ESTADO ACTUAL\nPrecio: 0.08"),
+            ("production_context", "PROCESOS\n1. Molienda\n\nCOMÚN"),
+            ("full_dashboard", "RESUMEN:\n\n📊 ESTADO ACTUAL:\n• Precio: 0.08\n\nCOMÚN\n\n💡 ACCIONES"),
+        ]
+
+        kept, stats = compress_context(sections, max_tokens=2000)
+
+        assert dict(kept)["full_dashboard"] == "RESUMEN:\n\n💡 ACCIONES"
+        assert stats["deduplicated_blocks"] == 2
+        assert stats["tokens_after"] < stats["tokens_before"]
+
+    def test_token_budget_drops_least_specific_sections(self):
+        sections = [
+            ("current_status", "A" * 400),
+            ("production_context", "B" * 2000),
+            ("optimal_windows", "C" * 800),
+            ("weekly_forecast", "D" * 800),
+        ]
+
+        kept, stats = compress_context(sections, max_tokens=400)
+
+        assert [name for name, _ in kept] == ["current_status", "optimal_windows"]
+        assert stats["dropped_sections"] == ["production_context", "weekly_forecast"]
+        assert stats["tokens_after"] <= 400
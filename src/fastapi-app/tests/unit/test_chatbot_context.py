@@ -0,0 +1,185 @@
+"""
+Unit Tests for Chatbot Context Providers
+========================================
+
+Tests services/chatbot_context_providers.py (ChatContextSnapshot) and how
+ChatbotContextService builds its context from it.
+
+Coverage:
+- ✅ Every category of a question shares one fetch per source
+- ✅ Concurrent get() of the same source reuse the in-flight task
+- ✅ Source errors and timeouts only drop the sections that use them
+- ✅ Each question gets a fresh snapshot
+- ✅ Production plan formatted from the optimizer result
+- ✅ Dashboard document decoded once per snapshot version
+- ✅ Fingerprint stable across identical calls (volatile fields ignored)
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.chatbot_context_providers import ChatContextSnapshot, fetch_dashboard
+from services.chatbot_context_service import ChatbotContextService
+
+DASHBOARD = {
+    "current_info": {
+        "energy": {"price_eur_kwh": 0.0812, "trend": "down"},
+        "weather": {"temperature": 21.5, "humidity": 48},
+        "production_status": "optimal"
+    },
+    "siar_analysis": {"seasonal_patterns": {"best_month": {"name": "Enero", "efficiency_score": 91.2}}},
+    "historical_analytics": {"optimization_potential": {"annual_savings_projection": 1234.5}},
+    "recommendations": {"human_recommendation": {"main_message": {"title": "Producir ahora"}}}
+}
+
+
+class _Sources:
+    """Providers with call counters."""
+
+    def __init__(self, delay: float = 0.02, fail=()):
+        self.calls = {}
+        self.delay = delay
+        self.fail = set(fail)
+
+    def provider(self, name, payload):
+        async def fetch():
+            self.calls[name] = self.calls.get(name, 0) + 1
+            await asyncio.sleep(self.delay)
+            if name in self.fail:
+                raise RuntimeError(f"{name} down")
+            return payload
+        return fetch
+
+    def providers(self):
+        return {
+            "dashboard": self.provider("dashboard", DASHBOARD),
+            "optimal_windows": self.provider("optimal_windows", {"optimal_windows": []}),
+            "alerts": self.provider("alerts", {"total_alerts": 1, "alerts": [
+                {"severity": "high", "message": "Pico precio 19h"}
+            ]}),
+            "savings": self.provider("savings", {"daily_savings": {"savings_eur": 4.5}}),
+            "latest_price": self.provider("latest_price", {
+                "price_eur_kwh": 0.0812, "timestamp": "2026-10-16T03:00:00+00:00"
+            }),
+            "price_stats": self.provider("price_stats", {"min": 0.01, "max": 0.3, "avg": 0.12, "count": 720}),
+            "production_plan": self.provider("production_plan", {
+                "target_date": "2026-10-17T00:00:00",
+                "plan": {"batches": [{
+                    "start_time": "02:00", "end_time": "08:00",
+                    "quality_type": "premium", "avg_price_eur_kwh": 0.0654
+                }]}
+            }),
+        }
+
+
+ALL_CATEGORIES = "¿Cuándo producir? precio, alertas, ahorro, plan, análisis histórico, estado actual y qué me recomiendas"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestChatContextSnapshot:
+    """Per-question memoization."""
+
+    async def test_sources_fetched_once_per_question(self):
+        sources = _Sources()
+        service = ChatbotContextService(providers=sources.providers())
+
+        context = await service.build_context(ALL_CATEGORIES)
+
+        assert sources.calls == {name: 1 for name in sources.providers()}
+        for section in ("ESTADO ACTUAL", "ALERTAS ACTIVAS (1)", "TRACKING AHORROS", "ANÁLISIS PRECIOS",
+                        "ANÁLISIS HISTÓRICO", "ANALYTICS HISTÓRICOS", "RECOMENDACIÓN DEL SISTEMA"):
+            assert section in context
+        assert "Precio actual (03:00h): 🟢 0.0812 €/kWh" in context
+
+        await service.build_context(ALL_CATEGORIES)
+        assert sources.calls["dashboard"] == 2  # New question, new snapshot
+
+    async def test_concurrent_gets_share_task(self):
+        sources = _Sources()
+        snapshot = ChatContextSnapshot(sources.providers())
+
+        results = await asyncio.gather(*[snapshot.get("dashboard") for _ in range(3)])
+
+        assert sources.calls == {"dashboard": 1}
+        assert all(r is DASHBOARD for r in results)
+        assert snapshot.fetched == ["dashboard"]
+
+    async def test_failed_source_only_drops_its_sections(self):
+        sources = _Sources(fail={"alerts"})
+        service = ChatbotContextService(providers=sources.providers())
+
+        context = await service.build_context("¿Hay alertas? ¿Cuál es el estado actual?")
+
+        assert "ALERTAS ACTIVAS" not in context
+        assert "ESTADO ACTUAL" in context
+        assert "PROCESOS DE PRODUCCIÓN" in context
+
+    async def test_source_timeout(self):
+        sources = _Sources(delay=1.0)
+        snapshot = ChatContextSnapshot(sources.providers(), timeout_seconds=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await snapshot.get("alerts")
+
+    async def test_production_plan_section(self):
+        service = ChatbotContextService(providers=_Sources().providers())
+
+        context = await service.build_context("Planificar los batches")
+
+        assert "PLAN PRODUCCIÓN OPTIMIZADO (2026-10-17):" in context
+        assert "- 02:00-08:00h: premium (Precio: 0.0654 €/kWh)" in context
+
+    async def test_fingerprint_ignores_volatile_fields(self):
+        """Two identical provider calls give the same fingerprint; changed data does not."""
+        calls = {"n": 0}
+
+        async def alerts():
+            calls["n"] += 1
+            return {"alerts": [{"type": "heat_wave", "datetime": f"2026-10-16T10:00:0{calls['n']}"}]}
+
+        async def production_plan(price=0.0654):
+            return {
+                "plan": {"avg_price_eur_kwh": price},
+                "metadata": {"solver": {"mode": "exact", "solve_ms": 1.5 + calls["n"]}}
+            }
+
+        async def fingerprint(providers):
+            snapshot = ChatContextSnapshot(providers)
+            await asyncio.gather(*[snapshot.get(source) for source in providers])
+            return snapshot.fingerprint()
+
+        providers = {"alerts": alerts, "production_plan": production_plan}
+        first = await fingerprint(providers)
+        second = await fingerprint(providers)
+        changed = await fingerprint({"alerts": alerts, "production_plan": lambda: production_plan(0.07)})
+
+        assert first == second
+        assert changed != first
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestDashboardProvider:
+    """In-process /dashboard/complete."""
+
+    async def test_decoded_once_per_snapshot_version(self):
+        body = json.dumps(DASHBOARD).encode()
+        snapshot_service = SimpleNamespace(get_snapshot=AsyncMock(
+            return_value=SimpleNamespace(etag="v1", bodies={"complete": body})
+        ))
+
+        with patch("services.dashboard_snapshot.get_dashboard_snapshot_service", return_value=snapshot_service), \
+                patch("services.dashboard.get_dashboard_service", return_value=object()):
+            first = await fetch_dashboard()
+            second = await fetch_dashboard()
+            snapshot_service.get_snapshot.return_value = SimpleNamespace(etag="v2", bodies={"complete": body})
+            third = await fetch_dashboard()
+
+        assert first == DASHBOARD
+        assert second is first
+        assert third is not first and third == first
@@ -0,0 +1,187 @@
+"""
+Unit Tests for Async / Streaming Chatbot
+========================================
+
+Tests ChatbotService (AsyncAnthropic) and POST /chat/ask/stream against a
+local stub LLM server that speaks the Anthropic Messages API (JSON and SSE)
+with configurable latency.
+
+Coverage:
+- ✅ ask() through the async client (answer, tokens, cost)
+- ✅ Concurrent asks overlap and the event loop keeps running
+- ✅ ask_stream(): tokens arrive before the full answer
+- ✅ API errors become error responses / error events
+- ✅ /chat/ask/stream emits SSE token + done events
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+import uvicorn
+from anthropic import AsyncAnthropic
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from services.chatbot_service import ChatbotService
+
+STUB_TOKENS = ["✅ Producir ", "hoy ", "02:00-08:00h ", "(P3, ", "0.06 ", "€/kWh)."]
+STUB_FIRST_TOKEN_SECONDS = 0.2
+STUB_TOKEN_INTERVAL_SECONDS = 0.03
+
+
+def _stub_llm_app() -> FastAPI:
+    """Servidor compatible con POST /v1/messages (sin y con stream)."""
+    app = FastAPI()
+
+    def message(text: str, output_tokens: int):
+        return {
+            "id": "msg_stub", "type": "message", "role": "assistant", "model": "stub",
+            "content": [{"type": "text", "text": text}], "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 900, "output_tokens": output_tokens}
+        }
+
+    def sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        if "FAIL" in body["messages"][0]["content"]:
+            return JSONResponse(status_code=400, content={
+                "type": "error", "error": {"type": "invalid_request_error", "message": "stub failure"}
+            })
+
+        if not body.get("stream"):
+            await asyncio.sleep(STUB_FIRST_TOKEN_SECONDS + STUB_TOKEN_INTERVAL_SECONDS * len(STUB_TOKENS))
+            return message("".join(STUB_TOKENS), len(STUB_TOKENS))
+
+        async def events():
+            start = message("", 1)
+            start["content"], start["stop_reason"] = [], None
+            yield sse("message_start", {"type": "message_start", "message": start})
+            yield sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                              "content_block": {"type": "text", "text": ""}})
+            await asyncio.sleep(STUB_FIRST_TOKEN_SECONDS)
+            for token in STUB_TOKENS:
+                yield sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                  "delta": {"type": "text_delta", "text": token}})
+                await asyncio.sleep(STUB_TOKEN_INTERVAL_SECONDS)
+            yield sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield sse("message_delta", {"type": "message_delta", "usage": {"output_tokens": len(STUB_TOKENS)},
+                                        "delta": {"stop_reason": "end_turn", "stop_sequence": None}})
+            yield sse("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def stub_llm_url():
+    """Stub LLM en su propio thread/event loop (como una API remota)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(_stub_llm_app(), host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.02)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+def chatbot(stub_llm_url):
+    service = ChatbotService()
+    service.client = AsyncAnthropic(api_key="test", base_url=stub_llm_url, max_retries=0)
+    service.context_service.build_context = AsyncMock(return_value="CONTEXTO: precio 0.06 €/kWh")
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestAsyncChatbot:
+    """ChatbotService against the stub LLM server."""
+
+    async def test_ask(self, chatbot):
+        result = await chatbot.ask("¿Cuándo producir?")
+
+        assert result["success"] is True
+        assert result["answer"] == "".join(STUB_TOKENS)
+        assert result["tokens"] == {"input": 900, "output": len(STUB_TOKENS), "total": 900 + len(STUB_TOKENS)}
+        assert result["cost_usd"] == pytest.approx(chatbot._calculate_cost(900, len(STUB_TOKENS)))
+
+    async def test_concurrent_asks_do_not_block_loop(self, chatbot):
+        single = STUB_FIRST_TOKEN_SECONDS + STUB_TOKEN_INTERVAL_SECONDS * len(STUB_TOKENS)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await asyncio.gather(*[chatbot.ask(f"Pregunta {i}") for i in range(6)])
+        elapsed = time.perf_counter() - start
+        ticking.cancel()
+
+        assert all(r["success"] for r in results)
+        assert elapsed < single * 3  # Serializadas serían 6x
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < single / 2  # Loop libre durante las llamadas
+
+    async def test_stream_tokens_before_answer(self, chatbot):
+        events, arrivals = [], []
+        start = time.perf_counter()
+        async for event in chatbot.ask_stream("¿Cuándo producir?"):
+            events.append(event)
+            arrivals.append(time.perf_counter() - start)
+
+        tokens = [e["data"]["text"] for e in events if e["event"] == "token"]
+        done = events[-1]
+        assert "".join(tokens) == "".join(STUB_TOKENS)
+        assert done["event"] == "done" and done["data"]["answer"] == "".join(STUB_TOKENS)
+        assert done["data"]["tokens"]["output"] == len(STUB_TOKENS)
+        assert done["data"]["first_token_ms"] < done["data"]["latency_ms"]
+        assert arrivals[-1] - arrivals[0] >= STUB_TOKEN_INTERVAL_SECONDS * (len(STUB_TOKENS) - 1)
+
+    async def test_api_errors(self, chatbot):
+        result = await chatbot.ask("FAIL")
+        events = [e async for e in chatbot.ask_stream("FAIL")]
+
+        assert result["success"] is False
+        assert result["answer"].startswith("❌")
+        assert [e["event"] for e in events] == ["error"]
+        assert events[0]["data"] == {**result, "latency_ms": events[0]["data"]["latency_ms"]}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestChatStreamEndpoint:
+    """POST /chat/ask/stream (SSE)."""
+
+    async def test_sse_events(self, chatbot, monkeypatch):
+        from api.routers import chatbot as chatbot_router
+
+        monkeypatch.setattr(chatbot_router, "get_chatbot_service", lambda: chatbot)
+        monkeypatch.setattr(chatbot_router.limiter, "enabled", False)
+        app = FastAPI()
+        app.include_router(chatbot_router.router)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/chat/ask/stream", json={"question": "¿Cuándo producir?"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = [b for b in response.text.split("\n\n") if b]
+        events = [(b.split("\n")[0][len("event: "):], json.loads(b.split("\n")[1][len("data: "):])) for b in blocks]
+        assert [name for name, _ in events] == ["token"] * len(STUB_TOKENS) + ["done"]
+        assert events[-1][1]["success"] is True and "timestamp" in events[-1][1]
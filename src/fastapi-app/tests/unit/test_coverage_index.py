@@ -0,0 +1,160 @@
+"""
+Unit Tests for Coverage Index
+==============================
+
+Tests infrastructure/influxdb/coverage.py, the server-side coverage query
+and its use by GapDetectionService.
+
+Coverage:
+- ✅ Coverage query counts per window server-side (aggregateWindow)
+- ✅ Written points (Point / dict / line) mark their hours present only with the tracked field
+- ✅ Write updates saved once per delay from a timer thread; flush() saves pending ones
+- ✅ Scans mark verified ranges; recent hours stay unverified
+- ✅ Bitmaps persist across instances
+- ✅ Second detection only scans unverified hours
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from influxdb_client import Point
+
+from infrastructure.influxdb.coverage import CoverageIndex
+from infrastructure.influxdb.queries import get_coverage_query
+from services.gap_detector import GapDetectionService
+
+T0 = datetime(2025, 10, 20, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return CoverageIndex(path=tmp_path / "coverage.npz", recheck_hours=48)
+
+
+@pytest.mark.unit
+class TestCoverageIndex:
+    """Unit tests for CoverageIndex."""
+
+    def test_coverage_query(self):
+        """Hourly counts, empty windows included, tags and field filtered."""
+        query = get_coverage_query(
+            "energy_data", "generation_mix", "2025-10-01T00:00:00Z", "2025-10-08T00:00:00Z",
+            field="value_mwh", every="1d", tags={"source": "ree_generation"}
+        )
+
+        assert 'r["_field"] == "value_mwh"' in query
+        assert 'r["source"] == "ree_generation"' in query
+        assert "aggregateWindow(every: 1d, fn: count, createEmpty: true" in query
+
+    def test_record_points(self, index):
+        """Points and dicts of tracked measurements mark their hour."""
+        points = [
+            Point("energy_prices").field("price_eur_kwh", 0.1).time(T0 + timedelta(minutes=5)),
+            Point("energy_prices").field("price_eur_kwh", 0.1).time(T0 + timedelta(minutes=50)),
+            {"measurement": "weather_data", "time": (T0 + timedelta(hours=3)).isoformat(), "fields": {"temperature": 20.5}},
+            {"measurement": "weather_data", "time": (T0 + timedelta(hours=2)).isoformat(), "fields": {"humidity": 60.0}},
+            Point("energy_prices").field("price_eur_mwh", 100.0).time(T0 + timedelta(hours=1)),
+            'weather_data,station_id=5279X note="a,temperature=1",humidity=50 ' + str(int((T0 + timedelta(hours=1)).timestamp() * 1e9)),
+            Point("generation_mix").field("value_mwh", 1.0).time(T0),
+        ]
+
+        assert index.record_points(points, bucket="energy_data") == 2
+        assert index.present_hours("energy_prices", T0, T0 + timedelta(hours=4)) == [T0]
+        assert index.present_hours("weather_data", T0, T0 + timedelta(hours=4)) == [T0 + timedelta(hours=3)]
+        assert index.record_points(points, bucket="energy_data") == 0
+        assert index.record_points(points, bucket="other_bucket") == 0
+
+    def test_write_saves_debounced(self, tmp_path):
+        """Several writes → one background save after the delay; flush() saves at once."""
+        index = CoverageIndex(path=tmp_path / "coverage.npz", save_delay=0.05)
+
+        with patch.object(CoverageIndex, "save", autospec=True, side_effect=CoverageIndex.save) as save:
+            for hour in range(3):
+                index.record_points(Point("energy_prices").field("price_eur_kwh", 0.1).time(T0 + timedelta(hours=hour)))
+            assert save.call_count == 0
+            time.sleep(0.2)
+            assert save.call_count == 1
+
+            index.record_points(Point("energy_prices").field("price_eur_kwh", 0.1).time(T0 + timedelta(hours=5)))
+            index.flush()
+            assert save.call_count == 2
+
+        restored = CoverageIndex(path=tmp_path / "coverage.npz")
+        assert len(restored.present_hours("energy_prices", T0, T0 + timedelta(hours=6))) == 4
+
+    def test_apply_scan_verifies_range(self, index):
+        """Scanned history is verified; the recheck window is not."""
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        start = now - timedelta(days=5)
+        counts = [(start + timedelta(hours=h), 0 if h in (10, 11) else 3) for h in range(5 * 24)]
+
+        index.apply_scan("weather_data", start, now, counts)
+
+        assert index.missing_hours("weather_data", start, now) == [start + timedelta(hours=10), start + timedelta(hours=11)]
+        assert index.unverified_ranges("weather_data", start, now) == [(now - timedelta(hours=48), now)]
+        assert index.unverified_ranges("weather_data", start - timedelta(hours=2), start + timedelta(hours=1)) == [
+            (start - timedelta(hours=2), start)
+        ]
+
+    def test_persistence(self, index, tmp_path):
+        """save() + new instance restores both bitmaps."""
+        index.mark_present("energy_prices", [T0, T0 + timedelta(hours=5)])
+        index.apply_scan("energy_prices", T0, T0 + timedelta(hours=6), [])
+        index.save()
+
+        restored = CoverageIndex(path=tmp_path / "coverage.npz")
+
+        assert restored.present_hours("energy_prices", T0, T0 + timedelta(hours=6)) == [T0, T0 + timedelta(hours=5)]
+        assert restored.unverified_ranges("energy_prices", T0, T0 + timedelta(hours=6)) == []
+        assert restored.stats() == {"energy_prices": {"present_hours": 2, "verified_hours": 6}}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestGapDetectionWithCoverage:
+    """GapDetectionService + CoverageIndex"""
+
+    def _service_mock(self, hours_missing):
+        """DataIngestionService returning hourly counts for the queried range."""
+        calls = []
+
+        def query(flux_query, *args, **kwargs):
+            calls.append(flux_query)
+            start = datetime.fromisoformat(flux_query.split("range(start: ")[1].split(",")[0])
+            stop = datetime.fromisoformat(flux_query.split("stop: ")[1].split(")")[0])
+            records = []
+            hour = start
+            while hour < stop:
+                record = Mock()
+                record.get_time.return_value = hour
+                record.get_value.return_value = 0 if hour in hours_missing else 1
+                records.append(record)
+                hour += timedelta(hours=1)
+            table = Mock()
+            table.records = records
+            return [table]
+
+        service = MagicMock()
+        service.config.bucket = "energy_data"
+        service.client.query_api.return_value.query.side_effect = query
+        service.__aenter__.return_value = service
+        return service, calls
+
+    async def test_second_detection_scans_recent_hours_only(self, index):
+        """Verified history comes from the index; only the recheck window is queried."""
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        missing = {now - timedelta(days=4) + timedelta(hours=h) for h in range(6)}
+        service, calls = self._service_mock(missing)
+        detector = GapDetectionService(coverage_index=index)
+
+        with patch("services.gap_detector.DataIngestionService", return_value=service):
+            first = await detector._detect_ree_gaps(days_back=7)
+            second = await detector._detect_ree_gaps(days_back=7)
+
+        assert len(calls) == 2
+        assert "aggregateWindow(every: 1h, fn: count" in calls[0]
+        assert f"range(start: {(now - timedelta(hours=48)).isoformat()}" in calls[1]
+        assert [(g.start_time, g.end_time) for g in first] == [(min(missing), max(missing))]
+        assert [(g.start_time, g.end_time) for g in second] == [(min(missing), max(missing))]
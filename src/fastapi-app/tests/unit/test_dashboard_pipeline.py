@@ -0,0 +1,123 @@
+"""
+Unit Tests for Dashboard Section Pipeline
+==========================================
+
+Tests the concurrent section graph in DashboardService.get_complete_dashboard_data().
+
+Coverage:
+- ✅ Independent sections run concurrently
+- ✅ Predictions receive current_info (dependency ordering)
+- ✅ Per-section timeout falls back to a partial result
+- ✅ Section errors are isolated
+- ✅ Wall times reported in response metadata
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from core.config import settings
+from services.dashboard import DashboardService
+
+
+CURRENT_INFO = {
+    "energy": {"price_eur_kwh": 0.12},
+    "weather": {"temperature": 21.0, "humidity": 50.0},
+    "production_status": "optimal"
+}
+
+
+def _delayed(result, delay):
+    """Async section stub that sleeps before returning."""
+    async def section(*args):
+        await asyncio.sleep(delay)
+        return result
+    return section
+
+
+@pytest.fixture
+def dashboard():
+    """DashboardService with stubbed sections (no HTTP calls)."""
+    with patch("services.dashboard.REEClient"), \
+         patch("services.dashboard.OpenWeatherMapClient"), \
+         patch("services.dashboard.PriceForecastingService"):
+        service = DashboardService(ml_models=MagicMock(), feature_engine=MagicMock())
+    service._get_current_info = _delayed(CURRENT_INFO, 0.2)
+    service._get_weekly_forecast_heatmap = _delayed({"status": "success", "calendar_days": []}, 0.2)
+    service._get_siar_analysis = _delayed({"status": "success"}, 0.2)
+    service._get_ml_predictions = _delayed({"energy_optimization": {"score": 80}}, 0.0)
+    service._generate_recommendations = MagicMock(return_value={"energy": []})
+    service._generate_alerts = MagicMock(return_value=[])
+    return service
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestDashboardSectionPipeline:
+    """Unit tests for concurrent dashboard sections."""
+
+    async def test_independent_sections_run_concurrently(self, dashboard):
+        """Three 0.2s sections complete in ~0.2s, not 0.6s."""
+        start = time.perf_counter()
+        data = await dashboard.get_complete_dashboard_data()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.45
+        assert data["weekly_forecast"]["status"] == "success"
+        assert data["siar_analysis"]["status"] == "success"
+
+    async def test_predictions_receive_current_info(self, dashboard):
+        """Predictions, recommendations and alerts consume current_info."""
+        received = []
+
+        async def predictions(current_info):
+            received.append(current_info)
+            return {"energy_optimization": {"score": 80}}
+
+        dashboard._get_ml_predictions = predictions
+        await dashboard.get_complete_dashboard_data()
+
+        assert received == [CURRENT_INFO]
+        dashboard._generate_alerts.assert_called_once_with(CURRENT_INFO, {"energy_optimization": {"score": 80}})
+
+    async def test_slow_section_times_out_with_fallback(self, dashboard):
+        """A slow upstream only costs its own budget."""
+        dashboard._get_weekly_forecast_heatmap = _delayed({"status": "success"}, 5.0)
+        timeouts = {**settings.DASHBOARD_SECTION_TIMEOUTS, "weekly_forecast": 0.3}
+
+        with patch.object(settings, "DASHBOARD_SECTION_TIMEOUTS", timeouts):
+            start = time.perf_counter()
+            data = await dashboard.get_complete_dashboard_data()
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert data["weekly_forecast"]["status"] == "error"
+        assert data["weekly_forecast"]["calendar_days"] == []
+        assert data["metadata"]["sections"]["weekly_forecast"]["status"] == "timeout"
+        assert data["metadata"]["degraded_sections"] == ["weekly_forecast"]
+
+    async def test_section_error_is_isolated(self, dashboard):
+        """An exception in one section does not fail the dashboard."""
+        async def broken():
+            raise RuntimeError("SIAR endpoint down")
+
+        dashboard._get_siar_analysis = broken
+        data = await dashboard.get_complete_dashboard_data()
+
+        assert data["siar_analysis"] == {"status": "error", "message": "SIAR endpoint down"}
+        assert data["current_info"] == CURRENT_INFO
+        assert data["metadata"]["sections"]["siar_analysis"]["status"] == "error"
+
+    async def test_metadata_reports_section_wall_times(self, dashboard):
+        """Every section reports its wall time and status."""
+        data = await dashboard.get_complete_dashboard_data()
+        sections = data["metadata"]["sections"]
+
+        assert set(sections) == {
+            "current_info", "predictions", "recommendations",
+            "alerts", "weekly_forecast", "siar_analysis"
+        }
+        assert all(s["status"] == "ok" for s in sections.values())
+        assert sections["current_info"]["seconds"] >= 0.2
+        assert data["metadata"]["total_seconds"] < sum(s["seconds"] for s in sections.values())
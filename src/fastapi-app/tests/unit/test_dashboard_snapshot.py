@@ -0,0 +1,171 @@
+"""
+Unit Tests for Dashboard Snapshot Service
+==========================================
+
+Tests the dashboard snapshot materializer (services/dashboard_snapshot.py).
+
+Coverage:
+- ✅ First request builds the snapshot
+- ✅ Fresh snapshots are served without rebuilding
+- ✅ Stale-while-revalidate (single background rebuild)
+- ✅ Refresh during a build (new data) triggers one follow-up build
+- ✅ ETag/version stability when content is unchanged
+- ✅ ETag ignores build timestamps and section timings
+- ✅ Fallback to stale snapshot on rebuild failure
+- ✅ Summary/alerts views derived from the complete document
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from services.dashboard_snapshot import DashboardSnapshotService
+
+
+DOCUMENT = {
+    "current_info": {
+        "energy": {"price_eur_kwh": 0.12},
+        "weather": {"temperature": 21.0, "humidity": 50.0},
+        "production_status": "optimal"
+    },
+    "predictions": {
+        "energy_optimization": {"score": 80},
+        "production_recommendation": {"class": "Optimal"}
+    },
+    "alerts": [{"level": "warning", "message": "Test"}],
+    "system_status": {"status": "ok"},
+    "timestamp": "2025-10-16T10:00:00"
+}
+
+
+@pytest.fixture
+def dashboard_service():
+    """Mock DashboardService returning a fixed document."""
+    service = MagicMock()
+    service.get_complete_dashboard_data = AsyncMock(side_effect=lambda: dict(DOCUMENT))
+    return service
+
+
+@pytest.fixture
+def snapshots():
+    """Snapshot service without the historical analytics dependency."""
+    service = DashboardSnapshotService(max_age_seconds=60, max_stale_seconds=600)
+    with patch.object(
+        DashboardSnapshotService,
+        "_build_document",
+        new=lambda self, svc: svc.get_complete_dashboard_data()
+    ):
+        yield service
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestDashboardSnapshotService:
+    """Unit tests for snapshot serving and rebuilds."""
+
+    async def test_first_request_builds_snapshot(self, snapshots, dashboard_service):
+        """No snapshot yet: the request awaits one build."""
+        snapshot = await snapshots.get_snapshot(dashboard_service)
+
+        assert snapshot.version == 1
+        assert json.loads(snapshot.bodies["complete"])["timestamp"] == DOCUMENT["timestamp"]
+        assert snapshots.stats["blocking_builds"] == 1
+        dashboard_service.get_complete_dashboard_data.assert_awaited_once()
+
+    async def test_fresh_snapshot_served_without_rebuild(self, snapshots, dashboard_service):
+        """Fresh snapshots never touch the dashboard pipeline."""
+        await snapshots.get_snapshot(dashboard_service)
+        await snapshots.get_snapshot(dashboard_service)
+        await snapshots.get_snapshot(dashboard_service)
+
+        assert dashboard_service.get_complete_dashboard_data.await_count == 1
+        assert snapshots.stats["fresh_hits"] == 2
+
+    async def test_stale_snapshot_served_while_revalidating(self, snapshots, dashboard_service):
+        """Stale snapshot returned immediately; one background rebuild."""
+        first = await snapshots.get_snapshot(dashboard_service)
+        first.built_at -= 120  # older than max_age
+
+        served = await asyncio.gather(*[snapshots.get_snapshot(dashboard_service) for _ in range(5)])
+        assert all(s is first for s in served)
+
+        await snapshots._refresh_task
+        assert dashboard_service.get_complete_dashboard_data.await_count == 2
+        assert snapshots.stats["stale_hits"] == 5
+
+    async def test_refresh_during_build_rebuilds_again(self, snapshots, dashboard_service):
+        """Data ingested while a build runs is picked up by one more build."""
+        release = asyncio.Event()
+        documents = iter([{**DOCUMENT, "alerts": []}, DOCUMENT])
+
+        async def slow_document():
+            await release.wait()
+            return dict(next(documents))
+
+        dashboard_service.get_complete_dashboard_data = AsyncMock(side_effect=slow_document)
+
+        task = snapshots.refresh(dashboard_service)
+        await asyncio.sleep(0)
+        assert snapshots.refresh(dashboard_service) is task
+        assert snapshots.refresh(dashboard_service) is task
+        release.set()
+        snapshot = await task
+
+        assert dashboard_service.get_complete_dashboard_data.await_count == 2
+        assert snapshot.document["alerts"] == DOCUMENT["alerts"]
+        assert snapshots.stats["follow_up_builds"] == 1
+
+    async def test_unchanged_content_keeps_version_and_etag(self, snapshots, dashboard_service):
+        """Rebuilding identical content does not invalidate client ETags."""
+        first = await snapshots.get_snapshot(dashboard_service)
+        second = await snapshots.refresh(dashboard_service)
+
+        assert second.version == first.version
+        assert second.view_etag("complete") == first.view_etag("complete")
+
+    async def test_etag_ignores_build_time_fields(self, snapshots, dashboard_service):
+        """New timestamps/timings keep the ETag; changed data gets a new one."""
+        first = await snapshots.get_snapshot(dashboard_service)
+
+        dashboard_service.get_complete_dashboard_data.side_effect = lambda: {
+            **DOCUMENT,
+            "system_status": {"status": "ok", "last_update": "2025-10-16T10:05:00"},
+            "metadata": {"total_seconds": 1.7},
+            "timestamp": "2025-10-16T10:05:00"
+        }
+        rebuilt = await snapshots.refresh(dashboard_service)
+
+        assert rebuilt.etag == first.etag
+        assert rebuilt.version == first.version
+        assert json.loads(rebuilt.bodies["complete"])["timestamp"] == "2025-10-16T10:05:00"
+
+        dashboard_service.get_complete_dashboard_data.side_effect = lambda: {
+            **DOCUMENT, "current_info": {"energy": {"price_eur_kwh": 0.2}}
+        }
+        changed = await snapshots.refresh(dashboard_service)
+
+        assert changed.etag != first.etag
+        assert changed.version == first.version + 1
+
+    async def test_rebuild_failure_serves_expired_snapshot(self, snapshots, dashboard_service):
+        """An expired snapshot is still better than a 500."""
+        first = await snapshots.get_snapshot(dashboard_service)
+        first.built_at -= 10_000  # beyond max_age + max_stale
+        dashboard_service.get_complete_dashboard_data.side_effect = Exception("InfluxDB down")
+
+        served = await snapshots.get_snapshot(dashboard_service)
+
+        assert served is first
+        assert snapshots.stats["build_errors"] == 1
+
+    async def test_summary_and_alerts_views(self, snapshots, dashboard_service):
+        """Derived views are serialized alongside the complete document."""
+        snapshot = await snapshots.get_snapshot(dashboard_service)
+
+        summary = json.loads(snapshot.bodies["summary"])
+        alerts = json.loads(snapshot.bodies["alerts"])
+
+        assert summary["current"]["energy_price"] == 0.12
+        assert summary["alerts_count"] == 1
+        assert alerts["alert_counts"]["warning"] == 1
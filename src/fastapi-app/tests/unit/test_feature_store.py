@@ -0,0 +1,212 @@
+"""
+Unit Tests for Parquet Feature Store
+=====================================
+
+Tests services/feature_store.py (InfluxDB queries mocked).
+
+Coverage:
+- ✅ Sub-hourly and multi-station rows aligned to one row per hour
+- ✅ First refresh loads full history, later ones only the delta since the watermark (minus overlap)
+- ✅ Overlapping hours are overwritten by the newest values, per-year partitions
+- ✅ Column and time-range pruning on read
+- ✅ Sources joined on the hour, clashing column names prefixed
+- ✅ Without pyarrow, load() queries InfluxDB directly
+- ✅ Ranges written below the watermark overlap are marked dirty and re-materialized
+- ✅ Sink-written lines mapped to their source's dirty range
+- ✅ Manifest updates from several store instances (processes) are merged
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pandas as pd
+import pytest
+
+from services import feature_store as feature_store_module
+from core.config import settings
+from services.feature_store import FeatureStore, record_written_lines, to_hourly
+
+
+def _frame(start, hours, **columns):
+    frame = pd.DataFrame({"timestamp": pd.date_range(start, periods=hours, freq="h", tz="UTC")})
+    for name, value in columns.items():
+        frame[name] = value
+    return frame
+
+
+@pytest.fixture
+def influx(monkeypatch):
+    """query_frame_async mock returning queued frames; records the Flux queries."""
+    query = AsyncMock()
+    monkeypatch.setattr(feature_store_module, "query_frame_async", query)
+    client = Mock()
+    client.bucket = "energy_data"
+    return client, query
+
+
+def _write_manifest(root, **entries):
+    (root / "_manifest.json").write_text(json.dumps(entries))
+
+
+def _flux_start(query_mock, call=-1):
+    flux = query_mock.call_args_list[call].args[1]
+    return flux.split("range(start: ")[1].split(")")[0].split(",")[0]
+
+
+@pytest.mark.unit
+class TestFeatureStore:
+    """Unit tests for the incremental Parquet store."""
+
+    def test_to_hourly(self):
+        """Quarter-hour and per-station rows are averaged into their hour."""
+        frame = pd.DataFrame({
+            "timestamp": pd.to_datetime([
+                "2025-01-01T00:00Z", "2025-01-01T00:15Z", "2025-01-01T00:45Z", "2025-01-01T01:00Z", "2025-01-01T02:00Z"
+            ]),
+            "temperature": [10.0, 12.0, 14.0, 5.0, None],
+        })
+
+        hourly = to_hourly(frame, ["temperature"])
+
+        assert hourly["timestamp"].tolist() == list(pd.date_range("2025-01-01", periods=2, freq="h", tz="UTC"))
+        assert hourly["temperature"].tolist() == [12.0, 5.0]
+
+    def test_incremental_refresh(self, tmp_path, influx):
+        """Full history first, then only the delta; overlapping hours take the new values."""
+        pytest.importorskip("pyarrow")
+        client, query = influx
+        store = FeatureStore(root=tmp_path, client=client, overlap_hours=2)
+
+        query.return_value = _frame("2024-12-31T20:00Z", 8, price_eur_kwh=0.1)
+        assert asyncio.run(store.refresh("ree")) == 8
+        assert _flux_start(query) == "0"
+        assert store.watermark("ree") == pd.Timestamp("2025-01-01T03:00Z")
+        assert store.stats()["sources"]["ree"]["partitions"] == [2024, 2025]
+
+        query.return_value = _frame("2025-01-01T01:00Z", 5, price_eur_kwh=0.2)
+        asyncio.run(store.refresh("ree"))
+        assert _flux_start(query) == "2025-01-01T01:00:00Z"
+        assert store.watermark("ree") == pd.Timestamp("2025-01-01T05:00Z")
+
+        stored = store.read("ree")
+        assert len(stored) == 10
+        assert stored["price_eur_kwh"].tolist() == [0.1] * 5 + [0.2] * 5
+
+        # Manifest survives a restart
+        assert FeatureStore(root=tmp_path, client=client).watermark("ree") == store.watermark("ree")
+
+    def test_read_pruning(self, tmp_path, influx):
+        """Only requested columns and [start, end) rows are returned."""
+        pytest.importorskip("pyarrow")
+        client, query = influx
+        store = FeatureStore(root=tmp_path, client=client)
+        query.return_value = _frame("2023-12-31T00:00Z", 72, temperature=20.0, humidity=50.0)
+        asyncio.run(store.refresh("weather"))
+
+        frame = store.read("weather", ["humidity"], start="2024-01-01", end="2024-01-01T06:00Z")
+
+        assert frame.columns.tolist() == ["timestamp", "humidity"]
+        assert len(frame) == 6
+        assert frame["timestamp"].min() == pd.Timestamp("2024-01-01", tz="UTC")
+
+    def test_read_aligned(self, tmp_path, influx):
+        """Sources are outer-joined per hour; shared names get a source prefix."""
+        pytest.importorskip("pyarrow")
+        client, query = influx
+        store = FeatureStore(root=tmp_path, client=client)
+        query.return_value = _frame("2025-03-01T00:00Z", 3, price_eur_kwh=0.15)
+        asyncio.run(store.refresh("ree"))
+        query.return_value = _frame("2025-03-01T01:00Z", 3, temperature=11.0, pressure=1013.0)
+        asyncio.run(store.refresh("weather"))
+        query.return_value = _frame("2025-03-01T00:00Z", 1, temperature=9.0)
+        asyncio.run(store.refresh("siar"))
+
+        aligned = store.read_aligned({
+            "ree": ["price_eur_kwh"], "weather": ["temperature"], "siar": ["temperature"]
+        })
+
+        assert aligned.columns.tolist() == ["timestamp", "price_eur_kwh", "weather_temperature", "siar_temperature"]
+        assert len(aligned) == 4
+        assert aligned["siar_temperature"].notna().sum() == 1
+
+    def test_load_without_parquet(self, tmp_path, influx, monkeypatch):
+        """Without pyarrow the requested range is queried from InfluxDB, nothing is stored."""
+        client, query = influx
+        monkeypatch.setattr(feature_store_module, "_parquet_available", lambda: False)
+        store = FeatureStore(root=tmp_path, client=client)
+        query.return_value = _frame("2025-01-01T00:00Z", 4, value_mwh=100.0)
+
+        frame = asyncio.run(store.load("gas", ["value_mwh"], start="2025-01-01"))
+
+        assert len(frame) == 4
+        assert _flux_start(query) == "2025-01-01T00:00:00Z"
+        assert 'r["source"] == "ree_generation"' in query.call_args.args[1]
+        assert not (tmp_path / "gas").exists()
+
+    def test_mark_dirty_outside_overlap(self, tmp_path, influx):
+        """Only ranges older than watermark - overlap are recorded, rounded out to whole hours."""
+        client, _ = influx
+        _write_manifest(tmp_path, ree={"watermark": "2025-03-10T00:00:00+00:00"})
+        store = FeatureStore(root=tmp_path, client=client, overlap_hours=48)
+
+        assert not store.mark_dirty("ree", "2025-03-08T06:00Z", "2025-03-09T00:00Z")
+        assert not store.mark_dirty("gas", "2025-01-01", "2025-01-02")
+        assert store.mark_dirty("ree", "2025-03-01T10:30Z", "2025-03-01T11:10Z")
+        assert store.mark_dirty("ree", "2025-03-01T13:00Z", "2025-03-09T00:00Z")
+
+        assert store.dirty_ranges("ree") == [
+            (pd.Timestamp("2025-03-01T10:00Z"), pd.Timestamp("2025-03-01T12:00Z")),
+            (pd.Timestamp("2025-03-01T13:00Z"), pd.Timestamp("2025-03-08T00:00Z")),
+        ]
+
+    def test_dirty_range_rematerialized(self, tmp_path, influx):
+        """A backfilled range below the overlap is fetched again on the next refresh."""
+        pytest.importorskip("pyarrow")
+        client, query = influx
+        store = FeatureStore(root=tmp_path, client=client, overlap_hours=2)
+        query.return_value = _frame("2025-01-01T00:00Z", 24, price_eur_kwh=0.1)
+        asyncio.run(store.refresh("ree"))
+
+        store.mark_dirty("ree", "2025-01-01T03:00Z", "2025-01-01T05:00Z")
+        query.side_effect = [_frame("2025-01-01T22:00Z", 2, price_eur_kwh=0.1), _frame("2025-01-01T03:00Z", 2, price_eur_kwh=0.5)]
+        asyncio.run(store.refresh("ree"))
+
+        assert _flux_start(query) == "2025-01-01T03:00:00Z"
+        frame = store.read("ree", ["price_eur_kwh"])
+        assert frame["price_eur_kwh"].tolist() == [0.1] * 3 + [0.5] * 2 + [0.1] * 19
+        assert store.dirty_ranges("ree") == []
+
+    def test_written_lines_mark_dirty(self, tmp_path, influx, monkeypatch):
+        """Sink listener: old lines of a tracked measurement become a dirty range of their source."""
+        client, _ = influx
+        _write_manifest(tmp_path, ree={"watermark": "2025-03-10T00:00:00+00:00"})
+        store = FeatureStore(root=tmp_path, client=client, overlap_hours=48)
+        monkeypatch.setattr(feature_store_module, "get_feature_store", lambda: store)
+        day = int(pd.Timestamp("2025-03-01T00:00Z").value)
+        hour = 3600 * 10**9
+
+        record_written_lines(settings.INFLUXDB_BUCKET, [
+            f"energy_prices,provider=ree price_eur_kwh=0.1 {day + 5 * hour}",
+            f"energy_prices,provider=ree price_eur_kwh=0.2 {day + 2 * hour}",
+            f"weather_data,station_id=3195 temperature=12.0 {day}",
+            "energy_prices price_eur_kwh=0.3",
+        ])
+
+        assert store.dirty_ranges("ree") == [
+            (pd.Timestamp("2025-03-01T02:00Z"), pd.Timestamp("2025-03-01T06:00Z"))
+        ]
+        assert "weather" not in store.stats()["sources"]
+
+    def test_manifest_merged_across_instances(self, tmp_path, influx):
+        """Two stores on the same root (API + training worker) keep each other's entries."""
+        client, _ = influx
+        api_store = FeatureStore(root=tmp_path, client=client)
+        worker_store = FeatureStore(root=tmp_path, client=client)
+        assert api_store.stats()["sources"] == {}
+
+        worker_store._merge("gas", _frame("2025-01-01", 0))
+        api_store._merge("ree", _frame("2025-01-01", 0))
+
+        assert set(api_store.stats()["sources"]) == {"gas", "ree"}
+        assert set(worker_store.stats()["sources"]) == {"gas", "ree"}
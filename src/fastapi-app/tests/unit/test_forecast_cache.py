@@ -0,0 +1,217 @@
+"""
+Unit Tests for Price Forecast Cache
+====================================
+
+Tests the process-wide forecast cache in services/price_forecasting_service.py.
+
+Coverage:
+- ✅ One Prophet predict per hour across service instances
+- ✅ predict_hours served from the weekly forecast cache
+- ✅ Inertia correction and gas input memoized
+- ✅ Inertia/gas fallbacks (no data) not memoized, nor the forecast built on them
+- ✅ Invalidation on _save_model() and hour rollover
+- ✅ A computation spanning an hour rollover is not stored for the new hour
+- ✅ Single-flight for concurrent callers
+- ✅ Cancelling one caller does not cancel the shared computation
+- ✅ Cached entries protected from consumer mutation
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import MagicMock, AsyncMock, patch
+
+import numpy as np
+import pandas as pd
+
+from services.price_forecasting_service import (
+    ForecastCache,
+    ForecastInputUnavailable,
+    PriceForecastingService,
+    get_forecast_cache
+)
+
+
+LAST_TRAINING = datetime(2025, 10, 16, 3, 0, 0)
+
+
+def _prophet_forecast(future: pd.DataFrame) -> pd.DataFrame:
+    """Deterministic stand-in for Prophet.predict()."""
+    yhat = np.full(len(future), 0.12)
+    return pd.DataFrame({
+        "ds": future["ds"],
+        "yhat": yhat,
+        "yhat_lower": yhat - 0.02,
+        "yhat_upper": yhat + 0.02
+    })
+
+
+def _make_service(tmp_path) -> PriceForecastingService:
+    service = PriceForecastingService(models_dir=str(tmp_path))
+    service.model = MagicMock()
+    service.model.predict.side_effect = _prophet_forecast
+    service.last_training = LAST_TRAINING
+    service._get_inertia_correction = AsyncMock(return_value=0.01)
+    return service
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Each test starts with an empty shared cache."""
+    get_forecast_cache().invalidate("test setup")
+    yield
+    get_forecast_cache().invalidate("test teardown")
+
+
+@pytest.fixture
+def gas_service():
+    """Patched GasGenerationService returning a fixed gas value."""
+    with patch("services.price_forecasting_service.GasGenerationService") as cls:
+        cls.return_value.get_latest = AsyncMock(
+            return_value={"gas_gen": 100000.0, "gas_gen_scaled": 0.4, "date": "2025-10-15"}
+        )
+        yield cls.return_value
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestForecastCache:
+    """Unit tests for the shared forecast cache."""
+
+    async def test_one_predict_per_hour_across_instances(self, tmp_path, gas_service):
+        """Separate service instances (dashboard, insights, optimizer) share one forecast."""
+        first = _make_service(tmp_path)
+        second = _make_service(tmp_path)
+
+        a = await first.predict_weekly()
+        b = await second.predict_weekly()
+
+        assert a == b
+        assert len(a) == 168
+        assert first.model.predict.call_count + second.model.predict.call_count == 1
+        assert a[0]["predicted_price"] == pytest.approx(0.13)
+
+    async def test_predict_hours_uses_cached_weekly(self, tmp_path, gas_service):
+        """predict_hours slices the cached weekly forecast."""
+        service = _make_service(tmp_path)
+
+        weekly = await service.predict_weekly()
+        hours = await service.predict_hours(hours=24)
+
+        assert hours == weekly[:24]
+        assert service.model.predict.call_count == 1
+
+    async def test_inertia_and_gas_memoized(self, tmp_path, gas_service):
+        """Inertia and gas are fetched once per hour, regardless of start hour."""
+        service = _make_service(tmp_path)
+
+        await service.predict_weekly()
+        await service.predict_weekly(start_date=datetime(2025, 10, 20, 0, 0))
+
+        assert service.model.predict.call_count == 2
+        service._get_inertia_correction.assert_awaited_once_with(window_hours=3)
+        gas_service.get_latest.assert_awaited_once()
+
+    async def test_fallbacks_not_memoized(self, tmp_path, gas_service):
+        """Missing inertia/gas data falls back for this call only; the next call retries."""
+        service = _make_service(tmp_path)
+        service._get_inertia_correction.side_effect = [ForecastInputUnavailable("no prices"), 0.01]
+        gas_service.get_latest.side_effect = [None, {"gas_gen": 100000.0, "gas_gen_scaled": 0.4}]
+
+        degraded = await service.predict_weekly()
+        recovered = await service.predict_weekly()
+
+        assert degraded[0]["predicted_price"] == pytest.approx(0.12)
+        assert recovered[0]["predicted_price"] == pytest.approx(0.13)
+        assert service._get_inertia_correction.await_count == 2
+        assert gas_service.get_latest.await_count == 2
+        assert service.model.predict.call_count == 2
+        assert service.model.predict.call_args.args[0]["gas_gen_scaled"].iloc[0] == 0.4
+
+    async def test_save_model_invalidates(self, tmp_path, gas_service):
+        """Saving a new model drops cached forecasts."""
+        service = _make_service(tmp_path)
+        await service.predict_weekly()
+        cache = get_forecast_cache()
+        assert cache.get_stats()["entries"] > 0
+
+        service.model = {"stub": "model"}  # picklable stand-in for _save_model
+        service._save_model()
+
+        assert cache.get_stats()["entries"] == 0
+        assert (tmp_path / "latest" / "price_forecast_prophet.pkl").exists()
+
+    async def test_hour_rollover_invalidates(self, tmp_path, gas_service):
+        """A new hour forces a new forecast."""
+        service = _make_service(tmp_path)
+        cache = get_forecast_cache()
+
+        with patch.object(ForecastCache, "current_hour", return_value=datetime(2025, 10, 16, 10)):
+            await service.predict_weekly(start_date=datetime(2025, 10, 16, 10))
+        with patch.object(ForecastCache, "current_hour", return_value=datetime(2025, 10, 16, 11)):
+            await service.predict_weekly(start_date=datetime(2025, 10, 16, 10))
+
+        assert service.model.predict.call_count == 2
+        assert cache.stats["invalidations"] >= 1
+
+    async def test_compute_across_rollover_not_stored(self):
+        """A compute started at 10:59 on an empty cache is neither stored nor joined at 11:00."""
+        cache = ForecastCache()
+        release = asyncio.Event()
+
+        def compute(label):
+            async def run():
+                await release.wait()
+                return label
+            return run
+
+        with patch.object(ForecastCache, "current_hour", return_value=datetime(2025, 10, 16, 10)):
+            stale = asyncio.ensure_future(cache.get_or_compute("k", compute("10:59")))
+            await asyncio.sleep(0)
+        with patch.object(ForecastCache, "current_hour", return_value=datetime(2025, 10, 16, 11)):
+            fresh = asyncio.ensure_future(cache.get_or_compute("k", compute("11:00")))
+            await asyncio.sleep(0)
+            release.set()
+
+            assert await stale == "10:59"
+            assert await fresh == "11:00"
+            assert await cache.get_or_compute("k", compute("recomputed")) == "11:00"
+
+    async def test_concurrent_callers_single_flight(self, tmp_path, gas_service):
+        """Concurrent consumers wait for one computation."""
+        service = _make_service(tmp_path)
+
+        results = await asyncio.gather(*[service.predict_weekly() for _ in range(5)])
+
+        assert service.model.predict.call_count == 1
+        assert all(r == results[0] for r in results)
+
+    async def test_cancelled_caller_does_not_cancel_waiters(self):
+        """A caller cancelled by its section timeout leaves the computation running."""
+        cache = ForecastCache()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "forecast"
+
+        first = asyncio.ensure_future(cache.get_or_compute("k", slow))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_or_compute("k", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "forecast"
+        assert first.cancelled() and len(calls) == 1
+        assert await cache.get_or_compute("k", slow) == "forecast"  # Cached
+
+    async def test_consumer_mutation_does_not_leak(self, tmp_path, gas_service):
+        """Callers get copies of the cached predictions."""
+        service = _make_service(tmp_path)
+
+        first = await service.predict_weekly()
+        first[0]["predicted_price"] = 999.0
+        second = await service.predict_weekly()
+
+        assert second[0]["predicted_price"] == pytest.approx(0.13)
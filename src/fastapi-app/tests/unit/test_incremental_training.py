@@ -0,0 +1,188 @@
+"""
+Unit Tests for Incremental (Warm-Start) Retraining
+===================================================
+
+Tests domain/ml/incremental_training.py, ModelMetricsTracker.log_training_run
+and DirectMLService.train_models(incremental=True).
+
+Coverage:
+- ✅ Plan: full refit without artifact, skip below the new-samples threshold,
+  incremental otherwise, periodic full refit
+- ✅ RandomForest warm start adds trees; refuses class/feature changes and the tree cap
+- ✅ Prophet fitted parameters exported as stan_init
+- ✅ Incremental runs logged with drift vs the last full refit
+- ✅ DirectMLService: full refit → skip → incremental (+trees, saved, state updated)
+"""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from core.config import settings
+from domain.ml import incremental_training
+from domain.ml.incremental_training import (
+    MODE_FULL,
+    MODE_INCREMENTAL,
+    MODE_SKIP,
+    IncrementalTrainingState,
+    prophet_warm_start_params,
+    warm_start_forest
+)
+from domain.ml.model_metrics_tracker import ModelMetricsTracker
+
+
+def _hours(count, start="2025-01-01"):
+    return pd.Series(pd.date_range(start, periods=count, freq="h", tz="UTC"))
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    """Isolated shared state (the services use get_incremental_state())."""
+    instance = IncrementalTrainingState(tmp_path / "incremental_state.json")
+    monkeypatch.setattr(incremental_training, "_incremental_state", instance)
+    return instance
+
+
+@pytest.mark.unit
+class TestIncrementalPlan:
+    """Unit tests for the skip / incremental / full refit decision."""
+
+    def test_plan_modes(self, state, monkeypatch):
+        """Full without artifact, skip below threshold, incremental, then periodic full refit."""
+        monkeypatch.setattr(settings, "ML_INCREMENTAL_MIN_NEW_SAMPLES", 24)
+        monkeypatch.setattr(settings, "ML_FULL_REFIT_EVERY", 2)
+        history = _hours(500)
+
+        assert state.plan("m", history, model_available=False).mode == MODE_FULL
+        state.record("m", MODE_FULL, history.max())
+
+        plan = state.plan("m", _hours(510), model_available=True)
+        assert (plan.mode, plan.new_samples) == (MODE_SKIP, 10)
+        assert state.plan("m", _hours(510), model_available=False).mode == MODE_FULL
+
+        for count in (530, 560):
+            plan = state.plan("m", _hours(count), model_available=True)
+            assert plan.mode == MODE_INCREMENTAL
+            state.record("m", plan.mode, _hours(count).max())
+
+        assert state.plan("m", _hours(600), model_available=True).mode == MODE_FULL
+        # Persisted across restarts
+        assert IncrementalTrainingState(state.path).get("m")["incremental_runs"] == 2
+
+    def test_recent_window(self, state, monkeypatch):
+        """The window covers everything after the watermark and at least the last N hours."""
+        monkeypatch.setattr(settings, "ML_INCREMENTAL_WINDOW_HOURS", 24)
+        state.record("m", MODE_FULL, _hours(100).max())
+        plan = state.plan("m", _hours(110), model_available=True, force_full=True)
+
+        assert state.recent_window(plan, _hours(110)).sum() == 24
+        state.record("m", MODE_FULL, _hours(50).max())
+        plan = state.plan("m", _hours(110), model_available=True)
+        assert state.recent_window(plan, _hours(110)).sum() == 60
+
+
+@pytest.mark.unit
+class TestWarmStart:
+    """Unit tests for RandomForest and Prophet warm starts."""
+
+    def test_warm_start_forest(self):
+        """Trees are added on the new window; class changes and the cap force a full refit."""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.random((200, 3)), columns=["a", "b", "c"])
+        y = np.where(X["a"] > 0.5, "Optimal", "Halt")
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+        first_tree = model.estimators_[0]
+
+        assert warm_start_forest(model, X[:50], y[:50], add_trees=5, max_trees=100)
+        assert model.n_estimators == 15 and len(model.estimators_) == 15
+        assert model.estimators_[0] is first_tree
+        assert model.warm_start is False
+
+        assert not warm_start_forest(model, X[:50], np.full(50, "Halt"), add_trees=5, max_trees=100)
+        assert not warm_start_forest(model, X[:50], y[:50], add_trees=5, max_trees=16)
+        assert not warm_start_forest(model, X[["a", "b"]][:50], y[:50], add_trees=5, max_trees=100)
+        assert not warm_start_forest(RandomForestRegressor(), X, X["a"])
+        assert model.n_estimators == 15
+
+    def test_prophet_warm_start_params(self):
+        """MAP fits export scalars for k/m/sigma_obs and vectors for delta/beta."""
+        model = SimpleNamespace(mcmc_samples=0, params={
+            "k": np.array([[0.1]]), "m": np.array([[0.5]]), "sigma_obs": np.array([[0.02]]),
+            "delta": np.zeros((1, 25)), "beta": np.ones((1, 40))
+        })
+
+        init = prophet_warm_start_params(model)
+
+        assert init["k"] == pytest.approx(0.1) and init["sigma_obs"] == pytest.approx(0.02)
+        assert init["delta"].shape == (25,) and init["beta"].shape == (40,)
+        assert prophet_warm_start_params(SimpleNamespace(params={})) is None
+
+
+@pytest.mark.unit
+class TestTrainingRunTracking:
+    """Unit tests for training time / drift tracking."""
+
+    def test_drift_vs_full_refit(self, tmp_path):
+        """Incremental runs carry the difference against the last full refit."""
+        tracker = ModelMetricsTracker(csv_path=tmp_path / "metrics.csv")
+        tracker.log_training_run("m", {"mae": 0.03, "rmse": 0.05, "r2": 0.5, "duration_seconds": 60.0}, mode=MODE_FULL)
+
+        drift = tracker.log_training_run(
+            "m", {"mae": 0.035, "rmse": 0.05, "r2": 0.45, "duration_seconds": 6.0}, mode=MODE_INCREMENTAL
+        )
+
+        assert drift["mae"] == pytest.approx(0.005)
+        assert drift["duration_seconds"] == pytest.approx(-54.0)
+        history = tracker.get_metrics_history("m")
+        assert history[-1]["notes"].startswith("incremental; drift_vs_full_refit mae=+0.0050")
+        assert tracker.get_last_full_refit("m")["mae"] == "0.03"
+
+
+@pytest.mark.unit
+class TestDirectMLIncremental:
+    """DirectMLService.train_models(incremental=True) end to end (InfluxDB mocked)."""
+
+    @staticmethod
+    def _data(hours):
+        rng = np.random.default_rng(1)
+        return pd.DataFrame({
+            "timestamp": _hours(hours),
+            "price_eur_kwh": 0.1 + 0.1 * rng.random(hours),
+            "temperature": 15 + 10 * rng.random(hours),
+            "humidity": 40 + 30 * rng.random(hours),
+        })
+
+    def test_full_skip_incremental(self, tmp_path, state, monkeypatch):
+        from domain.ml.direct_ml import DirectMLService
+
+        monkeypatch.setattr(settings, "ML_INCREMENTAL_MIN_NEW_SAMPLES", 24)
+        monkeypatch.setattr(settings, "ML_INCREMENTAL_TREES", 10)
+        service = DirectMLService()
+        service.models_dir = Path(tmp_path)
+        service.latest_dir = tmp_path / "latest"
+        service.latest_dir.mkdir()
+        service.registry_path = tmp_path / "model_registry.json"
+        service.metrics_tracker = ModelMetricsTracker(csv_path=tmp_path / "metrics.csv")
+
+        modes = []
+        for hours in (400, 410, 460):
+            service.extract_data_from_influxdb = AsyncMock(return_value=self._data(hours))
+            result = asyncio.run(service.train_models(incremental=True))
+            assert result["success"] is True
+            modes.append(result["training_mode"])
+
+        assert modes == [MODE_FULL, MODE_SKIP, MODE_INCREMENTAL]
+        assert result["energy_model"]["n_estimators"] == 110
+        assert "mae" in result["drift_vs_full_refit"]
+        assert state.get("direct_ml")["watermark"] == self._data(460)["timestamp"].max().isoformat()
+
+        reloaded = DirectMLService()
+        reloaded.latest_dir = service.latest_dir
+        reloaded.load_models()
+        assert reloaded.production_model.n_estimators == 110
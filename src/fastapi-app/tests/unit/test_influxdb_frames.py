@@ -0,0 +1,178 @@
+"""
+Unit Tests for InfluxDB Columnar Extraction
+============================================
+
+Tests the Flux-to-DataFrame extraction layer (infrastructure/influxdb/frames.py).
+
+Coverage:
+- ✅ Pivoted query building (pivot + keep)
+- ✅ sort/limit applied across series (group())
+- ✅ Plain CSV parsing into typed columns
+- ✅ Schema changes mid-stream (repeated headers)
+- ✅ Streamed parsing in bounded reads and row chunks
+- ✅ Flux error tables
+- ✅ query_raw integration and response release
+"""
+
+import io
+
+import pytest
+from unittest.mock import Mock
+
+import numpy as np
+
+import infrastructure.influxdb.frames as frames_module
+from core.exceptions import InfluxDBQueryError
+from infrastructure.influxdb.frames import (
+    FRAME_DIALECT,
+    build_frame_query,
+    query_frame,
+    read_flux_csv
+)
+
+
+PIVOTED_CSV = (
+    b",result,table,_time,station_id,humidity,temperature\r\n"
+    b",_result,0,2025-01-01T00:00:00Z,J09,60,10.5\r\n"
+    b",_result,0,2025-01-01T01:00:00Z,J09,61,\r\n"
+    b"\r\n"
+)
+
+
+@pytest.mark.unit
+class TestBuildFrameQuery:
+    """Unit tests for pivoted Flux query building."""
+
+    def test_query_pivots_and_keeps_columns(self):
+        """Fields are filtered, pivoted server-side and trimmed with keep()."""
+        query = build_frame_query(
+            bucket="siar_historical",
+            measurement="siar_weather",
+            fields=["temperature", "humidity"],
+            start="2000-01-01T00:00:00Z",
+            keep_tags=["station_id"]
+        )
+
+        assert 'r["_field"] == "temperature" or r["_field"] == "humidity"' in query
+        assert 'pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")' in query
+        assert 'keep(columns: ["_time", "station_id", "temperature", "humidity"])' in query
+        # Shaping happens before sort
+        assert query.index("pivot(") < query.index("sort(")
+
+    def test_query_descending_with_limit(self):
+        """Descending sort and limit are appended last."""
+        query = build_frame_query(
+            bucket="energy_data",
+            measurement="energy_prices",
+            fields=["price_eur_kwh"],
+            start="-90d",
+            descending=True,
+            limit=200
+        )
+
+        assert 'sort(columns: ["_time"], desc: true)' in query
+        assert query.rstrip().endswith("limit(n: 200)")
+        # Limit counts rows across series, not per series
+        assert query.index("group()") < query.index("sort(") < query.index("limit(")
+
+    def test_unsorted_unlimited_query_not_grouped(self):
+        """Without sort or limit, series tables are left as they are."""
+        query = build_frame_query(
+            bucket="energy_data",
+            measurement="weather_data",
+            fields=["temperature"],
+            start="-1d",
+            sort=False
+        )
+
+        assert "group()" not in query
+
+
+@pytest.mark.unit
+class TestReadFluxCsv:
+    """Unit tests for CSV parsing into typed columns."""
+
+    def test_parses_typed_columns(self):
+        """Timestamps are UTC datetimes, values float64, tags strings."""
+        df = read_flux_csv(PIVOTED_CSV, ["temperature", "humidity"], ["station_id"])
+
+        assert list(df.columns) == ["timestamp", "station_id", "temperature", "humidity"]
+        assert len(df) == 2
+        assert str(df["timestamp"].dt.tz) == "UTC"
+        assert df["temperature"].dtype == np.float64
+        assert df["temperature"].iloc[0] == 10.5
+        assert np.isnan(df["temperature"].iloc[1])
+        assert df["station_id"].iloc[0] == "J09"
+
+    def test_schema_change_mid_stream(self):
+        """A second header block with fewer columns is aligned by name."""
+        body = PIVOTED_CSV + (
+            b",result,table,_time,temperature\r\n"
+            b",_result,1,2025-01-01T02:00:00Z,11\r\n"
+        )
+
+        df = read_flux_csv(body, ["temperature", "humidity"], ["station_id"])
+
+        assert len(df) == 3
+        assert df["temperature"].iloc[2] == 11.0
+        assert np.isnan(df["humidity"].iloc[2])
+
+    def test_streamed_in_chunks(self, monkeypatch):
+        """Small reads and row chunks give the same frame, without reading the whole body at once."""
+        monkeypatch.setattr(frames_module, "READ_CHUNK_BYTES", 16)
+        monkeypatch.setattr(frames_module, "PARSE_CHUNK_ROWS", 1)
+        body = PIVOTED_CSV + (
+            b",result,table,_time,temperature\r\n"
+            b",_result,1,2025-01-01T02:00:00Z,11\r\n"
+        )
+        stream = io.BytesIO(body)
+        reads = []
+        source = Mock(read=lambda size: reads.append(size) or stream.read(size))
+
+        df = read_flux_csv(source, ["temperature", "humidity"], ["station_id"])
+
+        assert set(reads) == {16}
+        assert list(df["temperature"].fillna(-1)) == [10.5, -1, 11.0]
+        assert df["station_id"].iloc[1] == "J09"
+
+    def test_missing_columns_and_rename(self):
+        """Requested columns absent from the response come back as NaN."""
+        df = read_flux_csv(
+            PIVOTED_CSV,
+            ["temperature", "pressure"],
+            rename={"temperature": "temp"}
+        )
+
+        assert "temp" in df.columns
+        assert df["pressure"].isna().all()
+
+    def test_empty_response(self):
+        """Empty body returns an empty, typed frame."""
+        df = read_flux_csv(b"", ["price_eur_kwh"])
+
+        assert df.empty
+        assert list(df.columns) == ["timestamp", "price_eur_kwh"]
+
+    def test_error_table_raises(self):
+        """Flux error tables surface as InfluxDBQueryError."""
+        with pytest.raises(InfluxDBQueryError):
+            read_flux_csv(b"error,reference\r\nfailed to compile,897\r\n", ["price_eur_kwh"])
+
+
+@pytest.mark.unit
+class TestQueryFrame:
+    """Unit tests for query_frame() against a mocked QueryApi."""
+
+    def test_uses_query_raw_with_plain_dialect(self):
+        """query_frame requests plain CSV and releases the response."""
+        response = Mock()
+        response.read.side_effect = io.BytesIO(PIVOTED_CSV).read
+        query_api = Mock()
+        query_api.query_raw.return_value = response
+
+        df = query_frame(query_api, "from(bucket: \"x\")", ["temperature"])
+
+        query_api.query_raw.assert_called_once()
+        assert query_api.query_raw.call_args.kwargs["dialect"] is FRAME_DIALECT
+        response.release_conn.assert_called_once()
+        assert len(df) == 2
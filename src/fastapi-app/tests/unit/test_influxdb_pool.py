@@ -0,0 +1,156 @@
+"""
+Unit Tests for Shared InfluxDB Client
+======================================
+
+Tests the process-wide pooled client (infrastructure/influxdb/client.py)
+and its use by DataIngestionService.
+
+Coverage:
+- ✅ DataIngestionService reuses one client across entries
+- ✅ No health round-trip on context entry
+- ✅ Lazy, cached health probing
+- ✅ Lease counters and pool saturation events
+- ✅ One wrapper per connection target
+- ✅ One write API per write options value
+- ✅ Pool metrics exposed
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+import infrastructure.influxdb.client as influx_client_module
+from infrastructure.influxdb.client import (
+    InfluxDBClientWrapper,
+    get_influxdb_client,
+    get_influxdb_pool_stats
+)
+from services.data_ingestion import DataIngestionService, InfluxDBConfig
+
+
+@pytest.fixture
+def influx_factory():
+    """Fresh client registry with a mocked InfluxDBClient constructor."""
+    with patch.object(influx_client_module, "_influxdb_client_instance", None), \
+         patch.object(influx_client_module, "_pooled_clients", {}), \
+         patch.object(influx_client_module, "InfluxDBClient") as factory:
+        factory.return_value.health.return_value = MagicMock(status="pass", message="ready", version="2.7")
+        yield factory
+
+
+@pytest.fixture
+def ingestion_config():
+    return InfluxDBConfig(url="http://influxdb:8086", token="token", org="chocolate_factory", bucket="energy_data")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestDataIngestionPooledClient:
+    """DataIngestionService borrows the shared client."""
+
+    async def test_client_reused_across_entries(self, influx_factory, ingestion_config):
+        """Repeated `async with DataIngestionService()` builds one client."""
+        for _ in range(5):
+            async with DataIngestionService(ingestion_config) as service:
+                assert service.client is influx_factory.return_value
+
+        assert influx_factory.call_count == 1
+        influx_factory.return_value.health.assert_not_called()
+        influx_factory.return_value.close.assert_not_called()
+
+    async def test_leases_released_on_exit(self, influx_factory, ingestion_config):
+        """Leases are counted and returned, even when the body raises."""
+        with pytest.raises(RuntimeError):
+            async with DataIngestionService(ingestion_config):
+                raise RuntimeError("query failed")
+
+        async with DataIngestionService(ingestion_config):
+            pass
+
+        wrapper = get_influxdb_client(
+            url=ingestion_config.url,
+            token=ingestion_config.token,
+            org=ingestion_config.org,
+            timeout=ingestion_config.timeout
+        )
+        stats = wrapper.get_pool_stats()
+        assert stats["leases"] == 2
+        assert stats["in_flight"] == 0
+
+
+@pytest.mark.unit
+class TestInfluxDBClientWrapperPool:
+    """Unit tests for health caching, leases and the client registry."""
+
+    def test_health_probe_is_cached(self, influx_factory):
+        """ensure_healthy() probes once per TTL, again after mark_unhealthy()."""
+        wrapper = InfluxDBClientWrapper(url="http://influxdb:8086", token="t", org="o")
+
+        assert wrapper.ensure_healthy(max_age=60)["status"] == "pass"
+        wrapper.ensure_healthy(max_age=60)
+        assert influx_factory.return_value.health.call_count == 1
+
+        wrapper.mark_unhealthy()
+        wrapper.ensure_healthy(max_age=60)
+        assert influx_factory.return_value.health.call_count == 2
+
+    def test_saturation_events(self, influx_factory):
+        """More concurrent leases than pooled connections are reported."""
+        wrapper = InfluxDBClientWrapper(url="http://influxdb:8086", token="t", org="o", pool_maxsize=2)
+
+        for _ in range(3):
+            wrapper.acquire()
+        stats = wrapper.get_pool_stats()
+        for _ in range(3):
+            wrapper.release()
+
+        assert stats["peak_in_flight"] == 3
+        assert stats["saturation_events"] == 1
+        assert wrapper.get_pool_stats()["in_flight"] == 0
+
+    def test_one_wrapper_per_target(self, influx_factory):
+        """Same target shares a wrapper; a different org gets its own."""
+        default = get_influxdb_client()
+        same = get_influxdb_client(url=default.url, token=default.token, org=default.org)
+        other_a = get_influxdb_client(org="other_org")
+        other_b = get_influxdb_client(org="other_org")
+
+        assert same is default
+        assert other_a is other_b
+        assert other_a is not default
+        assert len([key for key in get_influxdb_pool_stats() if key != "executor"]) == 2
+
+    def test_write_api_per_options(self, influx_factory):
+        """Different write options get their own write API; equal options share one."""
+        from influxdb_client.client.write_api import SYNCHRONOUS, WriteOptions, WriteType
+
+        influx_factory.return_value.write_api.side_effect = lambda write_options: MagicMock(options=write_options)
+        wrapper = InfluxDBClientWrapper(url="http://influxdb:8086", token="token", org="org")
+
+        sync = wrapper.write_api()
+        batching = wrapper.write_api(WriteOptions(write_type=WriteType.batching, batch_size=500))
+
+        assert sync.options is SYNCHRONOUS
+        assert batching.options.write_type == WriteType.batching
+        assert wrapper.write_api(SYNCHRONOUS) is sync
+        assert wrapper.write_api(WriteOptions(write_type=WriteType.batching, batch_size=500)) is batching
+        assert influx_factory.return_value.write_api.call_count == 2
+
+        wrapper.close()
+        sync.close.assert_called_once()
+        batching.close.assert_called_once()
+
+    def test_pool_stats_from_urllib3(self):
+        """Reuse figures are read from the real urllib3 pool manager."""
+        wrapper = InfluxDBClientWrapper(url="http://localhost:8086", token="t", org="o", pool_maxsize=4)
+        pool_manager = wrapper.client.api_client.rest_client.pool_manager
+        pool = pool_manager.connection_from_url("http://localhost:8086")
+        pool.num_requests = 10
+        pool.num_connections = 2
+
+        stats = wrapper.get_pool_stats()
+        wrapper.close()
+
+        assert stats["pool_maxsize"] == 4
+        assert stats["http_requests"] == 10
+        assert stats["connections_opened"] == 2
+        assert stats["connection_reuse_ratio"] == 0.8
@@ -0,0 +1,170 @@
+"""
+Unit Tests for Ingestion Sink
+==============================
+
+Tests infrastructure/influxdb/sink.py and line protocol helpers.
+
+Coverage:
+- ✅ Line protocol split respects escapes and quoted fields
+- ✅ Concurrent producers share one batched write
+- ✅ Same (series, timestamp, values) is skipped; changed values upsert
+- ✅ overwrite=True always writes
+- ✅ Points without fields are skipped, not fatal to the batch
+- ✅ Failed writes retried with backoff, then raised to producers
+- ✅ Write timeout scales with the chunk size
+- ✅ Backpressure bounds the queue depth
+- ✅ Line protocol writes update the coverage index
+- ✅ Write listeners see each written chunk; listener errors never fail the write
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from influxdb_client import Point
+
+from infrastructure.influxdb.coverage import CoverageIndex
+from infrastructure.influxdb.line_protocol import measurement_of, split_line
+from infrastructure.influxdb import sink as sink_module
+from infrastructure.influxdb.sink import IngestionSink, add_write_listener
+
+T0 = datetime(2025, 10, 20, tzinfo=timezone.utc)
+
+
+def _price(hour: int, value: float = 0.1) -> Point:
+    return Point("energy_prices").tag("source", "ree_pvpc") \
+        .field("price_eur_kwh", value).time(T0 + timedelta(hours=hour))
+
+
+def _sink(client=None, **kwargs):
+    client = client or MagicMock(bucket="energy_data")
+    defaults = dict(batch_size=100, flush_interval=0.01, max_queue_points=1000, retry_backoff=0.001)
+    return IngestionSink(client, **{**defaults, **kwargs}), client
+
+
+@pytest.mark.unit
+class TestIngestionSink:
+    """Unit tests for IngestionSink."""
+
+    def test_split_line(self):
+        """Escaped spaces/commas and quoted strings stay inside their section."""
+        line = r'my\ measurement,station=Madrid\ Retiro note="a b, c",value=1i 1700000000000000000'
+
+        series, fields, timestamp = split_line(line)
+
+        assert series == r"my\ measurement,station=Madrid\ Retiro"
+        assert fields == 'note="a b, c",value=1i'
+        assert timestamp == 1700000000000000000
+        assert measurement_of(series) == "my measurement"
+        assert split_line("cpu value=1")[2] is None
+
+    def test_concurrent_producers_batched(self):
+        """Two producers within the linger window end up in one write."""
+        sink, client = _sink()
+
+        async def run():
+            return await asyncio.gather(
+                sink.write([_price(0), _price(1)], bucket="energy_data"),
+                sink.write([_price(2)], bucket="energy_data"),
+            )
+
+        assert asyncio.run(run()) == [2, 1]
+        client.write_points.assert_called_once()
+        lines = client.write_points.call_args.args[0]
+        assert len(lines) == 3 and all(isinstance(line, str) for line in lines)
+        assert sink.stats()["batches_written"] == 1
+        assert sink.stats()["queue_depth"] == 0
+
+    def test_idempotent_upserts(self):
+        """Re-sent points are skipped, changed values written, overwrite forces."""
+        sink, client = _sink()
+
+        async def run():
+            first = await sink.write([_price(0), _price(1)])
+            again = await sink.write([_price(0), _price(1, value=0.2)])
+            forced = await sink.write([_price(0)], overwrite=True)
+            return first, again, forced
+
+        assert asyncio.run(run()) == (2, 1, 1)
+        assert client.write_points.call_count == 3
+        assert sink.stats()["duplicates_skipped"] == 1
+        assert sink.has_written("energy_prices", {"source": "ree_pvpc"}, T0, bucket="energy_data")
+        assert not sink.has_written("energy_prices", {"source": "other"}, T0, bucket="energy_data")
+
+    def test_fieldless_point_skipped(self):
+        """A Point whose optional fields were all None does not sink the batch."""
+        sink, client = _sink()
+        sparse = Point("weather_data").tag("source", "aemet").time(T0)
+
+        assert asyncio.run(sink.write([_price(0), sparse, _price(1)])) == 2
+        assert asyncio.run(sink.write([sparse])) == 0
+        assert len(client.write_points.call_args.args[0]) == 2
+        assert sink.stats()["empty_points_skipped"] == 2
+
+    def test_retry_then_fail(self):
+        """Transient failure is retried; persistent failure reaches the producer."""
+        sink, client = _sink(max_retries=2)
+        client.write_points.side_effect = [RuntimeError("503"), 1]
+
+        assert asyncio.run(sink.write([_price(0)])) == 1
+        assert sink.stats()["retries"] == 1
+
+        client.write_points.side_effect = RuntimeError("down")
+        with pytest.raises(RuntimeError, match="down"):
+            asyncio.run(sink.write([_price(5)]))
+        assert sink.stats()["failed_batches"] == 1
+        assert not sink.has_written("energy_prices", {"source": "ree_pvpc"}, T0 + timedelta(hours=5))
+
+    def test_write_timeout_scales_with_chunk(self, monkeypatch):
+        """Chunk writes get their own timeout, not the query timeout."""
+        monkeypatch.setattr(sink_module.settings, "INFLUXDB_WRITE_TIMEOUT", 10.0)
+        monkeypatch.setattr(sink_module.settings, "INFLUXDB_WRITE_TIMEOUT_PER_1K_POINTS", 4.0)
+        timeouts = []
+
+        async def fake_run_blocking(func, *args, timeout=None, label=None, **kwargs):
+            timeouts.append(timeout)
+            return func(*args, **kwargs)
+
+        monkeypatch.setattr(sink_module, "run_blocking", fake_run_blocking)
+        sink, client = _sink(batch_size=500)
+
+        assert asyncio.run(sink.write([_price(h) for h in range(500)])) == 500
+        assert timeouts == [pytest.approx(12.0)]
+
+    def test_backpressure(self):
+        """Queue depth never exceeds max_queue_points (single submissions fit)."""
+        sink, client = _sink(batch_size=2, max_queue_points=4)
+
+        async def run():
+            await asyncio.gather(*(sink.write([_price(h), _price(h + 100)]) for h in range(10)))
+
+        asyncio.run(run())
+
+        stats = sink.stats()
+        assert stats["points_written"] == 20
+        assert stats["peak_queue_depth"] <= 4
+        assert stats["backpressure_waits"] > 0
+
+    def test_line_protocol_marks_coverage(self, tmp_path):
+        """Strings written through write_points still feed the coverage index."""
+        index = CoverageIndex(path=tmp_path / "coverage.npz")
+        lines = [
+            f"energy_prices,source=ree_pvpc price_eur_kwh=0.1 {int((T0 + timedelta(hours=h)).timestamp() * 1e9)}"
+            for h in (0, 1)
+        ]
+
+        assert index.record_points(lines, bucket="energy_data") == 2
+        assert index.present_hours("energy_prices", T0, T0 + timedelta(hours=3)) == [T0, T0 + timedelta(hours=1)]
+
+    def test_write_listeners(self, monkeypatch):
+        """Listeners get (bucket, lines) once per chunk; a failing listener is only logged."""
+        monkeypatch.setattr(sink_module, "_write_listeners", [])
+        seen = []
+        add_write_listener(lambda bucket, lines: seen.append((bucket, len(lines))))
+        add_write_listener(MagicMock(side_effect=RuntimeError("boom")))
+        sink, client = _sink()
+
+        assert asyncio.run(sink.write([_price(0), _price(1)], bucket="siar_weather")) == 2
+        assert seen == [("siar_weather", 2)]
+        client.write_points.assert_called_once()
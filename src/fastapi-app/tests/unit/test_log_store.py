@@ -0,0 +1,136 @@
+"""
+Unit Tests for the Segmented Log Store
+======================================
+
+Tests core/log_store.py (SegmentedLogHandler + search_log_segments) and
+GET /logs/search on top of it.
+
+Coverage:
+- ✅ Hourly segments per process with a sparse block index
+- ✅ Newest-first results, level and module filters
+- ✅ Blocks outside the time window / level / module are not read
+- ✅ Search stops once newer blocks fill the limit
+- ✅ Unindexed tail of the active segment is searched
+- ✅ Retention removes old segments
+- ✅ /logs/search reads the segments (filters, scan stats)
+"""
+
+import json
+import logging
+import os
+import time
+
+import pytest
+
+from core.log_store import SegmentedLogHandler, search_log_segments
+from core.logging_config import StructuredFormatter
+
+HOUR = 3600
+NOW = (int(time.time()) // HOUR) * HOUR + 1800  # Mitad de la hora actual
+
+
+def _record(created, level=logging.INFO, name="services.ree_service", msg="ok"):
+    record = logging.LogRecord(name, level, "test.py", 1, msg, (), None)
+    record.created = created
+    return record
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = SegmentedLogHandler(tmp_path, block_records=10, retention_hours=0)
+    handler.setFormatter(StructuredFormatter())
+    yield handler
+    handler.close()
+
+
+@pytest.mark.unit
+class TestSegmentedLogHandler:
+    """Writing segments and index."""
+
+    def test_segments_and_index(self, handler, tmp_path):
+        for i in range(25):
+            handler.handle(_record(NOW - 2 * HOUR + i))
+        handler.handle(_record(NOW))
+
+        segments = sorted(p.name for p in tmp_path.glob("*.jsonl"))
+        assert len(segments) == 2 and all(f"-p{os.getpid()}." in name for name in segments)
+
+        old_index = [json.loads(line) for line in sorted(tmp_path.glob("*.idx"))[0].read_text().splitlines()]
+        assert [block["count"] for block in old_index] == [10, 10, 5]  # Último bloque cerrado al cambiar de hora
+        assert old_index[1]["offset"] == old_index[0]["length"]
+        assert old_index[0]["levels"] == ["INFO"] and old_index[0]["loggers"] == ["services.ree_service"]
+
+    def test_retention(self, tmp_path):
+        handler = SegmentedLogHandler(tmp_path, retention_hours=2)
+        handler.setFormatter(StructuredFormatter())
+        handler.handle(_record(NOW - 5 * HOUR))
+        handler.handle(_record(NOW))
+        handler.close()
+
+        assert len(list(tmp_path.glob("*.jsonl"))) == 1
+        assert len(list(tmp_path.glob("*.idx"))) == 1
+
+
+@pytest.mark.unit
+class TestSearchLogSegments:
+    """Index-driven search."""
+
+    def test_newest_first_with_filters(self, handler, tmp_path):
+        for i in range(30):
+            level = logging.ERROR if i % 10 == 0 else logging.INFO
+            name = "services.weather" if i == 20 else "services.ree_service"
+            handler.handle(_record(NOW - 30 + i, level=level, name=name, msg=f"m{i}"))
+
+        errors = search_log_segments(tmp_path, level="error", limit=10)
+        weather = search_log_segments(tmp_path, module="weather", limit=10)
+
+        assert [e["message"] for e in errors["logs"]] == ["m20", "m10", "m0"]
+        assert errors["scan"]["lines_parsed"] == 3  # Nivel comprobado sobre los bytes
+        assert [e["message"] for e in weather["logs"]] == ["m20"]
+        assert weather["scan"]["blocks_read"] == 1
+
+    def test_time_window_skips_old_segments_and_blocks(self, handler, tmp_path):
+        for i in range(50):
+            handler.handle(_record(NOW - 10 * HOUR + i))
+        for i in range(20):
+            handler.handle(_record(NOW - 600 + i * 30, msg=f"recent{i}"))
+
+        result = search_log_segments(tmp_path, since=NOW - 300, limit=100)
+
+        assert [e["message"] for e in result["logs"]] == [f"recent{i}" for i in range(19, 9, -1)]
+        assert result["scan"]["segments"] == 1
+        assert result["scan"]["blocks_read"] == 1  # Bloque 0 (antes de since) ni se lee
+
+    def test_limit_stops_early_and_reads_unindexed_tail(self, handler, tmp_path):
+        for i in range(95):
+            handler.handle(_record(NOW - 100 + i, msg=f"m{i}"))
+
+        result = search_log_segments(tmp_path, limit=3)
+
+        assert [e["message"] for e in result["logs"]] == ["m94", "m93", "m92"]
+        assert result["scan"]["blocks"] == 10  # 9 indexados + final sin indexar
+        assert result["scan"]["blocks_read"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestLogSearchSegments:
+    """GET /logs/search over the segments."""
+
+    async def test_endpoint(self, tmp_path, monkeypatch):
+        from api.routers import health
+        from core.config import settings
+
+        monkeypatch.setattr(settings, "LOG_DIR", tmp_path)
+        handler = SegmentedLogHandler(tmp_path / "segments", retention_hours=0)
+        handler.setFormatter(StructuredFormatter())
+        handler.handle(_record(time.time() - 2 * HOUR, level=logging.ERROR, msg="old"))
+        handler.handle(_record(time.time(), level=logging.ERROR, msg="new"))
+        handler.close()
+
+        result = await health.search_logs(level="ERROR", hours=1, limit=10, module=None)
+
+        assert result["status"] == "success"
+        assert [entry["message"] for entry in result["logs"]] == ["new"]
+        assert result["filters"]["level"] == "ERROR"
+        assert result["scan"]["segments"] == 1
@@ -0,0 +1,139 @@
+"""
+Unit Tests for Compact Model Artifacts and Model Registry
+=========================================================
+
+Tests domain/ml/model_artifacts.py (CompactForest, ModelRegistry) and how
+DirectMLService publishes and loads them.
+
+Coverage:
+- ✅ CompactForest predictions identical to the sklearn forest (regressor + classifier)
+- ✅ Compact artifacts load memory-mapped
+- ✅ Registry: one load per artifact content, shared across callers
+- ✅ Registry: new latest/ version replaces (and releases) the previous one
+- ✅ DirectMLService serves compact copies, trains on full sklearn estimators
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from domain.ml.model_artifacts import (
+    CompactForest,
+    ModelRegistry,
+    compact_artifact_path,
+    load_artifact,
+    publish_latest,
+    write_compact_artifact,
+    write_pickle_atomic
+)
+
+
+def _data(n: int = 600):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((n, 4)) * 100, columns=["price", "hour", "temperature", "humidity"])
+    score = X["price"] + 0.5 * X["temperature"]
+    labels = np.where(score > 90, "Optimal", np.where(score > 50, "Moderate", "Reduced"))
+    return X, score, labels
+
+
+@pytest.mark.unit
+class TestCompactForest:
+    """Flattened forest inference."""
+
+    def test_regressor_matches_sklearn(self, tmp_path):
+        X, y, _ = _data()
+        model = RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+
+        path = write_compact_artifact(model, tmp_path / "energy_optimization_1.pkl")
+        forest = load_artifact(path)
+
+        assert path == compact_artifact_path(tmp_path / "energy_optimization_1.pkl")
+        assert path.name == "energy_optimization_1.forest.joblib"
+        assert isinstance(forest.threshold, np.memmap)
+        assert forest.n_estimators == 20
+        np.testing.assert_allclose(forest.predict(X.to_numpy()), model.predict(X), rtol=1e-12)
+
+    def test_classifier_matches_sklearn(self):
+        X, _, labels = _data()
+        model = RandomForestClassifier(n_estimators=15, class_weight="balanced", random_state=0).fit(X, labels)
+
+        forest = CompactForest.from_estimator(model)
+
+        np.testing.assert_allclose(forest.predict_proba(X.to_numpy()), model.predict_proba(X), atol=1e-12)
+        assert list(forest.classes_) == list(model.classes_)
+        assert (forest.predict(X.to_numpy()) == model.predict(X)).all()
+
+    def test_rejects_unfitted_and_bad_shapes(self, tmp_path):
+        assert write_compact_artifact(RandomForestRegressor(), tmp_path / "x.pkl") is None
+        X, y, _ = _data(100)
+        forest = CompactForest.from_estimator(RandomForestRegressor(n_estimators=2).fit(X, y))
+        with pytest.raises(ValueError):
+            forest.predict(np.zeros((1, 3)))
+        with pytest.raises(AttributeError):
+            forest.predict_proba(X.to_numpy())
+
+
+@pytest.mark.unit
+class TestModelRegistry:
+    """Process-wide cache keyed by artifact hash."""
+
+    def test_shared_by_content_and_replaced_on_publish(self, tmp_path):
+        registry = ModelRegistry()
+        latest = tmp_path / "latest"
+        latest.mkdir()
+        write_pickle_atomic({"version": 1}, tmp_path / "m_1.pkl")
+        write_pickle_atomic({"version": 1}, tmp_path / "copy_1.pkl")
+        write_pickle_atomic({"version": 2}, tmp_path / "m_2.pkl")
+        publish_latest(latest / "m.pkl", "../m_1.pkl")
+
+        first = registry.get(latest / "m.pkl")
+        assert registry.get(latest / "m.pkl") is first
+        assert registry.get(tmp_path / "copy_1.pkl") is first  # Same content, same object
+        assert registry.loads == 1 and registry.hits == 2
+
+        publish_latest(latest / "m.pkl", "../m_2.pkl")
+        assert registry.get(latest / "m.pkl") == {"version": 2}
+        assert registry.get_status()["models"] == 2  # copy_1 still holds version 1
+
+        write_pickle_atomic({"version": 3}, tmp_path / "copy_1.pkl")
+        registry.get(tmp_path / "copy_1.pkl")
+        assert registry.get_status()["models"] == 2
+        assert registry.loads == 3
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            ModelRegistry().get(tmp_path / "missing.pkl")
+
+
+@pytest.mark.unit
+class TestDirectMLArtifacts:
+    """DirectMLService publishing and loading."""
+
+    def test_serving_and_training_loads(self, tmp_path):
+        from domain.ml.direct_ml import DirectMLService
+
+        X, y, labels = _data()
+        service = DirectMLService()
+        service.models_dir = tmp_path
+        service.latest_dir = tmp_path / "latest"
+        service.latest_dir.mkdir()
+        service.registry_path = tmp_path / "model_registry.json"
+        energy = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+        production = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, labels)
+        service._save_model_with_version(energy, "energy_optimization", "20260101_000000", {})
+        service._save_model_with_version(production, "production_classifier", "20260101_000000", {})
+
+        serving, other, training = DirectMLService(), DirectMLService(), DirectMLService()
+        for instance in (serving, other, training):
+            instance.latest_dir = service.latest_dir
+        serving.load_models()
+        other.load_models()
+        training.load_models(for_training=True)
+
+        assert isinstance(serving.energy_model, CompactForest)
+        assert serving.energy_model is other.energy_model
+        assert isinstance(training.energy_model, RandomForestRegressor)
+        assert training.energy_model is not serving.energy_model
+        np.testing.assert_allclose(serving.energy_model.predict(X.to_numpy()), energy.predict(X))
+        assert serving.get_models_status()["energy_model"]["format"] == "CompactForest"
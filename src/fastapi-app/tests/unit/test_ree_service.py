@@ -10,6 +10,7 @@ Coverage:
 - ✅ Handle REE API errors
 - ✅ Transform data to InfluxDB format
 - ✅ Tariff period classification
+- ✅ Price reads cached across instances, invalidated after ingestion
 """
 
 import pytest
@@ -266,6 +267,43 @@ class TestREEService:
         assert latest_empty is None
 
 
+    async def test_prices_cached_until_ingestion(
+        self,
+        mock_influxdb_client,
+        sample_ree_api_response
+    ):
+        """
+        Test that price reads are cached and new ingestions invalidate them.
+
+        Verifies:
+        - A second service instance reuses the cached query
+        - ingest_prices drops the cached reads (tag "ree")
+        """
+        mock_influxdb_client.query = MagicMock(return_value=[
+            {'time': datetime(2025, 10, 19, 0, 0, tzinfo=timezone.utc), 'value': 0.15050, 'source': 'ree_pvpc'}
+        ])
+
+        first = await REEService(mock_influxdb_client).get_price_stats(date(2025, 10, 19), date(2025, 10, 20))
+        second = await REEService(mock_influxdb_client).get_price_stats(date(2025, 10, 19), date(2025, 10, 20))
+
+        assert first == second and first["count"] == 1
+        assert mock_influxdb_client.query.call_count == 1
+
+        sink = MagicMock()
+        sink.write = AsyncMock(return_value=3)
+        with patch('services.ree_service.REEAPIClient') as MockREEClient, \
+                patch('services.ree_service.get_ingestion_sink', return_value=sink):
+            mock_ree_instance = MockREEClient.return_value
+            mock_ree_instance.__aenter__ = AsyncMock(return_value=mock_ree_instance)
+            mock_ree_instance.__aexit__ = AsyncMock()
+            mock_ree_instance.get_pvpc_prices = AsyncMock(return_value=sample_ree_api_response)
+
+            await REEService(mock_influxdb_client).ingest_prices(date(2025, 10, 20), force_refresh=True)
+
+        await REEService(mock_influxdb_client).get_price_stats(date(2025, 10, 19), date(2025, 10, 20))
+        assert mock_influxdb_client.query.call_count == 2
+
+
 # =============================================================================
 # INTEGRATION NOTES
 # =============================================================================
@@ -286,3 +324,4 @@ Next steps:
 - Verify: Coverage increases as expected
 - Continue: test_weather_service.py (next file)
 """
+
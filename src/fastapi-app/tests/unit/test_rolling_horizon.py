@@ -0,0 +1,238 @@
+"""
+Unit Tests for Rolling-Horizon Planner
+=======================================
+
+Tests domain/optimization/rolling_horizon.py and
+HourlyOptimizerService.optimize_weekly_production().
+
+Coverage:
+- ✅ Batches run across midnight; next day waits for the carried-over batch
+- ✅ No overlapping hours over the whole 168h horizon
+- ✅ Price update re-plans only the affected days
+- ✅ Rolling the horizon forward one day reuses cached days and carry-in
+- ✅ A shorter horizon does not evict the rest of the cached week
+- ✅ Triggers during a background re-plan cause exactly one more pass
+- ✅ Background re-plan refreshes every cached (mode, target) variant
+- ✅ OpenWeatherMap forecast reused across weekly plans (TTL cache)
+- ✅ Weekly service output (absolute times, costs, replan summary)
+"""
+
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from core.cache import CacheManager
+from domain.optimization.rolling_horizon import RollingHorizonPlanner
+from services.hourly_optimizer_service import BATCH_PROFILES, HourlyOptimizerService
+
+START = datetime(2025, 10, 20, tzinfo=timezone.utc)
+DEMANDS = [(BATCH_PROFILES["premium"], 1), (BATCH_PROFILES["standard"], 1)]
+
+
+@pytest.fixture
+def week_prices():
+    """Cheap evenings and nights: late starts that finish after midnight pay off."""
+    rng = np.random.default_rng(5)
+    hours = np.arange(168) % 24
+    base = np.where((hours >= 18) | (hours < 6), 0.05, 0.25)
+    return base + rng.uniform(0, 0.01, 168)
+
+
+def _plan(planner, prices, mode="exact", start=START):
+    scores = 1 - prices / 0.30  # fixed normalization, as HourlyOptimizerService._score_hour
+    return planner.plan(start, prices, scores, [True] * len(prices), DEMANDS, mode=mode)
+
+
+def _busy_hours(result):
+    lengths = {p.quality_type: p.required_hours for p, _ in DEMANDS}
+    hours = []
+    for index, day in enumerate(result.days):
+        for quality, start in day.placements:
+            hours.extend(range(index * 24 + start, index * 24 + start + lengths[quality]))
+    return hours
+
+
+@pytest.mark.unit
+class TestRollingHorizonPlanner:
+    """Unit tests for day-by-day planning with carry-over."""
+
+    @pytest.mark.parametrize("mode", ["greedy", "exact"])
+    def test_carry_over_across_midnight(self, week_prices, mode):
+        """Spilled hours block the start of the next day; no hour is used twice."""
+        result = _plan(RollingHorizonPlanner(), week_prices, mode=mode)
+
+        assert len(result.days) == 7
+        assert any(day.spill_hours > 0 for day in result.days)
+        for previous, day in zip(result.days, result.days[1:]):
+            assert day.carry_in_hours == previous.spill_hours
+            assert all(start >= day.carry_in_hours for _, start in day.placements)
+            assert all(0 <= start < 24 for _, start in day.placements)
+
+        busy = _busy_hours(result)
+        assert len(busy) == len(set(busy))
+
+    def test_price_update_replans_affected_days_only(self, week_prices):
+        """A new price on day 5 keeps days 0-4 cached."""
+        planner = RollingHorizonPlanner()
+        first = _plan(planner, week_prices)
+        assert len(first.replanned) == 7
+
+        updated = week_prices.copy()
+        updated[5 * 24 + 12] += 0.10
+        second = _plan(planner, updated)
+
+        assert second.replanned[0] == START.date() + timedelta(days=5)
+        assert second.reused[:5] == [START.date() + timedelta(days=d) for d in range(5)]
+
+        unchanged = _plan(planner, updated)
+        assert unchanged.replanned == []
+
+    def test_rolling_forward_reuses_days_and_carry_in(self, week_prices):
+        """Next day's horizon reuses overlapping days; day 0's spill is carried in."""
+        planner = RollingHorizonPlanner()
+        extended = np.concatenate([week_prices, week_prices[:24]])
+        first = _plan(planner, extended[:168])
+
+        rolled = _plan(planner, extended[24:], start=START + timedelta(days=1))
+
+        assert rolled.days[0].carry_in_hours == first.days[0].spill_hours
+        assert rolled.reused == [START.date() + timedelta(days=d) for d in range(1, 6)]
+
+    def test_short_horizon_keeps_later_days(self, week_prices):
+        """A days=1 call leaves the other six cached days in place."""
+        planner = RollingHorizonPlanner()
+        _plan(planner, week_prices)
+
+        planner.plan(START, week_prices[:24], 1 - week_prices[:24] / 0.30, [True] * 24, DEMANDS, mode="exact", days=1)
+        again = _plan(planner, week_prices)
+
+        # Day 0 was re-solved without look-ahead by the short call; days 1-6 survived it
+        assert again.replanned == [START.date()]
+        assert again.reused == [START.date() + timedelta(days=d) for d in range(1, 7)]
+
+    def test_rejects_misaligned_inputs(self, week_prices):
+        """Length mismatch and non-midnight start raise ValueError."""
+        planner = RollingHorizonPlanner()
+        with pytest.raises(ValueError):
+            planner.plan(START, week_prices, week_prices[:-1], [True] * 168, DEMANDS)
+        with pytest.raises(ValueError):
+            planner.plan(START + timedelta(hours=3), week_prices, week_prices, [True] * 168, DEMANDS)
+
+
+@pytest.mark.unit
+class TestWeeklyOptimization:
+    """HourlyOptimizerService.optimize_weekly_production()"""
+
+    @pytest.fixture
+    def optimizer(self, week_prices, monkeypatch):
+        service = HourlyOptimizerService.__new__(HourlyOptimizerService)
+        service.batch_size_kg = 10
+        service.daily_target_kg = 20
+        service.standard_ratio = 0.5
+        service.premium_ratio = 0.5
+        service._rolling_planners = OrderedDict()
+
+        async def prices(start, hours):
+            return [float(p) for p in week_prices[:hours]], {"ree_published_hours": 0, "prophet_hours": hours, "missing_hours": 0}
+
+        async def weather(start, hours):
+            return [{"temperature": 22.0, "humidity": 45.0} for _ in range(hours)]
+
+        monkeypatch.setattr(service, "_get_price_horizon", prices)
+        monkeypatch.setattr(service, "_get_weather_horizon", weather)
+        return service
+
+    def test_weekly_plan(self, optimizer):
+        """Absolute batch times, per-day costs matching the planner, incremental re-plan."""
+        result = asyncio.run(optimizer.optimize_weekly_production(start_date=START, mode="exact"))
+
+        assert [d["date"] for d in result["plan"]] == [(START.date() + timedelta(days=d)).isoformat() for d in range(7)]
+        # Days 1-6 place both batches; the last day may lack look-ahead hours
+        assert all(d["unscheduled"] == {} for d in result["plan"][:6])
+        assert result["totals"]["batches"] + sum(result["plan"][6]["unscheduled"].values()) == 14
+        assert len(result["replan"]["replanned_days"]) == 7
+
+        # Linear batch pricing matches the planner's cost tables
+        for day in result["plan"]:
+            day_plan = optimizer._rolling_planners[("exact", 20.0)]._day_plans[datetime.fromisoformat(day["date"]).date()]
+            assert day["total_cost_eur"] == pytest.approx(day_plan.total_cost, abs=0.05)
+
+        spilled = [b for d in result["plan"] for b in d["batches"] if b["spills_into_next_day"]]
+        assert spilled
+        for batch in spilled:
+            start = datetime.fromisoformat(batch["start_time"])
+            end = datetime.fromisoformat(batch["end_time"])
+            assert end.date() == start.date() + timedelta(days=1)
+            assert batch["batch_id"].endswith(start.strftime("-%Y%m%d"))
+
+    def test_second_call_reuses_days(self, optimizer):
+        """Unchanged inputs: nothing re-solved, same plan."""
+        first = asyncio.run(optimizer.optimize_weekly_production(start_date=START))
+        second = asyncio.run(optimizer.optimize_weekly_production(start_date=START))
+
+        assert second["replan"]["replanned_days"] == []
+        assert len(second["replan"]["reused_days"]) == 7
+        assert second["plan"] == [{**d, "replanned": False} for d in first["plan"]]
+
+    def test_refresh_during_replan_runs_again(self, optimizer, monkeypatch):
+        """Triggers while a re-plan runs share its task and add one more pass."""
+        runs = []
+
+        async def replan(**kwargs):
+            runs.append(len(runs))
+            await asyncio.sleep(0.01)
+            return {"pass": len(runs)}
+
+        monkeypatch.setattr(optimizer, "optimize_weekly_production", replan)
+        optimizer._weekly_refresh_task = None
+        optimizer._weekly_refresh_pending = False
+
+        async def run():
+            task = optimizer.refresh_weekly_plan()
+            await asyncio.sleep(0)
+            assert optimizer.refresh_weekly_plan() is task
+            assert optimizer.refresh_weekly_plan() is task
+            return await task
+
+        assert asyncio.run(run()) == [{"pass": 2}]
+        assert len(runs) == 2
+
+    def test_refresh_covers_all_variants(self, optimizer):
+        """Every cached (mode, target) plan is re-planned, not just the default one."""
+        async def run():
+            await optimizer.optimize_weekly_production(start_date=START, mode="greedy")
+            await optimizer.optimize_weekly_production(start_date=START, mode="exact", target_kg=40)
+            optimizer._weekly_refresh_task = None
+            optimizer._weekly_refresh_pending = False
+            return await optimizer.refresh_weekly_plan()
+
+        results = asyncio.run(run())
+
+        assert list(optimizer._rolling_planners) == [("greedy", 20.0), ("exact", 40.0)]
+        assert [(r["metadata"]["mode"], r["target_kg_per_day"]) for r in results] == [("greedy", 20), ("exact", 40)]
+
+    def test_owm_forecast_cached(self, optimizer):
+        """One OpenWeatherMap call serves consecutive weekly plans; empty forecasts are not cached."""
+        records = [{"timestamp": START + timedelta(hours=3 * i), "temperature": 20.0, "humidity": 50.0} for i in range(40)]
+        client = AsyncMock()
+        client.__aenter__.return_value = client
+        client.get_forecast.side_effect = [[], records]
+
+        with patch("infrastructure.external_apis.OpenWeatherMapAPIClient", return_value=client), \
+             patch("services.hourly_optimizer_service.get_cache_manager", return_value=CacheManager(enabled=True)):
+            with pytest.raises(ValueError):
+                asyncio.run(optimizer._get_owm_forecast_records())
+            first = asyncio.run(optimizer._get_owm_forecast_records())
+            second = asyncio.run(optimizer._get_owm_forecast_records())
+
+        assert first == second == records
+        assert client.get_forecast.await_count == 2
+
+    def test_invalid_days(self, optimizer):
+        """More than the 168h forecast is rejected."""
+        with pytest.raises(ValueError):
+            asyncio.run(optimizer.optimize_weekly_production(start_date=START, days=8))
@@ -0,0 +1,133 @@
+"""
+Unit Tests for SIAR Streaming Loader
+=====================================
+
+Tests services/siar_loader.py and SiarETL on top of it.
+
+Coverage:
+- ✅ Encoding detected from the first bytes (UTF-16LE without BOM, UTF-8, cp1252)
+- ✅ Chunks produce the same line protocol as the Point-per-row path
+- ✅ Rows without date or values are dropped
+- ✅ Chunks are written to the siar_historical bucket through the sink
+- ✅ Parallel (process pool) and serial loads agree
+- ✅ Serial loads parse chunks off the event loop thread
+- ✅ SiarETL.process_real_siar_files delegates to the loader
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from influxdb_client import Point
+
+from services.siar_etl import SiarETL
+from services.siar_loader import SiarLoader, detect_encoding, parse_siar_file
+
+HEADER = (
+    "IdProvincia;IdEstacion;Fecha;Año;Dia;Temp Media (ºC);Temp Max (ºC);Hora Temp Max;"
+    "Temp Mínima (ºC);Hora Temp Min;Humedad Media (%);Humedad Max (%);Hora Hum Max;"
+    "Humedad Min (%);Hora Hum Mín;Velviento (m/s);DirViento (º);VelVientoMax (m/s);"
+    "Hora VelMax;Dir viento Vel Max (º);Radiación (MJ/m2);Precipitación (mm);PePMon;EtPMon"
+)
+ROWS = [
+    "23;9;01/01/2015;2015;1;6,13;14,23;13:38;-0,13;07:16;53,47;75;07:18;28,61;13:40;1,06;65,2;3;12:00;70;10,5;0;0,7;1,1",
+    "23;9;02/01/2015;2015;2;;;;;;;;;;;;;;;;;;;",
+    "23;9;03/01/2015;2015;3;7,5;15;14:00;1;06:00;60;80;06:00;40;14:00;1,5;90;4,2;12:00;80;11;2,4;0,8;1,2",
+]
+
+
+def _write_siar(path, rows=ROWS, encoding="utf-16-le"):
+    path.write_bytes(("\r\n".join([HEADER, *rows]) + "\r\n").encode(encoding))
+    return path
+
+
+@pytest.mark.unit
+class TestSiarLoader:
+    """Unit tests for encoding detection and chunk parsing."""
+
+    def test_detect_encoding(self, tmp_path):
+        """SIAR files are UTF-16LE without BOM; plain files fall back to UTF-8 / cp1252."""
+        assert detect_encoding(_write_siar(tmp_path / "a.csv")) == "utf-16-le"
+        assert detect_encoding(_write_siar(tmp_path / "b.csv", encoding="utf-8")) == "utf-8"
+        assert detect_encoding(_write_siar(tmp_path / "c.csv", encoding="cp1252")) == "cp1252"
+
+    def test_lines_match_point(self, tmp_path):
+        """Same series, sorted fields, trimmed floats and timestamp as Point; empty row dropped."""
+        chunks, rows = parse_siar_file(str(_write_siar(tmp_path / "J09.csv")), chunksize=2)
+        lines = [line for chunk in chunks for line in chunk]
+
+        expected = Point("siar_weather") \
+            .tag("station_id", "SIAR_J09_Linares") \
+            .tag("station_name", "SIAR_Linares_J09") \
+            .tag("province", "Jaén") \
+            .tag("data_source", "siar_historical") \
+            .field("temperature", 6.13).field("temperature_max", 14.23).field("temperature_min", -0.13) \
+            .field("humidity", 53.47).field("humidity_max", 75.0).field("humidity_min", 28.61) \
+            .field("wind_speed", 1.06).field("wind_direction", 65.2).field("wind_gust", 3.0) \
+            .field("precipitation", 0.0) \
+            .time(datetime(2015, 1, 1, tzinfo=timezone.utc))
+
+        assert rows == 3
+        assert len(chunks) == 2
+        assert len(lines) == 2
+        assert lines[0] == expected.to_line_protocol()
+
+    def test_load_writes_through_sink(self, tmp_path):
+        """Serial and parallel loads send the same lines to the SIAR bucket."""
+        for year in (2015, 2016, 2017):
+            _write_siar(tmp_path / f"J09_{year}.csv", [row.replace("2015", str(year)) for row in ROWS])
+
+        results = {}
+        for workers in (1, 2):
+            sink = AsyncMock()
+            sink.write.side_effect = lambda lines, bucket: len(lines)
+            loader = SiarLoader(workers=workers, chunksize=100, bucket="siar_historical", sink=sink)
+            stats = asyncio.run(loader.load_directory(tmp_path))
+
+            assert {call.kwargs["bucket"] for call in sink.write.call_args_list} == {"siar_historical"}
+            results[workers] = sorted(line for call in sink.write.call_args_list for line in call.args[0])
+            assert stats.total_records == 9
+            assert stats.successful_writes == 6
+            assert loader.last_report.files == 3
+            assert loader.last_report.mb_per_second > 0
+
+        assert results[1] == results[2]
+
+    def test_serial_load_parses_off_event_loop(self, tmp_path, monkeypatch):
+        """With one worker, chunks are parsed in a thread, not on the loop."""
+        import services.siar_loader as siar_loader
+
+        _write_siar(tmp_path / "J09_2015.csv")
+        parse_threads = []
+        frame_to_lines = siar_loader.frame_to_lines
+
+        def tracked(chunk):
+            parse_threads.append(threading.get_ident())
+            return frame_to_lines(chunk)
+
+        monkeypatch.setattr(siar_loader, "frame_to_lines", tracked)
+        sink = AsyncMock()
+        loader = SiarLoader(workers=1, chunksize=1, bucket="siar_historical", sink=sink)
+
+        async def scenario():
+            stats = await loader.load_directory(tmp_path)
+            return stats, threading.get_ident()
+
+        stats, loop_thread = asyncio.run(scenario())
+
+        assert stats.successful_writes == 2
+        assert len(parse_threads) == 3
+        assert loop_thread not in parse_threads
+
+    def test_siar_etl_delegates(self, tmp_path, monkeypatch):
+        """process_real_siar_files uses the given directory and the streaming loader."""
+        _write_siar(tmp_path / "J17_2024.csv", [row.replace(";9;", ";17;") for row in ROWS])
+        sink = AsyncMock()
+        monkeypatch.setattr("services.siar_loader.SiarLoader.sink", sink)
+
+        stats = asyncio.run(SiarETL().process_real_siar_files(str(tmp_path)))
+
+        assert stats.successful_writes == 2
+        assert "station_id=SIAR_J17_Linares" in sink.write.call_args.args[0][0]
@@ -0,0 +1,125 @@
+"""
+Unit Tests for Single-Flight Request Coalescing
+===============================================
+
+Tests core/cache/single_flight.py and its use in the services.
+
+Coverage:
+- ✅ Concurrent identical calls share one execution (counters)
+- ✅ Different arguments and later calls execute again (no caching)
+- ✅ Exceptions reach every caller of the flight
+- ✅ Cancelling the first caller does not cancel the others
+- ✅ Shared results are copied per caller
+- ✅ ignore_self: separate service instances share the flight
+- ✅ WeatherAggregationService.get_current_weather coalesced
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.cache import SingleFlight, get_single_flight_stats, single_flight
+
+
+class _Counter:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, value=1, fail=False):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if fail:
+            raise RuntimeError("upstream down")
+        return {"value": value, "items": [value]}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSingleFlight:
+    """Coalescing semantics."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        counter = _Counter()
+        cached = single_flight("test.shared")(counter)
+
+        results = await asyncio.gather(*[cached(1) for _ in range(5)], cached(2))
+
+        assert counter.calls == 2
+        assert results[:5] == [{"value": 1, "items": [1]}] * 5
+        stats = get_single_flight_stats()["test.shared"]
+        assert (stats["calls"], stats["executions"], stats["coalesced"], stats["in_flight"]) == (6, 2, 4, 0)
+
+        await cached(1)
+        assert counter.calls == 3  # Not a cache
+
+    async def test_exceptions_reach_all_callers(self):
+        counter = _Counter()
+        group = SingleFlight("test.errors")
+
+        results = await asyncio.gather(
+            *[group.do("k", lambda: counter(fail=True)) for _ in range(3)], return_exceptions=True
+        )
+
+        assert counter.calls == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert group.get_stats()["errors"] == 1
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        counter = _Counter(delay=0.1)
+        group = SingleFlight("test.cancel")
+
+        leader = asyncio.create_task(group.do("k", counter))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(group.do("k", counter))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == {"value": 1, "items": [1]}
+        assert leader.cancelled()
+        assert counter.calls == 1
+
+    async def test_shared_results_are_copies(self):
+        group = SingleFlight("test.copies")
+        counter = _Counter()
+
+        first, second = await asyncio.gather(group.do("k", counter), group.do("k", counter))
+        first["items"].append(99)
+
+        assert second == {"value": 1, "items": [1]}
+        assert (await group.do("k", counter))["items"] == [1]
+
+    async def test_ignore_self_shares_across_instances(self):
+        class Service:
+            calls = 0
+
+            @single_flight("test.service", ignore_self=True)
+            async def fetch(self, days: int = 7):
+                Service.calls += 1
+                await asyncio.sleep(0.05)
+                return days
+
+        await asyncio.gather(Service().fetch(), Service().fetch(), Service().fetch(days=3))
+
+        assert Service.calls == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestServiceCoalescing:
+    """Decorated service methods."""
+
+    async def test_current_weather_coalesced(self):
+        from services.weather_aggregation_service import WeatherAggregationService
+
+        counter = _Counter()
+        services = [WeatherAggregationService(MagicMock(), MagicMock()) for _ in range(4)]
+        for service in services:
+            service._get_openweathermap_weather = lambda: counter(20.5)
+
+        results = await asyncio.gather(*[s.get_current_weather(prefer_source="openweathermap") for s in services])
+
+        assert counter.calls == 1
+        assert all(r["value"] == 20.5 for r in results)
+        assert get_single_flight_stats()["weather.current"]["coalesced"] >= 3
@@ -0,0 +1,164 @@
+"""
+Unit Tests for Training Worker Pool
+====================================
+
+Tests services/training_pool.py and domain/ml/model_artifacts.py.
+
+Coverage:
+- ✅ Jobs run in a separate process with CPU/thread limits applied
+- ✅ BLAS/OpenMP pools in the worker honor the thread cap
+- ✅ Failures, crashes and timeouts reported as failed jobs (API process unaffected)
+- ✅ Same-name jobs queued or running are shared, not duplicated
+- ✅ Reload hooks run after published models, not after skipped/failed runs
+- ✅ Status report: running, queued and recent jobs
+- ✅ Atomic pickle writes and latest/ symlink swaps
+"""
+
+import asyncio
+import os
+import pickle
+import time
+
+import pytest
+
+from domain.ml.model_artifacts import publish_latest, write_pickle_atomic
+from services.training_pool import (
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_SUCCEEDED,
+    TrainingLimits,
+    TrainingWorkerPool
+)
+
+TARGET = f"{__name__}:_fake_training"
+
+
+async def _fake_training(delay: float = 0.0, skipped: bool = False, fail: bool = False):
+    """Stand-in for DirectMLService.train_models (importable from the worker process)."""
+    await asyncio.sleep(delay)
+    if fail:
+        return {"success": False, "error": "not enough data"}
+    return {
+        "success": True,
+        "skipped": skipped,
+        "training_mode": "skip" if skipped else "incremental",
+        "pid": os.getpid(),
+        "omp_threads": os.environ.get("OMP_NUM_THREADS")
+    }
+
+
+def _blas_threads():
+    """Effective BLAS/OpenMP thread counts inside the worker."""
+    from threadpoolctl import threadpool_info
+    return {"threads": [pool["num_threads"] for pool in threadpool_info()]}
+
+
+def _crash():
+    os._exit(3)
+
+
+@pytest.mark.unit
+class TestOutOfProcessTraining:
+    """Jobs executed in spawned worker processes."""
+
+    def test_runs_in_worker_process_with_limits(self):
+        pool = TrainingWorkerPool(out_of_process=True, limits=TrainingLimits(cpus=1, timeout_seconds=60))
+
+        async def scenario():
+            job = pool.submit("sklearn", TARGET)
+            result = await pool.run("sklearn", TARGET)
+            return job, result
+
+        job, result = asyncio.run(scenario())
+
+        assert job.status == STATUS_SUCCEEDED
+        assert result["pid"] == job.pid != os.getpid()
+        assert result["omp_threads"] == "1"
+
+    def test_worker_thread_pools_capped(self):
+        """numpy is imported before the job runs; its thread pools still start capped."""
+        pytest.importorskip("threadpoolctl")
+        pool = TrainingWorkerPool(out_of_process=True, limits=TrainingLimits(cpus=1, timeout_seconds=60))
+        before = os.environ.get("OMP_NUM_THREADS")
+
+        result = asyncio.run(pool.run("sklearn", f"{__name__}:_blas_threads"))
+
+        assert result["threads"] and set(result["threads"]) == {1}
+        assert os.environ.get("OMP_NUM_THREADS") == before
+
+    def test_failures_and_timeouts(self):
+        pool = TrainingWorkerPool(out_of_process=True, limits=TrainingLimits(timeout_seconds=60), workers=3)
+        short_pool = TrainingWorkerPool(out_of_process=True, limits=TrainingLimits(timeout_seconds=3))
+
+        async def scenario():
+            return await asyncio.gather(
+                pool.run("sklearn", f"{__name__}:_crash"),
+                short_pool.run("prophet", TARGET, delay=60),
+                pool.run("enhanced", TARGET, unknown_argument=1),
+            )
+
+        start = time.monotonic()
+        crashed, timed_out, bad_call = asyncio.run(scenario())
+
+        assert time.monotonic() - start < 30
+        assert crashed == {"success": False, "error": "training process exited with code 3"}
+        assert "timeout" in timed_out["error"]
+        assert "TypeError" in bad_call["error"]
+        assert {job["status"] for job in pool.get_status()["recent"]} == {STATUS_FAILED}
+
+
+@pytest.mark.unit
+class TestTrainingQueue:
+    """Queueing, sharing, reload hooks and status (inline execution)."""
+
+    def test_shared_jobs_and_reload_hooks(self):
+        pool = TrainingWorkerPool(out_of_process=False, workers=1)
+        reloads = []
+        pool.register_reload_hook("sklearn", lambda: reloads.append("sklearn"))
+
+        async def scenario():
+            first = pool.submit("sklearn", TARGET, delay=0.05)
+            second = pool.submit("sklearn", TARGET, delay=0.05)
+            queued = pool.submit("prophet", TARGET)
+            status = pool.get_status()
+            await pool.run("sklearn", TARGET)
+            await pool.run("prophet", TARGET)
+            skipped = await pool.run("sklearn", TARGET, skipped=True)
+            failed = await pool.run("sklearn", TARGET, fail=True)
+            return first, second, queued, status, skipped, failed
+
+        first, second, queued, status, skipped, failed = asyncio.run(scenario())
+
+        assert first is second
+        assert [job["id"] for job in status["queued"]] == [first.id, queued.id]
+        assert reloads == ["sklearn"]
+        assert skipped["training_mode"] == "skip"
+        assert failed == {"success": False, "error": "not enough data"}
+        assert [job["status"] for job in pool.get_status()["recent"]][:2] == [STATUS_FAILED, STATUS_SKIPPED]
+
+    def test_unknown_job(self):
+        pool = TrainingWorkerPool(out_of_process=False)
+
+        async def scenario():
+            pool.submit("does_not_exist")
+
+        with pytest.raises(ValueError):
+            asyncio.run(scenario())
+
+
+@pytest.mark.unit
+class TestModelArtifacts:
+    """Atomic publication of model files."""
+
+    def test_atomic_pickle_and_symlink(self, tmp_path):
+        latest = tmp_path / "latest"
+        latest.mkdir()
+        for version in ("v1", "v2"):
+            write_pickle_atomic({"version": version}, tmp_path / f"model_{version}.pkl")
+            publish_latest(latest / "model.pkl", f"../model_{version}.pkl")
+
+        with open(latest / "model.pkl", "rb") as f:
+            assert pickle.load(f) == {"version": "v2"}
+        assert os.readlink(latest / "model.pkl") == "../model_v2.pkl"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["latest", "model_v1.pkl", "model_v2.pkl"]
+        assert [p.name for p in latest.iterdir()] == ["model.pkl"]
@@ -35,11 +35,12 @@ async function sendChatbotMessage() {
     const typingId = addTypingIndicator();
 
     try {
-        // Call chatbot API
-        const response = await fetch('/chat/ask', {
+        // Call chatbot API (Server-Sent Events: tokens según se generan)
+        const response = await fetch('/chat/ask/stream', {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
             },
             body: JSON.stringify({
                 question: question,
@@ -51,21 +52,35 @@ async function sendChatbotMessage() {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
 
-        const data = await response.json();
-
-        // Remove typing indicator
-        removeTypingIndicator(typingId);
-
-        // Add assistant response
-        addChatMessage(data.answer, 'assistant', {
-            tokens: data.tokens,
-            latency_ms: data.latency_ms,
-            cost_usd: data.cost_usd
+        let message = null;
+        let answer = '';
+
+        await readChatEvents(response, (event, data) => {
+            if (event === 'token') {
+                if (!message) {
+                    // Primer token: sustituir el typing indicator por la respuesta
+                    removeTypingIndicator(typingId);
+                    message = addChatMessage('', 'assistant');
+                }
+                answer += data.text;
+                renderAssistantMessage(message, answer);
+            } else if (event === 'done') {
+                removeTypingIndicator(typingId);
+                if (!message) {
+                    message = addChatMessage('', 'assistant');
+                }
+                renderAssistantMessage(message, data.answer, {
+                    tokens: data.tokens,
+                    latency_ms: data.latency_ms,
+                    cost_usd: data.cost_usd
+                });
+                updateChatbotStats(data);
+            } else if (event === 'error') {
+                removeTypingIndicator(typingId);
+                addChatMessage(data.answer, 'error');
+            }
         });
 
-        // Update stats
-        updateChatbotStats(data);
-
     } catch (error) {
         console.error('Chatbot error:', error);
         removeTypingIndicator(typingId);
@@ -78,6 +93,43 @@ async function sendChatbotMessage() {
     }
 }
 
+/**
+ * Leer eventos SSE (event/data) del body de un fetch
+ */
+async function readChatEvents(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        // Los eventos terminan en línea vacía
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            let data = '';
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith('event: ')) {
+                    event = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    data += line.slice(6);
+                }
+            }
+            if (data) {
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+}
+
 /**
  * Quick question button handler
  */
@@ -106,21 +158,7 @@ function addChatMessage(text, type, metadata = null) {
         messageDiv.style.display = 'flex';
         messageDiv.style.justifyContent = 'flex-end';
     } else if (type === 'assistant') {
-        const costBadge = metadata ?
-            `<span class="chat-cost-badge">${metadata.latency_ms}ms · ${metadata.tokens.total} tokens · $${metadata.cost_usd.toFixed(6)}</span>`
-            : '';
-
-        messageDiv.innerHTML = `
-            <div style="display: flex; gap: 1rem; align-items: flex-start;">
-                <div style="font-size: 2rem; flex-shrink: 0;">🤖</div>
-                <div style="flex: 1;">
-                    <div style="background: rgba(255,255,255,0.1); padding: 1rem; border-radius: 8px;">
-                        <div style="font-size: 0.95rem; line-height: 1.6; white-space: pre-wrap;">${formatAssistantMessage(text)}</div>
-                        ${costBadge ? `<div style="margin-top: 0.5rem;">${costBadge}</div>` : ''}
-                    </div>
-                </div>
-            </div>
-        `;
+        renderAssistantMessage(messageDiv, text, metadata);
     } else if (type === 'error') {
         messageDiv.innerHTML = `
             <div class="chat-error">
@@ -133,6 +171,31 @@ function addChatMessage(text, type, metadata = null) {
 
     // Scroll to bottom
     container.scrollTop = container.scrollHeight;
+    return messageDiv;
+}
+
+/**
+ * Render (o re-render durante el streaming) de un mensaje del asistente
+ */
+function renderAssistantMessage(messageDiv, text, metadata = null) {
+    const costBadge = metadata ?
+        `<span class="chat-cost-badge">${metadata.latency_ms}ms · ${metadata.tokens.total} tokens · $${metadata.cost_usd.toFixed(6)}</span>`
+        : '';
+
+    messageDiv.innerHTML = `
+        <div style="display: flex; gap: 1rem; align-items: flex-start;">
+            <div style="font-size: 2rem; flex-shrink: 0;">🤖</div>
+            <div style="flex: 1;">
+                <div style="background: rgba(255,255,255,0.1); padding: 1rem; border-radius: 8px;">
+                    <div style="font-size: 0.95rem; line-height: 1.6; white-space: pre-wrap;">${formatAssistantMessage(text)}</div>
+                    ${costBadge ? `<div style="margin-top: 0.5rem;">${costBadge}</div>` : ''}
+                </div>
+            </div>
+        </div>
+    `;
+
+    const container = document.getElementById('chatMessagesContainer');
+    container.scrollTop = container.scrollHeight;
 }
 
 /**